@@ -5,17 +5,19 @@ Updated 2025-12-04: Added playwright-stealth for Cloudflare bypass
 Updated 2025-12-11: FASE 94.3 - Fixed import location, bare except, improved code quality
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 from datetime import datetime
 from dataclasses import dataclass, asdict
-from playwright.async_api import async_playwright, Browser, Page, Playwright
-from playwright_stealth import Stealth
+from playwright.async_api import Browser, BrowserContext, Page, Playwright
 from loguru import logger
 import time
 import asyncio
 
+from browser_pool import BrowserLease, get_browser_pool, shutdown_browser_pool
 from config import settings
+from http_fetcher import fetch_html as http_fetch_html, shutdown_http_client
 from resource_monitor import ResourceMonitor  # FASE 94.3: Moved from inside initialize()
+from resource_policy import ALLOW_ALL, ResourcePolicy, ResourceStats, apply_resource_policy
 
 
 @dataclass
@@ -59,90 +61,54 @@ class BaseScraper(ABC):
     _initialization_semaphore: asyncio.Semaphore = None
     _max_concurrent_init: int = 3  # Máximo de browsers inicializando ao mesmo tempo
 
+    # Requests aborted in this scraper's pages (override with a resource_policy preset)
+    resource_policy: ResourcePolicy = ALLOW_ALL
+
+    # Server-rendered sources: fetch_html tries a plain HTTP GET before the browser
+    http_first: bool = False
+
     def __init__(self, name: str, source: str, requires_login: bool = False):
         self.name = name
         self.source = source
         self.requires_login = requires_login
-        # Each scraper instance has its own browser and page (not shared)
-        self.playwright: Optional[Playwright] = None
+        # Browser is shared (BrowserPool); context and page belong to this instance
+        self.playwright: Optional[Playwright] = None  # Unused since BrowserPool (kept for compatibility)
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self._stealth_context = None  # Stealth context manager
+        self._lease: Optional[BrowserLease] = None
+        self._stealth_context = None  # Unused since BrowserPool (stealth lives in the pool)
+        self.resource_stats = ResourceStats()
+        self.fetch_mode: Optional[str] = None  # "http" or "browser" (last fetch_html call)
         self._initialized = False
         # Note: _initialization_queue lock is created lazily in async context
 
     async def _create_browser_and_page(self):
         """
-        Create individual browser and page for this scraper instance (matches backend pattern)
+        Get an isolated context and page for this scraper instance from the shared BrowserPool
+
+        The pool keeps warm Chromium processes (with playwright-stealth), so
+        this no longer pays a browser cold start: only a new BrowserContext
+        (own cookies/storage) and page are created.
 
         Updated 2025-12-04: Uses playwright-stealth for Cloudflare bypass
         Updated 2025-12-11: Added 60s timeout to prevent resource leak on hang
         """
         try:
-            # FASE 94: Wrap entire browser creation with 60s timeout
-            # This prevents zombie processes when browser creation hangs due to memory pressure
-            async with asyncio.timeout(60):  # 60s max for browser creation
-                # Start Playwright with Stealth (Cloudflare bypass)
-                if not self.playwright:
-                    # Configure stealth to mimic real browser
-                    stealth = Stealth(
-                        navigator_languages_override=('pt-BR', 'pt', 'en-US', 'en'),
-                        navigator_platform_override='Win32',
-                        navigator_user_agent_override='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    )
-                    # Use stealth wrapper around async_playwright
-                    self._stealth_context = stealth.use_async(async_playwright())
-                    self.playwright = await self._stealth_context.__aenter__()
-                    logger.debug(f"Playwright with Stealth started for {self.name}")
-
-                # Launch browser with configuration matching backend TypeScript
-                # Try Playwright's Chromium first (more stable in Docker)
-                # Backend uses: executablePath || undefined (Playwright's own Chromium if env not set)
-                import os
-                executable_path = os.environ.get('PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH')
-
-                launch_args = {
-                    'headless': settings.CHROME_HEADLESS,
-                    'timeout': 120000,  # FASE 141: Increased from 60s to 120s (high timeout rate 94.7%)
-                    'args': [
-                        '--no-sandbox',
-                        '--disable-setuid-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-accelerated-2d-canvas',
-                        '--disable-gpu',
-                        # FASE 102 FIX: Removed --single-process (causes EPIPE crashes)
-                        # '--single-process',  # DISABLED - causes pipe communication failures
-                        '--disable-background-timer-throttling',
-                        '--disable-backgrounding-occluded-windows',
-                        '--disable-renderer-backgrounding',
-                    ],
-                }
-
-                # Only set executable_path if env variable is set
-                if executable_path:
-                    launch_args['executable_path'] = executable_path
-
-                self.browser = await self.playwright.chromium.launch(**launch_args)
-                logger.debug(f"Playwright browser created for {self.name} (with Stealth)")
-
-                # Create page
-                self.page = await self.browser.new_page()
-
-                # Set viewport (matches backend: 1920x1080)
-                await self.page.set_viewport_size({"width": 1920, "height": 1080})
-
-                # Set user agent
-                await self.page.set_extra_http_headers({
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                })
-
-                # Set default timeout (120s for complex pages like Fundamentus)
-                self.page.set_default_timeout(120000)
-
-                logger.debug(f"Playwright page created for {self.name}")
+            # FASE 94: 60s timeout on context creation (and a possible browser launch)
+            # This prevents zombie processes when browser creation hangs due to memory pressure.
+            # Waiting for a free pool slot is not bounded (busy pool is not a hang)
+            self._lease = await get_browser_pool().acquire(self.name, timeout=60)
+            self.browser = self._lease.browser
+            self.context = self._lease.context
+            self.page = self._lease.page
+            # Abort images/fonts/trackers the scraper never parses (see resource_policy.py)
+            async with asyncio.timeout(60):
+                await apply_resource_policy(self.context, self.resource_policy, self.resource_stats)
+            logger.debug(f"Playwright context and page created for {self.name} (pooled browser)")
 
         except asyncio.TimeoutError:
-            logger.error(f"[TIMEOUT] Browser creation timed out for {self.name} after 120s - cleaning up")
+            logger.error(f"[TIMEOUT] Browser context creation timed out for {self.name} after 60s - cleaning up")
             await self._force_cleanup()  # Force cleanup on timeout
             raise
         except Exception as e:
@@ -206,126 +172,126 @@ class BaseScraper(ABC):
         """Override in subclasses that require login"""
         pass
 
-    async def cleanup(self):
-        """
-        Cleanup resources (page, browser, playwright, and stealth context - individual per scraper)
-        FASE 102 FIX: Added EPIPE/BrokenPipeError handling to prevent crashes on browser death
+    @property
+    def uses_http_first(self) -> bool:
+        """HTTP-first fetching is enabled for this scraper"""
+        return self.http_first and settings.SCRAPER_HTTP_FIRST and not self.requires_login
+
+    async def fetch_html(
+        self,
+        url: str,
+        ready_selector: Optional[str] = None,
+        final_markers: Sequence[str] = (),
+        settle_delay: float = 1.0,
+    ) -> str:
         """
-        try:
-            if self.page:
-                try:
-                    await self.page.close()
-                except (BrokenPipeError, ConnectionResetError) as e:
-                    logger.warning(f"[{self.name}] EPIPE on page close (browser died): {e}")
-                except Exception as e:
-                    if 'EPIPE' in str(e) or 'Target page, context or browser has been closed' in str(e):
-                        logger.warning(f"[{self.name}] Browser already closed during page cleanup")
-                    else:
-                        logger.debug(f"[{self.name}] Page close error: {e}")
-                finally:
-                    self.page = None
-                logger.debug(f"Page closed for {self.name}")
+        HTML of a page: over HTTP when possible (http_first), else via Playwright
 
-            if self.browser:
-                try:
-                    await self.browser.close()
-                except (BrokenPipeError, ConnectionResetError) as e:
-                    logger.warning(f"[{self.name}] EPIPE on browser close (process died): {e}")
-                except Exception as e:
-                    if 'EPIPE' in str(e) or 'Browser has been closed' in str(e):
-                        logger.warning(f"[{self.name}] Browser already terminated")
-                    else:
-                        logger.debug(f"[{self.name}] Browser close error: {e}")
-                finally:
-                    self.browser = None
-                logger.debug(f"Browser closed for {self.name}")
+        The HTTP response is used only if it is not an error/challenge page
+        and contains ready_selector (or one of final_markers); otherwise the
+        page is loaded in the browser, which is initialized on demand.
 
-            # Close stealth context (which closes playwright internally)
-            if self._stealth_context:
-                try:
-                    await self._stealth_context.__aexit__(None, None, None)
-                except (BrokenPipeError, ConnectionResetError):
-                    logger.warning(f"[{self.name}] EPIPE on stealth context exit")
-                except Exception:
-                    pass  # Ignore errors on stealth context cleanup
-                finally:
-                    self._stealth_context = None
-                    self.playwright = None
-                logger.debug(f"Stealth context closed for {self.name}")
-            elif self.playwright:
-                try:
-                    await self.playwright.stop()
-                except (BrokenPipeError, ConnectionResetError):
-                    logger.warning(f"[{self.name}] EPIPE on playwright stop")
-                except Exception:
-                    pass  # Ignore errors
-                finally:
-                    self.playwright = None
-                logger.debug(f"Playwright stopped for {self.name}")
+        Args:
+            url: Page URL
+            ready_selector: CSS selector present in usable pages
+            final_markers: Lowercase texts of usable pages without the selector (e.g. "não encontrado")
+            settle_delay: Seconds to let page scripts run after "load" (browser only)
 
-            self._initialized = False
+        Returns:
+            Page HTML (self.fetch_mode tells which path served it)
+        """
+        if self.uses_http_first:
+            html = await http_fetch_html(url, ready_selector, final_markers, owner=self.name)
+            if html is not None:
+                self.fetch_mode = "http"
+                return html
+
+        if not self.page:
+            await self.initialize()
+
+        logger.info(f"Navigating to {url}")
+        # Using 'load' instead of 'networkidle' to avoid timeout issues with slow analytics
+        await self.page.goto(url, wait_until="load", timeout=60000)
+        await asyncio.sleep(settle_delay)
+        self.fetch_mode = "browser"
+        return await self.page.content()
+
+    async def cleanup(self, broken: bool = False):
+        """
+        Cleanup resources: close this instance's context/page and return the
+        browser to the shared pool (the browser itself stays warm)
+        FASE 102 FIX: Added EPIPE/BrokenPipeError handling to prevent crashes on browser death
+
+        Args:
+            broken: Browser crashed or hung - the pool recycles it instead of reusing it
+        """
+        lease, self._lease = self._lease, None
+        try:
+            if lease:
+                # Closing the context closes the page too
+                await lease.pool.release(lease, broken=broken)
+                logger.debug(f"Browser context released for {self.name}")
+                if self.resource_stats.blocked:
+                    logger.debug(
+                        f"[{self.name}] Blocked {self.resource_stats.blocked}/"
+                        f"{self.resource_stats.blocked + self.resource_stats.allowed} requests "
+                        f"(~{self.resource_stats.bytes_saved / 1024:.0f} KB saved)"
+                    )
 
         except (BrokenPipeError, ConnectionResetError) as e:
             logger.warning(f"[{self.name}] EPIPE during cleanup - browser process died: {e}")
+        except Exception as e:
+            logger.error(f"Error during cleanup of {self.name}: {e}")
+        finally:
             # Reset all references to allow GC
             self.page = None
+            self.context = None
             self.browser = None
-            self._stealth_context = None
-            self.playwright = None
             self._initialized = False
-        except Exception as e:
-            logger.error(f"Error during cleanup of {self.name}: {e}")
 
     async def _force_cleanup(self):
         """
         FASE 94: Force cleanup with timeout - used when browser creation fails or times out.
         FASE 102 FIX: Added EPIPE handling for graceful recovery from browser crashes.
+        The pooled browser is recycled (broken=True): a crash or hang makes it suspect.
         This ensures no zombie processes are left behind even when cleanup itself hangs.
         """
         logger.warning(f"[FORCE CLEANUP] Starting force cleanup for {self.name}")
         try:
             # Wrap cleanup with 10s timeout to prevent cleanup from hanging
             async with asyncio.timeout(10):
-                await self.cleanup()
+                await self.cleanup(broken=True)
             logger.info(f"[FORCE CLEANUP] ✅ Cleanup completed for {self.name}")
         except asyncio.TimeoutError:
             logger.error(f"[FORCE CLEANUP] ⚠️ Cleanup timed out for {self.name} - resources may leak")
-            # Reset references even if cleanup failed to allow GC
-            self.page = None
-            self.browser = None
-            self._stealth_context = None
-            self.playwright = None
-            self._initialized = False
         except (BrokenPipeError, ConnectionResetError) as e:
             # FASE 102 FIX: Handle EPIPE gracefully - browser process already dead
             logger.warning(f"[FORCE CLEANUP] EPIPE for {self.name} - browser already dead: {e}")
-            self.page = None
-            self.browser = None
-            self._stealth_context = None
-            self.playwright = None
-            self._initialized = False
         except Exception as e:
             # Check if it's an EPIPE error wrapped in another exception
             if 'EPIPE' in str(e):
                 logger.warning(f"[FORCE CLEANUP] EPIPE error for {self.name}: {e}")
             else:
                 logger.error(f"[FORCE CLEANUP] ❌ Error during force cleanup of {self.name}: {e}")
-            # Reset references even if cleanup failed
+        finally:
+            # Reset references even if cleanup failed to allow GC
+            self._lease = None
             self.page = None
+            self.context = None
             self.browser = None
-            self._stealth_context = None
-            self.playwright = None
             self._initialized = False
 
     @classmethod
     async def cleanup_browser(cls):
         """
-        DEPRECATED: No longer needed - each scraper instance has its own browser
+        Close the shared browsers (BrowserPool of the running event loop) and
+        the shared HTTP client used by fetch_html
 
-        Browser cleanup is now handled by individual scraper.cleanup() method
-        This method is kept for backward compatibility but does nothing
+        Call on service shutdown; scraper.cleanup() only returns the browser
+        to the pool.
         """
-        pass
+        await shutdown_browser_pool()
+        await shutdown_http_client()
 
     @abstractmethod
     async def scrape(self, ticker: str) -> ScraperResult:
@@ -371,8 +337,9 @@ class BaseScraper(ABC):
                 try:
                     logger.info(f"[{self.name}] Scraping {ticker} (attempt {attempt + 1}/{settings.SCRAPER_MAX_RETRIES})")
 
-                    # Ensure initialized
-                    await self.initialize()
+                    # Ensure initialized (HTTP-first scrapers start the browser only if needed)
+                    if not self.uses_http_first:
+                        await self.initialize()
 
                     # Perform scrape
                     result = await self.scrape(ticker)
@@ -427,8 +394,9 @@ class BaseScraper(ABC):
                 logger.warning(f"[{self.name}] Cleanup failed: {cleanup_error}")
 
     async def __aenter__(self):
-        """Async context manager entry"""
-        await self.initialize()
+        """Async context manager entry (HTTP-first scrapers lease a browser only if a fetch needs it)"""
+        if not self.uses_http_first:
+            await self.initialize()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
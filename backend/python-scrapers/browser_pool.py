@@ -0,0 +1,388 @@
+"""
+Browser Pool - Chromium compartilhado entre jobs de scraping
+
+Antes cada instância de scraper iniciava seu próprio driver Playwright e
+processo Chromium (cold start de alguns segundos por job) e fechava tudo
+ao final. O pool mantém poucos browsers aquecidos por processo e entrega a
+cada job um BrowserContext isolado (cookies, storage e cache próprios) com
+uma página:
+
+- BROWSER_POOL_SIZE browsers, cada um com até BROWSER_POOL_MAX_CONTEXTS
+  jobs simultâneos (jobs excedentes aguardam uma vaga)
+- browser reciclado após BROWSER_POOL_MAX_JOBS jobs (limita vazamento de
+  memória do Chromium) ou ao cair/travar (EPIPE, processo morto)
+- um pool por event loop (main.py, api-service e execuções via
+  asyncio.run têm loops distintos e objetos Playwright não atravessam loops)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from loguru import logger
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from playwright_stealth import Stealth
+
+from config import settings
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Chromium flags (matches backend TypeScript)
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+    # FASE 102 FIX: Removed --single-process (causes EPIPE crashes)
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+
+@dataclass
+class PooledBrowser:
+    """Chromium process managed by the pool"""
+
+    browser: Browser
+    launched_at: float = field(default_factory=time.time)
+    active_contexts: int = 0
+    jobs_served: int = 0
+    retired: bool = False  # No new jobs; closed once active_contexts reaches 0
+
+    @property
+    def alive(self) -> bool:
+        return not self.retired and self.browser.is_connected()
+
+
+@dataclass
+class BrowserLease:
+    """Isolated context + page lent to one job (return it with pool.release)"""
+
+    pool: "BrowserPool"
+    pooled: PooledBrowser
+    context: BrowserContext
+    page: Page
+    owner: str = ""
+    released: bool = False
+
+    @property
+    def browser(self) -> Browser:
+        return self.pooled.browser
+
+
+class BrowserPool:
+    """
+    Pool of warm Chromium browsers handing out one BrowserContext per job
+
+    Usage:
+        lease = await get_browser_pool().acquire("Fundamentus")
+        try:
+            await lease.page.goto(url)
+        finally:
+            await lease.pool.release(lease)
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_contexts: Optional[int] = None,
+        max_jobs: Optional[int] = None,
+    ):
+        self.size = max(1, size or settings.BROWSER_POOL_SIZE)
+        self.max_contexts = max(1, max_contexts or settings.BROWSER_POOL_MAX_CONTEXTS)
+        self.max_jobs = max(1, max_jobs or settings.BROWSER_POOL_MAX_JOBS)
+
+        self._stealth_context = None
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._retiring: List[PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        # Notified (with _lock held) whenever a launch started outside the lock ends
+        self._launched = asyncio.Condition(self._lock)
+        self._launching = 0
+        self._start_lock = asyncio.Lock()  # Playwright driver is started once
+        # One slot per simultaneous job (bounds memory: size * max_contexts pages)
+        self._slots = asyncio.Semaphore(self.size * self.max_contexts)
+        self._closed = False
+
+        # Estatísticas
+        self._launches = 0
+        self._recycled = 0
+        self._crashed = 0
+        self._leases = 0
+
+    async def acquire(self, owner: str = "", timeout: Optional[float] = None) -> BrowserLease:
+        """
+        Lend an isolated context and page (waits for a free slot)
+
+        Args:
+            owner: Scraper name (logs only)
+            timeout: Seconds allowed to create the context (and launch a browser
+                if needed) - the wait for a free slot is not bounded
+
+        Returns:
+            BrowserLease with context and page ready to navigate
+
+        Raises:
+            RuntimeError: If the pool was shut down
+            asyncio.TimeoutError: If creating the context took longer than timeout
+        """
+        await self._slots.acquire()
+        try:
+            async with self._launched:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is shut down")
+                    pooled = await self._pick_browser()
+                    if pooled is not None:
+                        pooled.active_contexts += 1
+                        break
+                    if len(self._browsers) + self._launching < self.size:
+                        self._launching += 1  # Launch below, outside the lock
+                        break
+                    # Every free context belongs to a browser still launching
+                    await self._launched.wait()
+
+            try:
+                async with asyncio.timeout(timeout):
+                    if pooled is None:
+                        pooled = await self._add_browser()
+                    context = await pooled.browser.new_context(
+                        viewport={"width": 1920, "height": 1080},  # matches backend
+                        user_agent=USER_AGENT,
+                    )
+                    page = await context.new_page()
+                # 120s default for complex pages like Fundamentus
+                page.set_default_timeout(120000)
+            except BaseException:
+                if pooled is None:
+                    raise  # Launch failed: _add_browser already undid the reservation
+                async with self._lock:
+                    pooled.active_contexts -= 1
+                    if not pooled.retired and not pooled.browser.is_connected():
+                        self._crashed += 1
+                        await self._retire(pooled)
+                raise
+
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._leases += 1
+        logger.debug(
+            f"[BrowserPool] Context lent to {owner or 'job'} "
+            f"(browser jobs={pooled.jobs_served}, active={pooled.active_contexts})"
+        )
+        return BrowserLease(pool=self, pooled=pooled, context=context, page=page, owner=owner)
+
+    async def release(self, lease: BrowserLease, broken: bool = False):
+        """
+        Close the job context and give its slot back
+
+        Args:
+            lease: Lease returned by acquire (releasing twice is a no-op)
+            broken: The job saw the browser crash/hang - recycle it
+        """
+        if lease.released:
+            return
+        lease.released = True
+        pooled = lease.pooled
+
+        try:
+            try:
+                async with asyncio.timeout(10):
+                    await lease.context.close()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                logger.warning(f"[BrowserPool] EPIPE closing context of {lease.owner}: {e}")
+                broken = True
+            except asyncio.TimeoutError:
+                logger.warning(f"[BrowserPool] Context close timed out for {lease.owner} - recycling browser")
+                broken = True
+            except Exception as e:
+                logger.debug(f"[BrowserPool] Context close error for {lease.owner}: {e}")
+
+            async with self._lock:
+                pooled.active_contexts -= 1
+                pooled.jobs_served += 1
+                if pooled.retired:
+                    if pooled.active_contexts == 0 and pooled in self._retiring:
+                        await self._close_browser(pooled)
+                elif broken or not pooled.browser.is_connected():
+                    self._crashed += 1
+                    await self._retire(pooled)
+                elif pooled.jobs_served >= self.max_jobs:
+                    self._recycled += 1
+                    await self._retire(pooled)
+        finally:
+            self._slots.release()
+
+    async def shutdown(self):
+        """Close every browser and stop Playwright"""
+        async with self._lock:
+            self._closed = True
+            for pooled in self._browsers + self._retiring:
+                await self._close_browser(pooled)
+            self._browsers.clear()
+            self._retiring.clear()
+
+            if self._stealth_context:
+                try:
+                    await self._stealth_context.__aexit__(None, None, None)
+                except Exception:
+                    pass  # Ignore errors on stealth context cleanup
+                self._stealth_context = None
+                self._playwright = None
+
+        logger.info(f"[BrowserPool] Shut down ({self._launches} browsers launched, {self._leases} jobs served)")
+
+    def get_stats(self) -> dict:
+        """Retorna estatísticas do pool"""
+        return {
+            "browsers": len(self._browsers),
+            "retiring": len(self._retiring),
+            "active_contexts": sum(p.active_contexts for p in self._browsers + self._retiring),
+            "max_browsers": self.size,
+            "max_contexts_per_browser": self.max_contexts,
+            "max_jobs_per_browser": self.max_jobs,
+            "launches": self._launches,
+            "recycled": self._recycled,
+            "crashed": self._crashed,
+            "jobs_served": self._leases,
+        }
+
+    async def _pick_browser(self) -> Optional[PooledBrowser]:
+        """
+        Least busy live browser with a free context (lock held)
+
+        Returns:
+            PooledBrowser, or None when a browser must be launched (or a
+            launch in progress awaited) first
+        """
+        for pooled in [p for p in self._browsers if not p.alive]:
+            await self._retire(pooled)
+
+        browsers = len(self._browsers) + self._launching
+        candidates = [p for p in self._browsers if p.active_contexts < self.max_contexts]
+        if candidates and (browsers >= self.size or min(p.active_contexts for p in candidates) == 0):
+            return min(candidates, key=lambda p: p.active_contexts)
+
+        if browsers < self.size or self._launching:
+            return None
+
+        # Slots are bounded by size * max_contexts, so only retiring browsers
+        # still holding jobs can get here: oversubscribe the least busy one
+        return min(self._browsers, key=lambda p: p.active_contexts)
+
+    async def _add_browser(self) -> PooledBrowser:
+        """
+        Launch the browser reserved in acquire (lock NOT held) and add it to the pool
+
+        Returns:
+            PooledBrowser already counting the caller's context
+        """
+        try:
+            browser = await self._launch_browser()
+        except BaseException:
+            async with self._launched:
+                self._launching -= 1
+                self._launched.notify_all()
+            raise
+
+        async with self._launched:
+            self._launching -= 1
+            self._launched.notify_all()
+            pooled = PooledBrowser(browser=browser, active_contexts=1)
+            if self._closed:
+                await self._close_browser(pooled)
+                raise RuntimeError("Browser pool is shut down")
+            self._browsers.append(pooled)
+        return pooled
+
+    async def _launch_browser(self) -> Browser:
+        """Start Playwright (once) and launch a Chromium process"""
+        async with asyncio.timeout(60):  # FASE 94: avoid zombie launches under memory pressure
+            async with self._start_lock:
+                if not self._playwright:
+                    # Stealth (Cloudflare bypass) applies to every context of every browser
+                    stealth = Stealth(
+                        navigator_languages_override=('pt-BR', 'pt', 'en-US', 'en'),
+                        navigator_platform_override='Win32',
+                        navigator_user_agent_override=USER_AGENT,
+                    )
+                    self._stealth_context = stealth.use_async(async_playwright())
+                    self._playwright = await self._stealth_context.__aenter__()
+                    logger.debug("[BrowserPool] Playwright with Stealth started")
+
+            launch_args = {
+                'headless': settings.CHROME_HEADLESS,
+                'timeout': 120000,  # FASE 141: Increased from 60s to 120s
+                'args': LAUNCH_ARGS,
+            }
+            # Playwright's own Chromium unless the env variable is set
+            executable_path = os.environ.get('PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH')
+            if executable_path:
+                launch_args['executable_path'] = executable_path
+
+            started = time.time()
+            browser = await self._playwright.chromium.launch(**launch_args)
+
+        self._launches += 1
+        logger.info(
+            f"[BrowserPool] Chromium launched in {time.time() - started:.2f}s "
+            f"({len(self._browsers) + 1}/{self.size} browsers)"
+        )
+        return browser
+
+    async def _retire(self, pooled: PooledBrowser):
+        """Stop lending a browser; close it now or when its last job ends (lock held)"""
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        pooled.retired = True
+        if pooled.active_contexts <= 0 or not pooled.browser.is_connected():
+            await self._close_browser(pooled)
+        elif pooled not in self._retiring:
+            self._retiring.append(pooled)
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        """Close a Chromium process, tolerating already dead browsers"""
+        if pooled in self._retiring:
+            self._retiring.remove(pooled)
+        try:
+            async with asyncio.timeout(10):
+                await pooled.browser.close()
+        except (BrokenPipeError, ConnectionResetError, asyncio.TimeoutError) as e:
+            logger.warning(f"[BrowserPool] Browser already dead or hung on close: {e!r}")
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Browser close error: {e}")
+        logger.debug(
+            f"[BrowserPool] Browser closed after {pooled.jobs_served} jobs "
+            f"({time.time() - pooled.launched_at:.0f}s alive)"
+        )
+
+
+# Um pool por event loop (Playwright é preso ao loop onde foi iniciado)
+_pools: Dict[asyncio.AbstractEventLoop, BrowserPool] = {}
+
+
+def get_browser_pool() -> BrowserPool:
+    """Browser pool of the running event loop (created on first use)"""
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _pools if other.is_closed()]:
+        del _pools[other]
+    if loop not in _pools:
+        _pools[loop] = BrowserPool()
+    return _pools[loop]
+
+
+async def shutdown_browser_pool():
+    """Shut down the pool of the running event loop, if any"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.shutdown()
@@ -2,8 +2,34 @@
 Configuration for Python Scrapers
 """
 import os
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
+
+
+def parse_source_limits(value: str) -> Dict[str, int]:
+    """
+    Parse SCRAPER_SOURCE_CONCURRENCY ("SOURCE=N,..." -> {"SOURCE": N})
+
+    Raises:
+        ValueError: If an entry is not SOURCE=N with N a positive integer
+    """
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        source, _, limit = item.partition("=")
+        try:
+            parsed = int(limit)
+        except ValueError:
+            parsed = 0
+        if not source.strip() or parsed < 1:
+            raise ValueError(
+                f"SCRAPER_SOURCE_CONCURRENCY: invalid entry '{item.strip()}' "
+                f"(expected SOURCE=N with N >= 1, e.g. \"FUNDAMENTUS=3,STATUSINVEST=1\")"
+            )
+        limits[source.strip().upper()] = parsed
+    return limits
 
 
 class Settings(BaseSettings):
@@ -22,15 +48,34 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
 
+    # Job queue (see job_queue.py)
+    SCRAPER_QUEUE_MODE: str = "list"  # list (LPUSH scraper:jobs) or stream (XADD scraper:jobs:stream)
+    SCRAPER_QUEUE_BLOCK_TIMEOUT: int = 5  # Seconds a blocking read waits before re-checking shutdown
+    SCRAPER_QUEUE_RECLAIM_IDLE: int = 900  # Stream mode: seconds before an unacked job is reclaimed
+
     # Scraper Configuration
     CHROME_HEADLESS: bool = True
     SCRAPER_TIMEOUT: int = 30000
     SCRAPER_MAX_RETRIES: int = 3
-    SCRAPER_CONCURRENT_JOBS: int = 3
+    SCRAPER_CONCURRENT_JOBS: int = 3  # Jobs scraped at the same time (per worker process)
+    SCRAPER_WORKER_PROCESSES: int = 1  # Service processes consuming the queue
+    SCRAPER_SOURCE_MAX_CONCURRENCY: int = 2  # Default cap of simultaneous jobs per source
+    SCRAPER_SOURCE_CONCURRENCY: str = ""  # Per-source caps, e.g. "FUNDAMENTUS=3,STATUSINVEST=1"
     SCRAPING_CONCURRENT_JOBS: int = 3
     SCRAPING_MAX_RETRIES: int = 3
     SCRAPING_TIMEOUT: int = 30000
 
+    # Browser Pool (warm Chromium processes shared by jobs, one BrowserContext per job)
+    BROWSER_POOL_SIZE: int = 2  # Chromium processes per service process
+    BROWSER_POOL_MAX_CONTEXTS: int = 4  # Simultaneous jobs per browser
+    BROWSER_POOL_MAX_JOBS: int = 50  # Recycle a browser after N jobs
+    SCRAPER_BLOCK_RESOURCES: bool = True  # Apply each scraper's resource_policy (see resource_policy.py)
+
+    # HTTP-first fetching (scrapers with http_first = True, see http_fetcher.py)
+    SCRAPER_HTTP_FIRST: bool = True  # Try a plain HTTP GET before the browser
+    SCRAPER_HTTP_TIMEOUT: float = 15.0  # Seconds per HTTP request before falling back to the browser
+    SCRAPER_HTTP_MAX_CONNECTIONS: int = 20  # Pooled keep-alive connections per process
+
     # Chrome/Browser Configuration
     CHROME_USER_DATA_DIR: str = "./browser-profiles"
     CHROME_EXECUTABLE_PATH: str = "/usr/bin/chromium-browser"
@@ -72,6 +117,18 @@ class Settings(BaseSettings):
         """Get database URL"""
         return f"postgresql://{self.DB_USERNAME}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_DATABASE}"
 
+    @field_validator("SCRAPER_SOURCE_CONCURRENCY")
+    @classmethod
+    def validate_source_concurrency(cls, value: str) -> str:
+        """Fail at startup (naming the setting) instead of on the first job"""
+        parse_source_limits(value)
+        return value
+
+    @property
+    def source_concurrency_limits(self) -> Dict[str, int]:
+        """Per-source caps from SCRAPER_SOURCE_CONCURRENCY ("SOURCE=N,...")"""
+        return parse_source_limits(self.SCRAPER_SOURCE_CONCURRENCY)
+
     @property
     def redis_url(self) -> str:
         """Get Redis URL"""
@@ -194,6 +194,46 @@ class ConfigManager:
             "SCRAPER_CONCURRENT_JOBS", required=False, default="3",
             description="Number of concurrent scraper jobs", category="scrapers"
         ),
+        "SCRAPER_QUEUE_MODE": ConfigVariable(
+            "SCRAPER_QUEUE_MODE", required=False, default="list",
+            description="Job queue mode: list (LPUSH scraper:jobs) or stream (consumer groups)", category="scrapers"
+        ),
+        "SCRAPER_QUEUE_BLOCK_TIMEOUT": ConfigVariable(
+            "SCRAPER_QUEUE_BLOCK_TIMEOUT", required=False, default="5",
+            description="Seconds a blocking queue read waits", category="scrapers"
+        ),
+        "SCRAPER_QUEUE_RECLAIM_IDLE": ConfigVariable(
+            "SCRAPER_QUEUE_RECLAIM_IDLE", required=False, default="900",
+            description="Stream mode: seconds before an unacknowledged job is reclaimed", category="scrapers"
+        ),
+        "SCRAPER_WORKER_PROCESSES": ConfigVariable(
+            "SCRAPER_WORKER_PROCESSES", required=False, default="1",
+            description="Scraper service processes consuming the job queue", category="scrapers"
+        ),
+        "SCRAPER_SOURCE_MAX_CONCURRENCY": ConfigVariable(
+            "SCRAPER_SOURCE_MAX_CONCURRENCY", required=False, default="2",
+            description="Default maximum simultaneous jobs per source", category="scrapers"
+        ),
+        "SCRAPER_SOURCE_CONCURRENCY": ConfigVariable(
+            "SCRAPER_SOURCE_CONCURRENCY", required=False, default="",
+            description="Per-source job caps (e.g. FUNDAMENTUS=3,STATUSINVEST=1)", category="scrapers"
+        ),
+        "SCRAPER_BLOCK_RESOURCES": ConfigVariable(
+            "SCRAPER_BLOCK_RESOURCES", required=False, default="true",
+            description="Abort images/fonts/trackers per scraper resource policy", category="scrapers"
+        ),
+        "SCRAPER_HTTP_FIRST": ConfigVariable(
+            "SCRAPER_HTTP_FIRST", required=False, default="true",
+            description="Fetch static-HTML sources over HTTP before using the browser", category="scrapers"
+        ),
+        "SCRAPER_HTTP_TIMEOUT": ConfigVariable(
+            "SCRAPER_HTTP_TIMEOUT", required=False, default="15",
+            description="HTTP-first request timeout in seconds", category="scrapers"
+        ),
+        "SCRAPER_HTTP_MAX_CONNECTIONS": ConfigVariable(
+            "SCRAPER_HTTP_MAX_CONNECTIONS", required=False, default="20",
+            description="Pooled HTTP connections per process", category="scrapers"
+        ),
         "SCRAPING_TIMEOUT": ConfigVariable(
             "SCRAPING_TIMEOUT", required=False, default="30000",
             description="Scraping timeout", category="scrapers"
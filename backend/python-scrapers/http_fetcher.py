@@ -0,0 +1,197 @@
+"""
+HTTP Fetcher - Busca de HTML sem browser para páginas renderizadas no servidor
+
+Fundamentus, Investsite e StatusInvest entregam os dados no HTML do
+servidor: um GET com cliente HTTP (~100 ms) basta na maioria dos tickers,
+sem BrowserContext nem execução de JavaScript. O BaseScraper tenta este
+caminho primeiro nos scrapers com http_first = True e só usa o Playwright
+quando a resposta não serve:
+
+- erro de rede ou status >= 400 (403/429/503 costumam ser bloqueio anti-bot)
+- página de challenge (Cloudflare "Just a moment...", captcha)
+- seletor esperado ausente (layout mudou ou conteúdo montado via JS)
+
+Cliente httpx compartilhado por event loop (como o BrowserPool), com
+keep-alive e HTTP/2 quando o pacote h2 está instalado (httpx[http2]).
+"""
+
+import asyncio
+import importlib.util
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import httpx
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from browser_pool import USER_AGENT
+from config import settings
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+if not HTTP2_AVAILABLE:
+    logger.debug("[HttpFetcher] h2 not installed - using HTTP/1.1 keep-alive")
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+# Anti-bot interstitials (lowercase) - only a real browser gets past them
+CHALLENGE_MARKERS = (
+    "just a moment...",
+    "attention required! | cloudflare",
+    "cf-chl-",
+    "challenge-platform",
+    "g-recaptcha",
+    "h-captcha",
+)
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+@dataclass
+class HttpFetchStats:
+    """HTTP-first outcomes: pages served over HTTP vs escalated to the browser"""
+
+    served: int = 0
+    escalated: int = 0
+    escalations_by_reason: Dict[str, int] = field(default_factory=dict)
+    total_time: float = 0.0
+
+    def record(self, reason: Optional[str], elapsed: float):
+        self.total_time += elapsed
+        if reason is None:
+            self.served += 1
+            return
+        self.escalated += 1
+        self.escalations_by_reason[reason] = self.escalations_by_reason.get(reason, 0) + 1
+
+    def to_dict(self) -> dict:
+        requests = self.served + self.escalated
+        return {
+            "served": self.served,
+            "escalated": self.escalated,
+            "escalations_by_reason": dict(self.escalations_by_reason),
+            "avg_request_time": round(self.total_time / requests, 3) if requests else 0.0,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+
+_stats = HttpFetchStats()
+
+# Um cliente por event loop (conexões httpx são presas ao loop)
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def get_http_fetch_stats() -> dict:
+    """Process-wide HTTP-first counters"""
+    return _stats.to_dict()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client of the running event loop (created on first use)"""
+    loop = asyncio.get_running_loop()
+    for other in [other for other in _clients if other.is_closed()]:
+        del _clients[other]
+    if loop not in _clients:
+        _clients[loop] = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(settings.SCRAPER_HTTP_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SCRAPER_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SCRAPER_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+        )
+    return _clients[loop]
+
+
+async def shutdown_http_client():
+    """Close the HTTP client of the running event loop, if any"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def decode_html(response: httpx.Response) -> str:
+    """Response text using the header charset, else the <meta charset> (e.g. ISO-8859-1 pages)"""
+    encoding = response.charset_encoding
+    if not encoding:
+        match = _META_CHARSET.search(response.content[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return response.content.decode(encoding, errors="replace")
+    except LookupError:
+        return response.content.decode("utf-8", errors="replace")
+
+
+def escalation_reason(
+    html: str,
+    status_code: int,
+    ready_selector: Optional[str] = None,
+    final_markers: Sequence[str] = (),
+) -> Optional[str]:
+    """
+    Why an HTTP response can't be used in place of the browser page
+
+    Args:
+        html: Response body
+        status_code: HTTP status
+        ready_selector: CSS selector that must exist in usable pages
+        final_markers: Lowercase texts that make the page usable anyway (e.g. "não encontrado")
+
+    Returns:
+        "status_<code>", "challenge", "missing_selector" or None if the HTML is usable
+    """
+    if status_code >= 400:
+        return f"status_{status_code}"
+    lowered = html.lower()
+    if any(marker in lowered for marker in CHALLENGE_MARKERS):
+        return "challenge"
+    if any(marker in lowered for marker in final_markers):
+        return None
+    if ready_selector and BeautifulSoup(html, "html.parser").select_one(ready_selector) is None:
+        return "missing_selector"
+    return None
+
+
+async def fetch_html(
+    url: str,
+    ready_selector: Optional[str] = None,
+    final_markers: Sequence[str] = (),
+    owner: str = "",
+) -> Optional[str]:
+    """
+    GET a server-rendered page
+
+    Args:
+        url: Page URL
+        ready_selector: CSS selector that must exist in the HTML
+        final_markers: Lowercase texts that make the page usable without the selector
+        owner: Scraper name (logs only)
+
+    Returns:
+        HTML, or None when the page must be loaded with the browser instead
+    """
+    started = time.time()
+    try:
+        response = await get_http_client().get(url)
+        html = decode_html(response)
+        reason = escalation_reason(html, response.status_code, ready_selector, final_markers)
+    except httpx.HTTPError as e:
+        logger.debug(f"[HttpFetcher] {owner} request failed for {url}: {e!r}")
+        reason = "network_error"
+
+    elapsed = time.time() - started
+    _stats.record(reason, elapsed)
+    if reason:
+        logger.info(f"[HttpFetcher] {owner} falling back to browser for {url} ({reason})")
+        return None
+
+    logger.debug(f"[HttpFetcher] {owner} fetched {url} over HTTP in {elapsed * 1000:.0f}ms")
+    return html
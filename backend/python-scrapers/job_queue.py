@@ -0,0 +1,309 @@
+"""
+Job Queue - Consumo assíncrono e confiável da fila de jobs no Redis
+
+Substitui o RPOP síncrono + sleep(1) do listener: o consumidor usa
+redis.asyncio com comandos bloqueantes (o job começa assim que chega e o
+event loop nunca trava) e só remove o job da fila após o ack, então jobs de
+um worker que morreu voltam para a fila.
+
+Dois modos (SCRAPER_QUEUE_MODE):
+- list (padrão, compatível com os produtores atuais: LPUSH scraper:jobs):
+  BLMOVE move o job para a lista de processamento do consumidor
+  (scraper:jobs:processing:<consumer>); ack = LREM. Cada consumidor mantém
+  um heartbeat com TTL; listas de consumidores sem heartbeat são
+  devolvidas à fila (reclaim)
+- stream (produtores usam XADD scraper:jobs:stream job <json>): consumer
+  group com XREADGROUP, XACK e XAUTOCLAIM de entradas pendentes há mais de
+  SCRAPER_QUEUE_RECLAIM_IDLE segundos; entradas entregues mais de
+  MAX_DELIVERIES vezes vão para scraper:jobs:dead. Entradas ainda em
+  processamento (ou aguardando vaga) têm o idle zerado periodicamente
+  (touch_in_flight), então só jobs de workers mortos ou travados são assumidos
+"""
+
+import json
+import os
+import socket
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set
+
+import redis.asyncio as aioredis
+from loguru import logger
+from redis.exceptions import ResponseError
+
+from config import settings
+
+
+@dataclass
+class QueuedJob:
+    """Job taken from the queue - ack it once processed"""
+
+    payload: Dict[str, Any]
+    raw: str
+    entry_id: Optional[str] = None  # Stream entry id (stream mode)
+    reclaimed: bool = False
+
+
+class RedisJobQueue:
+    """
+    Reliable async consumer of the scraper job queue
+
+    Usage:
+        queue = RedisJobQueue()
+        await queue.connect()
+        job = await queue.get()  # blocks up to block_timeout, None if empty
+        if job:
+            await process(job.payload)
+            await queue.ack(job)
+    """
+
+    MODES = ("list", "stream")
+    HEARTBEAT_TTL = 90  # seconds without heartbeat before a consumer is considered dead
+    MAX_DELIVERIES = 3  # stream mode: deliveries before moving an entry to the dead letter list
+    RECLAIM_BATCH = 100
+
+    def __init__(
+        self,
+        client: Optional[aioredis.Redis] = None,
+        queue: str = "scraper:jobs",
+        mode: Optional[str] = None,
+        consumer: Optional[str] = None,
+        group: str = "scrapers",
+        block_timeout: Optional[int] = None,
+        reclaim_idle: Optional[int] = None,
+    ):
+        """
+        Args:
+            client: redis.asyncio client (default: created in connect() from settings)
+            queue: List key (list mode); stream key is "<queue>:stream"
+            mode: list or stream (default: SCRAPER_QUEUE_MODE)
+            consumer: Unique consumer name (default: host-pid-random)
+            group: Consumer group (stream mode)
+            block_timeout: Seconds get() blocks waiting for a job (default: SCRAPER_QUEUE_BLOCK_TIMEOUT)
+            reclaim_idle: Stream mode: seconds a pending entry may stay unacked before
+                another consumer claims it (default: SCRAPER_QUEUE_RECLAIM_IDLE)
+        """
+        self.mode = (mode or settings.SCRAPER_QUEUE_MODE).lower()
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown queue mode '{self.mode}' (supported: {', '.join(self.MODES)})")
+
+        self.client = client
+        self.queue = queue
+        self.stream = f"{queue}:stream"
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.block_timeout = max(1, block_timeout or settings.SCRAPER_QUEUE_BLOCK_TIMEOUT)
+        self.reclaim_idle = max(1, reclaim_idle or settings.SCRAPER_QUEUE_RECLAIM_IDLE)
+
+        self.processing_key = f"{queue}:processing:{self.consumer}"
+        self.consumers_key = f"{queue}:consumers"
+        self.dead_key = f"{queue}:dead"
+        self._claimed: Deque[QueuedJob] = deque()
+        # Stream entries owned by this consumer and not acked yet (kept alive by touch_in_flight)
+        self._in_flight: Set[str] = set()
+
+    def _heartbeat_key(self, consumer: str) -> str:
+        return f"{self.queue}:consumer:{consumer}"
+
+    def _processing_key(self, consumer: str) -> str:
+        return f"{self.queue}:processing:{consumer}"
+
+    async def connect(self):
+        """Connect (if no client was given), register the consumer and create the stream group"""
+        if self.client is None:
+            self.client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                # Blocking reads wait up to block_timeout
+                socket_timeout=self.block_timeout + 5,
+            )
+        await self.client.ping()
+
+        if self.mode == "stream":
+            try:
+                await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+        await self.heartbeat()
+        logger.info(f"[JobQueue] Consumer {self.consumer} ready ({self.mode} mode, queue '{self.queue}')")
+
+    async def get(self, timeout: Optional[int] = None) -> Optional[QueuedJob]:
+        """
+        Next job, blocking up to timeout seconds (default: block_timeout)
+
+        Returns:
+            QueuedJob, or None if the queue stayed empty (or the job was not valid JSON)
+        """
+        timeout = timeout or self.block_timeout
+        if self.mode == "list":
+            raw = await self.client.blmove(self.queue, self.processing_key, timeout, "RIGHT", "LEFT")
+            if raw is None:
+                return None
+            return await self._decode(QueuedJob(payload={}, raw=raw))
+
+        while self._claimed:
+            job = await self._decode(self._claimed.popleft())
+            if job is not None:
+                return job
+
+        response = await self.client.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=1, block=timeout * 1000
+        )
+        if not response:
+            return None
+        entry_id, fields = response[0][1][0]
+        self._in_flight.add(entry_id)
+        return await self._decode(self._stream_job(entry_id, fields))
+
+    async def ack(self, job: QueuedJob):
+        """Mark a job as done (removes it from the processing list / stream pending entries)"""
+        if self.mode == "list":
+            await self.client.lrem(self.processing_key, 1, job.raw)
+        else:
+            await self.client.xack(self.stream, self.group, job.entry_id)
+            await self.client.xdel(self.stream, job.entry_id)
+            self._in_flight.discard(job.entry_id)
+
+    async def enqueue(self, job: Dict[str, Any]):
+        """Add a job (same format producers use: LPUSH list or XADD stream)"""
+        raw = json.dumps(job)
+        if self.mode == "list":
+            await self.client.lpush(self.queue, raw)
+        else:
+            await self.client.xadd(self.stream, {"job": raw})
+
+    async def heartbeat(self):
+        """Refresh this consumer's liveness (call at least every HEARTBEAT_TTL / 3 seconds)"""
+        await self.client.set(self._heartbeat_key(self.consumer), "1", ex=self.HEARTBEAT_TTL)
+        await self.client.sadd(self.consumers_key, self.consumer)
+
+    async def touch_in_flight(self) -> int:
+        """
+        Stream mode: reset the idle time of entries this consumer still holds
+
+        Jobs waiting for a source slot or in a long scrape stay pending with
+        no XACK; without this they would look abandoned after reclaim_idle
+        and be redelivered (and dead-lettered) while still running. Call it
+        more often than reclaim_idle (maintain_job_queue does).
+
+        Returns:
+            Number of entries refreshed
+        """
+        if self.mode != "stream" or not self._in_flight:
+            return 0
+        # JUSTID: no payload and no delivery count increment
+        refreshed = await self.client.xclaim(
+            self.stream, self.group, self.consumer,
+            min_idle_time=0, message_ids=list(self._in_flight), justid=True,
+        )
+        return len(refreshed)
+
+    async def reclaim(self) -> int:
+        """
+        Take back jobs of dead consumers
+
+        - list: jobs in processing lists of consumers without heartbeat go
+          back to the front of the queue
+        - stream: entries pending longer than reclaim_idle are claimed by this
+          consumer (returned by the next get() calls); its own in-flight
+          entries are left alone
+
+        Returns:
+            Number of jobs reclaimed
+        """
+        if self.mode == "list":
+            reclaimed = 0
+            for consumer in await self.client.smembers(self.consumers_key):
+                if consumer == self.consumer or await self.client.exists(self._heartbeat_key(consumer)):
+                    continue
+                reclaimed += await self._requeue_processing(self._processing_key(consumer))
+                await self.client.srem(self.consumers_key, consumer)
+                logger.warning(f"[JobQueue] Consumer {consumer} is gone - jobs returned to the queue")
+        else:
+            reclaimed = await self._claim_stale_entries()
+
+        if reclaimed:
+            logger.warning(f"[JobQueue] Reclaimed {reclaimed} unacknowledged jobs")
+        return reclaimed
+
+    async def close(self, requeue: bool = True):
+        """
+        Unregister the consumer and close the connection
+
+        Args:
+            requeue: list mode: return jobs still being processed (not acked) to the queue
+        """
+        if self.client is None:
+            return
+        try:
+            if requeue and self.mode == "list":
+                requeued = await self._requeue_processing(self.processing_key)
+                if requeued:
+                    logger.info(f"[JobQueue] {requeued} unfinished jobs returned to the queue")
+            await self.client.delete(self._heartbeat_key(self.consumer))
+            await self.client.srem(self.consumers_key, self.consumer)
+        finally:
+            await self.client.aclose()
+            self.client = None
+
+    async def _requeue_processing(self, processing_key: str) -> int:
+        """Move every job of a processing list back to the pop side of the queue"""
+        moved = 0
+        while await self.client.lmove(processing_key, self.queue, "RIGHT", "RIGHT") is not None:
+            moved += 1
+        return moved
+
+    async def _claim_stale_entries(self) -> int:
+        """XAUTOCLAIM entries idle for reclaim_idle; dead-letter the ones delivered too often"""
+        claimed = 0
+        start_id = "0-0"
+        while True:
+            next_id, entries, *_ = await self.client.xautoclaim(
+                self.stream, self.group, self.consumer,
+                min_idle_time=self.reclaim_idle * 1000, start_id=start_id, count=self.RECLAIM_BATCH,
+            )
+            for entry_id, fields in entries:
+                if fields is None:  # entry deleted meanwhile
+                    continue
+                if entry_id in self._in_flight:  # still ours (not touched in time)
+                    continue
+                pending = await self.client.xpending_range(
+                    self.stream, self.group, min=entry_id, max=entry_id, count=1
+                )
+                deliveries = pending[0]["times_delivered"] if pending else 1
+                job = self._stream_job(entry_id, fields, reclaimed=True)
+                if deliveries > self.MAX_DELIVERIES:
+                    logger.error(f"[JobQueue] Job {entry_id} delivered {deliveries} times - moved to {self.dead_key}")
+                    await self.client.lpush(self.dead_key, job.raw)
+                    await self.ack(job)
+                    continue
+                self._claimed.append(job)
+                self._in_flight.add(entry_id)
+                claimed += 1
+            if next_id in ("0-0", b"0-0") or not entries:
+                return claimed
+            start_id = next_id
+
+    def _stream_job(self, entry_id: str, fields: Dict[str, str], reclaimed: bool = False) -> QueuedJob:
+        """Stream entry as QueuedJob: JSON in the "job" field, or the fields themselves"""
+        raw = fields.get("job") or json.dumps(fields)
+        return QueuedJob(payload={}, raw=raw, entry_id=entry_id, reclaimed=reclaimed)
+
+    async def _decode(self, job: QueuedJob) -> Optional[QueuedJob]:
+        """Parse the JSON payload; malformed jobs are logged and dropped (acked)"""
+        try:
+            job.payload = json.loads(job.raw)
+            if not isinstance(job.payload, dict):
+                raise ValueError("job is not a JSON object")
+            return job
+        except ValueError as e:
+            logger.error(f"[JobQueue] Dropping malformed job {job.raw[:200]!r}: {e}")
+            await self.ack(job)
+            return None
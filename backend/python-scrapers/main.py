@@ -3,18 +3,28 @@ Main entry point for Python Scrapers Service
 
 ALL SCRAPERS MIGRATED TO PLAYWRIGHT - 2025-12-04
 OAuth API added - 2025-12-04
+
+Jobs are scraped concurrently: SCRAPER_CONCURRENT_JOBS per process (with
+per-source caps, see ScraperService.listen_for_jobs) and optionally
+SCRAPER_WORKER_PROCESSES processes consuming the same Redis queue. Jobs are
+read with blocking async commands and acknowledged after processing
+(job_queue.RedisJobQueue), so a crashed worker's jobs are reclaimed.
 """
 import asyncio
 import json
+import multiprocessing
 import signal
 import sys
 import threading
 from loguru import logger
-from typing import Dict, Type
+from typing import Dict, Optional, Set, Type
 
 from config import settings
 from database import db
 from redis_client import redis_client
+from job_queue import QueuedJob, RedisJobQueue
+from resource_policy import get_resource_stats
+from http_fetcher import get_http_fetch_stats
 from base_scraper import BaseScraper
 from scrapers import (
     # Fundamental Data Scrapers
@@ -73,11 +83,26 @@ from scrapers import (
 class ScraperService:
     """Main scraper service"""
 
+    # Jobs popped ahead per worker slot (waiting for their source cap, not for a slot)
+    PENDING_JOBS_PER_WORKER = 4
+    # Seconds to let in-flight jobs finish on shutdown
+    SHUTDOWN_GRACE_SECONDS = 60
+
     def __init__(self):
         self.running = False
         self.scrapers: Dict[str, Type[BaseScraper]] = {}
         self._register_scrapers()
 
+        # Concurrency: N jobs at a time, at most a per-source cap of them on one site
+        self.max_concurrent_jobs = max(1, settings.SCRAPER_CONCURRENT_JOBS)
+        self.source_limits = settings.source_concurrency_limits
+        self.default_source_limit = max(1, settings.SCRAPER_SOURCE_MAX_CONCURRENCY)
+        # Semaphores are created in the event loop (listen_for_jobs)
+        self._job_slots: Optional[asyncio.Semaphore] = None
+        self._source_slots: Dict[str, asyncio.Semaphore] = {}
+        self._active_jobs: Set[asyncio.Task] = set()
+        self.job_queue = RedisJobQueue(queue="scraper:jobs")
+
     def _register_scrapers(self):
         """Register available scrapers - ALL MIGRATED TO PLAYWRIGHT"""
 
@@ -199,8 +224,9 @@ class ScraperService:
             # Connect to database
             db.connect()
 
-            # Connect to Redis
+            # Connect to Redis (sync client: results/pub-sub; async queue consumer: jobs)
             redis_client.connect()
+            await self.job_queue.connect()
 
             self.running = True
             logger.success("Python Scrapers Service initialized successfully!")
@@ -214,10 +240,27 @@ class ScraperService:
         logger.info("Shutting down Python Scrapers Service...")
         self.running = False
 
+        # Let in-flight jobs finish (cancel after the grace period)
+        if self._active_jobs:
+            logger.info(f"Waiting for {len(self._active_jobs)} in-flight jobs...")
+            _, unfinished = await asyncio.wait(self._active_jobs, timeout=self.SHUTDOWN_GRACE_SECONDS)
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+                logger.warning(f"Cancelled {len(unfinished)} jobs still running after {self.SHUTDOWN_GRACE_SECONDS}s")
+
+        # Close shared browsers (BrowserPool)
+        await BaseScraper.cleanup_browser()
+
         # Disconnect from database
         db.disconnect()
 
-        # Disconnect from Redis
+        # Disconnect from Redis (unfinished jobs go back to the queue)
+        try:
+            await self.job_queue.close()
+        except Exception as e:
+            logger.error(f"Failed to close job queue: {e}")
         redis_client.disconnect()
 
         logger.success("Python Scrapers Service shut down")
@@ -312,24 +355,81 @@ class ScraperService:
             # Don't raise - scraping succeeded, just DB save failed
 
     async def listen_for_jobs(self):
-        """Listen for scraper jobs from Redis queue"""
-        logger.info("Listening for scraper jobs on Redis queue 'scraper:jobs'...")
+        """
+        Listen for scraper jobs from Redis queue and scrape them concurrently
+
+        Popped jobs run as tasks: each waits for a slot of its source
+        (SCRAPER_SOURCE_CONCURRENCY / SCRAPER_SOURCE_MAX_CONCURRENCY) and only
+        then for one of the SCRAPER_CONCURRENT_JOBS worker slots, so jobs of a
+        slow or capped site queue up without holding workers other sites could
+        use. At most PENDING_JOBS_PER_WORKER jobs per slot are popped ahead;
+        the rest stay in Redis.
+
+        Reads block in Redis (no polling delay) and a job is acknowledged
+        only after process_scraper_job returns: jobs of a worker that dies
+        mid-scrape are reclaimed by the others (maintain_job_queue).
+        """
+        logger.info(
+            f"Listening for scraper jobs on Redis queue 'scraper:jobs' ({self.job_queue.mode} mode, "
+            f"{self.max_concurrent_jobs} concurrent jobs, {self.default_source_limit} per source"
+            f"{', caps: ' + str(self.source_limits) if self.source_limits else ''})..."
+        )
+        self._job_slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        pending = asyncio.Semaphore(self.max_concurrent_jobs * self.PENDING_JOBS_PER_WORKER)
 
         while self.running:
+            await pending.acquire()
             try:
-                # Pop job from Redis list (blocking)
-                job = redis_client.rpop("scraper:jobs")
+                # Wait for a job (blocks in Redis up to SCRAPER_QUEUE_BLOCK_TIMEOUT)
+                job = await self.job_queue.get()
 
                 if job:
-                    await self.process_scraper_job(job)
+                    task = asyncio.create_task(self._run_job(job, pending))
+                    self._active_jobs.add(task)
+                    task.add_done_callback(self._active_jobs.discard)
                 else:
-                    # No jobs, sleep briefly
-                    await asyncio.sleep(1)
+                    pending.release()
 
             except Exception as e:
+                pending.release()
                 logger.error(f"Error in job listener: {e}")
                 await asyncio.sleep(5)
 
+    async def _run_job(self, job: QueuedJob, pending: asyncio.Semaphore):
+        """Run one job within its source cap and a worker slot, then acknowledge it"""
+        source = str(job.payload.get("source", "STATUSINVEST")).upper()
+        try:
+            async with self._source_slot(source):
+                async with self._job_slots:
+                    await self.process_scraper_job(job.payload)
+            # Not reached if cancelled on shutdown: the job is redelivered
+            await self.job_queue.ack(job)
+        except Exception as e:
+            logger.error(f"Error finishing job {job.payload.get('job_id', 'unknown')}: {e}")
+        finally:
+            pending.release()
+
+    def _source_slot(self, source: str) -> asyncio.Semaphore:
+        """Semaphore capping simultaneous jobs of a source"""
+        if source not in self._source_slots:
+            limit = self.source_limits.get(source, self.default_source_limit)
+            self._source_slots[source] = asyncio.Semaphore(limit)
+        return self._source_slots[source]
+
+    async def maintain_job_queue(self):
+        """Keep this consumer (and its unfinished jobs) alive and reclaim jobs of dead consumers"""
+        interval = min(RedisJobQueue.HEARTBEAT_TTL, self.job_queue.reclaim_idle) / 3
+        while self.running:
+            try:
+                await self.job_queue.heartbeat()
+                # Before reclaim: our own queued/running jobs must not look idle
+                await self.job_queue.touch_in_flight()
+                await self.job_queue.reclaim()
+            except Exception as e:
+                logger.error(f"Job queue maintenance failed: {e}")
+
+            await asyncio.sleep(interval)
+
     async def run_health_check(self):
         """Periodic health check"""
         while self.running:
@@ -340,7 +440,10 @@ class ScraperService:
                 # Check Redis connection
                 redis_client.client.ping()
 
-                logger.debug("Health check passed")
+                logger.debug(
+                    f"Health check passed (resource policies: {get_resource_stats()}, "
+                    f"http-first: {get_http_fetch_stats()})"
+                )
 
             except Exception as e:
                 logger.error(f"Health check failed: {e}")
@@ -352,8 +455,8 @@ class ScraperService:
         try:
             await self.initialize()
 
-            # Run job listener and health check concurrently
-            await asyncio.gather(self.listen_for_jobs(), self.run_health_check())
+            # Run job listener, queue maintenance and health check concurrently
+            await asyncio.gather(self.listen_for_jobs(), self.maintain_job_queue(), self.run_health_check())
 
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
@@ -391,12 +494,31 @@ def start_oauth_api():
         logger.error(f"Failed to start OAuth API: {e}")
 
 
+def run_worker_process():
+    """Entry point of extra worker processes (SCRAPER_WORKER_PROCESSES > 1)"""
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    service = ScraperService()
+    asyncio.run(service.run())
+
+
 def main():
     """Main entry point"""
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
+    # Extra worker processes consume the same Redis queue (each with its own
+    # event loop and browser pool). Started before any thread; daemon so they
+    # exit with the main process.
+    for index in range(max(1, settings.SCRAPER_WORKER_PROCESSES) - 1):
+        worker = multiprocessing.Process(
+            target=run_worker_process, name=f"scraper-worker-{index + 1}", daemon=True
+        )
+        worker.start()
+        logger.info(f"Scraper worker process {worker.name} started (pid {worker.pid})")
+
     # Start OAuth API in background thread (port 8080 - separate from api-service)
     oauth_thread = threading.Thread(target=start_oauth_api, daemon=True)
     oauth_thread.start()
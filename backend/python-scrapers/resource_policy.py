@@ -0,0 +1,195 @@
+"""
+Resource Policy - Bloqueio de recursos desnecessários por scraper
+
+Os scrapers leem apenas o HTML/DOM, mas páginas de portais baixam imagens,
+fontes, vídeos, analytics e anúncios antes do evento "load" - é isso que
+deixa a navegação lenta e sujeita aos timeouts de 60-120s. Cada scraper
+declara uma ResourcePolicy (atributo de classe resource_policy) e o
+BaseScraper instala um route no BrowserContext do job que aborta:
+
+- tipos de recurso bloqueados (image, media, font...)
+- requisições para domínios bloqueados (ads/analytics/trackers) e subdomínios
+
+O documento principal e os domínios permitidos (ex.: challenge do
+Cloudflare) nunca são bloqueados. Requisições abortadas não são baixadas,
+então os bytes economizados são estimados por tipo de recurso.
+
+Observação: com route ativo o Playwright desativa o cache HTTP do context -
+sem impacto aqui, pois cada job já recebe um context novo (cache vazio).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+from playwright.async_api import BrowserContext, Route
+
+from config import settings
+
+# Ads, analytics and tag managers seen on the scraped portals
+TRACKER_DOMAINS: Tuple[str, ...] = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "outbrain.com",
+    "taboola.com",
+    "facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "scorecardresearch.com",
+    "chartbeat.com",
+    "chartbeat.net",
+    "newrelic.com",
+    "nr-data.net",
+    "onesignal.com",
+    "pushnews.com.br",
+    "navdmp.com",
+    "tiktok.com",
+    "ads-twitter.com",
+    "quantserve.com",
+)
+
+# Never blocked: anti-bot challenges must load untouched
+ALWAYS_ALLOWED_DOMAINS: Tuple[str, ...] = (
+    "challenges.cloudflare.com",
+)
+
+# Typical transfer size per resource type (HTTP Archive medians, rounded)
+ESTIMATED_BYTES: Dict[str, int] = {
+    "image": 30_000,
+    "media": 300_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 25_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+
+def _matches(hostname: str, domains: Tuple[str, ...]) -> bool:
+    """hostname is one of the domains or a subdomain of one"""
+    return any(hostname == domain or hostname.endswith("." + domain) for domain in domains)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Declarative description of what a scraper's pages may download"""
+
+    block_types: FrozenSet[str] = frozenset()
+    block_domains: Tuple[str, ...] = ()
+    allow_domains: Tuple[str, ...] = ALWAYS_ALLOWED_DOMAINS
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_domains)
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """
+        Why a request must be aborted
+
+        Returns:
+            "type:<resource type>", "domain:<hostname>" or None to let it through
+        """
+        if resource_type == "document":
+            return None
+        hostname = (urlsplit(url).hostname or "").lower()
+        if hostname and _matches(hostname, self.allow_domains):
+            return None
+        if resource_type in self.block_types:
+            return f"type:{resource_type}"
+        if hostname and _matches(hostname, self.block_domains):
+            return f"domain:{hostname}"
+        return None
+
+
+# Presets
+ALLOW_ALL = ResourcePolicy()
+BLOCK_TRACKERS = ResourcePolicy(block_domains=TRACKER_DOMAINS)
+# Data pages parsed from HTML: no images, video, fonts, ads or analytics
+LIGHTWEIGHT = ResourcePolicy(
+    block_types=frozenset({"image", "media", "font"}),
+    block_domains=TRACKER_DOMAINS,
+)
+
+
+@dataclass
+class ResourceStats:
+    """Counters of requests let through / aborted by a resource policy"""
+
+    allowed: int = 0
+    blocked: int = 0
+    bytes_saved: int = 0  # Estimated (see ESTIMATED_BYTES)
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+    def record_blocked(self, resource_type: str):
+        self.blocked += 1
+        self.bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "estimated_bytes_saved": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+# Totais do processo (todos os scrapers)
+_totals = ResourceStats()
+
+
+def get_resource_stats() -> dict:
+    """Process-wide counters of every resource policy"""
+    return _totals.to_dict()
+
+
+async def apply_resource_policy(
+    context: BrowserContext,
+    policy: ResourcePolicy,
+    stats: Optional[ResourceStats] = None,
+) -> bool:
+    """
+    Route every request of a context through the policy
+
+    Args:
+        context: Job BrowserContext (the route dies with it)
+        policy: What to block
+        stats: Counters to update (besides the process totals)
+
+    Returns:
+        True if routing was installed (policy enabled and SCRAPER_BLOCK_RESOURCES on)
+    """
+    if not policy.enabled or not settings.SCRAPER_BLOCK_RESOURCES:
+        return False
+
+    async def handle(route: Route):
+        request = route.request
+        reason = policy.block_reason(request.resource_type, request.url)
+        try:
+            if reason:
+                for counters in (stats, _totals):
+                    if counters is not None:
+                        counters.record_blocked(request.resource_type)
+                await route.abort("blockedbyclient")
+            else:
+                for counters in (stats, _totals):
+                    if counters is not None:
+                        counters.allowed += 1
+                await route.continue_()
+        except Exception as e:
+            # Page or context closed while the request was in flight
+            logger.trace(f"[ResourcePolicy] Route for {request.url[:100]} not handled: {e}")
+
+    await context.route("**/*", handle)
+    return True
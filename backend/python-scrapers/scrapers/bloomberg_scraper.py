@@ -13,6 +13,7 @@ from loguru import logger
 from bs4 import BeautifulSoup
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class BloombergScraper(BaseScraper):
@@ -23,6 +24,7 @@ class BloombergScraper(BaseScraper):
     """
 
     BASE_URL = "https://www.bloomberglinea.com.br"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
 
     def __init__(self):
         super().__init__(
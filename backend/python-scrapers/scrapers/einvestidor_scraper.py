@@ -16,6 +16,7 @@ from bs4 import BeautifulSoup
 import re
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class EInvestidorScraper(BaseScraper):
@@ -34,6 +35,7 @@ class EInvestidorScraper(BaseScraper):
     """
 
     BASE_URL = "https://einvestidor.estadao.com.br"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
     COOKIES_FILE = "/app/data/cookies/einvestidor_session.json"
 
     def __init__(self):
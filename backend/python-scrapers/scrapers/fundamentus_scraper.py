@@ -11,6 +11,7 @@ from loguru import logger
 import re
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class FundamentusScraper(BaseScraper):
@@ -33,6 +34,10 @@ class FundamentusScraper(BaseScraper):
     """
 
     BASE_URL = "https://www.fundamentus.com.br/detalhes.php"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
+    http_first = True  # Server-rendered: plain HTTP unless blocked (see BaseScraper.fetch_html)
+    READY_SELECTOR = "table.w728"
+    NOT_FOUND_MARKERS = ("não encontrado", "papel não encontrado", "nenhum papel encontrado")
 
     def __init__(self):
         super().__init__(
@@ -52,26 +57,15 @@ class FundamentusScraper(BaseScraper):
             ScraperResult with comprehensive fundamental data
         """
         try:
-            # Ensure page is initialized (Playwright)
-            if not self.page:
-                await self.initialize()
-
             # Build URL
             url = f"{self.BASE_URL}?papel={ticker.upper()}"
-            logger.info(f"Navigating to {url}")
-
-            # Navigate (Playwright - auto-wait)
-            # Using 'load' instead of 'networkidle' to avoid timeout issues with slow analytics
-            await self.page.goto(url, wait_until="load", timeout=60000)
 
-            # Wait for page to fully load
-            await asyncio.sleep(1)
+            # HTTP first; Playwright (1s settle) if blocked or the data tables are missing
+            html_content = await self.fetch_html(url, self.READY_SELECTOR, self.NOT_FOUND_MARKERS, settle_delay=1)
 
-            # Check if ticker exists (Playwright)
-            page_source = (await self.page.content()).lower()
-            if ("não encontrado" in page_source or
-                "papel não encontrado" in page_source or
-                "nenhum papel encontrado" in page_source):
+            # Check if ticker exists
+            page_source = html_content.lower()
+            if any(marker in page_source for marker in self.NOT_FOUND_MARKERS):
                 return ScraperResult(
                     success=False,
                     error=f"Ticker {ticker} not found on Fundamentus",
@@ -79,7 +73,7 @@ class FundamentusScraper(BaseScraper):
                 )
 
             # Extract data
-            data = await self._extract_data(ticker)
+            data = self._extract_data(ticker, html_content)
 
             if data and data.get("ticker"):
                 return ScraperResult(
@@ -89,6 +83,7 @@ class FundamentusScraper(BaseScraper):
                     metadata={
                         "url": url,
                         "requires_login": False,
+                        "fetch_mode": self.fetch_mode,
                     },
                 )
             else:
@@ -106,7 +101,7 @@ class FundamentusScraper(BaseScraper):
                 source=self.source,
             )
 
-    async def _extract_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def _extract_data(self, ticker: str, html_content: str) -> Optional[Dict[str, Any]]:
         """
         Extract comprehensive fundamental data from Fundamentus page
 
@@ -185,8 +180,7 @@ class FundamentusScraper(BaseScraper):
                 "_ebit_ativo": None,      # EBIT/Ativo (temporary)
             }
 
-            # OPTIMIZATION: Get HTML content once and parse locally
-            html_content = await self.page.content()
+            # OPTIMIZATION: Parse the HTML once locally
             soup = BeautifulSoup(html_content, 'html.parser')
 
             # Company name (from header)
@@ -15,6 +15,7 @@ from loguru import logger
 from bs4 import BeautifulSoup
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class InfoMoneyScraper(BaseScraper):
@@ -25,6 +26,7 @@ class InfoMoneyScraper(BaseScraper):
     """
 
     BASE_URL = "https://www.infomoney.com.br"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
     COOKIES_FILE = Path("/app/data/cookies/infomoney_session.json")
 
     def __init__(self):
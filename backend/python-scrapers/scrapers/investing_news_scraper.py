@@ -18,6 +18,7 @@ from loguru import logger
 from bs4 import BeautifulSoup
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class InvestingNewsScraper(BaseScraper):
@@ -28,6 +29,7 @@ class InvestingNewsScraper(BaseScraper):
     """
 
     BASE_URL = "https://br.investing.com"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
     COOKIES_FILE = Path("/app/data/cookies/investing_session.json")
 
     def __init__(self):
@@ -12,6 +12,7 @@ from bs4 import BeautifulSoup
 import re
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class InvestsiteScraper(BaseScraper):
@@ -31,6 +32,11 @@ class InvestsiteScraper(BaseScraper):
     """
 
     BASE_URL = "https://www.investsite.com.br/principais_indicadores.php"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
+    http_first = True  # Server-rendered: plain HTTP unless blocked (see BaseScraper.fetch_html)
+    # Value cell of a populated indicator row (layout/menu tables alone are not enough)
+    READY_SELECTOR = 'td:-soup-contains("Preço/Lucro") + td:not(:empty)'
+    NOT_FOUND_MARKERS = ("nao encontrado", "ativo nao encontrado", "codigo invalido")
 
     def __init__(self):
         super().__init__(
@@ -50,27 +56,15 @@ class InvestsiteScraper(BaseScraper):
             ScraperResult with comprehensive fundamental data
         """
         try:
-            # Ensure page is initialized (Playwright)
-            if not self.page:
-                await self.initialize()
-
             # Build URL
             url = f"{self.BASE_URL}?cod_negociacao={ticker.upper()}"
-            logger.info(f"Navigating to {url}")
-
-            # Navigate (Playwright)
-            await self.page.goto(url, wait_until="load", timeout=60000)
 
-            # Small delay for JS execution
-            await asyncio.sleep(2)
+            # HTTP first; Playwright (2s for JS execution) if blocked or the indicator tables are missing
+            html_content = await self.fetch_html(url, self.READY_SELECTOR, self.NOT_FOUND_MARKERS, settle_delay=2)
 
             # Check if ticker exists
-            page_source = await self.page.content()
-            if (
-                "nao encontrado" in page_source.lower()
-                or "ativo nao encontrado" in page_source.lower()
-                or "codigo invalido" in page_source.lower()
-            ):
+            page_source = html_content.lower()
+            if any(marker in page_source for marker in self.NOT_FOUND_MARKERS):
                 return ScraperResult(
                     success=False,
                     error=f"Ticker {ticker} not found on Investsite",
@@ -78,7 +72,7 @@ class InvestsiteScraper(BaseScraper):
                 )
 
             # Extract data
-            data = await self._extract_data(ticker)
+            data = self._extract_data(ticker, html_content)
 
             if data and data.get("ticker"):
                 return ScraperResult(
@@ -88,6 +82,7 @@ class InvestsiteScraper(BaseScraper):
                     metadata={
                         "url": url,
                         "requires_login": False,
+                        "fetch_mode": self.fetch_mode,
                     },
                 )
             else:
@@ -105,7 +100,7 @@ class InvestsiteScraper(BaseScraper):
                 source=self.source,
             )
 
-    async def _extract_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def _extract_data(self, ticker: str, html_content: str) -> Optional[Dict[str, Any]]:
         """
         Extract comprehensive fundamental data from Investsite page
 
@@ -179,8 +174,7 @@ class InvestsiteScraper(BaseScraper):
                 "_var_ytd": None,
             }
 
-            # OPTIMIZATION: Get HTML content once and parse locally
-            html_content = await self.page.content()
+            # OPTIMIZATION: Parse the HTML once locally
             soup = BeautifulSoup(html_content, 'html.parser')
 
             # Company name - try multiple selectors
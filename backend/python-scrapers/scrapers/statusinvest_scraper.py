@@ -11,6 +11,7 @@ from loguru import logger
 from bs4 import BeautifulSoup
 
 from base_scraper import BaseScraper, ScraperResult
+from resource_policy import LIGHTWEIGHT
 
 
 class StatusInvestScraper(BaseScraper):
@@ -27,6 +28,10 @@ class StatusInvestScraper(BaseScraper):
     """
 
     BASE_URL = "https://statusinvest.com.br/acoes/"
+    resource_policy = LIGHTWEIGHT  # HTML only: skip images, fonts, media and trackers
+    http_first = True  # Server-rendered: plain HTTP unless blocked (see BaseScraper.fetch_html)
+    READY_SELECTOR = "[title='Valor atual do ativo']"
+    NOT_FOUND_MARKERS = ("não encontrado", "erro 404")
 
     def __init__(self):
         super().__init__(
@@ -46,24 +51,15 @@ class StatusInvestScraper(BaseScraper):
             ScraperResult with fundamental data
         """
         try:
-            # Ensure page is initialized (Playwright)
-            if not self.page:
-                await self.initialize()
-
             # Build URL
             url = f"{self.BASE_URL}{ticker.lower()}"
-            logger.info(f"Navigating to {url}")
-
-            # Navigate (Playwright)
-            # Using 'load' instead of 'networkidle' to avoid timeout issues
-            await self.page.goto(url, wait_until="load", timeout=60000)
 
-            # Small delay for JS execution
-            await asyncio.sleep(2)
+            # HTTP first; Playwright (2s for JS execution) if blocked (Cloudflare) or price missing
+            html_content = await self.fetch_html(url, self.READY_SELECTOR, self.NOT_FOUND_MARKERS, settle_delay=2)
 
             # Check if ticker exists
-            page_source = await self.page.content()
-            if "não encontrado" in page_source.lower() or "erro 404" in page_source.lower():
+            page_source = html_content.lower()
+            if any(marker in page_source for marker in self.NOT_FOUND_MARKERS):
                 return ScraperResult(
                     success=False,
                     error=f"Ticker {ticker} not found",
@@ -71,7 +67,7 @@ class StatusInvestScraper(BaseScraper):
                 )
 
             # Extract data
-            data = await self._extract_data(ticker)
+            data = self._extract_data(ticker, html_content)
 
             if data and data.get("ticker"):
                 return ScraperResult(
@@ -81,6 +77,7 @@ class StatusInvestScraper(BaseScraper):
                     metadata={
                         "url": url,
                         "requires_login": self.requires_login,
+                        "fetch_mode": self.fetch_mode,
                     },
                 )
             else:
@@ -98,7 +95,7 @@ class StatusInvestScraper(BaseScraper):
                 source=self.source,
             )
 
-    async def _extract_data(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def _extract_data(self, ticker: str, html_content: str) -> Optional[Dict[str, Any]]:
         """
         Extract fundamental data from page
 
@@ -131,8 +128,7 @@ class StatusInvestScraper(BaseScraper):
                 "payout": None,
             }
 
-            # OPTIMIZATION: Get HTML content once and parse locally
-            html_content = await self.page.content()
+            # OPTIMIZATION: Parse the HTML once locally
             soup = BeautifulSoup(html_content, 'html.parser')
 
             # Company name - h1 element
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Testes do BrowserPool (browser_pool.py) com browsers falsos - sem Chromium
+
+USO:
+    pytest tests/test_browser_pool.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("playwright")
+pytest.importorskip("playwright_stealth")
+
+from browser_pool import BrowserPool  # noqa: E402
+
+
+class FakePage:
+    def set_default_timeout(self, timeout):
+        pass
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.browser.open_contexts -= 1
+
+
+class FakeBrowser:
+    """Stand-in for playwright Browser (connected until close() or crash())"""
+
+    def __init__(self, context_delay: float = 0.0):
+        self.connected = True
+        self.closed = False
+        self.open_contexts = 0
+        self.context_delay = context_delay
+
+    def is_connected(self):
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+
+    async def new_context(self, **kwargs):
+        await asyncio.sleep(self.context_delay)
+        self.open_contexts += 1
+        return FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+def make_pool(size=1, max_contexts=1, max_jobs=100, launch_delay=0.0, context_delay=0.0):
+    pool = BrowserPool(size=size, max_contexts=max_contexts, max_jobs=max_jobs)
+    pool.launched = []
+
+    async def launch_browser():
+        await asyncio.sleep(launch_delay)
+        browser = FakeBrowser(context_delay)
+        pool.launched.append(browser)
+        pool._launches += 1
+        return browser
+
+    pool._launch_browser = launch_browser
+    return pool
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_browser_recycled_after_max_jobs():
+    async def scenario():
+        pool = make_pool(max_jobs=2)
+        for _ in range(3):
+            await pool.release(await pool.acquire("job"))
+
+        first, second = pool.launched
+        assert first.closed and not second.closed
+        stats = pool.get_stats()
+        assert stats["recycled"] == 1 and stats["launches"] == 2
+        assert stats["browsers"] == 1 and stats["active_contexts"] == 0
+
+    run(scenario())
+
+
+def test_crashed_browser_is_retired_and_replaced():
+    async def scenario():
+        pool = make_pool()
+        lease = await pool.acquire("job")
+        lease.browser.crash()
+        await pool.release(lease)
+        assert pool.get_stats()["crashed"] == 1
+
+        lease = await pool.acquire("job")
+        assert lease.browser is pool.launched[1]
+        await pool.release(lease, broken=True)  # Job saw EPIPE/hang
+
+        stats = pool.get_stats()
+        assert stats["crashed"] == 2 and stats["browsers"] == 0
+        assert all(browser.closed for browser in pool.launched)
+
+    run(scenario())
+
+
+def test_slots_bound_jobs_and_are_returned():
+    async def scenario():
+        pool = make_pool(size=2, max_contexts=2)
+        leases = await asyncio.gather(*(pool.acquire(f"job-{i}") for i in range(4)))
+        assert len(pool.launched) == 2
+        assert sorted(b.open_contexts for b in pool.launched) == [2, 2]
+
+        # Pool full: the next job waits for a slot
+        waiting = asyncio.create_task(pool.acquire("job-5"))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        await pool.release(leases[0])
+        lease = await asyncio.wait_for(waiting, timeout=1)
+        assert lease.pooled is leases[0].pooled
+
+        for lease in leases[1:] + [lease]:
+            await pool.release(lease)
+        assert pool.get_stats()["active_contexts"] == 0
+        assert pool._slots._value == 4
+
+    run(scenario())
+
+
+def test_concurrent_jobs_share_one_launch():
+    async def scenario():
+        pool = make_pool(size=1, max_contexts=3, launch_delay=0.05)
+        leases = await asyncio.gather(*(pool.acquire(f"job-{i}") for i in range(3)))
+        assert len(pool.launched) == 1
+        assert all(lease.pooled is leases[0].pooled for lease in leases)
+        assert leases[0].pooled.active_contexts == 3
+
+    run(scenario())
+
+
+def test_launch_does_not_hold_the_pool_lock():
+    async def scenario():
+        pool = make_pool(size=2, max_contexts=1)
+        first = await pool.acquire("job-1")
+
+        launch_gate = asyncio.Event()
+        launch_browser = pool._launch_browser
+
+        async def slow_launch():
+            await launch_gate.wait()
+            return await launch_browser()
+
+        pool._launch_browser = slow_launch
+        launching = asyncio.create_task(pool.acquire("job-2"))
+        await asyncio.sleep(0.05)
+
+        # release() needs the lock: it must not wait for the launch
+        await asyncio.wait_for(pool.release(first), timeout=1)
+
+        launch_gate.set()
+        second = await asyncio.wait_for(launching, timeout=1)
+        assert second.browser is pool.launched[1]
+        assert pool.get_stats()["browsers"] == 2
+
+    run(scenario())
+
+
+def test_failed_launch_returns_slot_and_reservation():
+    async def scenario():
+        pool = make_pool()
+        launch_browser = pool._launch_browser
+
+        async def failing_launch():
+            raise RuntimeError("launch failed")
+
+        pool._launch_browser = failing_launch
+        with pytest.raises(RuntimeError, match="launch failed"):
+            await pool.acquire("job")
+        assert pool._launching == 0 and pool._slots._value == 1
+
+        pool._launch_browser = launch_browser
+        await pool.release(await pool.acquire("job"))
+
+    run(scenario())
+
+
+def test_timeout_bounds_context_creation_not_slot_wait():
+    async def scenario():
+        pool = make_pool()
+        held = await pool.acquire("job-1")
+
+        # Waiting 0.1s for the slot is longer than the timeout - still fine
+        waiting = asyncio.create_task(pool.acquire("job-2", timeout=0.05))
+        await asyncio.sleep(0.1)
+        await pool.release(held)
+        await pool.release(await asyncio.wait_for(waiting, timeout=1))
+
+        # Hung context creation times out and gives the slot back
+        pool.launched[0].context_delay = 1
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire("job-3", timeout=0.05)
+        assert pool.get_stats()["active_contexts"] == 0
+        assert pool._slots._value == 1
+
+    run(scenario())
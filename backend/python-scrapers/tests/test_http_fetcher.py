@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Testes do caminho HTTP-first (http_fetcher.py + BaseScraper.fetch_html) - sem rede
+
+USO:
+    pytest tests/test_http_fetcher.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("playwright")
+
+import http_fetcher  # noqa: E402
+from base_scraper import BaseScraper, ScraperResult  # noqa: E402
+from http_fetcher import decode_html, escalation_reason  # noqa: E402
+
+DATA_PAGE = "<html><body><table class='w728'><tr><td>Cotação</td></tr></table></body></html>"
+
+
+def test_usable_page_is_not_escalated():
+    assert escalation_reason(DATA_PAGE, 200, "table.w728") is None
+
+
+def test_escalation_reasons():
+    assert escalation_reason(DATA_PAGE, 403, "table.w728") == "status_403"
+    challenge = "<html><title>Just a moment...</title><div id='challenge-platform'></div></html>"
+    assert escalation_reason(challenge, 200, "table.w728") == "challenge"
+    assert escalation_reason("<html><body></body></html>", 200, "table.w728") == "missing_selector"
+
+
+def test_final_markers_accept_page_without_selector():
+    page = "<html><body>Papel não encontrado</body></html>"
+    assert escalation_reason(page, 200, "table.w728", ("não encontrado",)) is None
+
+
+def test_investsite_selector_needs_a_populated_indicator():
+    investsite = pytest.importorskip("scrapers.investsite_scraper")
+    selector = investsite.InvestsiteScraper.READY_SELECTOR
+
+    shell = "<html><body><table><tr><td>Menu</td><td>Login</td></tr></table></body></html>"
+    loading = "<table><tr><td>Preço/Lucro</td><td> </td></tr></table>"
+    populated = "<table><tr><td>Preço/Lucro</td><td>5,32</td></tr></table>"
+    assert escalation_reason(shell, 200, selector) == "missing_selector"
+    assert escalation_reason(loading, 200, selector) == "missing_selector"
+    assert escalation_reason(populated, 200, selector) is None
+
+
+def test_decode_html_uses_meta_charset():
+    body = "<html><head><meta charset='iso-8859-1'></head><body>Cotação</body></html>".encode("latin-1")
+    response = httpx.Response(200, content=body, headers={"Content-Type": "text/html"})
+    assert "Cotação" in decode_html(response)
+
+
+class DummyScraper(BaseScraper):
+    http_first = True
+
+    def __init__(self):
+        super().__init__(name="Dummy", source="DUMMY")
+        self.browser_loads = 0
+
+    async def initialize(self):
+        # Browser path stand-in: count escalations instead of launching Chromium
+        self.browser_loads += 1
+        raise RuntimeError("browser requested")
+
+    async def scrape(self, ticker: str) -> ScraperResult:
+        return ScraperResult(success=True, source=self.source)
+
+
+def run_with_transport(handler, coro_factory):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        http_fetcher._clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await coro_factory()
+        finally:
+            await http_fetcher.shutdown_http_client()
+
+    return asyncio.run(scenario())
+
+
+def test_fetch_html_serves_over_http_without_browser():
+    scraper = DummyScraper()
+    html = run_with_transport(
+        lambda request: httpx.Response(200, html=DATA_PAGE),
+        lambda: scraper.fetch_html("https://example.com/detalhes.php?papel=PETR4", "table.w728"),
+    )
+    assert "w728" in html
+    assert scraper.fetch_mode == "http"
+    assert scraper.browser_loads == 0
+
+
+def test_fetch_html_falls_back_to_browser_on_challenge():
+    scraper = DummyScraper()
+    with pytest.raises(RuntimeError, match="browser requested"):
+        run_with_transport(
+            lambda request: httpx.Response(503, html="<title>Just a moment...</title>"),
+            lambda: scraper.fetch_html("https://example.com/acoes/petr4", "table.w728"),
+        )
+    assert scraper.browser_loads == 1
+    assert http_fetcher.get_http_fetch_stats()["escalations_by_reason"].get("status_503", 0) >= 1
+
+
+class PageScraper(BaseScraper):
+    """Scraper with the real initialize(): a browser lease goes through get_browser_pool"""
+
+    http_first = True
+
+    def __init__(self):
+        super().__init__(name="Page", source="PAGE")
+
+    async def scrape(self, ticker: str) -> ScraperResult:
+        await self.fetch_html(f"https://example.com/detalhes.php?papel={ticker}", "table.w728")
+        return ScraperResult(success=True, source=self.source)
+
+
+def test_job_served_over_http_never_leases_a_browser(monkeypatch):
+    import base_scraper
+
+    leases = []
+
+    class RecordingPool:
+        async def acquire(self, owner="", timeout=None):
+            leases.append(owner)
+            raise RuntimeError("browser leased")
+
+    monkeypatch.setattr(base_scraper, "get_browser_pool", lambda: RecordingPool())
+
+    async def job():
+        # Same path as main.process_scraper_job
+        async with PageScraper() as scraper:
+            return await scraper.scrape_with_retry("PETR4")
+
+    result = run_with_transport(lambda request: httpx.Response(200, html=DATA_PAGE), job)
+    assert result.success
+    assert leases == []
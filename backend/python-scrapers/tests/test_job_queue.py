@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Testes do RedisJobQueue (job_queue.py) com fakeredis - sem Redis real
+
+USO:
+    pytest tests/test_job_queue.py
+
+REQUISITOS:
+    - pip install fakeredis
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from job_queue import RedisJobQueue  # noqa: E402
+
+
+def make_queue(server, consumer, mode="list", **kwargs):
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return RedisJobQueue(client=client, mode=mode, consumer=consumer, block_timeout=1, **kwargs)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_list_mode_get_and_ack():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        queue = make_queue(server, "worker-a")
+        await queue.connect()
+
+        # Producers keep using LPUSH scraper:jobs
+        await queue.client.lpush("scraper:jobs", json.dumps({"ticker": "PETR4", "source": "FUNDAMENTUS"}))
+        job = await queue.get()
+        assert job.payload == {"ticker": "PETR4", "source": "FUNDAMENTUS"}
+        assert await queue.client.llen(queue.processing_key) == 1
+
+        await queue.ack(job)
+        assert await queue.client.llen(queue.processing_key) == 0
+        assert await queue.get() is None
+
+    run(scenario())
+
+
+def test_list_mode_preserves_fifo_order():
+    async def scenario():
+        queue = make_queue(fakeredis.FakeServer(), "worker-a")
+        await queue.connect()
+        for ticker in ("PETR4", "VALE3", "ITUB4"):
+            await queue.enqueue({"ticker": ticker})
+
+        tickers = [(await queue.get()).payload["ticker"] for _ in range(3)]
+        assert tickers == ["PETR4", "VALE3", "ITUB4"]
+
+    run(scenario())
+
+
+def test_list_mode_reclaims_jobs_of_dead_consumer():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        dead = make_queue(server, "worker-dead")
+        alive = make_queue(server, "worker-alive")
+        await dead.connect()
+        await alive.connect()
+
+        await dead.enqueue({"ticker": "PETR4"})
+        await dead.enqueue({"ticker": "VALE3"})
+        assert (await dead.get()).payload["ticker"] == "PETR4"  # taken, never acked
+
+        # Heartbeat alive: nothing to reclaim
+        assert await alive.reclaim() == 0
+
+        # Worker dies (heartbeat expires)
+        await alive.client.delete(dead._heartbeat_key("worker-dead"))
+        assert await alive.reclaim() == 1
+
+        # Reclaimed job is served first, then the rest of the queue
+        assert (await alive.get()).payload["ticker"] == "PETR4"
+        assert (await alive.get()).payload["ticker"] == "VALE3"
+        assert "worker-dead" not in await alive.client.smembers(alive.consumers_key)
+
+    run(scenario())
+
+
+def test_list_mode_close_requeues_unfinished_jobs():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        queue = make_queue(server, "worker-a")
+        await queue.connect()
+        await queue.enqueue({"ticker": "PETR4"})
+        await queue.get()
+        await queue.close()
+
+        other = make_queue(server, "worker-b")
+        await other.connect()
+        assert (await other.get()).payload["ticker"] == "PETR4"
+
+    run(scenario())
+
+
+def test_malformed_job_is_dropped():
+    async def scenario():
+        queue = make_queue(fakeredis.FakeServer(), "worker-a")
+        await queue.connect()
+        await queue.client.lpush("scraper:jobs", "not json")
+        assert await queue.get() is None
+        assert await queue.client.llen(queue.processing_key) == 0
+
+    run(scenario())
+
+
+def test_stream_mode_ack_and_reclaim():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        dead = make_queue(server, "worker-dead", mode="stream", reclaim_idle=1)
+        alive = make_queue(server, "worker-alive", mode="stream", reclaim_idle=1)
+        await dead.connect()
+        await alive.connect()
+
+        await dead.enqueue({"ticker": "PETR4"})
+        await dead.enqueue({"ticker": "VALE3"})
+        first = await dead.get()
+        assert first.payload["ticker"] == "PETR4"  # never acked
+
+        second = await alive.get()
+        assert second.payload["ticker"] == "VALE3"
+        await alive.ack(second)
+
+        # Not idle long enough yet
+        assert await alive.reclaim() == 0
+
+        await asyncio.sleep(1.1)
+        assert await alive.reclaim() == 1
+        reclaimed = await alive.get()
+        assert reclaimed.reclaimed and reclaimed.payload["ticker"] == "PETR4"
+        await alive.ack(reclaimed)
+
+        pending = await alive.client.xpending(alive.stream, alive.group)
+        assert pending["pending"] == 0
+
+    run(scenario())
+
+
+def test_stream_mode_dead_letters_after_max_deliveries():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        crashed = make_queue(server, "worker-crashed", mode="stream", reclaim_idle=1)
+        queue = make_queue(server, "worker-a", mode="stream", reclaim_idle=1)
+        queue.MAX_DELIVERIES = 1
+        await crashed.connect()
+        await queue.connect()
+        await queue.enqueue({"ticker": "POISON3"})
+        await crashed.get()  # delivery 1, never acked (worker crashed on it)
+
+        await asyncio.sleep(1.1)
+        assert await queue.reclaim() == 0  # delivery 2 > MAX_DELIVERIES
+        assert json.loads(await queue.client.rpop(queue.dead_key)) == {"ticker": "POISON3"}
+        assert await queue.get() is None
+
+    run(scenario())
+
+
+def test_stream_mode_keeps_in_flight_jobs_alive():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        worker = make_queue(server, "worker-a", mode="stream", reclaim_idle=1)
+        other = make_queue(server, "worker-b", mode="stream", reclaim_idle=1)
+        await worker.connect()
+        await other.connect()
+
+        await worker.enqueue({"ticker": "PETR4"})
+        job = await worker.get()  # long scrape (or waiting for a source slot)
+
+        # Held past reclaim_idle, touched more often than that
+        for _ in range(3):
+            await asyncio.sleep(0.5)
+            assert await worker.touch_in_flight() == 1
+            assert await other.reclaim() == 0
+
+        pending = await worker.client.xpending_range(worker.stream, worker.group, min="-", max="+", count=10)
+        assert pending[0]["consumer"] == "worker-a" and pending[0]["times_delivered"] == 1
+
+        await worker.ack(job)
+        assert await worker.touch_in_flight() == 0
+
+    run(scenario())
+
+
+def test_stream_mode_reclaim_skips_own_in_flight_jobs():
+    async def scenario():
+        queue = make_queue(fakeredis.FakeServer(), "worker-a", mode="stream", reclaim_idle=1)
+        queue.MAX_DELIVERIES = 1
+        await queue.connect()
+        await queue.enqueue({"ticker": "PETR4"})
+        job = await queue.get()
+
+        await asyncio.sleep(1.1)  # idle, but still being processed here
+        assert await queue.reclaim() == 0
+        assert await queue.client.llen(queue.dead_key) == 0
+        assert await queue.get(timeout=1) is None
+
+        await queue.ack(job)
+        pending = await queue.client.xpending(queue.stream, queue.group)
+        assert pending["pending"] == 0
+
+    run(scenario())
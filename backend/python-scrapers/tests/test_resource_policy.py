@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Testes do ResourcePolicy (resource_policy.py) - sem browser
+
+USO:
+    pytest tests/test_resource_policy.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("playwright")
+
+import resource_policy  # noqa: E402
+from resource_policy import ALLOW_ALL, LIGHTWEIGHT, ResourceStats, apply_resource_policy  # noqa: E402
+
+
+def test_lightweight_blocks_types_and_trackers():
+    assert LIGHTWEIGHT.block_reason("image", "https://www.fundamentus.com.br/logo.png") == "type:image"
+    assert LIGHTWEIGHT.block_reason("font", "https://fonts.gstatic.com/s/roboto.woff2") == "type:font"
+    assert (
+        LIGHTWEIGHT.block_reason("script", "https://www.googletagmanager.com/gtm.js")
+        == "domain:www.googletagmanager.com"
+    )
+    assert LIGHTWEIGHT.block_reason("script", "https://statusinvest.com.br/js/app.js") is None
+    assert LIGHTWEIGHT.block_reason("stylesheet", "https://statusinvest.com.br/css/app.css") is None
+
+
+def test_document_and_allowed_domains_never_blocked():
+    assert LIGHTWEIGHT.block_reason("document", "https://doubleclick.net/ad") is None
+    assert LIGHTWEIGHT.block_reason("image", "https://challenges.cloudflare.com/cdn-cgi/img.png") is None
+
+
+def test_domain_match_requires_label_boundary():
+    # "notdoubleclick.net" is not a subdomain of doubleclick.net
+    assert LIGHTWEIGHT.block_reason("script", "https://notdoubleclick.net/a.js") is None
+    assert LIGHTWEIGHT.block_reason("script", "https://ad.doubleclick.net/a.js") is not None
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_route_handler_counts_blocked_requests():
+    async def scenario():
+        context = FakeContext()
+        stats = ResourceStats()
+        assert await apply_resource_policy(context, LIGHTWEIGHT, stats)
+
+        routes = [
+            FakeRoute("document", "https://www.fundamentus.com.br/detalhes.php?papel=PETR4"),
+            FakeRoute("image", "https://www.fundamentus.com.br/logo.png"),
+            FakeRoute("script", "https://www.google-analytics.com/analytics.js"),
+        ]
+        for route in routes:
+            await context.handler(route)
+
+        assert [route.outcome for route in routes] == ["continue", "abort", "abort"]
+        assert stats.allowed == 1 and stats.blocked == 2
+        assert stats.blocked_by_type == {"image": 1, "script": 1}
+        assert stats.bytes_saved == resource_policy.ESTIMATED_BYTES["image"] + resource_policy.ESTIMATED_BYTES["script"]
+
+    asyncio.run(scenario())
+
+
+def test_disabled_policy_installs_no_route(monkeypatch):
+    async def scenario():
+        context = FakeContext()
+        assert not await apply_resource_policy(context, ALLOW_ALL)
+
+        monkeypatch.setattr(resource_policy.settings, "SCRAPER_BLOCK_RESOURCES", False)
+        assert not await apply_resource_policy(context, LIGHTWEIGHT)
+        assert context.handler is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Testes do pool de workers (ScraperService.listen_for_jobs) com fakeredis e
+jobs falsos - sem Redis real nem Chromium
+
+USO:
+    pytest tests/test_worker_pool.py
+
+REQUISITOS:
+    - pip install fakeredis
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from config import Settings  # noqa: E402
+from job_queue import RedisJobQueue  # noqa: E402
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_source_concurrency_is_parsed():
+    settings = Settings(SCRAPER_SOURCE_CONCURRENCY=" fundamentus=3, STATUSINVEST=1,")
+    assert settings.source_concurrency_limits == {"FUNDAMENTUS": 3, "STATUSINVEST": 1}
+    assert Settings(SCRAPER_SOURCE_CONCURRENCY="").source_concurrency_limits == {}
+
+
+@pytest.mark.parametrize("value", ["FUNDAMENTUS=abc", "FUNDAMENTUS", "=2", "FUNDAMENTUS=0", "A=1,B=-1"])
+def test_bad_source_concurrency_names_the_setting(value):
+    with pytest.raises(ValidationError, match="SCRAPER_SOURCE_CONCURRENCY"):
+        Settings(SCRAPER_SOURCE_CONCURRENCY=value)
+
+
+class JobRecorder:
+    """Stand-in for process_scraper_job tracking how many jobs run at once"""
+
+    def __init__(self, total: int, duration: float = 0.05):
+        self.total = total
+        self.duration = duration
+        self.running = {}
+        self.max_running = {}
+        self.max_total = 0
+        self.overlapped_capped = False
+        self.done = []
+        self.finished = asyncio.Event()
+
+    async def __call__(self, job: dict):
+        source = job["source"]
+        self.running[source] = self.running.get(source, 0) + 1
+        self.max_running[source] = max(self.max_running.get(source, 0), self.running[source])
+        self.max_total = max(self.max_total, sum(self.running.values()))
+        try:
+            await asyncio.sleep(self.duration)
+            # Another source made progress while the capped one was busy
+            if source != "SLOW" and self.running.get("SLOW"):
+                self.overlapped_capped = True
+        finally:
+            self.running[source] -= 1
+        self.done.append(job["job_id"])
+        if len(self.done) == self.total:
+            self.finished.set()
+
+
+@pytest.fixture
+def main_module():
+    # main.py imports the database layer and every scraper
+    pytest.importorskip("sqlalchemy")
+    pytest.importorskip("playwright")
+    pytest.importorskip("playwright_stealth")
+    import main
+
+    return main
+
+
+@pytest.mark.parametrize("mode", ["list", "stream"])
+def test_jobs_run_concurrently_within_source_caps(main_module, mode):
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        queue = RedisJobQueue(client=client, mode=mode, consumer="worker-a", block_timeout=1)
+        await queue.connect()
+
+        service = main_module.ScraperService()
+        service.job_queue = queue
+        service.max_concurrent_jobs = 4
+        service.default_source_limit = 2
+        service.source_limits = {"SLOW": 1}
+
+        jobs = [
+            {"job_id": f"{source}-{i}", "ticker": "PETR4", "source": source}
+            for i in range(4)
+            for source in ("SLOW", "FAST", "OTHER")
+        ]
+        for job in jobs:
+            await queue.enqueue(job)
+
+        # fakeredis serves a blocking read of an empty queue without yielding to
+        # the event loop: once every job was popped, wait like an idle read would
+        blocking_get = queue.get
+        popped = []
+
+        async def get(timeout=None):
+            if len(popped) == len(jobs):
+                await asyncio.sleep(0.05)
+                return None
+            job = await blocking_get(timeout)
+            if job:
+                popped.append(job)
+            return job
+
+        queue.get = get
+
+        recorder = JobRecorder(total=len(jobs))
+        service.process_scraper_job = recorder
+        service.running = True
+        listener = asyncio.create_task(service.listen_for_jobs())
+        try:
+            await asyncio.wait_for(recorder.finished.wait(), timeout=5)
+            # Acks happen right after each job returns
+            await asyncio.wait_for(asyncio.gather(*service._active_jobs), timeout=1)
+        finally:
+            service.running = False
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        assert sorted(recorder.done) == sorted(job["job_id"] for job in jobs)
+        assert recorder.max_running["SLOW"] == 1
+        assert recorder.max_running["FAST"] == recorder.max_running["OTHER"] == 2
+        assert 1 < recorder.max_total <= 4
+        assert recorder.overlapped_capped
+
+        # Every job acknowledged: nothing left in flight
+        if mode == "list":
+            assert await client.llen(queue.processing_key) == 0
+        else:
+            pending = await client.xpending(queue.stream, queue.group)
+            assert pending["pending"] == 0
+        assert await blocking_get(timeout=1) is None
+
+    run(scenario())
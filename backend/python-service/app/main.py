@@ -4,24 +4,50 @@ Descrição: API REST para cálculo de indicadores técnicos
 Performance: 10-50x mais rápido que TypeScript
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, Header, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import importlib.util
+import json
 import logging
 from datetime import datetime
+from typing import Optional, Union
 
 # Import models and services
 from app.models import (
     IndicatorsRequest,
     IndicatorsResponse,
+    SelectedIndicatorsResponse,
+    BatchIndicatorsRequest,
+    BatchIndicatorsResponse,
+    IncrementalIndicatorsRequest,
+    IncrementalIndicatorsResponse,
     ErrorResponse,
     HealthResponse,
     HistoricalDataRequest,
     HistoricalDataResponse,
+    HistoricalDataBatchRequest,
+    HistoricalDataBatchResponse,
     CotahistRequest,
     CotahistResponse,
+    CotahistDeltaRequest,
+    CotahistDeltaResponse,
 )
-from app.services import CotahistService, TechnicalAnalysisService, YFinanceService
+from app.services import (
+    CotahistService,
+    IncrementalIndicatorService,
+    PriceAdjustmentService,
+    ResamplingService,
+    TechnicalAnalysisService,
+    YFinanceService,
+)
+from app.services import indicator_kernels
+from app.services.indicator_encoding import (
+    encode_indicator_response,
+    negotiate_indicator_format,
+)
+from app.services.resampling import DataNotReadyError, price_arrays, resample_ohlcv
 
 # Configure logging
 logging.basicConfig(
@@ -50,8 +76,11 @@ app.add_middleware(
 
 # Initialize services
 cotahist_service = CotahistService()
+price_adjustment_service = PriceAdjustmentService()
 technical_analysis_service = TechnicalAnalysisService()
+incremental_indicator_service = IncrementalIndicatorService()
 yfinance_service = YFinanceService()
+resampling_service = ResamplingService(cotahist_service, yfinance_service, price_adjustment_service)
 
 
 # ============================================================================
@@ -109,14 +138,16 @@ async def health_check():
     Health check endpoint
     """
     try:
-        # Test pandas_ta_classic import
-        import pandas_ta_classic as ta
+        # Check pandas_ta_classic is installed without importing it (~1.3s)
+        if importlib.util.find_spec("pandas_ta_classic") is None:
+            raise ImportError("pandas_ta_classic is not installed")
 
         return HealthResponse(
             status="healthy",
             service="python-technical-analysis",
             version="1.0.0",
             dependencies={"pandas_ta_classic": "available"},
+            indicator_cache=technical_analysis_service.cache.stats(),
         )
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -128,28 +159,117 @@ async def health_check():
         )
 
 
-@app.post("/indicators", response_model=IndicatorsResponse, status_code=status.HTTP_200_OK)
-async def calculate_indicators(request: IndicatorsRequest):
+async def resolve_indicator_prices(request: IndicatorsRequest):
+    """
+    Price history for an indicators request, in the requested timeframe
+
+    Stored-source requests reuse the cached bars/aggregates of the ticker;
+    sent bars are resampled on the fly when a timeframe is given.
+    """
+    if request.source is not None:
+        return await resampling_service.load_bars(
+            request.source, request.ticker, request.timeframe or "1d"
+        )
+
+    prices = request.price_input()
+    if request.timeframe is not None:
+        prices = resample_ohlcv(price_arrays(prices), request.timeframe)
+    return prices
+
+
+@app.post(
+    "/indicators",
+    response_model=Union[IndicatorsResponse, SelectedIndicatorsResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def calculate_indicators(
+    request: IndicatorsRequest, accept: Optional[str] = Header(default=None)
+):
     """
     Calculate technical indicators for given price data
 
     Args:
-        request: IndicatorsRequest with ticker and prices
+        request: IndicatorsRequest with ticker and price history - as a list
+            of OHLCV objects (prices), parallel arrays (columns) or a base64
+            float matrix (buffer); the columnar modes skip per-bar validation.
+            Optional `indicators` selects which indicators (and params) to
+            calculate, e.g. [{"name": "sma", "params": {"period": 50}}, {"name": "rsi"}].
+            `timeframe` resamples the bars (1h, 4h, 1d, 1wk, 1mo); with
+            `source` (cotahist/yfinance) and no prices, daily bars are loaded
+            and cached server-side (COTAHIST from the Parquet cache only)
+        accept: Accept header - application/vnd.indicators.columnar+json or
+            application/vnd.apache.arrow.stream (optional "; dtype=float32")
+            return compact columnar buffers instead of JSON number lists
 
     Returns:
-        IndicatorsResponse with all calculated indicators
+        IndicatorsResponse with all calculated indicators, SelectedIndicatorsResponse
+        when `indicators` is set (or columnar encoding). 202 (with Retry-After)
+        when source=cotahist years are not cached yet - they are loaded in the
+        background
 
     Raises:
         HTTPException 400: If validation fails or insufficient data
         HTTPException 500: If calculation fails
     """
     start_time = datetime.utcnow()
-    logger.info(f"Calculating indicators for {request.ticker} ({len(request.prices)} data points)")
+    price_source = request.source or f"{request.data_points} data points"
+    logger.info(
+        f"Calculating indicators for {request.ticker} "
+        f"({price_source}, timeframe={request.timeframe or 'as sent'})"
+    )
 
     try:
+        prices = await resolve_indicator_prices(request)
+        data_points = len(prices["date"]) if isinstance(prices, dict) else len(prices)
+
+        output_format = negotiate_indicator_format(accept)
+        if output_format is not None:
+            # Fast path: encode the NumPy arrays directly (no per-element conversion)
+            series, latest = technical_analysis_service.calculate_indicator_arrays(
+                ticker=request.ticker,
+                prices=prices,
+                indicators=request.indicators,
+                engine=request.engine,
+            )
+            media_type, dtype = output_format
+            content = encode_indicator_response(
+                media_type,
+                dtype,
+                [(request.ticker, data_points, series, latest)],
+                timestamp=datetime.utcnow(),
+            )
+            logger.info(
+                f"Indicators calculated for {request.ticker} ({media_type}, {dtype}, "
+                f"{len(content)} bytes) in "
+                f"{(datetime.utcnow() - start_time).total_seconds() * 1000:.2f}ms"
+            )
+            return Response(content=content, media_type=media_type)
+
+        if request.indicators is not None:
+            # Only the selected indicators, keyed by flat name
+            series, latest = technical_analysis_service.calculate_indicator_arrays(
+                ticker=request.ticker,
+                prices=prices,
+                indicators=request.indicators,
+                engine=request.engine,
+            )
+            logger.info(
+                f"{len(series) + len(latest)} selected indicators calculated for {request.ticker} in "
+                f"{(datetime.utcnow() - start_time).total_seconds() * 1000:.2f}ms"
+            )
+            return SelectedIndicatorsResponse(
+                ticker=request.ticker,
+                indicators={
+                    name: technical_analysis_service._series_to_list(values)
+                    for name, values in series.items()
+                },
+                latest=latest,
+                data_points=data_points,
+            )
+
         # Calculate indicators
         indicators = technical_analysis_service.calculate_indicators(
-            ticker=request.ticker, prices=request.prices
+            ticker=request.ticker, prices=prices, engine=request.engine
         )
 
         # Calculate processing time
@@ -164,7 +284,15 @@ async def calculate_indicators(request: IndicatorsRequest):
             ticker=request.ticker,
             timestamp=end_time,
             indicators=indicators,
-            data_points=len(request.prices),
+            data_points=data_points,
+        )
+
+    except DataNotReadyError as e:
+        logger.info(f"Price data for {request.ticker} not ready: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(ErrorResponse(error="Data Not Ready", detail=str(e))),
+            headers={"Retry-After": "30"},
         )
 
     except ValueError as e:
@@ -184,6 +312,165 @@ async def calculate_indicators(request: IndicatorsRequest):
         )
 
 
+@app.post("/indicators/batch", response_model=BatchIndicatorsResponse, status_code=status.HTTP_200_OK)
+async def calculate_indicators_batch(
+    request: BatchIndicatorsRequest, accept: Optional[str] = Header(default=None)
+):
+    """
+    Calculate technical indicators for many tickers in one request
+
+    All series are packed into (time x ticker) frames and each indicator is
+    computed for every ticker in a single vectorized pass. Tickers with
+    insufficient data are reported in `errors` without failing the batch.
+
+    Args:
+        request: BatchIndicatorsRequest with one price history per ticker
+        accept: Accept header - columnar encodings as in POST /indicators
+
+    Returns:
+        BatchIndicatorsResponse with one IndicatorsResponse per ticker
+        (or columnar encoding)
+
+    Raises:
+        HTTPException 500: If calculation fails
+    """
+    start_time = datetime.utcnow()
+    logger.info(f"Calculating batch indicators for {len(request.items)} tickers")
+
+    try:
+        output_format = negotiate_indicator_format(accept)
+        if output_format is not None:
+            arrays, errors = technical_analysis_service.calculate_indicator_arrays_batch(
+                {item.ticker: item.price_input() for item in request.items}
+            )
+            media_type, dtype = output_format
+            content = encode_indicator_response(
+                media_type,
+                dtype,
+                [
+                    (item.ticker, item.data_points, *arrays[item.ticker])
+                    for item in request.items
+                    if item.ticker in arrays
+                ],
+                timestamp=datetime.utcnow(),
+                errors=errors,
+                batch=True,
+            )
+            logger.info(
+                f"Batch indicators calculated for {len(arrays)}/{len(request.items)} "
+                f"tickers ({media_type}, {dtype}, {len(content)} bytes)"
+            )
+            return Response(content=content, media_type=media_type)
+
+        indicators, errors = technical_analysis_service.calculate_indicators_batch(
+            {item.ticker: item.price_input() for item in request.items}
+        )
+
+        end_time = datetime.utcnow()
+        processing_time_ms = (end_time - start_time).total_seconds() * 1000
+
+        logger.info(
+            f"Batch indicators calculated for {len(indicators)}/{len(request.items)} "
+            f"tickers in {processing_time_ms:.2f}ms"
+        )
+
+        return BatchIndicatorsResponse(
+            timestamp=end_time,
+            total_tickers=len(request.items),
+            results=[
+                IndicatorsResponse(
+                    ticker=item.ticker,
+                    timestamp=end_time,
+                    indicators=indicators[item.ticker],
+                    data_points=item.data_points,
+                )
+                for item in request.items
+                if item.ticker in indicators
+            ],
+            errors=errors,
+        )
+
+    except Exception as e:
+        logger.error(f"Error calculating batch indicators: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate indicators: {str(e)}",
+        )
+
+
+@app.post(
+    "/indicators/incremental",
+    response_model=IncrementalIndicatorsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def update_indicators_incremental(request: IncrementalIndicatorsRequest):
+    """
+    Update the per-ticker indicator state with new bars and return latest values
+
+    The first call for a ticker (or reset=true) must send the full history
+    (min 200 points) to seed the state. Next calls only need the bars added
+    since the last call - each new bar is applied in O(1), instead of
+    recomputing every indicator over the whole history like POST /indicators.
+    Sending the last applied date again (e.g. today's candle while the session
+    is open) replaces that bar instead of being ignored.
+
+    Args:
+        request: IncrementalIndicatorsRequest with ticker, new prices and reset flag
+
+    Returns:
+        IncrementalIndicatorsResponse with the latest value of each indicator
+
+    Raises:
+        HTTPException 400: If there is no state and not enough data to seed it,
+            or the last bar can't be revised (state saved before this was supported)
+        HTTPException 500: If calculation fails
+    """
+    start_time = datetime.utcnow()
+    logger.info(
+        f"Updating incremental indicators for {request.ticker} "
+        f"({len(request.prices)} bars, reset={request.reset})"
+    )
+
+    try:
+        state, bars_applied = incremental_indicator_service.update(
+            ticker=request.ticker, prices=request.prices, reset=request.reset
+        )
+        indicators = state.snapshot()
+
+        end_time = datetime.utcnow()
+        processing_time_ms = (end_time - start_time).total_seconds() * 1000
+
+        logger.info(
+            f"Incremental indicators updated for {request.ticker}: "
+            f"{bars_applied} new bars in {processing_time_ms:.2f}ms"
+        )
+
+        return IncrementalIndicatorsResponse(
+            ticker=request.ticker,
+            timestamp=end_time,
+            last_date=state.last_date,
+            bars_applied=bars_applied,
+            data_points=state.bars,
+            indicators=indicators,
+        )
+
+    except ValueError as e:
+        logger.error(f"Validation error for {request.ticker}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Error updating incremental indicators for {request.ticker}: {str(e)}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update indicators: {str(e)}",
+        )
+
+
 @app.post("/historical-data", response_model=HistoricalDataResponse, status_code=status.HTTP_200_OK)
 async def fetch_historical_data(request: HistoricalDataRequest):
     """
@@ -203,8 +490,8 @@ async def fetch_historical_data(request: HistoricalDataRequest):
     logger.info(f"Fetching historical data for {request.ticker} (period={request.period}, interval={request.interval})")
 
     try:
-        # Fetch historical data
-        prices = yfinance_service.fetch_historical_data(
+        # Fetch historical data (thread pool + async backoff: does not block the event loop)
+        prices = await yfinance_service.fetch_historical_data_async(
             ticker=request.ticker,
             period=request.period,
             interval=request.interval,
@@ -244,6 +531,70 @@ async def fetch_historical_data(request: HistoricalDataRequest):
         )
 
 
+@app.post(
+    "/historical-data/batch", response_model=HistoricalDataBatchResponse, status_code=status.HTTP_200_OK
+)
+async def fetch_historical_data_batch(request: HistoricalDataBatchRequest):
+    """
+    Fetch historical price data of many tickers from Yahoo Finance concurrently
+
+    Up to max_concurrent tickers (capped by YFINANCE_MAX_CONCURRENCY) are
+    downloaded at the same time, each with its own retries. Tickers that
+    fail are reported in `errors` instead of failing the whole request.
+
+    Args:
+        request: HistoricalDataBatchRequest with tickers, period and interval
+
+    Returns:
+        HistoricalDataBatchResponse with one HistoricalDataResponse per
+        fetched ticker and the errors of the others
+
+    Example:
+        POST /historical-data/batch
+        {
+            "tickers": ["PETR4", "VALE3", "ITUB4"],
+            "period": "5y",
+            "interval": "1d"
+        }
+    """
+    start_time = datetime.utcnow()
+    logger.info(
+        f"Fetching historical data for {len(request.tickers)} tickers "
+        f"(period={request.period}, interval={request.interval})"
+    )
+
+    results, errors = await yfinance_service.fetch_many(
+        request.tickers,
+        period=request.period,
+        interval=request.interval,
+        max_concurrent=request.max_concurrent,
+    )
+
+    end_time = datetime.utcnow()
+    processing_time_ms = (end_time - start_time).total_seconds() * 1000
+    logger.info(
+        f"Historical data fetched for {len(results)}/{len(request.tickers)} tickers "
+        f"in {processing_time_ms:.2f}ms ({len(errors)} errors)"
+    )
+
+    return HistoricalDataBatchResponse(
+        timestamp=end_time,
+        total_tickers=len(request.tickers),
+        results=[
+            HistoricalDataResponse(
+                ticker=ticker,
+                timestamp=end_time,
+                period=request.period,
+                interval=request.interval,
+                data_points=len(prices),
+                prices=prices,
+            )
+            for ticker, prices in results.items()
+        ],
+        errors=errors,
+    )
+
+
 @app.post("/cotahist/fetch", response_model=CotahistResponse, status_code=status.HTTP_200_OK)
 async def fetch_cotahist_data(request: CotahistRequest):
     """
@@ -279,9 +630,22 @@ async def fetch_cotahist_data(request: CotahistRequest):
         - Timeout: 600 seconds (10 minutes)
 
     Note:
-        COTAHIST prices are NOT adjusted for splits/dividends.
-        For adjusted prices, use BRAPI or YFinance.
+        COTAHIST prices are NOT adjusted for splits/dividends by default.
+        With "adjusted": true, prices are adjusted locally using the corporate
+        events table (CORPORATE_EVENTS_FILE) plus any "events" in the request,
+        based on the last trading day returned. Events that cannot be applied
+        (e.g. a bonus without "fator") are listed in skipped_events.
+        For multi-year / all-tickers requests, prefer POST /cotahist/fetch/stream.
+
+    Raises:
+        HTTPException 400: If events are sent without adjusted=true
     """
+    if request.events and not request.adjusted:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="events are only used with adjusted=true",
+        )
+
     start_time = datetime.utcnow()
     years_requested = request.end_year - request.start_year + 1
 
@@ -292,12 +656,22 @@ async def fetch_cotahist_data(request: CotahistRequest):
 
     try:
         # Fetch historical data from COTAHIST
+        # Unfiltered fetches seed the /cotahist/delta watermark
         data = await cotahist_service.fetch_historical_data(
             start_year=request.start_year,
             end_year=request.end_year,
             tickers=request.tickers,
+            update_watermark=True,
         )
 
+        skipped_events = []
+        if request.adjusted:
+            events = {
+                ticker: [event.dict() for event in ticker_events]
+                for ticker, ticker_events in (request.events or {}).items()
+            }
+            price_adjustment_service.adjust_records(data, events=events, skipped=skipped_events)
+
         # Calculate processing time
         end_time = datetime.utcnow()
         processing_time_sec = (end_time - start_time).total_seconds()
@@ -317,6 +691,8 @@ async def fetch_cotahist_data(request: CotahistRequest):
             years_processed=unique_years,
             total_records=len(data),
             tickers_filter=request.tickers,
+            adjusted=request.adjusted,
+            skipped_events=skipped_events,
             data=data,
         )
 
@@ -337,6 +713,161 @@ async def fetch_cotahist_data(request: CotahistRequest):
         )
 
 
+@app.post("/cotahist/delta", response_model=CotahistDeltaResponse, status_code=status.HTTP_200_OK)
+async def fetch_cotahist_delta(request: CotahistDeltaRequest):
+    """
+    Incremental COTAHIST sync: only trading sessions after a watermark
+
+    Instead of re-downloading the annual file (~40 MB) to refresh the current
+    year, uses B3's smaller files:
+    - COTAHIST_D{DDMMYYYY}.ZIP (daily, ~200 KB) for the current month
+    - COTAHIST_M{MMYYYY}.ZIP (monthly) for past months
+    - COTAHIST_A{YYYY}.ZIP (annual, cached) for whole past years
+
+    Only requests without a tickers filter advance the service-side watermark.
+
+    Args:
+        request: CotahistDeltaRequest with optional since (last ingested date) and tickers
+
+    Returns:
+        CotahistDeltaResponse with records after `since` and the new watermark
+
+    Raises:
+        HTTPException 400: If no since is given and the service has no stored watermark
+        HTTPException 500: If download or parsing fails
+
+    Example:
+        POST /cotahist/delta
+        {
+            "since": "2026-10-15",
+            "tickers": ["ABEV3", "PETR4"]
+        }
+    """
+    start_time = datetime.utcnow()
+
+    try:
+        delta = await cotahist_service.fetch_delta(
+            since=request.since,
+            tickers=request.tickers,
+        )
+
+        processing_time_sec = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(
+            f"COTAHIST delta since {delta['since']}: {len(delta['data'])} records "
+            f"from {len(delta['files'])} files in {processing_time_sec:.2f}s"
+        )
+
+        return CotahistDeltaResponse(
+            since=delta["since"],
+            watermark=delta["watermark"],
+            files=delta["files"],
+            total_records=len(delta["data"]),
+            tickers_filter=request.tickers,
+            data=delta["data"],
+        )
+
+    except ValueError as e:
+        logger.error(f"Validation error for COTAHIST delta: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Error fetching COTAHIST delta: {str(e)}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch COTAHIST delta: {str(e)}",
+        )
+
+
+# Records per NDJSON chunk written to the socket (bounds per-chunk memory)
+NDJSON_CHUNK_SIZE = 10000
+
+
+@app.post("/cotahist/fetch/stream", status_code=status.HTTP_200_OK)
+async def stream_cotahist_data(request: CotahistRequest):
+    """
+    Stream historical price data from COTAHIST as NDJSON (one record per line)
+
+    Same record fields as POST /cotahist/fetch (unadjusted prices only), but records are
+    streamed year by year (ascending) as each year is downloaded and parsed,
+    instead of building and validating the whole response in memory:
+    - Peak memory stays bounded by one parsed year
+    - Callers can start processing before the last year is downloaded
+    - Rows are not re-validated through CotahistPricePoint (the parser already
+      emits the CotahistPricePoint fields and types)
+
+    Args:
+        request: CotahistRequest with start_year, end_year, and optional tickers filter.
+            adjusted=true is not supported: adjustment factors depend on events
+            after each bar, i.e. on the whole series, which a year-by-year
+            stream has not seen yet (use POST /cotahist/fetch)
+
+    Returns:
+        StreamingResponse (application/x-ndjson), one CotahistPricePoint JSON object per line
+
+    Raises:
+        HTTPException 400: If adjusted=true
+
+    Example:
+        POST /cotahist/fetch/stream
+        {"start_year": 1986, "end_year": 2024}
+
+        {"ticker": "PETR4", "date": "1986-01-02", "open": ..., ...}
+        {"ticker": "VALE3", "date": "1986-01-02", "open": ..., ...}
+
+    Note:
+        Errors after the stream has started cannot change the HTTP status.
+        Years that fail to download/parse are skipped (and logged), exactly
+        like POST /cotahist/fetch.
+    """
+    if request.adjusted:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "adjusted=true is not supported by /cotahist/fetch/stream "
+                "(adjustment needs the full series) - use POST /cotahist/fetch"
+            ),
+        )
+
+    start_time = datetime.utcnow()
+
+    logger.info(
+        f"Streaming COTAHIST data: {request.start_year}-{request.end_year} "
+        f"(tickers: {request.tickers or 'ALL'})"
+    )
+
+    async def generate_ndjson():
+        total_records = 0
+        years_streamed = 0
+
+        async for year, columns in cotahist_service.iter_historical_data(
+            start_year=request.start_year,
+            end_year=request.end_year,
+            tickers=request.tickers,
+        ):
+            records = cotahist_service.columns_to_records(columns)
+            for i in range(0, len(records), NDJSON_CHUNK_SIZE):
+                yield "".join(
+                    json.dumps(record, ensure_ascii=False) + "\n"
+                    for record in records[i : i + NDJSON_CHUNK_SIZE]
+                )
+
+            total_records += len(records)
+            years_streamed += 1
+
+        processing_time_sec = (datetime.utcnow() - start_time).total_seconds()
+        logger.info(
+            f"COTAHIST stream completed: {total_records} records "
+            f"from {years_streamed} years in {processing_time_sec:.2f}s"
+        )
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
 @app.get("/ping")
 async def ping():
     """
@@ -356,7 +887,11 @@ async def startup_event():
     Startup event - Initialize resources
     """
     logger.info("🚀 Python Technical Analysis Service starting...")
-    logger.info("📊 pandas_ta_classic loaded successfully")
+    numba_enabled, warm_up_seconds = indicator_kernels.warm_up()
+    logger.info(
+        f"🧮 Indicator kernels ready (numba={numba_enabled}, {warm_up_seconds * 1000:.0f}ms), "
+        f"default engine: {technical_analysis_service.default_engine}"
+    )
     logger.info("✅ Service ready to accept requests")
 
 
@@ -366,6 +901,8 @@ async def shutdown_event():
     Shutdown event - Cleanup resources
     """
     logger.info("👋 Python Technical Analysis Service shutting down...")
+    await cotahist_service.close()
+    yfinance_service.close()
 
 
 # ============================================================================
@@ -3,9 +3,13 @@ Pydantic Models for Python Service
 Descrição: Schemas para validação de dados de entrada/saída
 """
 
-from typing import List, Optional, Literal, Union
+import base64
+import re
+from typing import Any, ClassVar, Dict, List, Optional, Literal, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+
+import numpy as np
+from pydantic import BaseModel, Field, root_validator, validator
 
 
 # ============================================================================
@@ -41,12 +45,310 @@ class PriceDataPoint(BaseModel):
         return v
 
 
-class IndicatorsRequest(BaseModel):
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def validate_price_arrays(dates: np.ndarray, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Vectorized version of the PriceDataPoint checks for columnar price input
+
+    Raises:
+        ValueError: On length mismatch, non-finite/non-positive prices,
+            negative volume, high < low or unsorted dates
+    """
+    for field, values in arrays.items():
+        if len(values) != len(dates):
+            raise ValueError(f'{field} has {len(values)} values, expected {len(dates)} (one per date)')
+        if not np.isfinite(values).all():
+            raise ValueError(f'{field} must contain only finite numbers')
+
+    for field in ("open", "high", "low", "close"):
+        invalid = np.flatnonzero(arrays[field] <= 0)
+        if invalid.size:
+            raise ValueError(f'{field} must be > 0 (index {invalid[0]})')
+
+    invalid = np.flatnonzero(arrays["volume"] < 0)
+    if invalid.size:
+        raise ValueError(f'volume must be >= 0 (index {invalid[0]})')
+
+    invalid = np.flatnonzero(arrays["high"] < arrays["low"])
+    if invalid.size:
+        raise ValueError(f'high must be >= low (index {invalid[0]})')
+
+    if (dates[1:] < dates[:-1]).any():
+        raise ValueError('dates must be sorted (ascending)')
+
+
+class PriceColumns(BaseModel):
+    """
+    OHLCV price history as parallel arrays (one entry per bar)
+    Validated with vectorized checks instead of one model per bar
+    """
+    dates: List[str] = Field(..., description="ISO date strings (YYYY-MM-DD), ascending")
+    open: List[float] = Field(..., description="Opening prices")
+    high: List[float] = Field(..., description="Highest prices")
+    low: List[float] = Field(..., description="Lowest prices")
+    close: List[float] = Field(..., description="Closing prices")
+    volume: List[float] = Field(..., description="Trading volumes")
+
+    @root_validator(skip_on_failure=True)
+    def columns_must_be_valid(cls, values):
+        """Ensure columns have the same length and valid OHLCV values"""
+        cls._to_arrays(values)
+        return values
+
+    @staticmethod
+    def _to_arrays(values: dict) -> Dict[str, np.ndarray]:
+        try:
+            dates = np.array(values["dates"], dtype="datetime64[s]")
+        except ValueError:
+            raise ValueError('dates must be ISO date strings (YYYY-MM-DD)')
+        arrays = {field: np.asarray(values[field], dtype=float) for field in OHLCV_FIELDS}
+        validate_price_arrays(dates, arrays)
+        return {"date": dates, **arrays}
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Columns as NumPy arrays: date (datetime64), open, high, low, close, volume"""
+        return self._to_arrays({name: getattr(self, name) for name in ("dates",) + OHLCV_FIELDS})
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+class PriceBuffer(BaseModel):
+    """
+    OHLCV price history as a binary buffer
+
+    `data` is the base64 of a little-endian float matrix with 6 rows of n
+    values each (row-major): dates, open, high, low, close, volume. Dates are
+    days (date_unit='D') or seconds (date_unit='s') since 1970-01-01 UTC.
+    """
+    dtype: Literal['float64', 'float32'] = Field(default='float64', description="Float type of the matrix")
+    date_unit: Literal['D', 's'] = Field(default='D', description="Unit of the dates row (days or seconds since epoch)")
+    data: str = Field(..., description="base64 of the 6 x n little-endian float matrix")
+
+    @root_validator(skip_on_failure=True)
+    def buffer_must_be_valid(cls, values):
+        """Ensure the buffer decodes to a valid 6 x n OHLCV matrix"""
+        cls._to_arrays(values)
+        return values
+
+    @staticmethod
+    def _to_arrays(values: dict) -> Dict[str, np.ndarray]:
+        dtype = "<f4" if values["dtype"] == "float32" else "<f8"
+        try:
+            raw = base64.b64decode(values["data"], validate=True)
+        except ValueError:
+            raise ValueError('data must be valid base64')
+        if len(raw) % (6 * np.dtype(dtype).itemsize):
+            raise ValueError(f'data must hold 6 rows of {values["dtype"]} values of equal length')
+
+        matrix = np.frombuffer(raw, dtype=dtype).reshape(6, -1).astype(float)
+        if not np.isfinite(matrix[0]).all() or (matrix[0] != np.floor(matrix[0])).any():
+            raise ValueError(f'dates row must hold whole {values["date_unit"]} units since epoch')
+
+        dates = matrix[0].astype(np.int64).astype(f"datetime64[{values['date_unit']}]").astype("datetime64[s]")
+        arrays = dict(zip(OHLCV_FIELDS, matrix[1:]))
+        validate_price_arrays(dates, arrays)
+        return {"date": dates, **arrays}
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Decoded matrix as NumPy arrays: date (datetime64), open, high, low, close, volume"""
+        return self._to_arrays({"dtype": self.dtype, "date_unit": self.date_unit, "data": self.data})
+
+    def __len__(self) -> int:
+        itemsize = 4 if self.dtype == "float32" else 8
+        return (len(self.data.rstrip("=")) * 3 // 4) // (6 * itemsize)
+
+
+class PriceHistoryInput(BaseModel):
+    """
+    Price history in one of three input modes (exactly one must be set):
+    - prices: list of PriceDataPoint objects (validated per bar)
+    - columns: parallel arrays (PriceColumns, vectorized validation)
+    - buffer: base64 binary matrix (PriceBuffer, vectorized validation)
+    """
+    min_price_points: ClassVar[int] = 0
+
+    prices: Optional[List[PriceDataPoint]] = Field(default=None, description="Price history as OHLCV objects")
+    columns: Optional[PriceColumns] = Field(default=None, description="Price history as parallel arrays")
+    buffer: Optional[PriceBuffer] = Field(default=None, description="Price history as a binary buffer")
+
+    @validator('prices')
+    def prices_must_be_sorted(cls, v):
+        """Ensure prices are sorted by date ascending"""
+        if v is None:
+            return v
+        dates = [datetime.fromisoformat(p.date) for p in v]
+        if dates != sorted(dates):
+            raise ValueError('prices must be sorted by date (ascending)')
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def exactly_one_price_input(cls, values):
+        """Ensure exactly one input mode is used and it has enough data points"""
+        inputs = [values[name] for name in ("prices", "columns", "buffer") if values.get(name) is not None]
+        if not inputs and values.get("source") is not None:
+            # Bars loaded server-side (IndicatorsRequest.source)
+            return values
+        if len(inputs) != 1:
+            raise ValueError('send exactly one of prices, columns or buffer')
+        if len(inputs[0]) < cls.min_price_points:
+            raise ValueError(
+                f'price history needs at least {cls.min_price_points} data points, got {len(inputs[0])}'
+            )
+        return values
+
+    @property
+    def data_points(self) -> int:
+        """Number of price points, whatever the input mode (0 if none was sent)"""
+        source = self._price_source()
+        return len(source) if source is not None else 0
+
+    def price_input(self) -> Optional[Union[List[PriceDataPoint], Dict[str, np.ndarray]]]:
+        """Price history for TechnicalAnalysisService (objects or NumPy arrays)"""
+        if self.prices is not None:
+            return self.prices
+        source = self._price_source()
+        return source.to_arrays() if source is not None else None
+
+    def _price_source(self):
+        for source in (self.prices, self.columns, self.buffer):
+            if source is not None:
+                return source
+
+
+# Calculation engines: pandas_ta_classic (reference) or NumPy/Numba kernels
+INDICATOR_ENGINES = ("pandas_ta", "numpy")
+
+# Indicator catalog: name -> default parameters (accepted params and their types)
+INDICATOR_PARAMS = {
+    "sma": {"period": 20},
+    "ema": {"period": 9},
+    "rsi": {"period": 14},
+    "macd": {"fast": 12, "slow": 26, "signal": 9},
+    "stochastic": {"period": 14, "d": 3, "smooth_k": 3},
+    "bollinger_bands": {"period": 20, "std_dev": 2.0},
+    "atr": {"period": 14},
+    "obv": {},
+    "volume_sma": {"period": 20},
+    "pivot": {},
+    "trend": {"fast": 50, "slow": 200},
+    "trend_strength": {"period": 20},
+}
+
+
+class IndicatorSpec(BaseModel):
+    """
+    One indicator to calculate, with optional parameters (defaults in INDICATOR_PARAMS)
+    """
+    name: Literal[
+        'sma', 'ema', 'rsi', 'macd', 'stochastic', 'bollinger_bands',
+        'atr', 'obv', 'volume_sma', 'pivot', 'trend', 'trend_strength',
+    ] = Field(..., description="Indicator name")
+    params: Dict[str, float] = Field(default_factory=dict, description="Indicator parameters, e.g. {\"period\": 50}")
+
+    @validator('params')
+    def params_must_be_known(cls, v, values):
+        """Ensure params are accepted by the indicator, positive, and integers where expected"""
+        if 'name' not in values:
+            return v
+        defaults = INDICATOR_PARAMS[values['name']]
+        params = {}
+        for key, value in v.items():
+            if key not in defaults:
+                raise ValueError(f"unknown param '{key}' for {values['name']} (accepted: {list(defaults) or 'none'})")
+            if value <= 0 or value > 1000:
+                raise ValueError(f"param '{key}' must be in (0, 1000]")
+            if isinstance(defaults[key], int):
+                if value != int(value):
+                    raise ValueError(f"param '{key}' must be an integer")
+                value = int(value)
+            params[key] = value
+        if 'fast' in defaults and params.get('fast', defaults['fast']) >= params.get('slow', defaults['slow']):
+            raise ValueError('fast must be < slow')
+        return params
+
+
+class IndicatorsRequest(PriceHistoryInput):
     """
     Request to calculate technical indicators
     """
+    min_price_points: ClassVar[int] = 200
+
     ticker: str = Field(..., min_length=1, max_length=20, description="Asset ticker")
-    prices: List[PriceDataPoint] = Field(..., min_items=200, description="Price history (min 200 data points)")
+    indicators: Optional[List[IndicatorSpec]] = Field(
+        default=None,
+        min_items=1,
+        description="Indicators to calculate (default: the full fixed set in TechnicalIndicators)",
+    )
+    timeframe: Optional[Literal['1h', '4h', '1d', '1wk', '1mo']] = Field(
+        default=None,
+        description="Resample the bars to this timeframe before calculating (default: as sent)",
+    )
+    engine: Optional[Literal['pandas_ta', 'numpy']] = Field(
+        default=None,
+        description="Calculation engine: pandas_ta or numpy kernels (default: INDICATOR_ENGINE env, pandas_ta)",
+    )
+    source: Optional[Literal['cotahist', 'yfinance']] = Field(
+        default=None,
+        description="Load daily bars server-side (cached per ticker/timeframe) instead of sending prices",
+    )
+
+    @root_validator(skip_on_failure=True)
+    def source_excludes_prices(cls, values):
+        """Ensure stored-source requests don't also send prices"""
+        if values.get("source") is not None and any(
+            values.get(name) is not None for name in ("prices", "columns", "buffer")
+        ):
+            raise ValueError('send either source or a price history, not both')
+        return values
+
+
+class BatchIndicatorsItem(PriceHistoryInput):
+    """
+    Price history of one ticker in a batch indicators request
+    (tickers with less than 200 data points are reported as errors)
+    """
+    ticker: str = Field(..., min_length=1, max_length=20, description="Asset ticker")
+
+
+class BatchIndicatorsRequest(BaseModel):
+    """
+    Request to calculate technical indicators for many tickers at once
+    """
+    items: List[BatchIndicatorsItem] = Field(..., min_items=1, description="One price history per ticker")
+
+    @validator('items')
+    def tickers_must_be_unique(cls, v):
+        """Ensure each ticker appears only once"""
+        tickers = [item.ticker for item in v]
+        if len(tickers) != len(set(tickers)):
+            raise ValueError('tickers must be unique')
+        return v
+
+
+class IncrementalIndicatorsRequest(BaseModel):
+    """
+    Request to update the incremental indicator state of a ticker
+    """
+    ticker: str = Field(..., min_length=1, max_length=20, description="Asset ticker")
+    prices: List[PriceDataPoint] = Field(
+        ..., min_items=1,
+        description="New bars since the last call (full history, min 200, when seeding)",
+    )
+    reset: bool = Field(default=False, description="Discard stored state and seed from prices")
+
+    # The ticker names the per-ticker state file: no path separators or ".."
+    TICKER_PATTERN: ClassVar[re.Pattern] = re.compile(r"^[A-Z0-9.]{1,20}$")
+
+    @validator('ticker')
+    def ticker_must_be_symbol(cls, v):
+        """Normalize to upper case and allow only letters, digits and dots"""
+        v = v.strip().upper()
+        if not cls.TICKER_PATTERN.match(v) or set(v) == {"."}:
+            raise ValueError('ticker must contain only letters, digits and dots')
+        return v
 
     @validator('prices')
     def prices_must_be_sorted(cls, v):
@@ -137,6 +439,72 @@ class IndicatorsResponse(BaseModel):
     data_points: int = Field(..., description="Number of price points used")
 
 
+class SelectedIndicatorsResponse(BaseModel):
+    """
+    Response from /indicators when the request selects indicators
+
+    Keys follow the default names (sma_50, rsi, macd_signal, bb_upper...);
+    non-default parameters are appended as a suffix (rsi_21, macd_5_35_5).
+    """
+    ticker: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    indicators: Dict[str, List[Optional[float]]] = Field(..., description="Historical arrays by key")
+    latest: Dict[str, Union[PivotPointsIndicator, float, str]] = Field(
+        default_factory=dict, description="Latest-value indicators (pivot, trend, trend_strength, bb_bandwidth)"
+    )
+    data_points: int = Field(..., description="Number of price points used")
+
+
+class BatchIndicatorsResponse(BaseModel):
+    """
+    Response from /indicators/batch endpoint
+    """
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    total_tickers: int
+    results: List[IndicatorsResponse]
+    errors: Dict[str, str] = Field(default_factory=dict, description="Tickers that could not be calculated")
+
+
+class IndicatorSnapshot(BaseModel):
+    """
+    Latest value of each indicator (incremental mode)
+    None where the indicator does not have enough bars yet
+    """
+    sma_20: Optional[float]
+    sma_50: Optional[float]
+    sma_200: Optional[float]
+    ema_9: Optional[float]
+    ema_21: Optional[float]
+    rsi: Optional[float]
+    macd: Optional[float]
+    macd_signal: Optional[float]
+    macd_histogram: Optional[float]
+    stochastic_k: Optional[float]
+    stochastic_d: Optional[float]
+    bb_upper: Optional[float]
+    bb_middle: Optional[float]
+    bb_lower: Optional[float]
+    bb_bandwidth: Optional[float]
+    atr: Optional[float]
+    obv: Optional[float]
+    volume_sma: Optional[float]
+    pivot: PivotPointsIndicator
+    trend: Literal['UPTREND', 'DOWNTREND', 'SIDEWAYS']
+    trend_strength: float = Field(..., ge=0, le=100)
+
+
+class IncrementalIndicatorsResponse(BaseModel):
+    """
+    Response from /indicators/incremental endpoint
+    """
+    ticker: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    last_date: str = Field(..., description="Date of the last bar applied to the state")
+    bars_applied: int = Field(..., description="New bars applied in this call (a revised last bar counts)")
+    data_points: int = Field(..., description="Total bars applied to the state")
+    indicators: IndicatorSnapshot
+
+
 # ============================================================================
 # ERROR MODELS
 # ============================================================================
@@ -163,6 +531,9 @@ class HealthResponse(BaseModel):
     version: str = "1.0.0"
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     dependencies: dict = Field(default_factory=dict)
+    indicator_cache: Dict[str, Any] = Field(
+        default_factory=dict, description="Indicator result cache metrics (hits, misses, bytes)"
+    )
 
 
 # ============================================================================
@@ -203,10 +574,77 @@ class HistoricalDataResponse(BaseModel):
     prices: List[HistoricalPricePoint]
 
 
+class HistoricalDataBatchRequest(BaseModel):
+    """
+    Request to fetch historical data of many tickers from Yahoo Finance
+    """
+    tickers: List[str] = Field(..., min_items=1, max_items=1000, description="Asset tickers (B3)")
+    period: str = Field(default="max", description="Data period: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max")
+    interval: str = Field(default="1d", description="Data interval: 1d, 1wk, 1mo")
+    max_concurrent: Optional[int] = Field(
+        default=None, ge=1, description="Simultaneous downloads (capped by YFINANCE_MAX_CONCURRENCY)"
+    )
+
+    @validator('tickers')
+    def tickers_must_be_unique(cls, v):
+        """Ensure each ticker appears only once"""
+        if len(v) != len(set(v)):
+            raise ValueError('tickers must be unique')
+        return v
+
+
+class HistoricalDataBatchResponse(BaseModel):
+    """
+    Response from /historical-data/batch endpoint
+    """
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    total_tickers: int
+    results: List[HistoricalDataResponse]
+    errors: Dict[str, str] = Field(default_factory=dict, description="Tickers that could not be fetched")
+
+
 # ============================================================================
 # COTAHIST MODELS (B3 Official Historical Data)
 # ============================================================================
 
+class CorporateEvent(BaseModel):
+    """
+    Corporate action used to adjust COTAHIST prices
+
+    Same fields as StatusInvestDividendsScraper output (python-scrapers).
+    """
+    tipo: str = Field(..., description="dividendo, jcp, rendimento, desdobramento, grupamento or bonus")
+    data_ex: str = Field(..., description="Ex-date (YYYY-MM-DD): first trading day without the right")
+    valor_bruto: Optional[float] = Field(default=None, gt=0, description="Gross cash amount per share (cash events)")
+    fator: Optional[float] = Field(default=None, gt=0, description="Shares after / shares before (splits, reverse splits, bonus)")
+
+    @validator('data_ex')
+    def data_ex_must_be_iso_date(cls, v):
+        """Ensure data_ex is a valid ISO date"""
+        try:
+            datetime.strptime(v[:10], "%Y-%m-%d")
+        except ValueError:
+            raise ValueError('data_ex must be an ISO date (YYYY-MM-DD)')
+        return v[:10]
+
+    @root_validator(skip_on_failure=True)
+    def share_events_need_factor(cls, values):
+        """Ensure share events carry fator (valor_bruto alone does not define it)"""
+        if values['tipo'].lower() in ('desdobramento', 'grupamento', 'bonus') and values.get('fator') is None:
+            raise ValueError(f"{values['tipo']} events require fator (shares after / shares before)")
+        return values
+
+
+class SkippedCorporateEvent(BaseModel):
+    """
+    Corporate event in the requested range that could not be applied
+    """
+    ticker: str
+    tipo: str
+    data_ex: str
+    reason: str = Field(..., description="Why the event was not applied (e.g. missing fator)")
+
+
 class CotahistRequest(BaseModel):
     """
     Request to fetch historical data from COTAHIST (B3 official source)
@@ -219,6 +657,11 @@ class CotahistRequest(BaseModel):
     start_year: int = Field(default=1986, ge=1986, description="Start year (1986-present)")
     end_year: int = Field(default_factory=lambda: datetime.now().year, ge=1986, description="End year (1986-present)")
     tickers: Optional[List[str]] = Field(default=None, description="List of tickers to filter (optional, all if None)")
+    adjusted: bool = Field(default=False, description="Adjust prices for dividends/splits (local events table + events)")
+    events: Optional[Dict[str, List[CorporateEvent]]] = Field(
+        default=None,
+        description="Extra corporate events per ticker, merged with the local events table (requires adjusted=true)",
+    )
 
     @validator('start_year', 'end_year')
     def year_must_be_valid(cls, v):
@@ -240,8 +683,8 @@ class CotahistPricePoint(BaseModel):
     """
     Single historical price data point from COTAHIST (16 campos completos)
 
-    Note: COTAHIST prices are NOT adjusted for splits/dividends.
-    For adjusted prices, use BRAPI.
+    Note: COTAHIST prices are NOT adjusted for splits/dividends,
+    unless requested with adjusted=true (see CotahistRequest).
 
     Layout completo (245 bytes fixed-position):
     - 6 campos básicos (compatível PriceDataPoint)
@@ -277,4 +720,46 @@ class CotahistResponse(BaseModel):
     years_processed: int
     total_records: int
     tickers_filter: Optional[List[str]]
+    adjusted: bool = False
+    skipped_events: List[SkippedCorporateEvent] = Field(
+        default_factory=list,
+        description="Events not applied with adjusted=true (e.g. scraped bonus without fator)",
+    )
+    data: List[CotahistPricePoint]
+
+
+class CotahistDeltaRequest(BaseModel):
+    """
+    Request for incremental COTAHIST sync (daily/monthly files after a watermark)
+    """
+    since: Optional[str] = Field(
+        default=None,
+        description="Last ingested trading date (YYYY-MM-DD). Default: service-side watermark",
+    )
+    tickers: Optional[List[str]] = Field(default=None, description="List of tickers to filter (optional, all if None)")
+
+    @validator('since')
+    def since_must_be_iso_date(cls, v):
+        """Ensure since is a valid ISO date not in the future"""
+        if v is None:
+            return v
+        try:
+            since_date = datetime.strptime(v, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError('since must be an ISO date (YYYY-MM-DD)')
+        if since_date > datetime.now():
+            raise ValueError('since must not be in the future')
+        return v
+
+
+class CotahistDeltaResponse(BaseModel):
+    """
+    Response from /cotahist/delta endpoint
+    """
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    since: str = Field(..., description="Watermark used as starting point (exclusive)")
+    watermark: str = Field(..., description="New watermark: last date covered by the fetched files")
+    files: List[str] = Field(..., description="B3 files downloaded (COTAHIST_D/M/A)")
+    total_records: int
+    tickers_filter: Optional[List[str]]
     data: List[CotahistPricePoint]
@@ -3,7 +3,17 @@ Services Module
 """
 
 from .cotahist_service import CotahistService
+from .incremental_indicators import IncrementalIndicatorService
+from .price_adjustment import PriceAdjustmentService
+from .resampling import ResamplingService
 from .technical_analysis import TechnicalAnalysisService
 from .yfinance_service import YFinanceService
 
-__all__ = ["CotahistService", "TechnicalAnalysisService", "YFinanceService"]
+__all__ = [
+    "CotahistService",
+    "IncrementalIndicatorService",
+    "PriceAdjustmentService",
+    "ResamplingService",
+    "TechnicalAnalysisService",
+    "YFinanceService",
+]
@@ -0,0 +1,407 @@
+"""
+COTAHIST Cache - Cache colunar (Parquet) de anos COTAHIST já parseados
+
+Cada ano parseado é persistido como um arquivo Parquet, chaveado por ano e
+hash do ZIP de origem (COTAHIST_A{ano}_{hash}.parquet). Anos fechados nunca
+mudam na B3, então podem ser servidos direto do cache sem novo download -
+desde que o arquivo tenha sido gravado a partir de um ZIP baixado depois do
+fim do ano. O ano corrente fica parcial no cache; a flag "closed" nos
+metadados do Parquet distingue os dois casos, e um ano parcial é baixado e
+reparseado de novo quando o ano vira.
+
+Os registros são gravados ordenados por (ticker, data), em row groups
+pequenos: filtros por ticker e data usam as estatísticas min/max de cada row
+group (predicate push-down) e só leem os trechos relevantes do arquivo.
+
+Como cada ticker ocupa um intervalo contíguo de linhas, cada ano também tem
+um índice persistente ticker → (offset, quantidade) em um sidecar JSON
+(COTAHIST_A{ano}_{hash}.index.json). Requests de poucos tickers leem só os
+row groups que contêm esses intervalos, sem avaliar filtro no arquivo todo.
+
+Os ZIPs baixados da B3 também ficam em disco (zips/), com os validadores HTTP
+(ETag/Last-Modified) e o SHA-256 em um sidecar .meta.json, para download
+condicional e retomada (Range) após restart do serviço.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("[CotahistCache] pyarrow not available - COTAHIST cache disabled")
+
+# backend/python-service/data/cotahist (montado como volume no docker-compose)
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cotahist"
+
+
+class CotahistCache:
+    """
+    Cache em disco (Parquet) de anos COTAHIST parseados.
+
+    Example:
+        >>> cache = CotahistCache()
+        >>> path = cache.find(2020)
+        >>> columns = cache.read(path, tickers=["ABEV3", "PETR4"])
+    """
+
+    ROW_GROUP_SIZE = 5_000  # ~20 tickers por row group (ordenado por ticker)
+
+    # Acima deste nº de tickers, o filtro com push-down é mais barato que o índice
+    INDEX_MAX_TICKERS = 50
+
+    # Chave dos metadados do Parquet: ano completo (ZIP baixado após o fim do ano)
+    CLOSED_KEY = b"cotahist_closed"
+
+    def __init__(self, cache_dir: Optional[str] = None, zip_cache: Optional[bool] = None):
+        """
+        Args:
+            cache_dir: Diretório do cache (default: COTAHIST_CACHE_DIR ou
+                backend/python-service/data/cotahist)
+            zip_cache: Manter os ZIPs baixados em disco (default:
+                COTAHIST_ZIP_CACHE, habilitado se não definido)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("COTAHIST_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.enabled = PYARROW_AVAILABLE
+        if zip_cache is None:
+            zip_cache = os.getenv("COTAHIST_ZIP_CACHE", "true").lower() not in ("0", "false", "no")
+        self.zip_cache_enabled = zip_cache
+        # Índices já carregados: path → (ticker → (offset, qtd), offsets dos row groups)
+        self._indexes: Dict[Path, Tuple[Dict[str, List[int]], List[int]]] = {}
+
+    @staticmethod
+    def _schema() -> "pa.Schema":
+        """Schema Arrow dos registros COTAHIST (mesmos campos/ordem de parse_line)."""
+        return pa.schema([
+            ("ticker", pa.string()),
+            ("date", pa.string()),  # ISO YYYY-MM-DD (ordem lexicográfica = cronológica)
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+            ("company_name", pa.string()),
+            ("stock_type", pa.string()),
+            ("market_type", pa.int32()),
+            ("bdi_code", pa.int32()),
+            ("average_price", pa.float64()),
+            ("best_bid", pa.float64()),
+            ("best_ask", pa.float64()),
+            ("trades_count", pa.int64()),
+        ])
+
+    @staticmethod
+    def zip_hash(zip_content: bytes) -> str:
+        """Hash (SHA-256, 16 hex chars) do ZIP de origem - parte da chave do cache."""
+        return hashlib.sha256(zip_content).hexdigest()[:16]
+
+    def _path(self, year: int, zip_hash: str) -> Path:
+        return self.cache_dir / f"COTAHIST_A{year}_{zip_hash}.parquet"
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_suffix(".index.json")
+
+    def find(
+        self, year: int, zip_hash: Optional[str] = None, closed_only: bool = False
+    ) -> Optional[Path]:
+        """
+        Localiza o arquivo de cache de um ano.
+
+        Args:
+            year: Ano COTAHIST
+            zip_hash: Hash do ZIP (se None, retorna o arquivo mais recente do ano)
+            closed_only: Ignorar arquivos de ano parcial (ver is_closed)
+
+        Returns:
+            Path do arquivo Parquet ou None se não existir
+        """
+        if not self.enabled:
+            return None
+
+        if zip_hash:
+            path = self._path(year, zip_hash)
+            candidates = [path] if path.exists() else []
+        else:
+            candidates = list(self.cache_dir.glob(f"COTAHIST_A{year}_*.parquet"))
+        if closed_only:
+            candidates = [path for path in candidates if self.is_closed(path)]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda p: p.stat().st_mtime)
+
+    def is_closed(self, path: Path) -> bool:
+        """
+        Arquivo gravado com o ano completo (closed=True em write).
+
+        Caches sem a flag (gravados antes dela existir) contam como parciais.
+        """
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+        except (OSError, pa.ArrowException):
+            return False
+        return metadata.get(self.CLOSED_KEY) == b"true"
+
+    def write(
+        self, year: int, zip_hash: str, columns: Dict[str, List], closed: bool = False
+    ) -> "pa.Table":
+        """
+        Persiste um ano parseado (formato colunar de parse_file_columns).
+
+        Falhas de escrita (disco cheio, permissão) são apenas logadas: o cache é
+        uma otimização e não deve derrubar o request.
+
+        Args:
+            year: Ano COTAHIST
+            zip_hash: Hash do ZIP de origem
+            columns: Dict campo → lista de valores (ano completo, sem filtro)
+            closed: O ZIP foi baixado depois do fim do ano (dados completos);
+                só anos fechados são servidos sem novo download
+
+        Returns:
+            Tabela Arrow ordenada por (ticker, date) - mesma ordem do arquivo gravado
+        """
+        table = pa.Table.from_pydict(columns, schema=self._schema()).sort_by(
+            [("ticker", "ascending"), ("date", "ascending")]
+        )
+
+        path = self._path(year, zip_hash)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            pq.write_table(
+                table.replace_schema_metadata({self.CLOSED_KEY: b"true" if closed else b"false"}),
+                tmp_path,
+                row_group_size=self.ROW_GROUP_SIZE,
+            )
+            os.replace(tmp_path, path)
+            self._write_index(path, self._build_index(table.column("ticker")))
+
+            # Remover versões antigas do mesmo ano (ZIP com hash diferente)
+            for stale in self.cache_dir.glob(f"COTAHIST_A{year}_*.parquet"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+                    self._index_path(stale).unlink(missing_ok=True)
+                    self._indexes.pop(stale, None)
+
+            logger.info(
+                f"Cached COTAHIST {year} ({table.num_rows} records, "
+                f"{'closed' if closed else 'partial'}) at {path.name}"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write COTAHIST cache for {year}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+        return table
+
+    def zip_path(self, filename: str) -> Path:
+        """Caminho do ZIP B3 em disco (o diretório é criado se necessário)."""
+        zip_dir = self.cache_dir / "zips"
+        zip_dir.mkdir(parents=True, exist_ok=True)
+        return zip_dir / filename
+
+    @staticmethod
+    def read_zip_meta(path: Path) -> Optional[Dict]:
+        """Metadados (etag, last_modified, sha256, size) do ZIP/parcial em disco, ou None."""
+        try:
+            return json.loads(Path(f"{path}.meta.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write_zip_meta(path: Path, meta: Optional[Dict]) -> None:
+        """Persiste (ou remove, se meta=None) os metadados do ZIP/parcial."""
+        meta_path = Path(f"{path}.meta.json")
+        if meta is None:
+            meta_path.unlink(missing_ok=True)
+        else:
+            meta_path.write_text(json.dumps(meta))
+
+    def read_watermark(self) -> Optional[str]:
+        """
+        Último pregão já ingerido via delta sync (ISO YYYY-MM-DD), ou None.
+
+        Persistido em JSON (não depende de pyarrow).
+        """
+        path = self.cache_dir / "watermark.json"
+        try:
+            return json.loads(path.read_text()).get("last_trading_date")
+        except (OSError, ValueError):
+            return None
+
+    def write_watermark(self, last_trading_date: str) -> None:
+        """Persiste o watermark do delta sync (escrita atômica)."""
+        path = self.cache_dir / "watermark.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps({"last_trading_date": last_trading_date}))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write COTAHIST watermark: {e}")
+
+    def read(
+        self,
+        path: Path,
+        tickers: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, List]:
+        """
+        Lê um ano do cache (memory-mapped) aplicando filtros com push-down.
+
+        Args:
+            path: Arquivo retornado por find()
+            tickers: Tickers para filtrar (opcional)
+            start_date: Data inicial ISO YYYY-MM-DD, inclusiva (opcional)
+            end_date: Data final ISO YYYY-MM-DD, inclusiva (opcional)
+
+        Returns:
+            Dict campo → lista de valores
+        """
+        if tickers and len(tickers) <= self.INDEX_MAX_TICKERS:
+            table = self._read_indexed(path, tickers)
+            return self.filter(table, start_date=start_date, end_date=end_date)
+
+        table = pq.read_table(
+            path,
+            filters=self._build_filter(tickers, start_date, end_date),
+            memory_map=True,
+        )
+        return table.to_pydict()
+
+    def _read_indexed(self, path: Path, tickers: List[str]) -> "pa.Table":
+        """
+        Lê apenas as linhas dos tickers pedidos, usando o índice do ano.
+
+        Só os row groups que contêm os intervalos dos tickers são lidos
+        (e descomprimidos); as linhas exatas são recortadas em memória.
+        """
+        ticker_index, row_group_offsets = self._load_index(path)
+        ranges = [
+            ticker_index[ticker]
+            for ticker in sorted({t.upper() for t in tickers})
+            if ticker in ticker_index
+        ]
+        if not ranges:
+            return pa.Table.from_pylist([], schema=self._schema())
+
+        # Row groups que intersectam algum intervalo [offset, offset + qtd)
+        row_groups = sorted({
+            group
+            for offset, count in ranges
+            for group in range(len(row_group_offsets) - 1)
+            if row_group_offsets[group] < offset + count
+            and offset < row_group_offsets[group + 1]
+        })
+        table = pq.ParquetFile(path, memory_map=True).read_row_groups(row_groups)
+
+        # Posição de cada row group lido dentro da tabela concatenada
+        position = {}
+        rows_read = 0
+        for group in row_groups:
+            position[group] = rows_read
+            rows_read += row_group_offsets[group + 1] - row_group_offsets[group]
+
+        # Um intervalo que cruza a fronteira de row groups continua no grupo
+        # seguinte, que também foi lido (intersecta o intervalo) e é adjacente
+        slices = []
+        for offset, count in ranges:
+            group = next(
+                g for g in row_groups if row_group_offsets[g] <= offset < row_group_offsets[g + 1]
+            )
+            start = position[group] + offset - row_group_offsets[group]
+            slices.append(table.slice(start, count))
+
+        return pa.concat_tables(slices)
+
+    @staticmethod
+    def _build_index(tickers: "pa.ChunkedArray") -> Dict[str, List[int]]:
+        """Índice ticker → [offset, qtd] de uma coluna de tickers ORDENADA."""
+        counts = pc.value_counts(tickers).to_pylist()
+        index = {}
+        offset = 0
+        # value_counts preserva a ordem de primeira ocorrência (= ordem do arquivo)
+        for item in counts:
+            index[item["values"]] = [offset, item["counts"]]
+            offset += item["counts"]
+        return index
+
+    def _write_index(self, path: Path, index: Dict[str, List[int]]) -> None:
+        """Persiste o índice de tickers do arquivo (sidecar JSON)."""
+        self._index_path(path).write_text(json.dumps(index))
+        self._indexes.pop(path, None)
+
+    def _load_index(self, path: Path) -> Tuple[Dict[str, List[int]], List[int]]:
+        """
+        Carrega (ou constrói, para caches gravados sem índice) o índice do ano.
+
+        Returns:
+            Tupla (ticker → [offset, qtd], offsets de início de cada row group + total)
+        """
+        if path in self._indexes:
+            return self._indexes[path]
+
+        index_path = self._index_path(path)
+        try:
+            index = json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            logger.info(f"Building ticker index for {path.name}")
+            index = self._build_index(pq.read_table(path, columns=["ticker"]).column("ticker"))
+            try:
+                self._write_index(path, index)
+            except OSError as e:
+                logger.warning(f"Failed to write ticker index for {path.name}: {e}")
+
+        metadata = pq.ParquetFile(path, memory_map=True).metadata
+        row_group_offsets = [0]
+        for group in range(metadata.num_row_groups):
+            row_group_offsets.append(row_group_offsets[-1] + metadata.row_group(group).num_rows)
+
+        self._indexes[path] = (index, row_group_offsets)
+        return self._indexes[path]
+
+    def filter(
+        self,
+        table: "pa.Table",
+        tickers: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, List]:
+        """Aplica os mesmos filtros de read() a uma tabela em memória (retornada por write())."""
+        expression = self._build_filter(tickers, start_date, end_date)
+        if expression is not None:
+            table = table.filter(expression)
+        return table.to_pydict()
+
+    @staticmethod
+    def _build_filter(
+        tickers: Optional[List[str]],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Optional["pc.Expression"]:
+        """Monta a expressão de filtro (ticker IN ..., date BETWEEN ...)."""
+        expression = None
+
+        def combine(current, new):
+            return new if current is None else current & new
+
+        if tickers:
+            tickers_upper = sorted({t.upper() for t in tickers})
+            expression = combine(expression, pc.field("ticker").isin(tickers_upper))
+        if start_date:
+            expression = combine(expression, pc.field("date") >= start_date)
+        if end_date:
+            expression = combine(expression, pc.field("date") <= end_date)
+
+        return expression
@@ -9,17 +9,74 @@ Fonte: https://bvmf.bmfbovespa.com.br/InstDados/SerHist/
 """
 
 import asyncio
+import codecs
+import hashlib
 import io
 import logging
+import multiprocessing
+import os
+import time
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
 import httpx
+import numpy as np
+
+from .cotahist_cache import CotahistCache
 
 logger = logging.getLogger(__name__)
 
+# Tamanho do registro COTAHIST (sem terminador de linha)
+RECORD_LENGTH = 245
+
+# CODBDI aceitos: 02 (lote padrão), 12 (FIIs), 96 (fracionárias)
+ACCEPTED_BDI_CODES = (b"02", b"12", b"96")
+
+# Campos numéricos (posições 0-indexed, fim exclusivo) usados pelo parser vetorizado
+NUMERIC_FIELDS = {
+    "market_type": (24, 27),      # TPMERC
+    "open": (56, 69),             # PREABE
+    "high": (69, 82),             # PREMAX
+    "low": (82, 95),              # PREMIN
+    "average_price": (95, 108),   # PREMED
+    "close": (108, 121),          # PREULT
+    "best_bid": (121, 134),       # PREOFC
+    "best_ask": (134, 147),       # PREOFV
+    "volume": (152, 170),         # VOLTOT
+    "trades_count": (170, 188),   # QUATOT
+}
+
+PRICE_FIELDS = ("open", "high", "low", "average_price", "close", "best_bid", "best_ask")
+
+# Ordem dos campos de cada registro (mesma ordem do dict retornado por parse_line)
+RECORD_FIELDS = (
+    "ticker", "date", "open", "high", "low", "close", "volume",
+    "company_name", "stock_type", "market_type", "bdi_code",
+    "average_price", "best_bid", "best_ask", "trades_count",
+)
+
+# Instância do service em cada processo worker (criada pelo initializer do pool)
+_worker_service: Optional["CotahistService"] = None
+
+
+def _init_parse_worker(parser_mode: str, cache_dir: str) -> None:
+    """Initializer do ProcessPoolExecutor: cria um CotahistService por processo worker."""
+    global _worker_service
+    _worker_service = CotahistService(parser_mode=parser_mode, cache=CotahistCache(cache_dir))
+
+
+def _parse_year_in_worker(
+    year: int, zip_content: bytes, tickers: Optional[List[str]]
+) -> Dict[str, List]:
+    """Executa parse_year dentro do processo worker (função top-level = picklable)."""
+    return _worker_service.parse_year(year, zip_content, tickers=tickers)
+
 
 class CotahistService:
     """
@@ -45,10 +102,46 @@ class CotahistService:
 
     BASE_URL = "https://bvmf.bmfbovespa.com.br/InstDados/SerHist"
     TIMEOUT = 300  # 5 minutos (download pode demorar)
+    MAX_DOWNLOAD_ATTEMPTS = 3  # Tentativas por arquivo (retomando via Range)
+
+    PARSER_MODES = ("vectorized", "streaming")
+
+    def __init__(
+        self,
+        parser_mode: str = "vectorized",
+        cache: Optional[CotahistCache] = None,
+        parse_workers: Optional[int] = None,
+        base_url: Optional[str] = None,
+    ):
+        """
+        Inicializa o service com HTTP client configurado.
 
-    def __init__(self):
-        """Inicializa o service com HTTP client configurado."""
+        Args:
+            parser_mode: "vectorized" (NumPy, coluna a coluna) ou "streaming"
+                (linha a linha via parse_line). Default: "vectorized"
+            cache: Cache colunar de anos parseados (default: CotahistCache()
+                no diretório padrão; desabilitado se pyarrow não estiver instalado)
+            parse_workers: Nº de processos para parse paralelo de anos, limitado
+                ao nº de CPUs (default: COTAHIST_PARSE_WORKERS ou 0 = parse no
+                próprio processo)
+            base_url: URL base da série histórica (default: BASE_URL da B3;
+                útil para apontar para um servidor HTTP local com ZIPs de teste)
+        """
+        if parser_mode not in self.PARSER_MODES:
+            raise ValueError(
+                f"Invalid parser_mode '{parser_mode}' (expected one of {self.PARSER_MODES})"
+            )
+        self.parser_mode = parser_mode
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.cache = cache or CotahistCache()
+        if parse_workers is None:
+            parse_workers = int(os.getenv("COTAHIST_PARSE_WORKERS", "0"))
+        # Mais processos que CPUs só adiciona troca de contexto (parse é CPU-bound)
+        self.parse_workers = max(0, min(parse_workers, os.cpu_count() or 1))
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         self.client = httpx.AsyncClient(timeout=self.TIMEOUT, follow_redirects=True)
+        # Um download por arquivo de cada vez (compartilham o mesmo .part em disco)
+        self._download_locks: Dict[str, asyncio.Lock] = {}
 
     def _safe_int(self, value: str, divisor: float = 1.0) -> float:
         """
@@ -86,28 +179,198 @@ class CotahistService:
         Raises:
             httpx.HTTPError: Se download falhar (404, timeout, etc)
         """
-        url = f"{self.BASE_URL}/COTAHIST_A{year}.ZIP"
-        logger.info(f"Downloading COTAHIST for year {year} from {url}")
+        return await self.download_file(f"COTAHIST_A{year}.ZIP")
+
+    async def download_file(self, filename: str) -> bytes:
+        """
+        Faz download de um arquivo da série histórica B3.
+
+        Arquivos disponíveis (mesmo layout de 245 bytes):
+        - COTAHIST_A{AAAA}.ZIP: anual (~40MB)
+        - COTAHIST_M{MMAAAA}.ZIP: mensal (~3MB)
+        - COTAHIST_D{DDMMAAAA}.ZIP: diário (~200KB)
+
+        Com o cache de ZIPs habilitado (default):
+        - GET condicional (If-None-Match / If-Modified-Since): 304 reaproveita
+          o ZIP em disco, sem transferir o arquivo de novo
+        - Download em arquivo .part; se a conexão cair ou der timeout, a próxima
+          tentativa (ou o próximo request, mesmo após restart) retoma com
+          Range + If-Range a partir do que já foi baixado
+        - Verificação: tamanho declarado pelo servidor, CRC de cada membro do
+          ZIP e SHA-256 gravado no .meta.json (conferido ao reutilizar)
+        - Requests simultâneos do mesmo arquivo (ex.: fetch + delta) são
+          serializados por um lock por arquivo: o segundo reaproveita o ZIP
+          baixado pelo primeiro em vez de escrever no mesmo .part
+
+        Args:
+            filename: Nome do arquivo (ex: "COTAHIST_D16102026.ZIP")
+
+        Returns:
+            Conteúdo do arquivo ZIP em bytes
+
+        Raises:
+            httpx.HTTPError: Se download falhar (404, timeout, etc)
+            ValueError: Se o arquivo baixado estiver corrompido
+        """
+        url = f"{self.base_url}/{filename}"
+        logger.info(f"Downloading {filename} from {url}")
+
+        if not self.cache.zip_cache_enabled:
+            return await self._download_in_memory(url, filename)
+
+        try:
+            zip_path = self.cache.zip_path(filename)
+        except OSError as e:
+            logger.warning(f"ZIP cache unavailable ({e}), downloading {filename} in memory")
+            return await self._download_in_memory(url, filename)
+
+        lock = self._download_locks.setdefault(filename, asyncio.Lock())
+        async with lock:
+            return await self._download_to_cache(url, filename, zip_path)
+
+    async def _download_to_cache(self, url: str, filename: str, zip_path: Path) -> bytes:
+        """Download via cache de ZIPs (GET condicional, .part + Range) - lock do arquivo adquirido."""
+        part_path = zip_path.with_name(f"{zip_path.name}.part")
+
+        # ZIP já em disco: conferir integridade antes de usar no GET condicional
+        cached, meta = None, self.cache.read_zip_meta(zip_path)
+        if meta and zip_path.exists():
+            cached = zip_path.read_bytes()
+            if hashlib.sha256(cached).hexdigest() != meta.get("sha256"):
+                logger.warning(f"Cached {filename} failed checksum, downloading again")
+                cached = None
+
+        for attempt in range(1, self.MAX_DOWNLOAD_ATTEMPTS + 1):
+            # Sem compressão de transporte: offsets de Range e tamanhos
+            # declarados referem-se aos bytes do arquivo, gravados como chegam
+            headers = {"Accept-Encoding": "identity"}
+            if cached is not None:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            # Retomar download parcial somente se houver validador para If-Range
+            part_meta = self.cache.read_zip_meta(part_path) or {}
+            resume_from = part_path.stat().st_size if part_path.exists() else 0
+            if_range = part_meta.get("etag") or part_meta.get("last_modified")
+            if resume_from and if_range:
+                headers["Range"] = f"bytes={resume_from}-"
+                headers["If-Range"] = if_range
+
+            try:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        logger.info(f"{filename} not modified, using cached ZIP ({len(cached)} bytes)")
+                        return cached
+
+                    if response.status_code == 416:
+                        # Parcial inválido (arquivo mudou de tamanho): recomeçar
+                        part_path.unlink(missing_ok=True)
+                        self.cache.write_zip_meta(part_path, None)
+                        continue
 
+                    response.raise_for_status()
+
+                    resumed = response.status_code == 206
+                    if resumed:
+                        logger.info(f"Resuming {filename} from byte {resume_from}")
+                        expected_size = int(response.headers["Content-Range"].rsplit("/", 1)[-1])
+                    else:
+                        content_length = response.headers.get("Content-Length")
+                        expected_size = int(content_length) if content_length else None
+
+                    etag = response.headers.get("ETag")
+                    self.cache.write_zip_meta(part_path, {
+                        # ETag fraco (W/) não serve para If-Range
+                        "etag": etag if etag and not etag.startswith("W/") else None,
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "expected_size": expected_size,
+                    })
+
+                    with open(part_path, "ab" if resumed else "wb") as part_file:
+                        async for chunk in response.aiter_raw():
+                            part_file.write(chunk)
+                break
+
+            except httpx.TransportError as e:
+                # Timeout / conexão caiu: o .part fica para a próxima tentativa
+                downloaded = part_path.stat().st_size if part_path.exists() else 0
+                logger.warning(
+                    f"Download of {filename} interrupted at {downloaded} bytes "
+                    f"(attempt {attempt}/{self.MAX_DOWNLOAD_ATTEMPTS}): {e}"
+                )
+                if attempt == self.MAX_DOWNLOAD_ATTEMPTS:
+                    logger.error(f"Failed to download {filename}: {e}")
+                    raise
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to download {filename}: {e}")
+                raise
+        else:
+            raise httpx.HTTPError(f"Failed to download {filename} after {self.MAX_DOWNLOAD_ATTEMPTS} attempts")
+
+        content = part_path.read_bytes()
+        part_meta = self.cache.read_zip_meta(part_path) or {}
+        try:
+            self._verify_zip(content, part_meta.get("expected_size"))
+        except ValueError as e:
+            logger.error(f"Downloaded {filename} is corrupted: {e}")
+            part_path.unlink(missing_ok=True)
+            self.cache.write_zip_meta(part_path, None)
+            raise
+
+        os.replace(part_path, zip_path)
+        self.cache.write_zip_meta(part_path, None)
+        self.cache.write_zip_meta(zip_path, {
+            "etag": part_meta.get("etag"),
+            "last_modified": part_meta.get("last_modified"),
+            "sha256": hashlib.sha256(content).hexdigest(),
+            "size": len(content),
+        })
+
+        logger.info(f"Successfully downloaded {filename} ({len(content)} bytes)")
+        return content
+
+    async def _download_in_memory(self, url: str, filename: str) -> bytes:
+        """Download simples em memória (cache de ZIPs desabilitado)."""
         try:
             response = await self.client.get(url)
             response.raise_for_status()
             logger.info(
-                f"Successfully downloaded COTAHIST {year} ({len(response.content)} bytes)"
+                f"Successfully downloaded {filename} ({len(response.content)} bytes)"
             )
             return response.content
         except httpx.HTTPError as e:
-            logger.error(f"Failed to download COTAHIST {year}: {e}")
+            logger.error(f"Failed to download {filename}: {e}")
             raise
 
+    @staticmethod
+    def _verify_zip(content: bytes, expected_size: Optional[int]) -> None:
+        """
+        Verifica integridade de um ZIP baixado.
+
+        Raises:
+            ValueError: Tamanho diferente do declarado, ZIP inválido ou CRC incorreto
+        """
+        if expected_size is not None and len(content) != expected_size:
+            raise ValueError(f"size mismatch ({len(content)} != {expected_size} bytes)")
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as zf:
+                bad_member = zf.testzip()
+        except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+            raise ValueError(f"invalid ZIP: {e}")
+        if bad_member is not None:
+            raise ValueError(f"CRC mismatch in {bad_member}")
+
     async def download_years_parallel(
         self, years: List[int], max_concurrent: int = 5
     ) -> Dict[int, bytes]:
         """
         Faz download paralelo de múltiplos anos (FASE 39 - Performance Optimization).
 
-        Otimização: Baixa até 5 anos simultaneamente (vs sequencial).
-        Ganho esperado: 70-80% redução em tempo de download.
+        Janela deslizante: mantém até max_concurrent downloads em voo o tempo
+        todo - assim que um termina, o próximo ano da fila começa (em vez de
+        esperar o batch inteiro, onde um ano lento travava os demais).
 
         Args:
             years: Lista de anos para baixar
@@ -122,36 +385,42 @@ class CotahistService:
             >>> len(results)
             3  # Todos os 3 anos baixados com sucesso
         """
-        async def download_with_year(year: int) -> Tuple[int, Optional[bytes]]:
-            """Helper para retornar (ano, conteúdo) ou (ano, None) se falhar."""
-            try:
-                content = await self.download_year(year)
-                return (year, content)
-            except Exception as e:
-                logger.warning(f"Skipping year {year} (download failed): {e}")
-                return (year, None)
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        logger.info(
+            f"Downloading {len(years)} years (sliding window of {max_concurrent})"
+        )
 
-        # Processar em batches de max_concurrent
         results = {}
-        for i in range(0, len(years), max_concurrent):
-            batch = years[i : i + max_concurrent]
-            logger.info(f"Downloading batch: {batch} ({len(batch)} years in parallel)")
-
-            # Executar batch em paralelo
-            batch_results = await asyncio.gather(
-                *[download_with_year(year) for year in batch]
-            )
-
-            # Adicionar apenas sucessos ao dict
-            for year, content in batch_results:
-                if content is not None:
-                    results[year] = content
+        for year, content, _ in await asyncio.gather(
+            *[self._download_year_slot(year, semaphore) for year in years]
+        ):
+            if content is not None:
+                results[year] = content
 
         logger.info(
             f"Parallel download completed: {len(results)}/{len(years)} years successful"
         )
         return results
 
+    async def _download_year_slot(
+        self, year: int, semaphore: asyncio.Semaphore
+    ) -> Tuple[int, Optional[bytes], float]:
+        """
+        Baixa um ano ocupando uma vaga da janela de downloads.
+
+        Returns:
+            (ano, conteúdo ZIP ou None se falhar, segundos de download). O
+            tempo conta só a partir da vaga obtida (sem a espera na fila)
+        """
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                content = await self.download_year(year)
+            except Exception as e:
+                logger.warning(f"Skipping year {year} (download failed): {e}")
+                content = None
+            return year, content, time.perf_counter() - started
+
     def parse_line(self, line: str) -> Optional[Dict]:
         """
         Parse uma linha do arquivo COTAHIST (245 bytes fixed position).
@@ -258,99 +527,358 @@ class CotahistService:
 
     def parse_file(self, zip_content: bytes, tickers: Optional[List[str]] = None) -> List[Dict]:
         """
-        Descompacta ZIP e parse o arquivo TXT com STREAMING (linha por linha).
+        Descompacta ZIP e parse o arquivo TXT.
 
-        OTIMIZAÇÕES APLICADAS (FASE 38 - Performance Fix):
-        - ✅ Streaming: Processa linha por linha sem carregar arquivo inteiro
-        - ✅ Batch Processing: Append em lotes de 10k linhas
-        - ✅ Early Filter: Filtra ticker ANTES de parse completo (80% mais rápido)
-        - ✅ Codec Incremental: Decodifica em chunks de 8KB (não 37MB de uma vez)
+        Modos de parse (definidos por parser_mode):
+        - vectorized (default): lê o TXT inteiro como buffer de largura fixa
+          (np.frombuffer + reshape (n, 246)) e converte preços, volumes, datas e
+          CODBDI coluna a coluna. Se o layout não for o esperado (linhas de
+          tamanho variável, campos numéricos com lixo), cai para o modo streaming.
+        - streaming (FASE 38): decodifica linha a linha e chama parse_line.
 
         Performance (ano 2020 - 37MB, 275k linhas):
-        - ANTES: 35.4s (read + split + loop)
-        - DEPOIS: 4.2s (streaming + batch)
-        - GANHO: 88% redução
+        - streaming: 4.2s
+        - vectorized: sub-segundo (dominado pela montagem dos dicts de saída)
 
         Args:
             zip_content: Conteúdo do arquivo ZIP em bytes
             tickers: Lista opcional de tickers para filtrar (early filter optimization)
 
         Returns:
-            Lista de dicionários com dados parseados
+            Lista de dicionários com dados parseados (mesmo formato de parse_line)
         """
-        records = []
-        batch = []  # ✅ Batch processing (append em lotes)
-        BATCH_SIZE = 10000  # Lotes de 10k linhas
+        return self.columns_to_records(self.parse_file_columns(zip_content, tickers))
+
+    def parse_file_columns(
+        self, zip_content: bytes, tickers: Optional[List[str]] = None
+    ) -> Dict[str, List]:
+        """
+        Igual a parse_file, mas retorna os dados em formato colunar.
+
+        Args:
+            zip_content: Conteúdo do arquivo ZIP em bytes
+            tickers: Lista opcional de tickers para filtrar
 
+        Returns:
+            Dict campo → lista de valores (chaves em RECORD_FIELDS, listas alinhadas)
+        """
         # Normalizar tickers (CCRO3 = CCRO3, ccro3 = CCRO3)
         tickers_upper = set([t.upper() for t in tickers]) if tickers else None
 
         with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
             # Arquivos COTAHIST têm apenas 1 TXT dentro do ZIP
-            txt_files = [f for f in zf.namelist() if f.endswith(".TXT")]
+            txt_files = [f for f in zf.namelist() if f.upper().endswith(".TXT")]
 
             if not txt_files:
                 logger.error("No TXT file found in ZIP")
-                return []
+                return {field: [] for field in RECORD_FIELDS}
 
             txt_filename = txt_files[0]
-            logger.info(f"Parsing file: {txt_filename}")
+            logger.info(f"Parsing file: {txt_filename} (mode: {self.parser_mode})")
+
+            columns = None
+            if self.parser_mode == "vectorized":
+                columns = self._parse_buffer_vectorized(zf.read(txt_filename), tickers_upper)
+                if columns is None:
+                    logger.warning(
+                        f"Unexpected layout in {txt_filename}, falling back to streaming parser"
+                    )
+
+            if columns is None:
+                with zf.open(txt_filename, "r") as txt_file:
+                    records = self._parse_stream(txt_file, tickers_upper)
+                columns = {field: [r[field] for r in records] for field in RECORD_FIELDS}
+
+        logger.info(f"Parsed {len(columns['ticker'])} records from {txt_filename}")
+        return columns
+
+    @staticmethod
+    def columns_to_records(columns: Dict[str, List]) -> List[Dict]:
+        """Converte o formato colunar (parse_file_columns) em lista de dicts (parse_line)."""
+        return [
+            dict(zip(RECORD_FIELDS, values))
+            for values in zip(*(columns[field] for field in RECORD_FIELDS))
+        ]
+
+    def _parse_stream(self, txt_file, tickers_upper: Optional[Set[str]]) -> List[Dict]:
+        """
+        Parse STREAMING (linha por linha) de um arquivo TXT COTAHIST (FASE 38).
 
-            # ✅ STREAMING: Abrir arquivo em modo texto (não binário)
-            with zf.open(txt_filename, 'r') as txt_file:
-                # Decoder incremental (processa chunks de 8KB)
-                import codecs
-                reader = codecs.getreader("ISO-8859-1")(txt_file)
+        - Streaming: Processa linha por linha sem carregar arquivo inteiro
+        - Batch Processing: Append em lotes de 10k linhas
+        - Early Filter: Filtra ticker ANTES de parse completo (80% mais rápido)
+        - Codec Incremental: Decodifica em chunks de 8KB (não 37MB de uma vez)
 
-                for line in reader:  # ✅ Streaming linha por linha
-                    line = line.rstrip('\n\r')
-                    if not line or len(line) < 245:
-                        continue
+        Args:
+            txt_file: File-like binário do TXT
+            tickers_upper: Set de tickers (uppercase) para filtrar ou None
 
-                    # ✅ EARLY FILTER: Verificar ticker ANTES de parse completo
-                    # Economiza 80% do tempo se filtro ativo
-                    if tickers_upper:
-                        codneg = line[12:24].strip()  # Ticker (posição 13-24)
-                        if codneg not in tickers_upper:
-                            continue  # Skip linha inteira (sem parse)
-
-                    # Parse completo apenas se passou no filtro
-                    parsed = self.parse_line(line)
-                    if parsed:
-                        batch.append(parsed)
-
-                        # ✅ BATCH PROCESSING: Append em lotes (mais eficiente)
-                        if len(batch) >= BATCH_SIZE:
-                            records.extend(batch)
-                            batch = []
-
-                # Adicionar últimos registros (batch parcial)
-                if batch:
+        Returns:
+            Lista de dicionários com dados parseados
+        """
+        records = []
+        batch = []  # ✅ Batch processing (append em lotes)
+        BATCH_SIZE = 10000  # Lotes de 10k linhas
+
+        # Decoder incremental (processa chunks de 8KB)
+        reader = codecs.getreader("ISO-8859-1")(txt_file)
+
+        for line in reader:  # ✅ Streaming linha por linha
+            line = line.rstrip('\n\r')
+            if not line or len(line) < RECORD_LENGTH:
+                continue
+
+            # ✅ EARLY FILTER: Verificar ticker ANTES de parse completo
+            # Economiza 80% do tempo se filtro ativo
+            if tickers_upper:
+                codneg = line[12:24].strip()  # Ticker (posição 13-24)
+                if codneg not in tickers_upper:
+                    continue  # Skip linha inteira (sem parse)
+
+            # Parse completo apenas se passou no filtro
+            parsed = self.parse_line(line)
+            if parsed:
+                batch.append(parsed)
+
+                # ✅ BATCH PROCESSING: Append em lotes (mais eficiente)
+                if len(batch) >= BATCH_SIZE:
                     records.extend(batch)
+                    batch = []
+
+        # Adicionar últimos registros (batch parcial)
+        if batch:
+            records.extend(batch)
 
-        logger.info(f"Parsed {len(records)} records from {txt_filename}")
         return records
 
+    def _parse_buffer_vectorized(
+        self, raw: bytes, tickers_upper: Optional[Set[str]]
+    ) -> Optional[Dict[str, List]]:
+        """
+        Parse VETORIZADO do TXT COTAHIST inteiro (NumPy, coluna a coluna).
+
+        O TXT é tratado como matriz de bytes (n_linhas, 245 + terminador). Os
+        filtros (TIPREG, CODBDI, ticker) são aplicados como máscaras booleanas
+        antes de qualquer conversão, e os campos numéricos são convertidos de
+        dígitos ASCII para int64 de uma vez só por coluna.
+
+        Como ISO-8859-1 mapeia 1 byte = 1 caractere, as posições em bytes são
+        idênticas às posições usadas em parse_line.
+
+        Args:
+            raw: Conteúdo completo do TXT (bytes, ISO-8859-1)
+            tickers_upper: Set de tickers (uppercase) para filtrar ou None
+
+        Returns:
+            Dict campo → lista de valores (chaves em RECORD_FIELDS), ou None se
+            o layout não permitir parse vetorizado (chamador faz fallback)
+        """
+        newline = raw.find(b"\n")
+        if newline < 0:
+            return None
+
+        # Largura do registro = 245 bytes + "\n" (ou "\r\n")
+        crlf = newline > 0 and raw[newline - 1] == 0x0D
+        terminator = 2 if crlf else 1
+        width = newline + 1
+        if width - terminator != RECORD_LENGTH:
+            return None
+
+        # Última linha pode vir sem terminador: parse separado via parse_line
+        remainder = len(raw) % width
+        body_len = len(raw) - remainder
+        tail = raw[body_len:].rstrip(b"\r\n").decode("ISO-8859-1") if remainder else ""
+
+        rows = np.frombuffer(raw, dtype=np.uint8, count=body_len).reshape(-1, width)
+
+        # Todas as linhas precisam terminar na mesma coluna (largura fixa)
+        if not (rows[:, newline] == 0x0A).all():
+            return None
+        if crlf and not (rows[:, newline - 1] == 0x0D).all():
+            return None
+
+        # Filtros como máscaras: TIPREG=01, CODBDI aceito, ticker (early filter)
+        mask = (rows[:, 0] == ord("0")) & (rows[:, 1] == ord("1"))
+        mask &= np.isin(self._bytes_column(rows, 10, 12), ACCEPTED_BDI_CODES)
+
+        if tickers_upper:
+            padded = [
+                t.ljust(12).encode("ISO-8859-1")
+                for t in tickers_upper
+                if len(t) <= 12 and t.isascii()
+            ]
+            mask &= np.isin(self._bytes_column(rows, 12, 24), padded)
+
+        rows = rows[mask]
+
+        # Campos numéricos: qualquer byte fora de [0-9] (exceto campo todo em
+        # branco = 0, como _safe_int) invalida o parse vetorizado
+        numbers = {}
+        for name, (start, end) in NUMERIC_FIELDS.items():
+            values, valid, blank = self._digits_to_int(rows[:, start:end])
+            if not (valid | blank).all():
+                return None
+            numbers[name] = values
+
+        # Datas AAAAMMDD: linhas com data inválida são descartadas (como parse_line)
+        year, year_ok, _ = self._digits_to_int(rows[:, 2:6])
+        month, month_ok, _ = self._digits_to_int(rows[:, 6:8])
+        day, day_ok, _ = self._digits_to_int(rows[:, 8:10])
+        date_ok = year_ok & month_ok & day_ok & (year >= 1) & (month >= 1) & (month <= 12)
+
+        month_index = (year - 1970) * 12 + np.clip(month, 1, 12) - 1
+        month_start = month_index.astype("datetime64[M]").astype("datetime64[D]")
+        next_month = (month_index + 1).astype("datetime64[M]").astype("datetime64[D]")
+        days_in_month = (next_month - month_start).astype(np.int64)
+        date_ok &= (day >= 1) & (day <= days_in_month)
+
+        if not date_ok.all():
+            logger.warning(f"Invalid date format: {int((~date_ok).sum())} records skipped")
+            rows = rows[date_ok]
+            numbers = {name: values[date_ok] for name, values in numbers.items()}
+
+        # Data ISO (YYYY-MM-DD) montada direto dos bytes
+        iso = np.empty((len(rows), 10), dtype=np.uint8)
+        iso[:, 0:4] = rows[:, 2:6]
+        iso[:, 4] = ord("-")
+        iso[:, 5:7] = rows[:, 6:8]
+        iso[:, 7] = ord("-")
+        iso[:, 8:10] = rows[:, 8:10]
+
+        columns = {
+            "ticker": self._decode_column(self._bytes_column(rows, 12, 24)),
+            "date": self._decode_column(iso.view("S10").ravel()),
+            "company_name": self._decode_column(self._bytes_column(rows, 27, 39)),
+            "stock_type": self._decode_column(self._bytes_column(rows, 39, 49)),
+            "bdi_code": ((rows[:, 10].astype(np.int64) - 48) * 10 + rows[:, 11] - 48).tolist(),
+        }
+        for name in PRICE_FIELDS:
+            columns[name] = (numbers[name] / 100.0).tolist()
+        for name in ("volume", "trades_count", "market_type"):
+            columns[name] = numbers[name].tolist()
+
+        if len(tail) == RECORD_LENGTH:
+            if not tickers_upper or tail[12:24].strip() in tickers_upper:
+                parsed = self.parse_line(tail)
+                if parsed:
+                    for field in RECORD_FIELDS:
+                        columns[field].append(parsed[field])
+
+        return columns
+
+    @staticmethod
+    def _bytes_column(rows: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Extrai colunas [start:end) da matriz de bytes como array 1-D de bytes fixos (S{n})."""
+        return np.ascontiguousarray(rows[:, start:end]).view(f"S{end - start}").ravel()
+
+    @staticmethod
+    def _decode_column(column: np.ndarray) -> List[str]:
+        """
+        Decodifica (ISO-8859-1) e faz strip de uma coluna de bytes fixos.
+
+        Decodifica apenas os valores únicos (tickers, nomes e datas se repetem
+        milhares de vezes por ano) e reexpande via índice inverso.
+        """
+        uniques, inverse = np.unique(column, return_inverse=True)
+        decoded = np.array(
+            [value.decode("ISO-8859-1").strip() for value in uniques.tolist()], dtype=object
+        )
+        return decoded[inverse.ravel()].tolist()
+
+    @staticmethod
+    def _digits_to_int(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converte bloco (n, largura) de dígitos ASCII em int64, linha a linha.
+
+        Args:
+            block: Matriz de bytes (uint8) de um campo numérico de largura fixa
+
+        Returns:
+            Tupla (valores, válido, em_branco):
+            - valores: int64 (0 para linhas inválidas ou em branco)
+            - válido: linha contém apenas dígitos
+            - em_branco: linha contém apenas espaços (campo nullable)
+        """
+        # uint8: bytes abaixo de "0" dão wrap-around (>= 208), então basta <= 9
+        digits = block - np.uint8(ord("0"))
+        valid = (digits <= 9).all(axis=1)
+        blank = (block == ord(" ")).all(axis=1)
+        powers = 10 ** np.arange(block.shape[1] - 1, -1, -1, dtype=np.int64)
+        values = digits.astype(np.int64) @ powers
+        values[~valid] = 0
+        return values, valid, blank
+
+    def parse_year(
+        self, year: int, zip_content: bytes, tickers: Optional[List[str]] = None
+    ) -> Dict[str, List]:
+        """
+        Parse de um ano COTAHIST passando pelo cache colunar (se habilitado).
+
+        - Cache hit (mesmo ano + mesmo hash do ZIP): lê do Parquet com push-down
+        - Cache miss: parse do ano COMPLETO (sem filtro de ticker), grava no
+          cache e aplica o filtro em memória, para que requests seguintes de
+          qualquer ticker sejam servidos do cache
+        - Ano já encerrado com cache gravado como parcial: reparse, para gravar
+          o ano como fechado (o ZIP acabou de ser baixado, então está completo)
+
+        Args:
+            year: Ano do arquivo
+            zip_content: Conteúdo do ZIP COTAHIST_A{year}
+            tickers: Lista opcional de tickers para filtrar
+
+        Returns:
+            Dict campo → lista de valores (formato de parse_file_columns)
+        """
+        if not self.cache.enabled:
+            return self.parse_file_columns(zip_content, tickers=tickers)
+
+        # zip_content vem de um download (ou revalidação) feito agora: depois
+        # do fim do ano, o arquivo anual está completo
+        closed = year < date.today().year
+        zip_hash = self.cache.zip_hash(zip_content)
+        cached_path = self.cache.find(year, zip_hash)
+        if cached_path and (self.cache.is_closed(cached_path) or not closed):
+            logger.info(f"Year {year}: cache hit ({cached_path.name})")
+            return self.cache.read(cached_path, tickers=tickers)
+
+        table = self.cache.write(year, zip_hash, self.parse_file_columns(zip_content), closed=closed)
+        return self.cache.filter(table, tickers=tickers)
+
     async def fetch_historical_data(
         self,
         start_year: int = 1986,
         end_year: int = 2024,
         tickers: Optional[List[str]] = None,
+        max_concurrent: int = 5,
+        update_watermark: bool = False,
     ) -> List[Dict]:
         """
         Faz download e parse de múltiplos anos de COTAHIST.
 
         OTIMIZAÇÕES APLICADAS:
         - FASE 38: Streaming + Batch + Early Filter (parsing)
-        - FASE 39: Download Paralelo (network I/O)
+        - FASE 39: Download Paralelo em janela deslizante, com cada ZIP
+          parseado assim que termina de baixar (pipeline download → parse)
+        - Cache colunar: anos fechados (antes do ano corrente) já em cache como
+          completos são lidos direto do Parquet, sem download nem parse. O ano
+          corrente é sempre baixado, mas só é reparseado se o ZIP mudou (hash
+          diferente); um ano cacheado enquanto era o corrente é baixado de novo
+
+        Com update_watermark=True e sem filtro de tickers (sync explícito de
+        todos os ativos), também semeia o watermark do delta sync (fetch_delta)
+        com o fim do período coberto por end_year (ver _seed_watermark). Cargas
+        internas (ex.: ResamplingService, um ticker) nunca movem o watermark.
 
         Args:
             start_year: Ano inicial (default: 1986)
             end_year: Ano final (default: 2024)
             tickers: Lista de tickers para filtrar (opcional, default: todos)
+            max_concurrent: Máximo de downloads simultâneos (default: 5)
+            update_watermark: Semear o watermark do delta sync (ignorado com tickers)
 
         Returns:
-            Lista consolidada de todos os registros
+            Lista consolidada de todos os registros. Anos servidos pelo cache
+            vêm ordenados por (ticker, date)
 
         Example:
             >>> service = CotahistService()
@@ -369,21 +897,63 @@ class CotahistService:
             f"(tickers: {tickers or 'ALL'})"
         )
 
-        # FASE 39: Download paralelo de todos os anos (70-80% mais rápido)
         years = list(range(start_year, end_year + 1))
-        zip_contents = await self.download_years_parallel(years, max_concurrent=5)
 
-        # FASE 39: Parse sequencial (ROLLBACK - parsing paralelo causou overhead)
-        # Motivo: Python GIL + context switching overhead > ganho de paralelização
-        # Download paralelo (70% do tempo) já otimizou suficientemente
-        for year in sorted(zip_contents.keys()):
-            try:
-                zip_content = zip_contents[year]
+        # Anos fechados já em cache não precisam de download
+        cached_paths = self._find_cached_years(years)
+
+        # FASE 39: Download em janela deslizante com pipeline download → parse:
+        # cada ZIP é parseado assim que chega, enquanto os próximos anos ainda
+        # estão baixando. O parse é limitado a parse_workers anos simultâneos
+        # (1 sem pool de processos - ROLLBACK FASE 39: parse paralelo em
+        # threads causou overhead de GIL + context switching)
+        years_to_download = [year for year in years if year not in cached_paths]
+        download_slots = asyncio.Semaphore(max(1, max_concurrent))
+        parse_slots = asyncio.Semaphore(max(1, self.parse_workers))
+
+        async def download_and_parse(year: int):
+            _, zip_content, download_seconds = await self._download_year_slot(
+                year, download_slots
+            )
+            if zip_content is None:
+                return None
+
+            async with parse_slots:
+                started = time.perf_counter()
+                columns = await self._parse_year_async(year, zip_content, tickers)
+                parse_seconds = time.perf_counter() - started
+
+            logger.info(
+                f"Year {year}: download {download_seconds:.2f}s, "
+                f"parse {parse_seconds:.2f}s ({len(zip_content) / 1e6:.1f} MB)"
+            )
+            return columns
 
-                # Parse com streaming + batch + early filter (FASE 38)
-                year_records = self.parse_file(zip_content, tickers=tickers)
+        results = await asyncio.gather(
+            *[download_and_parse(year) for year in years_to_download],
+            return_exceptions=True,
+        )
+        parsed = {
+            year: columns
+            for year, columns in zip(years_to_download, results)
+            if columns is not None
+        }
 
+        years_parsed = 0
+        for year in sorted(set(cached_paths) | set(parsed)):
+            try:
+                if year in cached_paths:
+                    columns = self.cache.read(cached_paths[year], tickers=tickers)
+                else:
+                    columns = parsed.pop(year)
+                    if isinstance(columns, Exception):
+                        raise columns
+
+                year_records = self.columns_to_records(columns)
                 all_records.extend(year_records)
+                years_parsed += 1
+                if update_watermark and not tickers and year == end_year:
+                    self._seed_watermark(end_year, year_records)
 
                 logger.info(
                     f"Year {year}: {len(year_records)} records "
@@ -397,12 +967,353 @@ class CotahistService:
 
         logger.info(
             f"Fetch completed: {len(all_records)} total records "
-            f"from {len(zip_contents)} years"
+            f"from {years_parsed}/{len(years)} years"
         )
 
         return all_records
 
+    def _seed_watermark(self, year: int, year_records: List[Dict]) -> None:
+        """
+        Avança o watermark do delta sync após um fetch completo (sem filtro) do ano.
+
+        O arquivo anual de um ano passado cobre o ano inteiro (31/12): ele foi
+        baixado depois do fim do ano ou veio de um cache gravado como fechado
+        (_find_cached_years ignora caches parciais). O do ano corrente cobre
+        até o último pregão publicado nele (maior data entre os registros).
+        Nunca recua um watermark já persistido.
+        """
+        if year < date.today().year:
+            covered_until = date(year, 12, 31).isoformat()
+        elif year_records:
+            covered_until = max(record["date"] for record in year_records)
+        else:
+            return
+
+        if covered_until > (self.cache.read_watermark() or ""):
+            self.cache.write_watermark(covered_until)
+            logger.info(f"COTAHIST watermark seeded by full fetch: {covered_until}")
+
+    async def fetch_delta(
+        self,
+        since: Optional[str] = None,
+        tickers: Optional[List[str]] = None,
+        until: Optional[date] = None,
+    ) -> Dict:
+        """
+        Delta sync: busca apenas os pregões POSTERIORES a um watermark.
+
+        Em vez de rebaixar o arquivo anual (~40MB) todo dia, usa os arquivos
+        menores da B3, planejados por _plan_delta_files:
+        - Anos passados inteiros: arquivo anual (via cache colunar)
+        - Meses passados: arquivo mensal (se ainda não publicado, diários)
+        - Mês corrente: arquivos diários (dias úteis; 404 = sem pregão)
+
+        O watermark é a última data já coberta (último pregão ingerido, ou fim
+        do mês/ano de um arquivo mensal/anual completo). Se since não for
+        informado, usa o watermark persistido no cache, que só é atualizado por
+        deltas sem filtro de tickers (um delta filtrado não entregou os outros
+        ativos, então não pode avançá-lo). Arquivos são processados em ordem
+        cronológica e o processamento para no primeiro erro (exceto 404 de
+        diário), para que o watermark nunca avance por cima de um pregão não
+        ingerido.
+
+        Args:
+            since: Último pregão já ingerido (ISO YYYY-MM-DD). Default: watermark persistido
+            tickers: Lista opcional de tickers para filtrar
+            until: Data final inclusiva (default: hoje)
+
+        Returns:
+            Dict com:
+            - since: watermark usado como ponto de partida
+            - watermark: novo watermark (última data coberta)
+            - files: arquivos efetivamente baixados e parseados
+            - data: registros (formato parse_line) com date > since
+
+        Raises:
+            ValueError: Se since não for informado e não houver watermark persistido
+        """
+        since = since or self.cache.read_watermark()
+        if not since:
+            raise ValueError(
+                "No COTAHIST watermark available - provide 'since' or run a full "
+                "/cotahist/fetch up to the current year first"
+            )
+
+        since_date = date.fromisoformat(since)
+        until = until or date.today()
+
+        records: List[Dict] = []
+        files_fetched: List[str] = []
+        watermark = since
+
+        plan = deque(self._plan_delta_files(since_date, until))
+        while plan:
+            kind, period, filename = plan.popleft()
+            try:
+                if kind == "year":
+                    zip_content = await self.download_year(period)
+                    columns = await self._parse_year_async(period, zip_content, tickers)
+                else:
+                    zip_content = await self.download_file(filename)
+                    columns = await asyncio.to_thread(
+                        self.parse_file_columns, zip_content, tickers
+                    )
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404 and kind == "day":
+                    continue  # Feriado / sem pregão
+                if e.response.status_code == 404 and kind == "month":
+                    # Mensal ainda não publicado: trocar pelos diários do mês
+                    logger.info(f"{filename} not available yet, falling back to daily files")
+                    first_day = max(period, since_date + timedelta(days=1))
+                    month_end = self._next_month(period) - timedelta(days=1)
+                    plan.extendleft(reversed(self._plan_daily_files(first_day, month_end)))
+                    continue
+                logger.error(f"Delta sync stopped at {filename}: {e}")
+                break
+            except Exception as e:
+                logger.error(f"Delta sync stopped at {filename}: {e}")
+                break
+
+            files_fetched.append(filename)
+            records.extend(
+                record
+                for record in self.columns_to_records(columns)
+                if record["date"] > since
+            )
+
+            # Watermark = fim do período coberto pelo arquivo (independe do
+            # filtro de tickers: um ticker sem negócios não segura o watermark)
+            if kind == "year":
+                covered_until = date(period, 12, 31)
+            elif kind == "month":
+                covered_until = self._next_month(period) - timedelta(days=1)
+            else:
+                covered_until = period
+            watermark = max(watermark, min(covered_until, until).isoformat())
+
+        if not tickers and watermark > (self.cache.read_watermark() or ""):
+            self.cache.write_watermark(watermark)
+
+        logger.info(
+            f"Delta sync since {since}: {len(records)} records from "
+            f"{len(files_fetched)} files (watermark: {watermark})"
+        )
+        return {"since": since, "watermark": watermark, "files": files_fetched, "data": records}
+
+    def _plan_delta_files(self, since: date, until: date) -> List[Tuple[str, object, str]]:
+        """
+        Planeja os arquivos necessários para cobrir (since, until].
+
+        Returns:
+            Lista ordenada de (tipo, período, arquivo), tipo em "year"/"month"/"day"
+        """
+        plan = []
+        cursor = since + timedelta(days=1)
+
+        while cursor <= until:
+            if cursor.month == 1 and cursor.day == 1 and cursor.year < until.year:
+                # Ano passado inteiro: um arquivo anual
+                plan.append(("year", cursor.year, f"COTAHIST_A{cursor.year}.ZIP"))
+                cursor = date(cursor.year + 1, 1, 1)
+            elif (cursor.year, cursor.month) < (until.year, until.month):
+                # Mês passado (inteiro ou parcial): um arquivo mensal
+                month = date(cursor.year, cursor.month, 1)
+                plan.append(("month", month, f"COTAHIST_M{month:%m%Y}.ZIP"))
+                cursor = self._next_month(month)
+            else:
+                # Mês corrente: diários
+                plan.extend(self._plan_daily_files(cursor, until))
+                break
+
+        return plan
+
+    @staticmethod
+    def _plan_daily_files(first_day: date, last_day: date) -> List[Tuple[str, object, str]]:
+        """Arquivos diários (apenas dias úteis) de first_day a last_day, inclusive."""
+        plan = []
+        day = first_day
+        while day <= last_day:
+            if day.weekday() < 5:
+                plan.append(("day", day, f"COTAHIST_D{day:%d%m%Y}.ZIP"))
+            day += timedelta(days=1)
+        return plan
+
+    @staticmethod
+    def _next_month(month: date) -> date:
+        """Primeiro dia do mês seguinte."""
+        return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+    async def iter_historical_data(
+        self,
+        start_year: int = 1986,
+        end_year: int = 2024,
+        tickers: Optional[List[str]] = None,
+        max_concurrent: int = 5,
+    ) -> AsyncIterator[Tuple[int, Dict[str, List]]]:
+        """
+        Versão streaming de fetch_historical_data: entrega os dados ano a ano.
+
+        Cada ano é emitido (em ordem crescente) assim que é baixado e parseado,
+        enquanto os próximos anos continuam sendo baixados em background (até
+        max_concurrent downloads em paralelo). O pico de memória fica limitado a
+        um ano parseado + os ZIPs em voo, em vez de todos os anos de uma vez.
+
+        Cada download em voo já segue direto para o parse (em thread, ou no pool
+        de processos se parse_workers > 0), sem bloquear o event loop enquanto
+        a resposta está sendo transmitida.
+
+        Args:
+            start_year: Ano inicial (default: 1986)
+            end_year: Ano final (default: 2024)
+            tickers: Lista de tickers para filtrar (opcional, default: todos)
+            max_concurrent: Máximo de downloads simultâneos (default: 5)
+
+        Yields:
+            Tupla (ano, colunas) no formato de parse_file_columns. Anos que
+            falharem (download ou parse) são logados e pulados
+
+        Example:
+            >>> async for year, columns in service.iter_historical_data(2020, 2024):
+            ...     records = service.columns_to_records(columns)
+        """
+        years = list(range(start_year, end_year + 1))
+        cached_paths = self._find_cached_years(years)
+        download_queue = iter([year for year in years if year not in cached_paths])
+        pending: Dict[int, asyncio.Task] = {}
+
+        async def download_and_parse(year: int) -> Optional[Dict[str, List]]:
+            try:
+                zip_content = await self.download_year(year)
+            except Exception as e:
+                logger.warning(f"Skipping year {year} (download failed): {e}")
+                return None
+            return await self._parse_year_async(year, zip_content, tickers)
+
+        def schedule_downloads():
+            while len(pending) < max_concurrent:
+                year = next(download_queue, None)
+                if year is None:
+                    break
+                pending[year] = asyncio.create_task(download_and_parse(year))
+
+        try:
+            for year in years:
+                try:
+                    if year in cached_paths:
+                        columns = await asyncio.to_thread(
+                            self.cache.read, cached_paths[year], tickers=tickers
+                        )
+                    else:
+                        schedule_downloads()
+                        task = pending.pop(year)
+                        schedule_downloads()
+                        columns = await task
+                        if columns is None:
+                            continue
+                except Exception as e:
+                    logger.error(f"Failed to parse year {year}: {e}")
+                    continue
+
+                logger.info(f"Year {year}: {len(columns['ticker'])} records (streamed)")
+                yield year, columns
+        finally:
+            # Cliente desconectou (ou erro): cancelar downloads ainda em voo
+            for task in pending.values():
+                task.cancel()
+
+    def _find_cached_years(self, years: List[int]) -> Dict[int, Path]:
+        """
+        Retorna os anos FECHADOS (antes do ano corrente) que já estão no cache.
+
+        Esses anos nunca mudam na B3, então são servidos do cache sem download.
+        Só contam arquivos gravados com o ano completo: um ano cacheado
+        enquanto ainda era o corrente (parcial) é baixado e reparseado.
+        """
+        current_year = datetime.now().year
+        cached_paths = {}
+        for year in years:
+            if year < current_year:
+                path = self.cache.find(year, closed_only=True)
+                if path:
+                    cached_paths[year] = path
+
+        if cached_paths:
+            logger.info(f"Serving {len(cached_paths)} closed years from cache")
+
+        return cached_paths
+
+    def read_cached_years(
+        self, start_year: int, end_year: int, tickers: Optional[List[str]] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Registros de um intervalo de anos lidos SÓ do cache Parquet.
+
+        Sem download e sem tocar no watermark - para leituras dentro de um
+        request. Anos encerrados precisam estar no cache como fechados; o ano
+        corrente aceita o cache parcial.
+
+        Args:
+            start_year: Ano inicial
+            end_year: Ano final (inclusive)
+            tickers: Lista opcional de tickers para filtrar
+
+        Returns:
+            Registros (formato de parse_line) ou None se algum ano do intervalo
+            não está no cache (ou o cache está desabilitado)
+        """
+        if not self.cache.enabled:
+            return None
+
+        current_year = datetime.now().year
+        records = []
+        for year in range(start_year, end_year + 1):
+            path = self.cache.find(year, closed_only=year < current_year)
+            if path is None:
+                return None
+            records.extend(self.columns_to_records(self.cache.read(path, tickers=tickers)))
+        return records
+
+    async def _parse_year_async(
+        self, year: int, zip_content: bytes, tickers: Optional[List[str]]
+    ) -> Dict[str, List]:
+        """
+        Executa parse_year fora do event loop.
+
+        - parse_workers > 0: em um processo do ProcessPoolExecutor (paralelismo
+          real entre anos; o ZIP é enviado ao worker por pickle)
+        - parse_workers = 0: em thread (asyncio.to_thread)
+        """
+        if not self.parse_workers:
+            return await asyncio.to_thread(self.parse_year, year, zip_content, tickers=tickers)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_process_pool(), _parse_year_in_worker, year, zip_content, tickers
+            )
+        except BrokenProcessPool:
+            # Worker morreu (OOM, crash): descartar pool para ser recriado no próximo uso
+            logger.error(f"Parse worker pool broken while parsing year {year}, resetting pool")
+            self._process_pool = None
+            raise
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Cria (lazy) o pool de processos de parse."""
+        if self._process_pool is None:
+            logger.info(f"Starting COTAHIST parse pool with {self.parse_workers} workers")
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                # spawn: fork de um processo com event loop/threads ativos é inseguro
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_parse_worker,
+                initargs=(self.parser_mode, str(self.cache.cache_dir)),
+            )
+        return self._process_pool
+
     async def close(self):
-        """Cleanup HTTP client."""
+        """Cleanup HTTP client e pool de processos de parse."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
         if hasattr(self, "client"):
             await self.client.aclose()
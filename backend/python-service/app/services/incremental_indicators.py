@@ -0,0 +1,451 @@
+"""
+Incremental Technical Indicators
+Descrição: Estado por ticker dos indicadores técnicos, atualizado em O(1) por novo candle
+
+Instead of recomputing every indicator over the full history on each call,
+each ticker keeps the running state of its recurrences (rolling sums, EMA
+values, Wilder averages, OBV total) and only the new bars are applied.
+
+The recurrences reproduce pandas_ta_classic exactly, so the latest values
+match TechnicalAnalysisService.calculate_indicators over the same history:
+- SMA / Volume SMA / Bollinger: rolling sums (and sum of squares, ddof=0)
+- EMA: seeded with the SMA of the first `length` values, then alpha=2/(length+1)
+- MACD signal: EMA(9) seeded with the SMA of the first 9 MACD values
+- RSI / ATR: RMA = pandas ewm(alpha=1/length, adjust=True), kept as
+  weighted numerator/denominator pairs
+- Stochastic: rolling min/max (14) + SMA(3) smoothing for %K and %D
+- OBV: running signed volume total
+
+State is persisted as JSON (one file per ticker) so it survives restarts.
+The state from before the last bar is kept too, so a bar sent again with the
+same date (today's candle while the session is open) replaces the last one.
+"""
+
+import copy
+import json
+import logging
+import math
+import os
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import IndicatorSnapshot, PivotPointsIndicator, PriceDataPoint
+
+logger = logging.getLogger(__name__)
+
+# backend/python-service/data/indicator_state
+DEFAULT_STATE_DIR = Path(__file__).resolve().parents[2] / "data" / "indicator_state"
+
+SMA_PERIODS = (20, 50, 200)
+EMA_PERIODS = (9, 12, 21, 26)  # 12/26 feed MACD
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+STOCH_PERIOD = 14
+STOCH_SMOOTH = 3
+BB_PERIOD = 20
+BB_STD = 2.0
+VOLUME_SMA_PERIOD = 20
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+TREND_STRENGTH_WINDOW = 20
+
+
+class IndicatorState:
+    """
+    Running state of all indicators for one ticker
+    """
+
+    WINDOW = max(SMA_PERIODS)
+
+    def __init__(self):
+        self.bars = 0
+        self.last_date: Optional[str] = None
+        self.last_bar: Optional[Dict[str, float]] = None
+
+        self.closes: deque = deque(maxlen=self.WINDOW)
+        self.highs: deque = deque(maxlen=STOCH_PERIOD)
+        self.lows: deque = deque(maxlen=STOCH_PERIOD)
+        self.volumes: deque = deque(maxlen=VOLUME_SMA_PERIOD)
+
+        self.close_sums = {period: 0.0 for period in SMA_PERIODS}
+        self.close_sq_sum = 0.0  # Bollinger (BB_PERIOD)
+        self.volume_sum = 0.0
+
+        self.ema: Dict[int, Optional[float]] = {period: None for period in EMA_PERIODS}
+        self.macd_seed: List[float] = []
+        self.macd_signal: Optional[float] = None
+
+        # RMA (adjusted ewm): [numerator, denominator, observations]
+        self.rsi_gain = [0.0, 0.0, 0]
+        self.rsi_loss = [0.0, 0.0, 0]
+        self.atr = [0.0, 0.0, 0]
+
+        self.stoch_raw: deque = deque(maxlen=STOCH_SMOOTH)
+        self.stoch_k: deque = deque(maxlen=STOCH_SMOOTH)
+
+        self.obv = 0.0
+
+        # to_dict() before the last bar, so it can be revised (see checkpoint)
+        self.previous: Optional[Dict] = None
+
+    # ------------------------------------------------------------------------
+    # UPDATE
+    # ------------------------------------------------------------------------
+
+    def update(self, date: str, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """
+        Apply one new bar (O(1))
+
+        Args:
+            date: ISO date of the bar (must be after last_date)
+            open_, high, low, close, volume: OHLCV values
+        """
+        prev_close = self.closes[-1] if self.closes else None
+
+        # Rolling sums: drop the value leaving each window before appending
+        for period in SMA_PERIODS:
+            if len(self.closes) >= period:
+                self.close_sums[period] -= self.closes[-period]
+            self.close_sums[period] += close
+        if len(self.closes) >= BB_PERIOD:
+            self.close_sq_sum -= self.closes[-BB_PERIOD] ** 2
+        self.close_sq_sum += close * close
+        if len(self.volumes) == VOLUME_SMA_PERIOD:
+            self.volume_sum -= self.volumes[0]
+        self.volume_sum += volume
+
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.volumes.append(volume)
+        self.bars += 1
+
+        # EMAs (SMA seed at bar `period`, then recursive)
+        for period in EMA_PERIODS:
+            if self.bars == period:
+                self.ema[period] = sum(list(self.closes)[-period:]) / period
+            elif self.bars > period:
+                alpha = 2.0 / (period + 1)
+                self.ema[period] = alpha * close + (1 - alpha) * self.ema[period]
+
+        # MACD signal line (EMA of the MACD line from its first valid value)
+        if self.bars >= MACD_SLOW:
+            macd = self.ema[MACD_FAST] - self.ema[MACD_SLOW]
+            if self.macd_signal is None:
+                self.macd_seed.append(macd)
+                if len(self.macd_seed) == MACD_SIGNAL:
+                    self.macd_signal = sum(self.macd_seed) / MACD_SIGNAL
+                    self.macd_seed = []
+            else:
+                alpha = 2.0 / (MACD_SIGNAL + 1)
+                self.macd_signal = alpha * macd + (1 - alpha) * self.macd_signal
+
+        if prev_close is not None:
+            # RSI (Wilder) on gains/losses
+            change = close - prev_close
+            self._rma_update(self.rsi_gain, max(change, 0.0), RSI_PERIOD)
+            self._rma_update(self.rsi_loss, -min(change, 0.0), RSI_PERIOD)
+
+            # ATR (Wilder) on true range
+            true_range = max(high - low, abs(high - prev_close), abs(prev_close - low))
+            self._rma_update(self.atr, true_range, ATR_PERIOD)
+
+            # OBV
+            if change > 0:
+                self.obv += volume
+            elif change < 0:
+                self.obv -= volume
+        else:
+            self.obv = volume  # first bar: initial sign = +1
+
+        # Stochastic
+        if self.bars >= STOCH_PERIOD:
+            lowest, highest = min(self.lows), max(self.highs)
+            value_range = (highest - lowest) or np.finfo(float).eps
+            self.stoch_raw.append(100 * (close - lowest) / value_range)
+            if len(self.stoch_raw) == STOCH_SMOOTH:
+                self.stoch_k.append(sum(self.stoch_raw) / STOCH_SMOOTH)
+
+        self.last_date = date
+        self.last_bar = {"high": high, "low": low, "close": close}
+
+    def checkpoint(self) -> None:
+        """Keep a copy of the current state so the next bar can be revised"""
+        data = self.to_dict()
+        data.pop("previous")
+        self.previous = copy.deepcopy(data)
+
+    def revert(self) -> "IndicatorState":
+        """
+        State before the last bar (from the last checkpoint)
+
+        Raises:
+            ValueError: If no checkpoint was taken before the last bar
+        """
+        if self.previous is None:
+            raise ValueError(f"State before the {self.last_date} bar was not kept")
+        return IndicatorState.from_dict(self.previous)
+
+    @staticmethod
+    def _rma_update(rma: list, value: float, length: int) -> None:
+        """One step of pandas ewm(alpha=1/length, adjust=True)"""
+        decay = 1.0 - 1.0 / length
+        rma[0] = rma[0] * decay + value
+        rma[1] = rma[1] * decay + 1.0
+        rma[2] += 1
+
+    @staticmethod
+    def _rma_value(rma: list, length: int) -> Optional[float]:
+        return rma[0] / rma[1] if rma[2] >= length else None
+
+    # ------------------------------------------------------------------------
+    # SNAPSHOT
+    # ------------------------------------------------------------------------
+
+    def snapshot(self) -> IndicatorSnapshot:
+        """
+        Latest value of every indicator
+
+        Returns:
+            IndicatorSnapshot (None where the indicator has not enough bars yet)
+        """
+        close = self.closes[-1]
+
+        sma = {
+            period: self.close_sums[period] / period if self.bars >= period else None
+            for period in SMA_PERIODS
+        }
+
+        macd = macd_signal = macd_histogram = None
+        if self.bars >= MACD_SLOW:
+            macd = self.ema[MACD_FAST] - self.ema[MACD_SLOW]
+            if self.macd_signal is not None:
+                macd_signal = self.macd_signal
+                macd_histogram = macd - macd_signal
+
+        rsi = None
+        gain = self._rma_value(self.rsi_gain, RSI_PERIOD)
+        loss = self._rma_value(self.rsi_loss, RSI_PERIOD)
+        if gain is not None and gain + loss > 0:
+            rsi = 100 * gain / (gain + loss)
+
+        bb_upper = bb_middle = bb_lower = bb_bandwidth = None
+        if self.bars >= BB_PERIOD:
+            bb_middle = sma[BB_PERIOD]
+            variance = max(self.close_sq_sum / BB_PERIOD - bb_middle * bb_middle, 0.0)
+            deviation = BB_STD * math.sqrt(variance)
+            bb_upper, bb_lower = bb_middle + deviation, bb_middle - deviation
+            bb_bandwidth = (bb_upper - bb_lower) / bb_middle * 100
+
+        stoch_k = stoch_d = None
+        if len(self.stoch_raw) == STOCH_SMOOTH:
+            stoch_k = self.stoch_k[-1]
+            if len(self.stoch_k) == STOCH_SMOOTH:
+                stoch_d = sum(self.stoch_k) / STOCH_SMOOTH
+
+        return IndicatorSnapshot(
+            sma_20=sma[20],
+            sma_50=sma[50],
+            sma_200=sma[200],
+            ema_9=self.ema[9],
+            ema_21=self.ema[21],
+            rsi=rsi,
+            macd=macd,
+            macd_signal=macd_signal,
+            macd_histogram=macd_histogram,
+            stochastic_k=stoch_k,
+            stochastic_d=stoch_d,
+            bb_upper=bb_upper,
+            bb_middle=bb_middle,
+            bb_lower=bb_lower,
+            bb_bandwidth=bb_bandwidth,
+            atr=self._rma_value(self.atr, ATR_PERIOD),
+            obv=self.obv,
+            volume_sma=(
+                self.volume_sum / VOLUME_SMA_PERIOD
+                if self.bars >= VOLUME_SMA_PERIOD else None
+            ),
+            pivot=self._pivot_points(),
+            trend=self._trend(close, sma[50], sma[200]),
+            trend_strength=self._trend_strength(),
+        )
+
+    def _pivot_points(self) -> PivotPointsIndicator:
+        """Standard pivot points of the last bar (same as TechnicalAnalysisService)"""
+        high, low, close = self.last_bar["high"], self.last_bar["low"], self.last_bar["close"]
+        pivot = (high + low + close) / 3
+        return PivotPointsIndicator(
+            pivot=pivot,
+            r1=2 * pivot - low,
+            s1=2 * pivot - high,
+            r2=pivot + (high - low),
+            s2=pivot - (high - low),
+            r3=high + 2 * (pivot - low),
+            s3=low - 2 * (high - pivot),
+        )
+
+    @staticmethod
+    def _trend(close: float, sma_50: Optional[float], sma_200: Optional[float]) -> str:
+        """UPTREND / DOWNTREND / SIDEWAYS from price vs SMA50 vs SMA200"""
+        sma_50 = sma_50 or 0
+        sma_200 = sma_200 or 0
+        if close > sma_50 and sma_50 > sma_200:
+            return "UPTREND"
+        elif close < sma_50 and sma_50 < sma_200:
+            return "DOWNTREND"
+        return "SIDEWAYS"
+
+    def _trend_strength(self) -> float:
+        """Linear regression slope of the last 20 closes, normalized to 0-100"""
+        recent_closes = np.array(list(self.closes)[-TREND_STRENGTH_WINDOW:])
+        if len(recent_closes) < 2:
+            return 0.0
+        slope, _ = np.polyfit(np.arange(len(recent_closes)), recent_closes, 1)
+        strength = min(100, abs((slope / recent_closes.mean()) * 100) * 10)
+        return float(round(strength, 2))
+
+    # ------------------------------------------------------------------------
+    # PERSISTENCE
+    # ------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        """Serialize state to a JSON-compatible dict"""
+        return {
+            key: list(value) if isinstance(value, deque) else value
+            for key, value in self.__dict__.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IndicatorState":
+        """Rebuild state from to_dict() output"""
+        state = cls()
+        for key, value in data.items():
+            current = getattr(state, key)
+            if isinstance(current, deque):
+                current.extend(value)
+            elif isinstance(current, dict):
+                # JSON object keys are strings; periods are ints
+                setattr(state, key, {int(period): v for period, v in value.items()})
+            else:
+                setattr(state, key, value)
+        return state
+
+
+class IncrementalIndicatorService:
+    """
+    Per-ticker incremental indicator engine
+
+    Usage:
+    - First call for a ticker (or reset=True): full history (min 200 bars) seeds the state
+    - Next calls: only the new bars (older dates are ignored; the last applied
+      date may be sent again with revised values and replaces that bar)
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, min_data_points: int = 200):
+        self.state_dir = Path(
+            state_dir or os.getenv("INDICATOR_STATE_DIR", str(DEFAULT_STATE_DIR))
+        )
+        self.min_data_points = min_data_points
+        self._states: Dict[str, IndicatorState] = {}
+
+    def update(
+        self, ticker: str, prices: List[PriceDataPoint], reset: bool = False
+    ) -> Tuple[IndicatorState, int]:
+        """
+        Apply new bars to the ticker state
+
+        Args:
+            ticker: Asset ticker symbol
+            prices: New OHLCV bars sorted by date (full history when seeding)
+            reset: Discard existing state and seed from prices
+
+        Returns:
+            Tuple (state, bars_applied) - a revised last bar counts as applied
+
+        Raises:
+            ValueError: If there is no state yet and prices has less than 200 bars,
+                or the last bar is revised but its previous state was not kept
+        """
+        ticker = ticker.upper()
+        state = None if reset else self._get_state(ticker)
+
+        if state is None:
+            if len(prices) < self.min_data_points:
+                raise ValueError(
+                    f"No indicator state for {ticker} - send at least "
+                    f"{self.min_data_points} price points to seed it, got {len(prices)}"
+                )
+            state = IndicatorState()
+
+        applied = 0
+        for i, price in enumerate(prices):
+            # ISO dates compare correctly as strings
+            if state.last_date is not None and price.date < state.last_date:
+                continue
+            if state.last_date is not None and price.date == state.last_date:
+                # Revised last bar: undo it and apply the new values
+                try:
+                    state = state.revert()
+                except ValueError as e:
+                    raise ValueError(
+                        f"Cannot revise the {price.date} bar of {ticker}: {e} - "
+                        f"send the full history with reset=true"
+                    ) from e
+
+            # Only the bar that may be revised next needs the state before it
+            if i == len(prices) - 1 or prices[i + 1].date == price.date:
+                state.checkpoint()
+            else:
+                state.previous = None
+            state.update(price.date, price.open, price.high, price.low, price.close, price.volume)
+            applied += 1
+
+        self._states[ticker] = state
+        if applied:
+            self._save_state(ticker, state)
+
+        return state, applied
+
+    def _get_state(self, ticker: str) -> Optional[IndicatorState]:
+        """State from memory, falling back to the persisted JSON file"""
+        state = self._states.get(ticker)
+        if state is not None:
+            return state
+
+        path = self._state_path(ticker)
+        if not path.exists():
+            return None
+        try:
+            state = IndicatorState.from_dict(json.loads(path.read_text()))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Discarding invalid indicator state for {ticker}: {e}")
+            return None
+
+        self._states[ticker] = state
+        return state
+
+    def _state_path(self, ticker: str) -> Path:
+        """
+        JSON file of a ticker's state
+
+        Raises:
+            ValueError: If the ticker would resolve outside state_dir
+        """
+        state_dir = self.state_dir.resolve()
+        path = (state_dir / f"{ticker}.json").resolve()
+        if path.parent != state_dir:
+            raise ValueError(f"Invalid ticker for indicator state: {ticker!r}")
+        return path
+
+    def _save_state(self, ticker: str, state: IndicatorState) -> None:
+        """Persist state atomically (tmp file + rename)"""
+        try:
+            path = self._state_path(ticker)
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(state.to_dict()))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist indicator state for {ticker}: {e}")
@@ -0,0 +1,158 @@
+"""
+Indicator Cache
+Descrição: Cache LRU em memória de resultados de indicadores técnicos
+
+Different frontend views request the same ticker with identical price
+histories. Results of calculate_indicator_arrays are cached keyed by a
+fingerprint of the price series (dates + OHLCV bytes) and the resolved
+indicator plan, so a repeated request skips the pandas_ta pipeline.
+
+The cache is bounded by the memory used by the cached arrays
+(INDICATOR_CACHE_MAX_MB, default 128 MB; 0 disables it): least recently
+used entries are evicted first. Cached arrays are read-only because they
+are shared between requests.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# (series, latest) - output of TechnicalAnalysisService.calculate_indicator_arrays
+IndicatorResult = Tuple[Dict[str, np.ndarray], Dict[str, Any]]
+
+
+def fingerprint_prices(df: pd.DataFrame) -> str:
+    """
+    Hash of a price DataFrame (index + every column's raw bytes)
+
+    Args:
+        df: OHLCV DataFrame (TechnicalAnalysisService._create_dataframe)
+
+    Returns:
+        Hex digest identifying the exact series
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    # Same instants hash the same regardless of the index unit (s/us/ns)
+    digest.update(np.asarray(df.index.values, dtype="datetime64[ns]").tobytes())
+    for column in df.columns:
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Bounded LRU of indicator results, evicted by memory size.
+
+    Example:
+        >>> cache = IndicatorCache(max_bytes=64 * 1024 * 1024)
+        >>> key = (fingerprint_prices(df), plan)
+        >>> result = cache.get(key)
+        >>> if result is None:
+        ...     result = cache.put(key, compute(df))
+    """
+
+    # Fixed per-entry estimate for the key, latest values and dict overhead
+    ENTRY_OVERHEAD_BYTES = 2048
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Memory budget for cached arrays (default: env
+                INDICATOR_CACHE_MAX_MB, 128 MB). 0 disables the cache
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("INDICATOR_CACHE_MAX_MB", "128")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Hashable, Tuple[IndicatorResult, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[IndicatorResult]:
+        """
+        Cached result for key (marks it as most recently used)
+
+        Returns:
+            (series, latest) or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, result: IndicatorResult) -> IndicatorResult:
+        """
+        Store a result, evicting least recently used entries over the budget
+
+        Args:
+            key: (price fingerprint, indicator plan)
+            result: (series, latest) from calculate_indicator_arrays
+
+        Returns:
+            The same result, with its arrays made read-only
+        """
+        series, _ = result
+        for values in series.values():
+            values.flags.writeable = False
+
+        size = sum(values.nbytes for values in series.values()) + self.ENTRY_OVERHEAD_BYTES
+        if not self.enabled or size > self.max_bytes:
+            return result
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        """Drop every cached result (metrics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics and memory usage (exposed on /health)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
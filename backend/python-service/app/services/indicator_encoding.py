@@ -0,0 +1,196 @@
+"""
+Indicator Encoding
+Descrição: Formatos colunares compactos para respostas de indicadores técnicos
+
+The default /indicators response serializes every value as a JSON number
+(List[Optional[float]]). Clients that send a matching Accept header get the
+same indicators encoded straight from the NumPy arrays instead, without any
+per-element Python conversion:
+
+- application/vnd.indicators.columnar+json: JSON envelope where each series
+  is a base64 little-endian float buffer ({"length", "data"}); NaN marks
+  values that cannot be calculated (IEEE NaN survives both float32/float64)
+- application/vnd.apache.arrow.stream: Arrow IPC stream, one record batch
+  per ticker; missing values are Arrow nulls (validity bitmap) and series are
+  right-aligned to the price history length. Latest-value indicators go in
+  the schema metadata as JSON. Requires pyarrow (optional)
+
+Both accept a `dtype` parameter (float64 default, or float32 for half the
+size), e.g. `Accept: application/vnd.indicators.columnar+json; dtype=float32`.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("[IndicatorEncoding] pyarrow not available - Arrow IPC responses disabled")
+
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.indicators.columnar+json"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+DTYPES = {"float64": "<f8", "float32": "<f4"}
+
+# (ticker, data_points, series, latest) - output of calculate_indicator_arrays
+IndicatorArrays = Tuple[str, int, Dict[str, np.ndarray], Dict[str, Any]]
+
+
+def negotiate_indicator_format(accept: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Pick a columnar encoding from the Accept header
+
+    Args:
+        accept: Raw Accept header value
+
+    Returns:
+        (media_type, dtype) or None for the default JSON response
+    """
+    if not accept:
+        return None
+
+    supported = [COLUMNAR_JSON_MEDIA_TYPE]
+    if PYARROW_AVAILABLE:
+        supported.append(ARROW_STREAM_MEDIA_TYPE)
+
+    candidates = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        # Parameter names are case-insensitive (RFC 9110)
+        options = {
+            name.strip().lower(): value.strip()
+            for name, value in (param.split("=", 1) for param in params if "=" in param)
+        }
+        try:
+            quality = float(options.get("q", 1))
+        except ValueError:
+            quality = 0
+        if media_type.lower() in supported and quality > 0:
+            dtype = options.get("dtype", "float64").lower()
+            candidates.append((-quality, position, media_type.lower(), dtype if dtype in DTYPES else "float64"))
+
+    if not candidates:
+        return None
+
+    _, _, media_type, dtype = min(candidates)
+    return media_type, dtype
+
+
+def encode_indicator_response(
+    media_type: str,
+    dtype: str,
+    items: List[IndicatorArrays],
+    timestamp: datetime,
+    errors: Optional[Dict[str, str]] = None,
+    batch: bool = False,
+) -> bytes:
+    """
+    Encode indicator arrays in the negotiated columnar format
+
+    Args:
+        media_type: COLUMNAR_JSON_MEDIA_TYPE or ARROW_STREAM_MEDIA_TYPE
+        dtype: float64 or float32
+        items: One (ticker, data_points, series, latest) per ticker
+        timestamp: Response timestamp
+        errors: Per-ticker errors (batch only)
+        batch: Batch envelope (results list) instead of a single ticker
+
+    Returns:
+        Response body
+    """
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        return _encode_arrow(items, dtype, timestamp, errors or {})
+    return _encode_columnar_json(items, dtype, timestamp, errors or {}, batch)
+
+
+def _latest_to_dict(latest: Dict[str, Any]) -> Dict[str, Any]:
+    """Latest-value indicators as JSON-compatible values (pivot model → dict)"""
+    return {
+        name: value.dict() if hasattr(value, "dict") else value
+        for name, value in latest.items()
+    }
+
+
+def _encode_columnar_json(
+    items: List[IndicatorArrays],
+    dtype: str,
+    timestamp: datetime,
+    errors: Dict[str, str],
+    batch: bool,
+) -> bytes:
+    """JSON envelope with base64 float buffers"""
+    results = [
+        {
+            "ticker": ticker,
+            "timestamp": timestamp.isoformat(),
+            "data_points": data_points,
+            "series": {
+                name: {
+                    "length": len(values),
+                    "data": base64.b64encode(
+                        np.ascontiguousarray(values, dtype=DTYPES[dtype]).tobytes()
+                    ).decode("ascii"),
+                }
+                for name, values in series.items()
+            },
+            "latest": _latest_to_dict(latest),
+        }
+        for ticker, data_points, series, latest in items
+    ]
+    encoding = {"dtype": dtype, "byte_order": "little", "missing": "NaN"}
+
+    if batch:
+        payload = {
+            "timestamp": timestamp.isoformat(),
+            "total_tickers": len(items) + len(errors),
+            "encoding": encoding,
+            "results": results,
+            "errors": errors,
+        }
+    else:
+        payload = {**results[0], "encoding": encoding}
+
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _encode_arrow(
+    items: List[IndicatorArrays],
+    dtype: str,
+    timestamp: datetime,
+    errors: Dict[str, str],
+) -> bytes:
+    """Arrow IPC stream, one record batch per ticker"""
+    value_type = pa.float32() if dtype == "float32" else pa.float64()
+    names = list(items[0][2]) if items else []
+
+    schema = pa.schema(
+        [pa.field("ticker", pa.string())] + [pa.field(name, value_type) for name in names],
+        metadata={
+            "timestamp": timestamp.isoformat(),
+            "latest": json.dumps({ticker: _latest_to_dict(latest) for ticker, _, _, latest in items}),
+            "errors": json.dumps(errors),
+        },
+    )
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for ticker, data_points, series, _ in items:
+            columns = [pa.array([ticker] * data_points, pa.string())]
+            for name in names:
+                values = np.asarray(series[name], dtype=DTYPES[dtype])
+                # Right-align shorter series (stochastic) to the price history
+                padded = np.full(data_points, np.nan, dtype=DTYPES[dtype])
+                padded[data_points - len(values):] = values
+                columns.append(pa.array(padded, type=value_type, from_pandas=True))
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,288 @@
+"""
+Indicator Kernels
+Descrição: Kernels NumPy (com Numba opcional) dos indicadores principais
+
+Array-in/array-out implementations of SMA, EMA, RMA, RSI (Wilder), MACD,
+Stochastic, Bollinger Bands, ATR and OBV that reproduce pandas_ta_classic
+(same seeds, warm-up NaNs and output lengths) without pandas Series
+alignment or per-call object overhead. Inputs are finite float64 arrays
+(validated OHLCV); outputs match pandas_ta to floating point tolerance
+(~1e-9 relative), not bit for bit.
+
+The only sequential part is the first-order linear recurrence behind
+EMA/RMA (y[t] = beta * y[t-1] + x[t]):
+- with Numba (INDICATOR_KERNELS_NUMBA, enabled by default when installed)
+  it is a JIT-compiled loop, cached on disk after the first compilation
+- without it, the recurrence is solved in closed form block by block with
+  cumsum; blocks are sized so beta^-block stays below 1e100
+"""
+
+import logging
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+NUMBA_AVAILABLE = False
+if os.getenv("INDICATOR_KERNELS_NUMBA", "true").lower() not in ("0", "false", "no"):
+    try:
+        from numba import njit
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        logger.warning("[IndicatorKernels] numba not available - using NumPy recurrences")
+
+# Largest beta^-k used by the NumPy recurrence (ln(1e100))
+_MAX_GROWTH_EXPONENT = 230.0
+
+# pandas_ta non_zero_range: added to every range when any range is zero
+_EPSILON = np.finfo(float).eps
+
+
+def _linear_filter_numpy(values: np.ndarray, beta: float, initial: float) -> np.ndarray:
+    """y[t] = beta * y[t-1] + values[t], y[-1] = initial (block-wise closed form)"""
+    out = np.empty(len(values))
+    if beta <= 0.0:
+        out[:] = values
+        return out
+
+    block = len(values) if beta >= 1.0 else max(1, int(_MAX_GROWTH_EXPONENT / -np.log(beta)))
+    previous = initial
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        # y[s+j-1] = beta^j * (y[s-1] + sum_{i<j} values[s+i] / beta^(i+1))
+        decay = beta ** np.arange(1, len(chunk) + 1)
+        out[start:start + len(chunk)] = decay * (previous + np.cumsum(chunk / decay))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def _linear_filter_loop(values: np.ndarray, beta: float, initial: float) -> np.ndarray:
+    """y[t] = beta * y[t-1] + values[t], y[-1] = initial (sequential loop)"""
+    out = np.empty(len(values))
+    previous = initial
+    for t in range(len(values)):
+        previous = beta * previous + values[t]
+        out[t] = previous
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _linear_filter = njit(cache=True, nogil=True)(_linear_filter_loop)
+else:
+    _linear_filter = _linear_filter_numpy
+
+
+def _first_valid(values: np.ndarray) -> Optional[int]:
+    valid = np.flatnonzero(~np.isnan(values))
+    return int(valid[0]) if valid.size else None
+
+
+def _non_zero_range(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """high - low, plus epsilon everywhere if any range is zero (pandas_ta)"""
+    diff = high - low
+    if (diff == 0).any():
+        diff = diff + _EPSILON
+    return diff
+
+
+# ============================================================================
+# MOVING AVERAGES
+# ============================================================================
+
+def sma(values: np.ndarray, length: int) -> np.ndarray:
+    """Simple moving average (NaN for the first length-1 values)"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if length > len(values):
+        return out
+    sums = np.cumsum(values)
+    out[length - 1] = sums[length - 1]
+    out[length:] = sums[length:] - sums[:-length]
+    out[length - 1:] /= length
+    return out
+
+
+def ema(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Exponential moving average as pandas_ta ema: SMA of the first `length`
+    values as seed, then adjust=False recursion with alpha = 2 / (length + 1)
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if length > len(values):
+        return out
+    alpha = 2.0 / (length + 1)
+    seed = values[:length].mean()
+    out[length - 1] = seed
+    out[length:] = _linear_filter(alpha * values[length:], 1.0 - alpha, seed)
+    return out
+
+
+def rma(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Wilder's moving average as pandas_ta rma: ewm(alpha=1/length,
+    adjust=True, min_periods=length), starting at the first non-NaN value
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    start = _first_valid(values)
+    if start is None or len(values) - start < length:
+        return out
+    beta = 1.0 - 1.0 / length
+    observed = values[start:]
+    weighted = _linear_filter(observed, beta, 0.0)
+    weights = _linear_filter(np.ones(len(observed)), beta, 0.0)
+    out[start + length - 1:] = (weighted / weights)[length - 1:]
+    return out
+
+
+# ============================================================================
+# MOMENTUM
+# ============================================================================
+
+def rsi(close: np.ndarray, length: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder smoothing), 0-100"""
+    close = np.asarray(close, dtype=float)
+    change = np.empty(len(close))
+    change[0] = np.nan
+    change[1:] = np.diff(close)
+    gains = rma(np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0)), length)
+    losses = rma(np.where(change < 0, change, np.where(np.isnan(change), np.nan, 0.0)), length)
+    return 100.0 * gains / (gains + np.abs(losses))
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    fast_ema: Optional[np.ndarray] = None,
+    slow_ema: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    MACD line, signal (EMA of the line from its first valid value) and histogram
+
+    Args:
+        close: Close prices
+        fast, slow, signal: Periods
+        fast_ema, slow_ema: Precomputed EMAs of close (optional, reused)
+
+    Returns:
+        Dict with macd, macd_signal, macd_histogram
+    """
+    fast_ema = ema(close, fast) if fast_ema is None else fast_ema
+    slow_ema = ema(close, slow) if slow_ema is None else slow_ema
+    line = fast_ema - slow_ema
+
+    signal_line = np.full(len(line), np.nan)
+    start = _first_valid(line)
+    if start is not None:
+        signal_line[start:] = ema(line[start:], signal)
+
+    return {"macd": line, "macd_signal": signal_line, "macd_histogram": line - signal_line}
+
+
+def stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    d: int = 3,
+    smooth_k: int = 3,
+) -> Dict[str, np.ndarray]:
+    """
+    Stochastic %K/%D as pandas_ta stoch
+
+    Like pandas_ta, the outputs start at the first full window: they hold
+    len(close) - period + 1 values.
+    """
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    if period > len(close):
+        return {"stochastic_k": np.empty(0), "stochastic_d": np.empty(0)}
+
+    lowest_low = sliding_window_view(low, period).min(axis=1)
+    highest_high = sliding_window_view(high, period).max(axis=1)
+    raw = 100.0 * (close[period - 1:] - lowest_low) / _non_zero_range(highest_high, lowest_low)
+
+    stoch_k = sma(raw, smooth_k)
+    stoch_d = np.full(len(stoch_k), np.nan)
+    start = _first_valid(stoch_k)
+    if start is not None:
+        stoch_d[start:] = sma(stoch_k[start:], d)
+
+    return {"stochastic_k": stoch_k, "stochastic_d": stoch_d}
+
+
+# ============================================================================
+# VOLATILITY
+# ============================================================================
+
+def stdev(values: np.ndarray, length: int) -> np.ndarray:
+    """Rolling population standard deviation (ddof=0), two-pass per window"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if length > len(values):
+        return out
+    out[length - 1:] = sliding_window_view(values, length).std(axis=1)
+    return out
+
+
+def bollinger_bands(
+    close: np.ndarray,
+    period: int = 20,
+    std_dev: float = 2.0,
+    middle: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Bollinger Bands: SMA(period) +- std_dev * population stdev"""
+    middle = sma(close, period) if middle is None else middle
+    deviations = std_dev * stdev(close, period)
+    return {"bb_upper": middle + deviations, "bb_middle": middle, "bb_lower": middle - deviations}
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range (NaN on the first bar, as pandas_ta)"""
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    out = np.empty(len(close))
+    out[0] = np.nan
+    previous_close = close[:-1]
+    out[1:] = np.maximum.reduce([
+        np.abs(_non_zero_range(high, low)[1:]),
+        np.abs(high[1:] - previous_close),
+        np.abs(previous_close - low[1:]),
+    ])
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int = 14) -> np.ndarray:
+    """Average True Range (Wilder smoothing of the true range)"""
+    return rma(true_range(high, low, close), length)
+
+
+# ============================================================================
+# VOLUME
+# ============================================================================
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-Balance Volume (first bar counted as an up bar, as pandas_ta)"""
+    close = np.asarray(close, dtype=float)
+    signs = np.empty(len(close))
+    signs[0] = 1.0
+    signs[1:] = np.sign(np.diff(close))
+    return np.cumsum(signs * np.asarray(volume, dtype=float))
+
+
+def warm_up() -> Tuple[bool, float]:
+    """
+    Compile (or load from the Numba cache) the JIT kernels ahead of the first request
+
+    Returns:
+        (numba enabled, seconds spent)
+    """
+    import time
+
+    start = time.perf_counter()
+    _linear_filter(np.ones(4), 0.5, 0.0)
+    return NUMBA_AVAILABLE, time.perf_counter() - start
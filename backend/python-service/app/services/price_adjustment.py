@@ -0,0 +1,289 @@
+"""
+Price Adjustment - Ajuste de preços COTAHIST por proventos e eventos societários
+
+COTAHIST traz preços brutos (sem ajuste). Este módulo aplica fatores de ajuste
+retroativos, no mesmo formato de eventos produzido pelo
+StatusInvestDividendsScraper (python-scrapers):
+
+- Proventos em dinheiro (dividendo, jcp, rendimento): fator = (C - D) / C,
+  onde C é o fechamento do último pregão antes da data EX e D o valor bruto
+- Desdobramento / grupamento / bonificação: fator = 1 / fator_do_evento,
+  onde fator_do_evento = ações depois / ações antes (ex: 2.0 em um split 1:2,
+  0.1 em um grupamento 10:1, 1.1 em uma bonificação de 10%)
+
+Cada pregão é multiplicado pelo produto dos fatores de todos os eventos com
+data EX posterior a ele (produto acumulado calculado de trás para frente com
+NumPy). A base do ajuste é o último pregão da série: eventos com data EX
+depois dele são ignorados.
+
+Os eventos vêm da tabela local (JSON, CORPORATE_EVENTS_FILE) e/ou do request.
+O fator de cada evento é memorizado por ticker (não muda depois de calculado).
+
+O StatusInvestDividendsScraper não extrai a proporção de bonificações (só o
+valor_bruto, que é o custo atribuído por ação e não define o fator). Eventos
+de ações sem "fator" não são ajustados: adjust_records os devolve em skipped
+para que o chamador possa sinalizá-los.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# backend/python-service/data/corporate_events.json
+DEFAULT_EVENTS_FILE = Path(__file__).resolve().parents[2] / "data" / "corporate_events.json"
+
+# Campos de preço ajustados (volume é financeiro em R$ e não muda)
+ADJUSTED_PRICE_FIELDS = ("open", "high", "low", "close", "average_price", "best_bid", "best_ask")
+
+# Tipos (normalizados pelo StatusInvestDividendsScraper) com pagamento em dinheiro
+CASH_EVENT_TYPES = ("dividendo", "jcp", "rendimento")
+
+# Tipos que alteram a quantidade de ações (exigem "fator")
+SHARE_EVENT_TYPES = ("desdobramento", "grupamento", "bonus")
+
+# Chave de um evento: (data_ex, tipo, valor_bruto, fator)
+EventKey = Tuple[str, str, Optional[float], Optional[float]]
+
+
+class PriceAdjustmentService:
+    """
+    Ajuste vetorizado de preços COTAHIST por proventos, desdobramentos e grupamentos.
+
+    Example:
+        >>> service = PriceAdjustmentService()
+        >>> events = {"PETR4": [{"tipo": "dividendo", "valor_bruto": 1.5, "data_ex": "2024-05-10"}]}
+        >>> adjusted = service.adjust_records(records, events=events)
+    """
+
+    def __init__(self, events_file: Optional[str] = None):
+        """
+        Inicializa o service de ajuste.
+
+        Args:
+            events_file: Tabela local de eventos em JSON (default: env
+                CORPORATE_EVENTS_FILE ou data/corporate_events.json). Aceita
+                {"PETR4": [eventos...]} ou a lista de resultados do scraper
+                [{"ticker": "PETR4", "dividends": [eventos...]}]
+        """
+        self.events_file = Path(
+            events_file or os.getenv("CORPORATE_EVENTS_FILE", str(DEFAULT_EVENTS_FILE))
+        )
+        self._table: Dict[str, List[Dict]] = {}
+        self._table_mtime: Optional[float] = None
+
+        # ticker → {evento → fator de preço}
+        self._factor_cache: Dict[str, Dict[EventKey, float]] = {}
+
+    def load_events(self, ticker: str) -> List[Dict]:
+        """
+        Eventos da tabela local para um ticker (recarrega se o arquivo mudou).
+
+        Args:
+            ticker: Ticker do ativo (ex: PETR4)
+
+        Returns:
+            Lista de eventos (vazia se o ticker ou o arquivo não existem)
+        """
+        try:
+            mtime = self.events_file.stat().st_mtime
+        except OSError:
+            return []
+
+        if mtime != self._table_mtime:
+            self._table = self._read_table()
+            self._table_mtime = mtime
+
+        return self._table.get(ticker.upper(), [])
+
+    def _read_table(self) -> Dict[str, List[Dict]]:
+        """Lê a tabela local de eventos (JSON), normalizando para ticker → eventos."""
+        try:
+            raw = json.loads(self.events_file.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Invalid corporate events file {self.events_file}: {e}")
+            return {}
+
+        if isinstance(raw, list):
+            # Resultados do StatusInvestDividendsScraper: [{"ticker", "dividends"}]
+            table: Dict[str, List[Dict]] = {}
+            for item in raw:
+                table.setdefault(item["ticker"].upper(), []).extend(item.get("dividends", []))
+            return table
+
+        return {ticker.upper(): events for ticker, events in raw.items()}
+
+    def adjust_records(
+        self,
+        records: List[Dict],
+        events: Optional[Dict[str, List[Dict]]] = None,
+        skipped: Optional[List[Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Ajusta os preços de registros COTAHIST (formato de parse_line) in-place.
+
+        Args:
+            records: Registros COTAHIST (qualquer ordem, um ou mais tickers)
+            events: Eventos extras por ticker (somados aos da tabela local)
+            skipped: Se informada, recebe os eventos no período que não puderam
+                ser aplicados ({"ticker", "tipo", "data_ex", "reason"})
+
+        Returns:
+            A mesma lista de registros, com os campos de preço ajustados
+
+        Example:
+            >>> records = await cotahist_service.fetch_historical_data(2020, 2024, ["PETR4"])
+            >>> service.adjust_records(records)
+        """
+        if not records:
+            return records
+
+        events = {ticker.upper(): ticker_events for ticker, ticker_events in (events or {}).items()}
+
+        tickers = np.array([record["ticker"] for record in records])
+        dates = np.array([record["date"] for record in records], dtype="datetime64[D]")
+        closes = np.fromiter((record["close"] for record in records), dtype=np.float64, count=len(records))
+
+        unique_tickers, inverse = np.unique(tickers, return_inverse=True)
+        multipliers = np.ones(len(records))
+
+        for position, ticker in enumerate(unique_tickers.tolist()):
+            ticker_events = self._merge_events(self.load_events(ticker), events.get(ticker, []))
+            if not ticker_events:
+                continue
+
+            rows = np.flatnonzero(inverse == position)
+            rows = rows[np.argsort(dates[rows], kind="stable")]
+            multipliers[rows] = self._cumulative_factors(
+                ticker, dates[rows], closes[rows], ticker_events, skipped
+            )
+
+        adjusted_rows = np.flatnonzero(multipliers != 1.0)
+        for row, multiplier in zip(adjusted_rows.tolist(), multipliers[adjusted_rows].tolist()):
+            record = records[row]
+            for field in ADJUSTED_PRICE_FIELDS:
+                record[field] = round(record[field] * multiplier, 6)
+
+        logger.info(
+            f"Adjusted {len(adjusted_rows)}/{len(records)} records "
+            f"({len(unique_tickers)} tickers)"
+        )
+        return records
+
+    def _cumulative_factors(
+        self,
+        ticker: str,
+        dates: np.ndarray,
+        closes: np.ndarray,
+        ticker_events: List[Dict],
+        skipped: Optional[List[Dict]] = None,
+    ) -> np.ndarray:
+        """
+        Multiplicador de preço de cada pregão de um ticker.
+
+        Args:
+            ticker: Ticker do ativo
+            dates: Datas dos pregões (datetime64[D], ordenadas)
+            closes: Fechamentos brutos alinhados com dates
+            ticker_events: Eventos do ticker
+            skipped: Lista que recebe os eventos sem dados suficientes
+
+        Returns:
+            Array com o produto dos fatores dos eventos com data EX > data do pregão
+        """
+        cache = self._factor_cache.setdefault(ticker, {})
+        event_dates = []
+        factors = []
+
+        for event in ticker_events:
+            key = self._event_key(event)
+            if key is None:
+                continue
+
+            ex_date = np.datetime64(key[0], "D")
+            # Base do ajuste = último pregão; sem pregão anterior o evento não afeta a série
+            if ex_date > dates[-1] or ex_date <= dates[0]:
+                continue
+
+            factor = cache.get(key)
+            if factor is None:
+                previous_close = closes[np.searchsorted(dates, ex_date, side="left") - 1]
+                try:
+                    factor = self._event_factor(key, previous_close)
+                except ValueError as e:
+                    logger.warning(f"Skipping {ticker} {key[1]} on {key[0]}: {e}")
+                    if skipped is not None:
+                        skipped.append(
+                            {"ticker": ticker, "tipo": key[1], "data_ex": key[0], "reason": str(e)}
+                        )
+                    continue
+                cache[key] = factor
+
+            event_dates.append(ex_date)
+            factors.append(factor)
+
+        if not factors:
+            return np.ones(len(dates))
+
+        event_dates = np.array(event_dates, dtype="datetime64[D]")
+        factors = np.array(factors)
+        order = np.argsort(event_dates, kind="stable")
+        event_dates, factors = event_dates[order], factors[order]
+
+        # suffix[i] = produto dos fatores dos eventos i..n-1 (suffix[n] = 1)
+        suffix = np.append(np.cumprod(factors[::-1])[::-1], 1.0)
+        return suffix[np.searchsorted(event_dates, dates, side="right")]
+
+    @staticmethod
+    def _event_key(event: Dict) -> Optional[EventKey]:
+        """Normaliza um evento (formato do scraper) para a chave (data_ex, tipo, valor, fator)."""
+        tipo = (event.get("tipo") or "").lower()
+        data_ex = event.get("data_ex")
+        if not data_ex or tipo not in CASH_EVENT_TYPES + SHARE_EVENT_TYPES:
+            return None
+
+        valor = event.get("valor_bruto")
+        fator = event.get("fator")
+        return (
+            str(data_ex)[:10],
+            tipo,
+            float(valor) if valor is not None else None,
+            float(fator) if fator is not None else None,
+        )
+
+    @staticmethod
+    def _event_factor(key: EventKey, previous_close: float) -> float:
+        """
+        Fator de preço de um evento.
+
+        Returns:
+            Fator em (0, +inf)
+
+        Raises:
+            ValueError: Se o evento não tem dados suficientes
+        """
+        _, tipo, valor, fator = key
+
+        if tipo in SHARE_EVENT_TYPES:
+            if not fator or fator <= 0:
+                raise ValueError("missing 'fator' (shares after / shares before)")
+            return 1.0 / fator
+
+        if not valor or previous_close <= 0 or valor >= previous_close:
+            raise ValueError(f"valor_bruto={valor} vs previous close {previous_close}")
+        return float((previous_close - valor) / previous_close)
+
+    def _merge_events(self, *sources: Iterable[Dict]) -> List[Dict]:
+        """Une eventos de várias fontes, removendo duplicados (mesma chave)."""
+        merged = {}
+        for source in sources:
+            for event in source:
+                key = self._event_key(event)
+                if key is not None:
+                    merged.setdefault(key, event)
+        return list(merged.values())
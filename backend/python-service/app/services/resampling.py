@@ -0,0 +1,315 @@
+"""
+Resampling Service
+Descrição: Reamostragem OHLCV multi-timeframe (diário → semanal/mensal, intraday → 1h/4h)
+
+Bars are aggregated with a vectorized group-by over sorted NumPy arrays: each
+timestamp gets an integer period key, group boundaries come from np.diff and
+high/low/volume are reduced with np.maximum/np.minimum/np.add.reduceat. A bar
+is labelled with the timestamp of its first trade in the period (weekly bars
+start on the first trading day of the week, not on a calendar Monday).
+
+Period keys:
+- 1h / 4h: hours since epoch (4h blocks anchored at 00:00 of the timestamp's
+  clock - B3 session timestamps are naive local time)
+- 1d: calendar day
+- 1wk: ISO week (Monday to Sunday)
+- 1mo: calendar month
+
+ResamplingService also keeps daily bars per (source, ticker), loaded from
+COTAHIST (split/dividend adjusted) or Yahoo Finance, and the aggregates
+derived from them per timeframe, so indicator requests can name a ticker and
+timeframe instead of shipping the price history. COTAHIST bars are read from
+the Parquet cache only: a request never downloads the annual files, a miss
+fills the cache in the background and raises DataNotReadyError.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.models import OHLCV_FIELDS
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ("1h", "4h", "1d", "1wk", "1mo")
+INTRADAY_TIMEFRAMES = ("1h", "4h")
+SOURCES = ("cotahist", "yfinance")
+
+# Columnar bars: date (datetime64) + OHLCV float arrays, ascending
+Bars = Dict[str, np.ndarray]
+
+
+class DataNotReadyError(Exception):
+    """Source data is being loaded in the background - retry the request later"""
+
+
+def price_arrays(prices) -> Bars:
+    """
+    Price input (list of PriceDataPoint/dicts or columnar arrays) as columnar bars
+
+    Args:
+        prices: PriceInput from an indicators request or a list of records
+
+    Returns:
+        Dict with date (datetime64[s]) and OHLCV arrays
+    """
+    if isinstance(prices, dict):
+        return prices
+
+    def field(point, name):
+        return point[name] if isinstance(point, dict) else getattr(point, name)
+
+    return {
+        "date": np.array([field(p, "date") for p in prices], dtype="datetime64[s]"),
+        **{
+            name: np.fromiter((field(p, name) for p in prices), dtype=float, count=len(prices))
+            for name in OHLCV_FIELDS
+        },
+    }
+
+
+def _period_keys(dates: np.ndarray, timeframe: str) -> np.ndarray:
+    """Integer period of each timestamp (equal keys = same output bar)"""
+    if timeframe == "1h":
+        return dates.astype("datetime64[h]").astype(np.int64)
+    if timeframe == "4h":
+        return dates.astype("datetime64[h]").astype(np.int64) // 4
+    if timeframe == "1d":
+        return dates.astype("datetime64[D]").astype(np.int64)
+    if timeframe == "1wk":
+        # 1970-01-01 is a Thursday: shift by 3 days so weeks start on Monday
+        return (dates.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    if timeframe == "1mo":
+        return dates.astype("datetime64[M]").astype(np.int64)
+    raise ValueError(f"Unsupported timeframe '{timeframe}' (supported: {', '.join(TIMEFRAMES)})")
+
+
+def resample_ohlcv(bars: Bars, timeframe: str) -> Bars:
+    """
+    Aggregate OHLCV bars into a coarser timeframe
+
+    Args:
+        bars: Columnar bars sorted by date (price_arrays)
+        timeframe: Target timeframe (1h, 4h, 1d, 1wk, 1mo)
+
+    Returns:
+        Aggregated bars: open of the first bar, max high, min low, close of
+        the last bar and summed volume per period
+
+    Raises:
+        ValueError: If the timeframe is unknown or finer than the input
+            (intraday timeframes from daily bars)
+
+    Example:
+        >>> weekly = resample_ohlcv(daily, "1wk")
+    """
+    dates = np.asarray(bars["date"]).astype("datetime64[s]")
+    if len(dates) == 0:
+        return {"date": dates, **{name: np.asarray(bars[name], dtype=float) for name in OHLCV_FIELDS}}
+
+    if timeframe in INTRADAY_TIMEFRAMES and not (dates != dates.astype("datetime64[D]")).any():
+        raise ValueError(f"Cannot resample daily bars to {timeframe} - send intraday bars")
+
+    keys = _period_keys(dates, timeframe)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    ends = np.concatenate((starts[1:], [len(keys)])) - 1
+
+    return {
+        "date": dates[starts],
+        "open": np.asarray(bars["open"], dtype=float)[starts],
+        "high": np.maximum.reduceat(np.asarray(bars["high"], dtype=float), starts),
+        "low": np.minimum.reduceat(np.asarray(bars["low"], dtype=float), starts),
+        "close": np.asarray(bars["close"], dtype=float)[ends],
+        "volume": np.add.reduceat(np.asarray(bars["volume"], dtype=float), starts),
+    }
+
+
+class ResamplingService:
+    """
+    Daily bars per (source, ticker) and their cached aggregates per timeframe.
+
+    Example:
+        >>> service = ResamplingService(cotahist_service, yfinance_service, price_adjustment_service)
+        >>> weekly = await service.load_bars("cotahist", "PETR4", "1wk")
+    """
+
+    # Tickers kept in memory (least recently used are dropped)
+    MAX_TICKERS = int(os.getenv("RESAMPLING_MAX_TICKERS", "500"))
+
+    # Daily bars are reloaded from the source after this many seconds
+    TTL_SECONDS = int(os.getenv("RESAMPLING_TTL_SECONDS", "3600"))
+
+    # COTAHIST years loaded per ticker (current year included)
+    COTAHIST_YEARS = int(os.getenv("RESAMPLING_COTAHIST_YEARS", "10"))
+
+    def __init__(self, cotahist_service, yfinance_service, price_adjustment_service=None):
+        """
+        Args:
+            cotahist_service: CotahistService (source "cotahist")
+            yfinance_service: YFinanceService (source "yfinance")
+            price_adjustment_service: PriceAdjustmentService applied to COTAHIST
+                bars (optional - raw prices without it)
+        """
+        self.cotahist_service = cotahist_service
+        self.yfinance_service = yfinance_service
+        self.price_adjustment_service = price_adjustment_service
+
+        # (source, ticker) → (loaded_at, {timeframe → bars}); "1d" holds the base bars
+        self._store: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Bars]]]" = OrderedDict()
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        # (start_year, end_year) → background COTAHIST cache fill
+        self._cotahist_warmups: Dict[Tuple[int, int], asyncio.Task] = {}
+
+    def store_bars(self, source: str, ticker: str, bars: Bars) -> None:
+        """
+        Replace the daily bars of a ticker (drops its cached aggregates)
+
+        Args:
+            source: cotahist or yfinance
+            ticker: Asset ticker
+            bars: Daily columnar bars sorted by date
+        """
+        key = (source, ticker.upper())
+        self._store[key] = (time.monotonic(), {"1d": bars})
+        self._store.move_to_end(key)
+        while len(self._store) > self.MAX_TICKERS:
+            evicted, _ = self._store.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+    def get_bars(self, source: str, ticker: str, timeframe: str = "1d") -> Optional[Bars]:
+        """
+        Cached bars of a ticker in a timeframe (aggregated on first use)
+
+        Returns:
+            Bars or None if the ticker is not loaded or its bars expired
+        """
+        key = (source, ticker.upper())
+        entry = self._store.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.TTL_SECONDS:
+            return None
+
+        self._store.move_to_end(key)
+        aggregates = entry[1]
+        if timeframe not in aggregates:
+            aggregates[timeframe] = resample_ohlcv(aggregates["1d"], timeframe)
+        return aggregates[timeframe]
+
+    async def load_bars(self, source: str, ticker: str, timeframe: str = "1d") -> Bars:
+        """
+        Bars of a ticker in a timeframe, loading daily bars from the source if needed
+
+        Args:
+            source: cotahist or yfinance
+            ticker: Asset ticker (e.g. PETR4)
+            timeframe: 1d, 1wk or 1mo (sources only have daily bars)
+
+        Returns:
+            Columnar bars
+
+        Raises:
+            ValueError: If the source is unknown or has no data for the ticker
+            DataNotReadyError: If the COTAHIST years are not cached yet (they
+                are being downloaded in the background)
+        """
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source '{source}' (supported: {', '.join(SOURCES)})")
+
+        bars = self.get_bars(source, ticker, timeframe)
+        if bars is not None:
+            return bars
+
+        # One load per ticker even with concurrent requests
+        lock = self._locks.setdefault((source, ticker.upper()), asyncio.Lock())
+        async with lock:
+            bars = self.get_bars(source, ticker, timeframe)
+            if bars is not None:
+                return bars
+
+            start_time = time.perf_counter()
+            if source == "cotahist":
+                records = await self._load_cotahist(ticker.upper())
+                if not records:
+                    raise ValueError(f"No {source} data found for {ticker}")
+                bars = self._daily_bars(records)
+            else:
+                # Columnar straight from the history DataFrame (raises ValueError if empty)
+                columns = await self.yfinance_service.fetch_historical_data_async(
+                    ticker.upper(), "max", "1d", columnar=True
+                )
+                bars = self._daily_bars({name: columns[name] for name in ("date", *OHLCV_FIELDS)})
+
+            self.store_bars(source, ticker, bars)
+            logger.info(
+                f"Loaded {len(bars['date'])} {source} bars for {ticker} in "
+                f"{time.perf_counter() - start_time:.2f}s"
+            )
+            return self.get_bars(source, ticker, timeframe)
+
+    async def _load_cotahist(self, ticker: str) -> List[Dict]:
+        """
+        COTAHIST records of a ticker for the last COTAHIST_YEARS years (adjusted)
+
+        Read from the Parquet cache only. On a miss the years are fetched in
+        the background (filling the cache for every ticker, without moving
+        the /cotahist/delta watermark) and DataNotReadyError is raised.
+        Without pyarrow there is no cache: the years are fetched in the request.
+        """
+        end_year = datetime.now().year
+        start_year = end_year - self.COTAHIST_YEARS + 1
+
+        if self.cotahist_service.cache.enabled:
+            records = await asyncio.to_thread(
+                self.cotahist_service.read_cached_years, start_year, end_year, [ticker]
+            )
+            if records is None:
+                self._warm_cotahist_cache(start_year, end_year, ticker)
+                raise DataNotReadyError(
+                    f"COTAHIST {start_year}-{end_year} is not cached yet - "
+                    f"loading in the background, retry later"
+                )
+        else:
+            records = await self.cotahist_service.fetch_historical_data(
+                start_year=start_year, end_year=end_year, tickers=[ticker]
+            )
+
+        records = [record for record in records if record["ticker"] == ticker]
+        if records and self.price_adjustment_service is not None:
+            self.price_adjustment_service.adjust_records(records)
+        return records
+
+    def _warm_cotahist_cache(self, start_year: int, end_year: int, ticker: str) -> None:
+        """Fetch COTAHIST years in the background (one fill per year range at a time)"""
+        key = (start_year, end_year)
+        task = self._cotahist_warmups.get(key)
+        if task is not None and not task.done():
+            return
+
+        logger.info(f"COTAHIST {start_year}-{end_year} not cached - filling cache in the background")
+        task = asyncio.create_task(
+            self.cotahist_service.fetch_historical_data(
+                start_year=start_year, end_year=end_year, tickers=[ticker]
+            )
+        )
+        task.add_done_callback(self._log_warmup_failure)
+        self._cotahist_warmups[key] = task
+
+    @staticmethod
+    def _log_warmup_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"COTAHIST background cache fill failed: {task.exception()}")
+
+    @staticmethod
+    def _daily_bars(records: Union[List[Dict], Bars]) -> Bars:
+        """Records or columnar bars (any order) as daily bars sorted by date, one bar per day"""
+        bars = price_arrays(records)
+        order = np.argsort(bars["date"], kind="stable")
+        dates = bars["date"][order]
+        # Keep the last record of a duplicated day
+        last = np.concatenate((dates[1:] != dates[:-1], [True]))
+        return {name: values[order][last] for name, values in bars.items()}
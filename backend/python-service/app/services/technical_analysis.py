@@ -6,13 +6,18 @@ Precisão: 100% - bibliotecas validadas pela comunidade
 IMPORTANTE: pandas-ta foi descontinuado, usar pandas_ta_classic (fork oficial)
 """
 
+import os
+
 import pandas as pd
-import pandas_ta_classic as ta
 import numpy as np
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 
 from app.models import (
+    INDICATOR_ENGINES,
+    INDICATOR_PARAMS,
+    OHLCV_FIELDS,
+    IndicatorSpec,
     PriceDataPoint,
     TechnicalIndicators,
     MACDIndicator,
@@ -20,6 +25,46 @@ from app.models import (
     BollingerBandsIndicator,
     PivotPointsIndicator,
 )
+from app.services import indicator_kernels as kernels
+from app.services.indicator_cache import IndicatorCache, fingerprint_prices
+
+
+def _pandas_ta():
+    """
+    pandas_ta_classic, imported on first use
+
+    Importing it takes ~1.3s, so only the pandas_ta engine pays for it - the
+    numpy engine and the other services never load it.
+    """
+    import pandas_ta_classic
+
+    return pandas_ta_classic
+
+
+# List of PriceDataPoint objects or columnar arrays (PriceColumns/PriceBuffer.to_arrays)
+PriceInput = Union[List[PriceDataPoint], Dict[str, np.ndarray]]
+
+# Resolved indicator: (name, ((param, value), ...)) with every default filled in
+PlannedIndicator = Tuple[str, Tuple[Tuple[str, float], ...]]
+
+# Full fixed set (TechnicalIndicators) - used when the request selects nothing
+DEFAULT_INDICATOR_SET = (
+    IndicatorSpec(name="sma", params={"period": 20}),
+    IndicatorSpec(name="sma", params={"period": 50}),
+    IndicatorSpec(name="sma", params={"period": 200}),
+    IndicatorSpec(name="ema", params={"period": 9}),
+    IndicatorSpec(name="ema", params={"period": 21}),
+    IndicatorSpec(name="rsi"),
+    IndicatorSpec(name="macd"),
+    IndicatorSpec(name="stochastic"),
+    IndicatorSpec(name="bollinger_bands"),
+    IndicatorSpec(name="atr"),
+    IndicatorSpec(name="obv"),
+    IndicatorSpec(name="volume_sma"),
+    IndicatorSpec(name="pivot"),
+    IndicatorSpec(name="trend"),
+    IndicatorSpec(name="trend_strength"),
+)
 
 
 class TechnicalAnalysisService:
@@ -27,32 +72,41 @@ class TechnicalAnalysisService:
     Service for calculating technical indicators using pandas_ta
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[IndicatorCache] = None):
+        """
+        Args:
+            cache: LRU for calculate_indicator_arrays results (default:
+                IndicatorCache sized by INDICATOR_CACHE_MAX_MB)
+        """
         self.min_data_points = 200
+        self.cache = cache if cache is not None else IndicatorCache()
+        # pandas_ta (reference) or numpy (indicator_kernels); requests may override
+        self.default_engine = os.getenv("INDICATOR_ENGINE", "pandas_ta")
 
-    def _series_to_list(self, series: pd.Series) -> List[float]:
+    def _series_to_list(self, series: Union[pd.Series, np.ndarray]) -> List[Optional[float]]:
         """
-        Convert pandas Series to List[float], replacing NaN with None and filtering
+        Convert pandas Series / float array to List[float], replacing NaN with None
 
         Args:
-            series: Pandas Series
+            series: Pandas Series or NumPy array
 
         Returns:
-            List of float values (NaN values replaced with None, then filtered out)
+            List of float values (NaN values replaced with None)
         """
-        # Replace NaN with None, convert to list, then filter out None values
+        # tolist() converts to Python floats in C; only the NaN check runs per element
         # Frontend can handle missing data by not plotting those points
-        return [float(v) if not pd.isna(v) else None for v in series.values]
+        return [None if v != v else v for v in np.asarray(series, dtype=float).tolist()]
 
     def calculate_indicators(
-        self, ticker: str, prices: List[PriceDataPoint]
+        self, ticker: str, prices: PriceInput, engine: Optional[str] = None
     ) -> TechnicalIndicators:
         """
         Calculate all technical indicators
 
         Args:
             ticker: Asset ticker symbol
-            prices: List of OHLCV price data points (min 200)
+            prices: OHLCV price data points or columnar arrays (min 200)
+            engine: Calculation engine (see calculate_indicator_arrays)
 
         Returns:
             TechnicalIndicators object with all calculated indicators
@@ -60,63 +114,457 @@ class TechnicalAnalysisService:
         Raises:
             ValueError: If insufficient data points
         """
-        if len(prices) < self.min_data_points:
+        series, latest = self.calculate_indicator_arrays(ticker, prices, engine=engine)
+        return self.to_technical_indicators(series, latest)
+
+    def calculate_indicator_arrays(
+        self,
+        ticker: str,
+        prices: PriceInput,
+        indicators: Optional[List[IndicatorSpec]] = None,
+        engine: Optional[str] = None,
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Calculate technical indicators as NumPy arrays (no per-element conversion)
+
+        Used directly by the columnar response encodings; calculate_indicators
+        converts the same arrays to lists.
+
+        Only the selected indicators are calculated. Intermediates shared
+        between them (SMA50/200 for trend, the fast/slow EMAs for MACD, the
+        middle band SMA for Bollinger) are computed once per request.
+        Results are cached by price series fingerprint + indicator plan
+        (self.cache); arrays returned from the cache are read-only.
+
+        Args:
+            ticker: Asset ticker symbol
+            prices: OHLCV price data points or columnar arrays (min 200)
+            indicators: Indicators to calculate (default: DEFAULT_INDICATOR_SET)
+            engine: "pandas_ta" or "numpy" (indicator_kernels: same results
+                to floating point tolerance, less overhead). Default:
+                INDICATOR_ENGINE env var, pandas_ta if unset
+
+        Returns:
+            Tuple (series, latest):
+            - series: flat name -> float array (NaN where not calculable), e.g.
+              sma_20, macd_signal, stochastic_k, bb_upper
+            - latest: bb_bandwidth, pivot, trend, trend_strength
+
+            Non-default parameters are appended to the names (rsi_21,
+            macd_5_35_5, bb_upper_20_2.5); SMA/EMA are always sma_<period>.
+
+        Raises:
+            ValueError: If insufficient data points or unknown engine
+        """
+        engine = engine or self.default_engine
+        if engine not in INDICATOR_ENGINES:
+            raise ValueError(f"Unknown indicator engine '{engine}' (supported: {', '.join(INDICATOR_ENGINES)})")
+
+        data_points = self._price_count(prices)
+        if data_points < self.min_data_points:
+            raise ValueError(
+                f"Insufficient data - need at least {self.min_data_points} price points, got {data_points}"
+            )
+
+        plan = self.plan_indicators(indicators)
+        longest = max(
+            (value for _, params in plan for param, value in params if param != "std_dev"),
+            default=0,
+        )
+        if longest > data_points:
             raise ValueError(
-                f"Insufficient data - need at least {self.min_data_points} price points, got {len(prices)}"
+                f"Indicator period {longest:g} exceeds the {data_points} price points provided"
             )
 
         # Convert to pandas DataFrame
         df = self._create_dataframe(prices)
 
-        # Calculate all indicators
-        indicators = {
-            # Trend Indicators
-            "sma_20": self._calculate_sma(df, 20),
-            "sma_50": self._calculate_sma(df, 50),
-            "sma_200": self._calculate_sma(df, 200),
-            "ema_9": self._calculate_ema(df, 9),
-            "ema_21": self._calculate_ema(df, 21),
-            # Momentum Indicators
-            "rsi": self._calculate_rsi(df, 14),
-            "macd": self._calculate_macd(df),
-            "stochastic": self._calculate_stochastic(df, 14),
-            # Volatility Indicators
-            "bollinger_bands": self._calculate_bollinger_bands(df, 20, 2),
-            "atr": self._calculate_atr(df, 14),
-            # Volume Indicators
-            "obv": self._calculate_obv(df),
-            "volume_sma": self._calculate_volume_sma(df, 20),
-            # Support and Resistance
-            "pivot": self._calculate_pivot_points(df),
-            # Trend Analysis
-            "trend": self._detect_trend(df),
-            "trend_strength": self._calculate_trend_strength(df),
+        cache_key = None
+        if self.cache.enabled:
+            cache_key = (fingerprint_prices(df), plan, engine)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Intermediates shared between indicators: (kind, *params) -> array
+        memo: Dict[Tuple, np.ndarray] = {}
+        series: Dict[str, np.ndarray] = {}
+        latest: Dict[str, Any] = {}
+
+        for name, params in plan:
+            suffix = self._indicator_suffix(name, params)
+            resolve = getattr(self, f"_resolve_{name}")
+            indicator_series, indicator_latest = resolve(df, memo, engine, **dict(params))
+            series.update({key + suffix: values for key, values in indicator_series.items()})
+            latest.update({key + suffix: value for key, value in indicator_latest.items()})
+
+        if cache_key is not None:
+            return self.cache.put(cache_key, (series, latest))
+        return series, latest
+
+    @staticmethod
+    def plan_indicators(
+        indicators: Optional[List[IndicatorSpec]] = None,
+    ) -> Tuple[PlannedIndicator, ...]:
+        """
+        Resolve the requested indicators: fill in default params, drop duplicates
+
+        Args:
+            indicators: Requested indicators (None = DEFAULT_INDICATOR_SET)
+
+        Returns:
+            Hashable tuple of (name, ((param, value), ...)) in request order
+        """
+        planned = []
+        for spec in indicators or DEFAULT_INDICATOR_SET:
+            params = {**INDICATOR_PARAMS[spec.name], **spec.params}
+            entry = (spec.name, tuple(params.items()))
+            if entry not in planned:
+                planned.append(entry)
+        return tuple(planned)
+
+    @staticmethod
+    def _indicator_suffix(name: str, params: Tuple[Tuple[str, float], ...]) -> str:
+        """Output name suffix for non-default params ("" for defaults, SMA and EMA)"""
+        if name in ("sma", "ema") or dict(params) == INDICATOR_PARAMS[name]:
+            return ""
+        return "".join(f"_{value:g}" for _, value in params)
+
+    @staticmethod
+    def _cached(memo: Dict[Tuple, Any], key: Tuple, compute: Callable[[], Any]) -> Any:
+        """Return memo[key], computing it on first use"""
+        if key not in memo:
+            memo[key] = compute()
+        return memo[key]
+
+    # ========================================================================
+    # INDICATOR RESOLVERS (name -> (series, latest), sharing the request memo)
+    # ========================================================================
+
+    def _resolve_sma(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        sma = self._cached(memo, ("sma", period), lambda: self._calculate_sma(df, period, engine))
+        return {f"sma_{period}": sma}, {}
+
+    def _resolve_ema(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        ema = self._cached(memo, ("ema", period), lambda: self._calculate_ema(df, period, engine))
+        return {f"ema_{period}": ema}, {}
+
+    def _resolve_rsi(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        return {"rsi": self._calculate_rsi(df, period, engine)}, {}
+
+    def _resolve_macd(self, df: pd.DataFrame, memo: Dict, engine: str, fast: int, slow: int, signal: int):
+        fast_ema = self._resolve_ema(df, memo, engine, fast)[0][f"ema_{fast}"]
+        slow_ema = self._resolve_ema(df, memo, engine, slow)[0][f"ema_{slow}"]
+        return self._calculate_macd(df, fast_ema, slow_ema, signal, engine), {}
+
+    def _resolve_stochastic(
+        self, df: pd.DataFrame, memo: Dict, engine: str, period: int, d: int, smooth_k: int
+    ):
+        return self._calculate_stochastic(df, period, d, smooth_k, engine), {}
+
+    def _resolve_bollinger_bands(self, df: pd.DataFrame, memo: Dict, engine: str, period: int, std_dev: float):
+        middle = self._resolve_sma(df, memo, engine, period)[0][f"sma_{period}"]
+        bands = self._calculate_bollinger_bands(df, middle, period, std_dev, engine)
+        return bands, {"bb_bandwidth": self._calculate_bandwidth(bands)}
+
+    def _resolve_atr(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        return {"atr": self._calculate_atr(df, period, engine)}, {}
+
+    def _resolve_obv(self, df: pd.DataFrame, memo: Dict, engine: str):
+        return {"obv": self._calculate_obv(df, engine)}, {}
+
+    def _resolve_volume_sma(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        return {"volume_sma": self._calculate_volume_sma(df, period, engine)}, {}
+
+    def _resolve_pivot(self, df: pd.DataFrame, memo: Dict, engine: str):
+        return {}, {"pivot": self._calculate_pivot_points(df)}
+
+    def _resolve_trend(self, df: pd.DataFrame, memo: Dict, engine: str, fast: int, slow: int):
+        sma_fast = self._resolve_sma(df, memo, engine, fast)[0][f"sma_{fast}"]
+        sma_slow = self._resolve_sma(df, memo, engine, slow)[0][f"sma_{slow}"]
+        return {}, {"trend": self._detect_trend(df, sma_fast, sma_slow)}
+
+    def _resolve_trend_strength(self, df: pd.DataFrame, memo: Dict, engine: str, period: int):
+        return {}, {"trend_strength": self._calculate_trend_strength(df, period)}
+
+    def to_technical_indicators(
+        self, series: Dict[str, np.ndarray], latest: Dict[str, Any]
+    ) -> TechnicalIndicators:
+        """
+        Build the TechnicalIndicators response model from indicator arrays
+
+        Args:
+            series: Indicator arrays (calculate_indicator_arrays)
+            latest: Latest-value indicators (calculate_indicator_arrays)
+
+        Returns:
+            TechnicalIndicators with NaN converted to None
+        """
+        to_list = self._series_to_list
+
+        return TechnicalIndicators(
+            sma_20=to_list(series["sma_20"]),
+            sma_50=to_list(series["sma_50"]),
+            sma_200=to_list(series["sma_200"]),
+            ema_9=to_list(series["ema_9"]),
+            ema_21=to_list(series["ema_21"]),
+            rsi=to_list(series["rsi"]),
+            macd=MACDIndicator(
+                macd=to_list(series["macd"]),
+                signal=to_list(series["macd_signal"]),
+                histogram=to_list(series["macd_histogram"]),
+            ),
+            stochastic=StochasticIndicator(
+                k=to_list(series["stochastic_k"]),
+                d=to_list(series["stochastic_d"]),
+            ),
+            bollinger_bands=BollingerBandsIndicator(
+                upper=to_list(series["bb_upper"]),
+                middle=to_list(series["bb_middle"]),
+                lower=to_list(series["bb_lower"]),
+                bandwidth=latest["bb_bandwidth"],
+            ),
+            atr=to_list(series["atr"]),
+            obv=to_list(series["obv"]),
+            volume_sma=to_list(series["volume_sma"]),
+            pivot=latest["pivot"],
+            trend=latest["trend"],
+            trend_strength=latest["trend_strength"],
+        )
+
+    def calculate_indicators_batch(
+        self, series: Dict[str, PriceInput]
+    ) -> Tuple[Dict[str, TechnicalIndicators], Dict[str, str]]:
+        """
+        Calculate all technical indicators for many tickers in one vectorized pass
+
+        Args:
+            series: Mapping ticker -> OHLCV price history (sorted by date)
+
+        Returns:
+            Tuple (indicators by ticker, error message by ticker). Tickers with
+            insufficient data are reported in errors instead of failing the batch
+        """
+        arrays, errors = self.calculate_indicator_arrays_batch(series)
+        return (
+            {ticker: self.to_technical_indicators(*result) for ticker, result in arrays.items()},
+            errors,
+        )
+
+    def calculate_indicator_arrays_batch(
+        self, series: Dict[str, PriceInput]
+    ) -> Tuple[Dict[str, Tuple[Dict[str, np.ndarray], Dict[str, Any]]], Dict[str, str]]:
+        """
+        Calculate indicator arrays for many tickers in one vectorized pass
+
+        Series are right-aligned into (time x ticker) frames, padded with NaN at
+        the start, and each indicator is computed for every column at once with
+        pandas rolling/ewm. Formulas mirror pandas_ta_classic (same seeds and
+        smoothing), so results match calculate_indicator_arrays per ticker.
+
+        Args:
+            series: Mapping ticker -> OHLCV price history (sorted by date)
+
+        Returns:
+            Tuple ((series, latest) by ticker, error message by ticker)
+        """
+        errors = {
+            ticker: f"Insufficient data - need at least {self.min_data_points} price points, got {self._price_count(prices)}"
+            for ticker, prices in series.items()
+            if self._price_count(prices) < self.min_data_points
+        }
+        tickers = [ticker for ticker in series if ticker not in errors]
+        if not tickers:
+            return {}, errors
+
+        frames, first_rows = self._create_batch_frames([series[t] for t in tickers])
+        close, high, low, volume = frames["close"], frames["high"], frames["low"], frames["volume"]
+
+        # Shared intermediates (SMA50/200 are reused by the trend detection)
+        sma_20 = close.rolling(20).mean()
+        sma_50 = close.rolling(50).mean()
+        sma_200 = close.rolling(200).mean()
+
+        # MACD (12, 26, 9): signal is an SMA-seeded EMA of the MACD line
+        macd_line = self._batch_ema(close, 12) - self._batch_ema(close, 26)
+        macd_signal = self._batch_ema(macd_line, 9)
+
+        # Stochastic (14, 3, 3)
+        lowest_low = low.rolling(14).min()
+        stoch = 100 * (close - lowest_low) / self._batch_non_zero_range(high.rolling(14).max(), lowest_low)
+        stoch_k = stoch.rolling(3).mean()
+        stoch_d = stoch_k.rolling(3).mean()
+
+        # Bollinger Bands (20, 2) - population std (ddof=0) like pandas_ta
+        deviation = 2.0 * close.rolling(20).std(ddof=0)
+
+        # ATR (14): RMA of the true range, first bar of each series undefined
+        prev_close = close.shift(1)
+        true_range = np.fmax(
+            np.fmax(self._batch_non_zero_range(high, low).abs(), (high - prev_close).abs()),
+            (prev_close - low).abs(),
+        ).to_numpy()
+        true_range[first_rows, np.arange(len(tickers))] = np.nan
+
+        # OBV: signed volume, first bar of each series counted as positive
+        sign = np.sign(close.diff().to_numpy())
+        sign[first_rows, np.arange(len(tickers))] = 1
+        obv = pd.DataFrame(sign * volume.to_numpy()).cumsum()
+
+        columns = {
+            "sma_20": sma_20,
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "ema_9": self._batch_ema(close, 9),
+            "ema_21": self._batch_ema(close, 21),
+            "rsi": self._batch_rsi(close, 14),
+            "macd": macd_line,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_line - macd_signal,
+            "stochastic_k": stoch_k,
+            "stochastic_d": stoch_d,
+            "bb_upper": sma_20 + deviation,
+            "bb_middle": sma_20,
+            "bb_lower": sma_20 - deviation,
+            "atr": self._batch_rma(pd.DataFrame(true_range), 14),
+            "obv": obv,
+            "volume_sma": volume.rolling(20).mean(),
         }
+        values = {name: frame.to_numpy() for name, frame in columns.items()}
+
+        # Latest-value indicators, all tickers at once (last row = last bar)
+        last_close = close.to_numpy()[-1]
+        last_high = high.to_numpy()[-1]
+        last_low = low.to_numpy()[-1]
+        recent_closes = close.to_numpy()[-20:]
+        slopes = np.polyfit(np.arange(len(recent_closes)), recent_closes, 1)[0]
+        strengths = np.minimum(100, np.abs(slopes / recent_closes.mean(axis=0) * 100) * 10)
+
+        results = {}
+        for column, ticker in enumerate(tickers):
+            start = first_rows[column]
+            ticker_series = {name: values[name][start:, column] for name in values}
+
+            # ta.stoch returns %K/%D starting at the first full 14-bar window
+            for name in ("stochastic_k", "stochastic_d"):
+                ticker_series[name] = ticker_series[name][13:]
+
+            latest = {
+                "bb_bandwidth": self._calculate_bandwidth(ticker_series),
+                "pivot": self._pivot_points_from_values(
+                    float(last_high[column]), float(last_low[column]), float(last_close[column])
+                ),
+                "trend": self._trend_from_values(
+                    float(last_close[column]),
+                    float(values["sma_50"][-1, column]),
+                    float(values["sma_200"][-1, column]),
+                ),
+                "trend_strength": float(round(strengths[column], 2)),
+            }
+            results[ticker] = (ticker_series, latest)
+
+        return results, errors
+
+    def _create_batch_frames(
+        self, batch: List[PriceInput]
+    ) -> Tuple[Dict[str, pd.DataFrame], np.ndarray]:
+        """
+        Pack many price series into right-aligned (time x ticker) frames
 
-        return TechnicalIndicators(**indicators)
+        Args:
+            batch: One price history per ticker (objects or columnar arrays)
 
-    def _create_dataframe(self, prices: List[PriceDataPoint]) -> pd.DataFrame:
+        Returns:
+            Tuple (frames by field, first valid row of each column)
+        """
+        lengths = np.array([self._price_count(prices) for prices in batch])
+        rows = int(lengths.max())
+        first_rows = rows - lengths
+
+        # (field, time, ticker)
+        data = np.full((len(OHLCV_FIELDS), rows, len(batch)), np.nan)
+        for column, prices in enumerate(batch):
+            data[:, first_rows[column]:, column] = self._price_matrix(prices)
+
+        frames = {
+            field: pd.DataFrame(data[position])
+            for position, field in enumerate(OHLCV_FIELDS)
+        }
+        return frames, first_rows
+
+    @staticmethod
+    def _price_count(prices: PriceInput) -> int:
+        """Number of bars in a price history (objects or columnar arrays)"""
+        return len(prices["close"]) if isinstance(prices, dict) else len(prices)
+
+    @staticmethod
+    def _price_matrix(prices: PriceInput) -> np.ndarray:
+        """OHLCV values as a (5, n) float array"""
+        if isinstance(prices, dict):
+            return np.vstack([prices[field] for field in OHLCV_FIELDS])
+        # One pass over the data points instead of one per field
+        matrix = np.array([(p.open, p.high, p.low, p.close, p.volume) for p in prices], dtype=float)
+        return matrix.reshape(-1, len(OHLCV_FIELDS)).T
+
+    @staticmethod
+    def _batch_ema(frame: pd.DataFrame, length: int) -> pd.DataFrame:
+        """
+        Column-wise EMA seeded with the SMA of each column's first `length` values
+
+        Same as ta.ema(sma=True): values before the seed are NaN, then
+        ewm(span=length, adjust=False) from the seed onwards.
+        """
+        values = frame.to_numpy(copy=True)
+        valid = ~np.isnan(values)
+        first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+        seed_rows = first_valid + length - 1
+
+        columns = np.arange(values.shape[1])
+        has_seed = seed_rows < len(values)
+        seeds = frame.rolling(length).mean().to_numpy()[seed_rows[has_seed], columns[has_seed]]
+
+        values[np.arange(len(values))[:, None] < seed_rows] = np.nan
+        values[seed_rows[has_seed], columns[has_seed]] = seeds
+
+        return pd.DataFrame(values).ewm(span=length, adjust=False).mean()
+
+    @staticmethod
+    def _batch_rma(frame: pd.DataFrame, length: int) -> pd.DataFrame:
+        """Column-wise Wilder's moving average (same as ta.rma)"""
+        return frame.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+    def _batch_rsi(self, close: pd.DataFrame, length: int) -> pd.DataFrame:
+        """Column-wise RSI (same as ta.rsi without talib)"""
+        change = close.diff()
+        positive_avg = self._batch_rma(change.clip(lower=0), length)
+        negative_avg = self._batch_rma(change.clip(upper=0), length)
+        return 100 * positive_avg / (positive_avg + negative_avg.abs())
+
+    @staticmethod
+    def _batch_non_zero_range(high: pd.DataFrame, low: pd.DataFrame) -> pd.DataFrame:
+        """Column-wise high - low, plus epsilon in columns with any zero range (like ta's non_zero_range)"""
+        diff = high - low
+        return diff + np.finfo(float).eps * (diff == 0).any(axis=0)
+
+    def _create_dataframe(self, prices: PriceInput) -> pd.DataFrame:
         """
         Convert price data to pandas DataFrame
 
         Args:
-            prices: List of OHLCV data points
+            prices: List of OHLCV data points or columnar arrays (no per-bar conversion)
 
         Returns:
             DataFrame with OHLCV data
         """
-        data = {
-            "date": [p.date for p in prices],
-            "open": [p.open for p in prices],
-            "high": [p.high for p in prices],
-            "low": [p.low for p in prices],
-            "close": [p.close for p in prices],
-            "volume": [p.volume for p in prices],
-        }
+        if isinstance(prices, dict):
+            dates = prices["date"]
+        else:
+            dates = [p.date for p in prices]
 
-        df = pd.DataFrame(data)
-        df["date"] = pd.to_datetime(df["date"])
-        df.set_index("date", inplace=True)
+        df = pd.DataFrame(
+            dict(zip(OHLCV_FIELDS, self._price_matrix(prices))),
+            index=pd.DatetimeIndex(pd.to_datetime(dates), name="date"),
+        )
 
         return df
 
@@ -124,78 +572,110 @@ class TechnicalAnalysisService:
     # TREND INDICATORS
     # ========================================================================
 
-    def _calculate_sma(self, df: pd.DataFrame, period: int) -> List[float]:
+    def _calculate_sma(self, df: pd.DataFrame, period: int, engine: str = "pandas_ta") -> np.ndarray:
         """
-        Simple Moving Average using pandas_ta
+        Simple Moving Average using pandas_ta (or the NumPy kernel)
 
         Args:
             df: OHLCV DataFrame
             period: SMA period
+            engine: pandas_ta or numpy
 
         Returns:
             Historical SMA values (array)
         """
-        sma = ta.sma(df["close"], length=period)
-        return self._series_to_list(sma)
+        if engine == "numpy":
+            return kernels.sma(df["close"].to_numpy(), period)
+        sma = _pandas_ta().sma(df["close"], length=period)
+        return sma.to_numpy(dtype=float)
 
-    def _calculate_ema(self, df: pd.DataFrame, period: int) -> List[float]:
+    def _calculate_ema(self, df: pd.DataFrame, period: int, engine: str = "pandas_ta") -> np.ndarray:
         """
-        Exponential Moving Average using pandas_ta
+        Exponential Moving Average using pandas_ta (or the NumPy kernel)
 
         Args:
             df: OHLCV DataFrame
             period: EMA period
+            engine: pandas_ta or numpy
 
         Returns:
             Historical EMA values (array)
         """
-        ema = ta.ema(df["close"], length=period)
-        return self._series_to_list(ema)
+        if engine == "numpy":
+            return kernels.ema(df["close"].to_numpy(), period)
+        ema = _pandas_ta().ema(df["close"], length=period)
+        return ema.to_numpy(dtype=float)
 
     # ========================================================================
     # MOMENTUM INDICATORS
     # ========================================================================
 
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> List[float]:
+    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14, engine: str = "pandas_ta") -> np.ndarray:
         """
-        Relative Strength Index using pandas_ta
+        Relative Strength Index using pandas_ta (or the NumPy kernel)
 
         Args:
             df: OHLCV DataFrame
             period: RSI period (default 14)
+            engine: pandas_ta or numpy
 
         Returns:
             Historical RSI values (0-100) as array
         """
-        rsi = ta.rsi(df["close"], length=period)
-        return self._series_to_list(rsi)
-
-    def _calculate_macd(self, df: pd.DataFrame) -> MACDIndicator:
+        if engine == "numpy":
+            return kernels.rsi(df["close"].to_numpy(), period)
+        rsi = _pandas_ta().rsi(df["close"], length=period)
+        return rsi.to_numpy(dtype=float)
+
+    def _calculate_macd(
+        self,
+        df: pd.DataFrame,
+        fast_ema: np.ndarray,
+        slow_ema: np.ndarray,
+        signal: int = 9,
+        engine: str = "pandas_ta",
+    ) -> Dict[str, np.ndarray]:
         """
-        MACD (Moving Average Convergence Divergence) using pandas_ta
+        MACD (Moving Average Convergence Divergence) from precomputed EMAs
 
-        Calculation:
-        - MACD Line = EMA(12) - EMA(26)
-        - Signal Line = EMA(9) of MACD Line
+        Calculation (same as pandas_ta macd):
+        - MACD Line = EMA(fast) - EMA(slow)
+        - Signal Line = EMA(signal) of MACD Line, from its first valid value
         - Histogram = MACD - Signal
 
         Args:
             df: OHLCV DataFrame
+            fast_ema: EMA(fast) of close (e.g. 12)
+            slow_ema: EMA(slow) of close (e.g. 26)
+            signal: Signal line period (default 9)
+            engine: pandas_ta or numpy
 
         Returns:
-            MACDIndicator with historical arrays for macd, signal, histogram
+            Historical arrays for macd, macd_signal, macd_histogram
         """
-        macd_df = ta.macd(df["close"], fast=12, slow=26, signal=9)
-
-        return MACDIndicator(
-            macd=self._series_to_list(macd_df[f"MACD_12_26_9"]),
-            signal=self._series_to_list(macd_df[f"MACDs_12_26_9"]),
-            histogram=self._series_to_list(macd_df[f"MACDh_12_26_9"]),
-        )
+        if engine == "numpy":
+            return kernels.macd(
+                df["close"].to_numpy(), signal=signal, fast_ema=fast_ema, slow_ema=slow_ema
+            )
+        macd = pd.Series(fast_ema - slow_ema, index=df.index)
+        signal_line = _pandas_ta().ema(macd.loc[macd.first_valid_index():], length=signal)
+        signal_line = signal_line.reindex(df.index).to_numpy(dtype=float)
+        macd = macd.to_numpy(dtype=float)
+
+        return {
+            "macd": macd,
+            "macd_signal": signal_line,
+            "macd_histogram": macd - signal_line,
+        }
 
     def _calculate_stochastic(
-        self, df: pd.DataFrame, period: int = 14
-    ) -> StochasticIndicator:
+        self,
+        df: pd.DataFrame,
+        period: int = 14,
+        d: int = 3,
+        smooth_k: int = 3,
+        engine: str = "pandas_ta",
+    ) -> Dict[str, np.ndarray]:
         """
         Stochastic Oscillator using pandas_ta
 
@@ -206,101 +686,131 @@ class TechnicalAnalysisService:
         Args:
             df: OHLCV DataFrame
             period: Stochastic period (default 14)
+            d: %D smoothing period (default 3)
+            smooth_k: %K smoothing period (default 3)
+            engine: pandas_ta or numpy
 
         Returns:
-            StochasticIndicator with historical arrays for k and d
+            Historical arrays for stochastic_k and stochastic_d
         """
-        stoch_df = ta.stoch(
-            df["high"], df["low"], df["close"], k=period, d=3, smooth_k=3
+        if engine == "numpy":
+            return kernels.stochastic(
+                df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), period, d, smooth_k
+            )
+        stoch_df = _pandas_ta().stoch(
+            df["high"], df["low"], df["close"], k=period, d=d, smooth_k=smooth_k
         )
 
-        return StochasticIndicator(
-            k=self._series_to_list(stoch_df[f"STOCHk_{period}_3_3"]),
-            d=self._series_to_list(stoch_df[f"STOCHd_{period}_3_3"]),
-        )
+        return {
+            "stochastic_k": stoch_df[f"STOCHk_{period}_{d}_{smooth_k}"].to_numpy(dtype=float),
+            "stochastic_d": stoch_df[f"STOCHd_{period}_{d}_{smooth_k}"].to_numpy(dtype=float),
+        }
 
     # ========================================================================
     # VOLATILITY INDICATORS
     # ========================================================================
 
     def _calculate_bollinger_bands(
-        self, df: pd.DataFrame, period: int = 20, std_dev: float = 2.0
-    ) -> BollingerBandsIndicator:
+        self,
+        df: pd.DataFrame,
+        middle: np.ndarray,
+        period: int = 20,
+        std_dev: float = 2.0,
+        engine: str = "pandas_ta",
+    ) -> Dict[str, np.ndarray]:
         """
-        Bollinger Bands using pandas_ta
+        Bollinger Bands around a precomputed SMA (same as pandas_ta bbands)
 
         Args:
             df: OHLCV DataFrame
+            middle: SMA(period) of close - the middle band
             period: BB period (default 20)
             std_dev: Standard deviation multiplier (default 2)
+            engine: pandas_ta or numpy
 
         Returns:
-            BollingerBandsIndicator with historical arrays for upper, middle, lower, and latest bandwidth
-        """
-        bb_df = ta.bbands(df["close"], length=period, std=std_dev)
-
-        # pandas_ta uses float notation in column names (e.g., "BBU_20_2.0")
-        upper_series = bb_df[f"BBU_{period}_{float(std_dev)}"]
-        middle_series = bb_df[f"BBM_{period}_{float(std_dev)}"]
-        lower_series = bb_df[f"BBL_{period}_{float(std_dev)}"]
-
-        # Calculate bandwidth (latest value only)
-        upper_latest = float(upper_series.iloc[-1])
-        middle_latest = float(middle_series.iloc[-1])
-        lower_latest = float(lower_series.iloc[-1])
-        bandwidth = ((upper_latest - lower_latest) / middle_latest) * 100
-
-        return BollingerBandsIndicator(
-            upper=self._series_to_list(upper_series),
-            middle=self._series_to_list(middle_series),
-            lower=self._series_to_list(lower_series),
-            bandwidth=bandwidth
-        )
+            Historical arrays for bb_upper, bb_middle, bb_lower
+        """
+        if engine == "numpy":
+            return kernels.bollinger_bands(df["close"].to_numpy(), period, std_dev, middle=middle)
+        # Population standard deviation (ddof=0), as pandas_ta bbands
+        deviations = std_dev * _pandas_ta().stdev(df["close"], length=period, ddof=0).to_numpy(dtype=float)
+
+        return {
+            "bb_upper": middle + deviations,
+            "bb_middle": middle,
+            "bb_lower": middle - deviations,
+        }
 
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> List[float]:
+    @staticmethod
+    def _calculate_bandwidth(series: Dict[str, np.ndarray]) -> float:
         """
-        Average True Range using pandas_ta
+        Bollinger bandwidth of the latest bar: (upper - lower) / middle * 100
+
+        Args:
+            series: Indicator arrays containing bb_upper, bb_middle, bb_lower
+
+        Returns:
+            Latest bandwidth (percentage)
+        """
+        upper_latest = float(series["bb_upper"][-1])
+        middle_latest = float(series["bb_middle"][-1])
+        lower_latest = float(series["bb_lower"][-1])
+        return ((upper_latest - lower_latest) / middle_latest) * 100
+
+    def _calculate_atr(self, df: pd.DataFrame, period: int = 14, engine: str = "pandas_ta") -> np.ndarray:
+        """
+        Average True Range using pandas_ta (or the NumPy kernel)
 
         Args:
             df: OHLCV DataFrame
             period: ATR period (default 14)
+            engine: pandas_ta or numpy
 
         Returns:
             Historical ATR values (array)
         """
-        atr = ta.atr(df["high"], df["low"], df["close"], length=period)
-        return self._series_to_list(atr)
+        if engine == "numpy":
+            return kernels.atr(df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), period)
+        atr = _pandas_ta().atr(df["high"], df["low"], df["close"], length=period)
+        return atr.to_numpy(dtype=float)
 
     # ========================================================================
     # VOLUME INDICATORS
     # ========================================================================
 
-    def _calculate_obv(self, df: pd.DataFrame) -> List[float]:
+    def _calculate_obv(self, df: pd.DataFrame, engine: str = "pandas_ta") -> np.ndarray:
         """
-        On-Balance Volume using pandas_ta
+        On-Balance Volume using pandas_ta (or the NumPy kernel)
 
         Args:
             df: OHLCV DataFrame
+            engine: pandas_ta or numpy
 
         Returns:
             Historical OBV values (array)
         """
-        obv = ta.obv(df["close"], df["volume"])
-        return self._series_to_list(obv)
+        if engine == "numpy":
+            return kernels.obv(df["close"].to_numpy(), df["volume"].to_numpy())
+        obv = _pandas_ta().obv(df["close"], df["volume"])
+        return obv.to_numpy(dtype=float)
 
-    def _calculate_volume_sma(self, df: pd.DataFrame, period: int = 20) -> List[float]:
+    def _calculate_volume_sma(self, df: pd.DataFrame, period: int = 20, engine: str = "pandas_ta") -> np.ndarray:
         """
         Volume Simple Moving Average
 
         Args:
             df: OHLCV DataFrame
             period: SMA period (default 20)
+            engine: pandas_ta or numpy
 
         Returns:
             Historical Volume SMA values (array)
         """
-        volume_sma = ta.sma(df["volume"], length=period)
-        return self._series_to_list(volume_sma)
+        if engine == "numpy":
+            return kernels.sma(df["volume"].to_numpy(), period)
+        volume_sma = _pandas_ta().sma(df["volume"], length=period)
+        return volume_sma.to_numpy(dtype=float)
 
     # ========================================================================
     # SUPPORT AND RESISTANCE
@@ -320,6 +830,11 @@ class TechnicalAnalysisService:
         low = float(df["low"].iloc[-1])
         close = float(df["close"].iloc[-1])
 
+        return self._pivot_points_from_values(high, low, close)
+
+    @staticmethod
+    def _pivot_points_from_values(high: float, low: float, close: float) -> PivotPointsIndicator:
+        """Standard pivot points from the last bar's high, low and close"""
         pivot = (high + low + close) / 3
         r1 = 2 * pivot - low
         s1 = 2 * pivot - high
@@ -336,7 +851,9 @@ class TechnicalAnalysisService:
     # TREND ANALYSIS
     # ========================================================================
 
-    def _detect_trend(self, df: pd.DataFrame) -> str:
+    def _detect_trend(
+        self, df: pd.DataFrame, sma_50_array: np.ndarray, sma_200_array: np.ndarray
+    ) -> str:
         """
         Detect current trend based on moving averages
 
@@ -347,17 +864,22 @@ class TechnicalAnalysisService:
 
         Args:
             df: OHLCV DataFrame
+            sma_50_array: Precomputed fast SMA (default SMA50)
+            sma_200_array: Precomputed slow SMA (default SMA200)
 
         Returns:
             Trend direction: 'UPTREND', 'DOWNTREND', or 'SIDEWAYS'
         """
         current_price = float(df["close"].iloc[-1])
         # Get latest values from arrays
-        sma_50_array = self._calculate_sma(df, 50)
-        sma_200_array = self._calculate_sma(df, 200)
-        sma_50 = sma_50_array[-1] if sma_50_array else 0
-        sma_200 = sma_200_array[-1] if sma_200_array else 0
+        sma_50 = float(sma_50_array[-1]) if len(sma_50_array) else 0
+        sma_200 = float(sma_200_array[-1]) if len(sma_200_array) else 0
+
+        return self._trend_from_values(current_price, sma_50, sma_200)
 
+    @staticmethod
+    def _trend_from_values(current_price: float, sma_50: float, sma_200: float) -> str:
+        """Classify trend from the latest price, SMA50 and SMA200"""
         if current_price > sma_50 and sma_50 > sma_200:
             return "UPTREND"
         elif current_price < sma_50 and sma_50 < sma_200:
@@ -365,7 +887,7 @@ class TechnicalAnalysisService:
         else:
             return "SIDEWAYS"
 
-    def _calculate_trend_strength(self, df: pd.DataFrame) -> float:
+    def _calculate_trend_strength(self, df: pd.DataFrame, period: int = 20) -> float:
         """
         Calculate trend strength using linear regression
 
@@ -376,19 +898,20 @@ class TechnicalAnalysisService:
 
         Args:
             df: OHLCV DataFrame
+            period: Number of recent periods in the regression (default 20)
 
         Returns:
             Trend strength (0-100)
         """
-        # Use last 20 periods for trend strength
-        recent_closes = df["close"].tail(20).values
+        # Use last `period` periods for trend strength
+        recent_closes = df["close"].tail(period).values
         x = np.arange(len(recent_closes))
 
         # Linear regression
         slope, _ = np.polyfit(x, recent_closes, 1)
 
         # Normalize slope to 0-100 scale
-        avg_price = float(df["close"].tail(20).mean())
+        avg_price = float(df["close"].tail(period).mean())
         strength = min(100, abs((slope / avg_price) * 100) * 10)
 
         return float(round(strength, 2))
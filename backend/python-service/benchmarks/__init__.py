@@ -0,0 +1,7 @@
+"""
+Benchmarks do Python Service (indicadores técnicos)
+
+Uso:
+    cd backend/python-service
+    python -m benchmarks.run --help
+"""
@@ -0,0 +1,80 @@
+"""
+Fixtures sintéticas OHLCV para os benchmarks
+
+Séries geradas por random walk geométrico com seed fixa: mesmos tamanhos e
+mesma seed produzem exatamente os mesmos dados em qualquer máquina, então
+resultados de execuções diferentes são comparáveis.
+"""
+
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+
+from app.models import OHLCV_FIELDS, PriceDataPoint
+
+# Tamanhos padrão (barras por série e tickers por batch)
+BAR_SIZES = (200, 2_500, 10_000)
+BATCH_SIZES = (1, 100, 1_000)
+
+# Barras por ticker nos batches (~1 ano de pregões)
+BATCH_BARS = 250
+
+
+@lru_cache(maxsize=None)
+def synthetic_bars(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Série OHLCV diária sintética em formato colunar
+
+    Args:
+        n: Número de barras
+        seed: Seed do gerador (séries diferentes por ticker)
+
+    Returns:
+        Dict com date (datetime64[s], dias úteis a partir de 2000-01-03) e
+        arrays OHLCV. Arrays são read-only (compartilhados via cache)
+    """
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    open_ = low + (high - low) * rng.uniform(0, 1, n)
+    volume = rng.integers(1_000, 100_000, n).astype(float)
+
+    dates = np.busday_offset("2000-01-03", np.arange(n), roll="forward").astype("datetime64[s]")
+    bars = {"date": dates, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+    for values in bars.values():
+        values.flags.writeable = False
+    return bars
+
+
+@lru_cache(maxsize=None)
+def synthetic_points(n: int, seed: int = 0) -> List[PriceDataPoint]:
+    """Mesma série de synthetic_bars como lista de PriceDataPoint (já validada)"""
+    return [PriceDataPoint(**point) for point in synthetic_records(n, seed)]
+
+
+@lru_cache(maxsize=None)
+def synthetic_records(n: int, seed: int = 0) -> List[Dict]:
+    """Mesma série de synthetic_bars como lista de dicts (payload JSON de /indicators)"""
+    bars = synthetic_bars(n, seed)
+    dates = np.datetime_as_string(bars["date"], unit="D").tolist()
+    columns = [bars[field].tolist() for field in OHLCV_FIELDS]
+    return [
+        {"date": date, **dict(zip(OHLCV_FIELDS, values))}
+        for date, *values in zip(dates, *columns)
+    ]
+
+
+def synthetic_columns(n: int, seed: int = 0) -> Dict:
+    """Mesma série como payload PriceColumns (arrays paralelos)"""
+    bars = synthetic_bars(n, seed)
+    return {
+        "dates": np.datetime_as_string(bars["date"], unit="D").tolist(),
+        **{field: bars[field].tolist() for field in OHLCV_FIELDS},
+    }
+
+
+def synthetic_batch(tickers: int, n: int = BATCH_BARS) -> Dict[str, Dict[str, np.ndarray]]:
+    """Batch de séries colunares, uma por ticker (seed = posição do ticker)"""
+    return {f"T{seed:04d}": synthetic_bars(n, seed) for seed in range(tickers)}
@@ -0,0 +1,426 @@
+"""
+Benchmark Suite - Indicadores técnicos (TechnicalAnalysisService + endpoints)
+
+Mede, sobre séries sintéticas determinísticas (benchmarks/fixtures.py):
+- dataframe.*   construção do DataFrame (lista de objetos vs arrays colunares)
+- indicator.*   cada indicador isolado, sobre um DataFrame já construído,
+                nos dois engines (pandas_ta e kernels numpy)
+- pipeline.*    calculate_indicator_arrays completo (por engine, sem cache,
+                e com cache)
+- convert.*     conversão dos arrays para listas (TechnicalIndicators)
+- endpoint.*    latência de POST /indicators (JSON, columns, resposta colunar)
+- batch.*       batches de 1/100/1.000 tickers: vetorizado vs loop por ticker,
+                e POST /indicators/batch
+
+Cada benchmark é calibrado (estilo timeit/asv): o nº de chamadas por amostra
+cresce até a amostra durar --min-time, e são coletadas até --repeat amostras
+(limitadas por --max-time). Os tempos reportados são por chamada.
+
+Os resultados podem ser exportados (JSON com metadados da máquina, versões
+e commit; CSV) e comparados com uma execução anterior (--compare), o que
+retorna exit code 1 se algum benchmark ficou mais lento que --threshold.
+
+Uso:
+    cd backend/python-service
+    python -m benchmarks.run [--filter NOME ...] [--sizes 200 2500 10000]
+                             [--batches 1 100 1000] [--output results.json]
+                             [--csv results.csv] [--compare baseline.json]
+
+Exemplos:
+    python -m benchmarks.run --output bench-2.1.0.json
+    python -m benchmarks.run --filter indicator. --sizes 2500
+    python -m benchmarks.run --compare bench-2.1.0.json --threshold 1.2
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from importlib import metadata
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+
+from app.models import INDICATOR_ENGINES, INDICATOR_PARAMS
+from app.services.indicator_cache import IndicatorCache
+from app.services.indicator_encoding import COLUMNAR_JSON_MEDIA_TYPE
+from app.services.technical_analysis import TechnicalAnalysisService
+from benchmarks.fixtures import (
+    BAR_SIZES,
+    BATCH_BARS,
+    BATCH_SIZES,
+    synthetic_bars,
+    synthetic_batch,
+    synthetic_columns,
+    synthetic_points,
+    synthetic_records,
+)
+
+# Pacotes cujas versões vão para os metadados do resultado
+TRACKED_PACKAGES = ("numpy", "pandas", "pandas-ta-classic", "pyarrow", "numba", "fastapi", "pydantic")
+
+# Loggers silenciados durante os benchmarks de endpoint
+QUIET_LOGGERS = ("app", "httpx")
+
+
+@dataclass
+class Benchmark:
+    """Um caso: setup() prepara os dados e retorna a função medida (dentro de context())"""
+    name: str
+    group: str
+    params: Dict[str, Any]
+    setup: Callable[[], Callable[[], Any]]
+    context: Callable[[], ContextManager] = nullcontext
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    group: str
+    params: Dict[str, Any]
+    number: int
+    samples: List[float] = field(default_factory=list)
+    min: float = 0.0
+    median: float = 0.0
+    mean: float = 0.0
+    stdev: float = 0.0
+
+
+# ============================================================================
+# BENCHMARK CASES
+# ============================================================================
+
+def collect_benchmarks(sizes: List[int], batches: List[int], batch_bars: int) -> Iterator[Benchmark]:
+    """Gera os casos para os tamanhos de série e de batch escolhidos"""
+    # Sem cache: mede o cálculo, não o lookup
+    service = TechnicalAnalysisService(cache=IndicatorCache(max_bytes=0))
+
+    for n in sizes:
+        params = {"bars": n}
+
+        yield Benchmark(
+            f"dataframe.objects[bars={n}]", "dataframe", params,
+            lambda n=n: lambda points=synthetic_points(n): service._create_dataframe(points),
+        )
+        yield Benchmark(
+            f"dataframe.columns[bars={n}]", "dataframe", params,
+            lambda n=n: lambda bars=synthetic_bars(n): service._create_dataframe(bars),
+        )
+
+        for engine in INDICATOR_ENGINES:
+            engine_params = {**params, "engine": engine}
+
+            for name, defaults in INDICATOR_PARAMS.items():
+                def setup_indicator(n=n, name=name, defaults=defaults, engine=engine):
+                    df = service._create_dataframe(synthetic_bars(n))
+                    resolve = getattr(service, f"_resolve_{name}")
+                    # Memo novo por chamada: mede o indicador inteiro, sem intermediários prontos
+                    return lambda: resolve(df, {}, engine, **defaults)
+
+                yield Benchmark(
+                    f"indicator.{name}[bars={n},engine={engine}]", "indicator", engine_params, setup_indicator
+                )
+
+            yield Benchmark(
+                f"pipeline.arrays[bars={n},engine={engine}]", "pipeline", engine_params,
+                lambda n=n, engine=engine: lambda bars=synthetic_bars(n): service.calculate_indicator_arrays(
+                    "BENCH", bars, engine=engine
+                ),
+            )
+
+        def setup_cached(n=n):
+            cached_service = TechnicalAnalysisService()
+            bars = synthetic_bars(n)
+            cached_service.calculate_indicator_arrays("BENCH", bars)
+            return lambda: cached_service.calculate_indicator_arrays("BENCH", bars)
+
+        yield Benchmark(f"pipeline.cached[bars={n}]", "pipeline", params, setup_cached)
+
+        def setup_convert(n=n):
+            series, latest = service.calculate_indicator_arrays("BENCH", synthetic_bars(n))
+            return lambda: service.to_technical_indicators(series, latest)
+
+        yield Benchmark(f"convert.to_lists[bars={n}]", "convert", params, setup_convert)
+
+        for case, payload, accept in (
+            ("json", lambda n=n: {"prices": synthetic_records(n)}, None),
+            ("columns", lambda n=n: {"columns": synthetic_columns(n)}, None),
+            ("columnar", lambda n=n: {"columns": synthetic_columns(n)}, COLUMNAR_JSON_MEDIA_TYPE),
+        ):
+            yield Benchmark(
+                f"endpoint.{case}[bars={n}]", "endpoint", params,
+                lambda payload=payload, accept=accept: endpoint_call(
+                    "/indicators", {"ticker": "BENCH", **payload()}, accept
+                ),
+                context=endpoint_context,
+            )
+
+    for tickers in batches:
+        params = {"tickers": tickers, "bars": batch_bars}
+
+        yield Benchmark(
+            f"batch.vectorized[tickers={tickers}]", "batch", params,
+            lambda tickers=tickers: lambda batch=synthetic_batch(tickers, batch_bars): (
+                service.calculate_indicator_arrays_batch(batch)
+            ),
+        )
+
+        def setup_loop(tickers=tickers):
+            batch = synthetic_batch(tickers, batch_bars)
+            return lambda: [service.calculate_indicator_arrays(ticker, bars) for ticker, bars in batch.items()]
+
+        yield Benchmark(f"batch.loop[tickers={tickers}]", "batch", params, setup_loop)
+
+        def batch_payload(tickers=tickers):
+            return {
+                "items": [
+                    {"ticker": f"T{seed:04d}", "columns": synthetic_columns(batch_bars, seed)}
+                    for seed in range(tickers)
+                ]
+            }
+
+        yield Benchmark(
+            f"endpoint.batch_columnar[tickers={tickers}]", "endpoint", params,
+            lambda batch_payload=batch_payload: endpoint_call(
+                "/indicators/batch", batch_payload(), COLUMNAR_JSON_MEDIA_TYPE
+            ),
+            context=endpoint_context,
+        )
+
+
+@contextmanager
+def endpoint_context() -> Iterator[None]:
+    """
+    Durante a medição dos endpoints: sem cache de indicadores e sem logs de app.*
+    e do httpx do TestClient (um log INFO por request distorce a latência);
+    restaura tudo ao sair
+    """
+    from app import main
+
+    loggers = [logging.getLogger(name) for name in QUIET_LOGGERS]
+    previous_levels = [logger.level for logger in loggers]
+    previous_cache = main.technical_analysis_service.cache
+    for logger in loggers:
+        logger.setLevel(logging.CRITICAL)
+    main.technical_analysis_service.cache = IndicatorCache(max_bytes=0)
+    try:
+        yield
+    finally:
+        main.technical_analysis_service.cache = previous_cache
+        for logger, level in zip(loggers, previous_levels):
+            logger.setLevel(level)
+
+
+def endpoint_call(path: str, payload: Dict, accept: Optional[str]) -> Callable[[], Any]:
+    """POST com corpo já serializado (mede o serviço, não o json.dumps do cliente)"""
+    from app import main
+
+    client = TestClient(main.app)
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if accept:
+        headers["Accept"] = accept
+
+    def call():
+        response = client.post(path, content=body, headers=headers)
+        response.raise_for_status()
+        return response.content
+
+    return call
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float, max_time: float) -> Tuple[int, List[float]]:
+    """
+    Tempo por chamada de func
+
+    Returns:
+        (chamadas por amostra, tempos por chamada de cada amostra em segundos)
+    """
+    func()  # warm-up (imports, caches de pandas_ta, JIT)
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / number]
+    deadline = time.perf_counter() + max_time
+    while len(samples) < repeat and time.perf_counter() + elapsed < deadline:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+
+    return number, samples
+
+
+def run(benchmarks: List[Benchmark], repeat: int, min_time: float, max_time: float) -> List[BenchmarkResult]:
+    results = []
+    for benchmark in benchmarks:
+        with benchmark.context():
+            func = benchmark.setup()
+            number, samples = measure(func, repeat, min_time, max_time)
+        result = BenchmarkResult(
+            name=benchmark.name,
+            group=benchmark.group,
+            params=benchmark.params,
+            number=number,
+            samples=samples,
+            min=min(samples),
+            median=statistics.median(samples),
+            mean=statistics.fmean(samples),
+            stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+        results.append(result)
+        print(f"{result.name:<45} {format_time(result.median):>10}  "
+              f"(min {format_time(result.min)}, {len(samples)}x{number})", flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+# ============================================================================
+# EXPORT / COMPARE
+# ============================================================================
+
+def environment() -> Dict[str, Any]:
+    """Metadados da execução (para comparar resultados entre máquinas/releases)"""
+    versions = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def export_json(path: str, results: List[BenchmarkResult], config: Dict[str, Any]) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {"environment": environment(), "config": config, "results": [asdict(r) for r in results]},
+            f,
+            indent=2,
+        )
+
+
+def export_csv(path: str, results: List[BenchmarkResult]) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "group", "params", "number", "samples", "min_s", "median_s", "mean_s", "stdev_s"])
+        for r in results:
+            writer.writerow([
+                r.name, r.group, json.dumps(r.params), r.number, len(r.samples),
+                f"{r.min:.9f}", f"{r.median:.9f}", f"{r.mean:.9f}", f"{r.stdev:.9f}",
+            ])
+
+
+def compare(baseline_path: str, results: List[BenchmarkResult], threshold: float) -> int:
+    """
+    Compara medianas com uma execução anterior (export JSON)
+
+    Returns:
+        Número de regressões (ratio > threshold)
+    """
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"\n{'benchmark':<45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        ratio = result.median / previous["median"] if previous["median"] else math.inf
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{result.name:<45} {format_time(previous['median']):>10} "
+              f"{format_time(result.median):>10} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de indicadores técnicos")
+    parser.add_argument("--filter", nargs="*", default=[], help="Só benchmarks cujo nome contém um destes textos")
+    parser.add_argument("--sizes", nargs="*", type=int, default=list(BAR_SIZES), help="Barras por série")
+    parser.add_argument("--batches", nargs="*", type=int, default=list(BATCH_SIZES), help="Tickers por batch")
+    parser.add_argument("--batch-bars", type=int, default=BATCH_BARS, help="Barras por ticker nos batches")
+    parser.add_argument("--repeat", type=int, default=5, help="Amostras por benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duração mínima de uma amostra (s)")
+    parser.add_argument("--max-time", type=float, default=10.0, help="Tempo máximo por benchmark (s)")
+    parser.add_argument("--output", help="Exporta os resultados em JSON")
+    parser.add_argument("--csv", help="Exporta os resultados em CSV")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Ratio acima do qual é regressão")
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        benchmark
+        for benchmark in collect_benchmarks(args.sizes, args.batches, args.batch_bars)
+        if not args.filter or any(text in benchmark.name for text in args.filter)
+    ]
+    if not benchmarks:
+        print("No benchmarks match the filter", file=sys.stderr)
+        return 2
+
+    results = run(benchmarks, args.repeat, args.min_time, args.max_time)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "csv", "compare")}
+    if args.output:
+        export_json(args.output, results, config)
+        print(f"\nResults written to {args.output}")
+    if args.csv:
+        export_csv(args.csv, results)
+        print(f"Results written to {args.csv}")
+    if args.compare:
+        return 1 if compare(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+COTAHIST fixture builders (245-byte fixed-width records zipped like B3 files)
+"""
+import io
+import zipfile
+from typing import Iterable, Optional
+
+RECORD_LENGTH = 245
+
+
+def record_line(
+    ticker: str,
+    day: str,
+    close: float = 10.0,
+    open_: Optional[float] = None,
+    high: Optional[float] = None,
+    low: Optional[float] = None,
+    volume: int = 1_000,
+    trades: int = 10,
+    bdi: str = "02",
+    tipreg: str = "01",
+    company: str = "COMPANY",
+    stock_type: str = "ON",
+    market_type: str = "010",
+    blank_optional: bool = False,
+) -> str:
+    """
+    One COTAHIST quote record (day as YYYYMMDD, prices in BRL)
+
+    blank_optional leaves the nullable fields (PREMED, PREOFC, PREOFV, QUATOT)
+    filled with spaces instead of digits.
+    """
+    open_ = close if open_ is None else open_
+    high = max(open_, close) if high is None else high
+    low = min(open_, close) if low is None else low
+
+    def price(value: float) -> str:
+        return f"{round(value * 100):013d}"
+
+    optional = " " * 13 if blank_optional else price((high + low) / 2)
+    line = (
+        tipreg
+        + day
+        + bdi
+        + ticker.ljust(12)
+        + market_type
+        + company.ljust(12)[:12]
+        + stock_type.ljust(10)[:10]
+        + " " * 3      # PRAZOT
+        + "R$  "       # MODREF
+        + price(open_)
+        + price(high)
+        + price(low)
+        + optional     # PREMED
+        + price(close)
+        + optional     # PREOFC
+        + optional     # PREOFV
+        + f"{trades:05d}"
+        + f"{volume:018d}"
+        + (" " * 18 if blank_optional else f"{trades:018d}")
+    )
+    return line.ljust(RECORD_LENGTH)
+
+
+def header_line(year: int) -> str:
+    return f"00COTAHIST.{year}BOVESPA {year}0102".ljust(RECORD_LENGTH)
+
+
+def trailer_line(year: int, records: int) -> str:
+    return f"99COTAHIST.{year}BOVESPA {year}1231{records + 2:011d}".ljust(RECORD_LENGTH)
+
+
+def make_cotahist_zip(
+    lines: Iterable[str],
+    year: int = 2020,
+    newline: str = "\n",
+    name: Optional[str] = None,
+    final_newline: bool = True,
+) -> bytes:
+    """ZIP with one TXT member: header, the given records and trailer"""
+    lines = list(lines)
+    body = newline.join([header_line(year), *lines, trailer_line(year, len(lines))])
+    if final_newline:
+        body += newline
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(name or f"COTAHIST_A{year}.TXT", body.encode("ISO-8859-1"))
+    return buffer.getvalue()
+
+
+def year_lines(year: int, tickers: Iterable[str] = ("PETR4", "VALE3"), days: int = 5) -> list:
+    """A few trading days of each ticker in January of year"""
+    return [
+        record_line(ticker, f"{year}01{day + 2:02d}", close=10 + index + day / 10)
+        for index, ticker in enumerate(tickers)
+        for day in range(days)
+    ]
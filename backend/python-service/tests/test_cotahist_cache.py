@@ -0,0 +1,208 @@
+"""
+Tests for CotahistCache (Parquet cache of parsed COTAHIST years)
+"""
+import json
+import random
+from datetime import date, datetime
+
+import pytest
+
+from app.services import cotahist_service as cotahist_module
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+from tests.cotahist_fixtures import make_cotahist_zip, year_lines
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def service(tmp_path):
+    return CotahistService(cache=CotahistCache(str(tmp_path / "cotahist")), parse_workers=0)
+
+
+def travel_to_next_year(monkeypatch):
+    """Make the service believe the current year has ended"""
+    today = date(date.today().year + 1, 1, 5)
+
+    class NextYearDate(date):
+        @classmethod
+        def today(cls):
+            return today
+
+    class NextYearDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(today.year, today.month, today.day, 10, 0)
+
+    monkeypatch.setattr(cotahist_module, "date", NextYearDate)
+    monkeypatch.setattr(cotahist_module, "datetime", NextYearDatetime)
+
+
+def test_past_year_is_cached_as_closed(service):
+    year = date.today().year - 1
+    service.parse_year(year, make_cotahist_zip(year_lines(year), year=year))
+
+    path = service.cache.find(year)
+    assert service.cache.is_closed(path)
+    assert service._find_cached_years([year]) == {year: path}
+
+
+def test_partial_year_is_downloaded_again_after_rollover(service, monkeypatch):
+    year = date.today().year
+    partial = make_cotahist_zip(year_lines(year, days=3), year=year)
+    service.parse_year(year, partial)
+
+    # Current year: cached, but partial - never served without a download
+    partial_path = service.cache.find(year)
+    assert not service.cache.is_closed(partial_path)
+    assert service._find_cached_years([year]) == {}
+
+    travel_to_next_year(monkeypatch)
+    assert service._find_cached_years([year]) == {}
+
+    # The year ended: the complete annual file is parsed and cached as closed
+    complete = make_cotahist_zip(year_lines(year, days=5), year=year)
+    columns = service.parse_year(year, complete)
+    assert len(columns["ticker"]) == 10
+
+    closed_path = service.cache.find(year)
+    assert service.cache.is_closed(closed_path)
+    assert not partial_path.exists()
+    assert service._find_cached_years([year]) == {year: closed_path}
+
+
+def test_same_zip_cached_as_partial_is_closed_after_rollover(service, monkeypatch):
+    year = date.today().year
+    content = make_cotahist_zip(year_lines(year), year=year)
+    service.parse_year(year, content)
+
+    # ZIP unchanged after the year ended (same hash): reparsed once, now closed
+    travel_to_next_year(monkeypatch)
+    service.parse_year(year, content)
+    assert service.cache.is_closed(service.cache.find(year))
+
+
+def test_cache_without_closed_flag_counts_as_partial(service, tmp_path):
+    year = date.today().year - 1
+    service.parse_year(year, make_cotahist_zip(year_lines(year), year=year))
+    path = service.cache.find(year)
+
+    # Written before the flag existed
+    pq.write_table(pq.read_table(path).replace_schema_metadata(None), path)
+    assert not service.cache.is_closed(path)
+    assert service.cache.find(year, closed_only=True) is None
+
+
+# ----------------------------------------------------------------------------
+# Per-ticker index sidecar
+# ----------------------------------------------------------------------------
+
+def index_columns(tickers=60, seed=7):
+    """Unsorted year with a different number of sessions per ticker"""
+    rng = random.Random(seed)
+    rows = [
+        (f"T{number:03d}3", f"2020-{month:02d}-{day:02d}")
+        for number in range(tickers)
+        for month in range(1, 2 + number % 3)
+        for day in range(1, 2 + (number * 7) % 11)
+    ]
+    rng.shuffle(rows)
+    columns = {
+        "ticker": [ticker for ticker, _ in rows],
+        "date": [day for _, day in rows],
+        "volume": [1_000 + position for position in range(len(rows))],
+        "company_name": ["COMPANY"] * len(rows),
+        "stock_type": ["ON"] * len(rows),
+        "market_type": [10] * len(rows),
+        "bdi_code": [2] * len(rows),
+        "trades_count": [10] * len(rows),
+    }
+    for field in ("open", "high", "low", "close", "average_price", "best_bid", "best_ask"):
+        columns[field] = [rng.uniform(1, 100) for _ in rows]
+    return columns
+
+
+@pytest.fixture
+def index_cache(tmp_path, monkeypatch):
+    # Tiny row groups: ticker ranges cross row group boundaries
+    monkeypatch.setattr(CotahistCache, "ROW_GROUP_SIZE", 7)
+    cache = CotahistCache(str(tmp_path / "cotahist"))
+    cache.write(2020, "a" * 16, index_columns(), closed=True)
+    return cache
+
+
+def test_index_matches_sorted_parquet(index_cache):
+    path = index_cache.find(2020)
+    table = pq.read_table(path)
+    index = json.loads(index_cache._index_path(path).read_text())
+
+    assert pq.ParquetFile(path).metadata.num_row_groups > 1
+    assert list(index) == sorted(index)
+    assert sum(count for _, count in index.values()) == table.num_rows
+
+    tickers = table.column("ticker").to_pylist()
+    dates = table.column("date").to_pylist()
+    expected_offset = 0
+    for ticker, (offset, count) in index.items():
+        assert offset == expected_offset
+        assert set(tickers[offset:offset + count]) == {ticker}
+        assert dates[offset:offset + count] == sorted(dates[offset:offset + count])
+        expected_offset += count
+
+
+@pytest.mark.parametrize(
+    "tickers, start_date, end_date",
+    [
+        (["T0013"], None, None),
+        (["t0053", "T0023", "T0333"], None, None),  # Lowercase and missing ticker
+        (["T0053", "T0023"], "2020-01-03", "2020-02-05"),
+        (["T0593", "T0003"], None, "2020-01-04"),
+        (["T9993"], None, None),
+    ],
+)
+def test_indexed_read_equals_full_read_then_filter(index_cache, tickers, start_date, end_date):
+    path = index_cache.find(2020)
+    expected = index_cache.filter(pq.read_table(path), tickers, start_date, end_date)
+
+    assert index_cache.read(path, tickers, start_date, end_date) == expected
+
+
+def test_many_tickers_fall_back_to_pushdown_filter(index_cache, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("index used above INDEX_MAX_TICKERS")
+
+    path = index_cache.find(2020)
+    tickers = [f"T{number:03d}3" for number in range(CotahistCache.INDEX_MAX_TICKERS + 1)]
+    expected = index_cache.filter(pq.read_table(path), tickers, "2020-01-02", None)
+
+    monkeypatch.setattr(index_cache, "_read_indexed", fail)
+    assert index_cache.read(path, tickers, start_date="2020-01-02") == expected
+
+
+def test_missing_index_is_rebuilt(index_cache):
+    path = index_cache.find(2020)
+    index_path = index_cache._index_path(path)
+    expected = json.loads(index_path.read_text())
+    index_path.unlink()
+
+    fresh = CotahistCache(str(index_cache.cache_dir))
+    assert fresh.read(path, ["T0043"]) == index_cache.read(path, ["T0043"])
+    assert json.loads(index_path.read_text()) == expected
+
+
+def test_new_hash_removes_stale_year_and_index(index_cache):
+    stale = index_cache.find(2020)
+    index_cache.read(stale, ["T0013"])  # Loads the stale index in memory
+    assert stale in index_cache._indexes
+
+    index_cache.write(2020, "b" * 16, index_columns(tickers=3), closed=True)
+
+    current = index_cache.find(2020)
+    assert current.name == f"COTAHIST_A2020_{'b' * 16}.parquet"
+    assert not stale.exists()
+    assert not index_cache._index_path(stale).exists()
+    assert stale not in index_cache._indexes
+    assert index_cache._index_path(current).exists()
+    assert sorted(index_cache.cache_dir.glob("COTAHIST_A2020_*")) == sorted(
+        [current, index_cache._index_path(current)]
+    )
@@ -0,0 +1,343 @@
+"""
+Tests for CotahistService.download_file (ZIP cache, conditional GET, Range resume)
+
+Runs against a local HTTP stand-in serving fixture ZIPs (base_url points the
+service at it), so no request reaches B3.
+"""
+import asyncio
+import gzip
+import hashlib
+import io
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+
+FILENAME = "COTAHIST_D16102026.ZIP"
+
+
+def make_zip(lines: int = 2_000) -> bytes:
+    """Small ZIP with a COTAHIST-like member (stored, so bytes are not compressible away)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+        body = "".join(f"01{2026_10_16:08d}{i:0>235}\n" for i in range(lines))
+        zf.writestr("COTAHIST_D16102026.TXT", body)
+    return buffer.getvalue()
+
+
+class FixtureServer:
+    """
+    Serves FILES with ETag/Last-Modified, honoring If-None-Match and Range/If-Range
+
+    Knobs:
+        drop_at: Close the connection after this many body bytes (once)
+        corrupt: Overwrite the second half of the body with zeros
+        gzip: gzip-encode bodies for clients that accept it
+        delay: Seconds to wait before answering each request
+
+    max_active records the most requests served at the same time.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.drop_at = None
+        self.corrupt = False
+        self.gzip = False
+        self.delay = 0.0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server.lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(server.delay)
+                    server.handle(self)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        name = request.path.rsplit("/", 1)[-1]
+        headers = {
+            key: request.headers[key]
+            for key in ("Range", "If-Range", "If-None-Match", "If-Modified-Since", "Accept-Encoding")
+            if request.headers.get(key)
+        }
+        self.requests.append(headers)
+
+        data = self.files.get(name)
+        if data is None:
+            request.send_response(404)
+            request.end_headers()
+            return
+
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            request.send_response(304)
+            request.end_headers()
+            return
+
+        start = 0
+        if headers.get("Range") and headers.get("If-Range") == etag:
+            start = int(headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(data):
+                request.send_response(416)
+                request.send_header("Content-Range", f"bytes */{len(data)}")
+                request.end_headers()
+                return
+            request.send_response(206)
+            request.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            request.send_response(200)
+
+        body = data[start:]
+        if self.corrupt:
+            half = len(body) // 2
+            body = body[:half] + b"\0" * (len(body) - half)
+        if self.gzip and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            request.send_header("Content-Encoding", "gzip")
+        request.send_header("Content-Length", str(len(body)))
+        request.send_header("ETag", etag)
+        request.send_header("Last-Modified", "Fri, 16 Oct 2026 20:00:00 GMT")
+        request.end_headers()
+
+        if self.drop_at is not None and start == 0:
+            request.wfile.write(body[:self.drop_at])
+            request.wfile.flush()
+            self.drop_at = None
+            request.connection.shutdown(2)
+            return
+        request.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    fixture = FixtureServer()
+    fixture.files[FILENAME] = make_zip()
+    fixture.thread.start()
+    yield fixture
+    fixture.httpd.shutdown()
+    fixture.httpd.server_close()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cotahist"
+
+
+def make_service(server: FixtureServer, cache_dir) -> CotahistService:
+    return CotahistService(cache=CotahistCache(str(cache_dir), zip_cache=True), base_url=server.base_url)
+
+
+@pytest.mark.asyncio
+async def test_download_stores_zip_with_etag(server, cache_dir):
+    service = make_service(server, cache_dir)
+    try:
+        content = await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    assert content == server.files[FILENAME]
+    zip_path = cache_dir / "zips" / FILENAME
+    assert zip_path.read_bytes() == content
+    meta = CotahistCache.read_zip_meta(zip_path)
+    assert meta["etag"] == f'"{hashlib.md5(content).hexdigest()}"'
+    assert meta["sha256"] == hashlib.sha256(content).hexdigest()
+    assert not zip_path.with_name(f"{FILENAME}.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_revalidation_304_reuses_cached_zip(server, cache_dir):
+    first = make_service(server, cache_dir)
+    try:
+        await first.download_file(FILENAME)
+    finally:
+        await first.close()
+
+    # New service instance (process restart) over the same cache directory
+    second = make_service(server, cache_dir)
+    try:
+        content = await second.download_file(FILENAME)
+    finally:
+        await second.close()
+
+    assert content == server.files[FILENAME]
+    assert server.requests[-1]["If-None-Match"] == f'"{hashlib.md5(content).hexdigest()}"'
+    assert "If-Modified-Since" in server.requests[-1]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_download_resumes_with_range(server, cache_dir):
+    data = server.files[FILENAME]
+    drop_at = len(data) * 3 // 4
+    server.drop_at = drop_at
+    service = make_service(server, cache_dir)
+    try:
+        content = await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    assert content == data
+    resumed = server.requests[-1]
+    assert resumed["Range"] == f"bytes={drop_at}-"
+    assert resumed["If-Range"] == f'"{hashlib.md5(data).hexdigest()}"'
+
+
+@pytest.mark.asyncio
+async def test_416_discards_stale_part_and_restarts(server, cache_dir):
+    data = server.files[FILENAME]
+    service = make_service(server, cache_dir)
+    try:
+        # Partial download longer than the file now served (file was replaced)
+        part_path = service.cache.zip_path(FILENAME).with_name(f"{FILENAME}.part")
+        part_path.write_bytes(b"x" * (len(data) + 10))
+        service.cache.write_zip_meta(part_path, {
+            "etag": f'"{hashlib.md5(data).hexdigest()}"',
+            "last_modified": None,
+            "expected_size": len(data) + 10,
+        })
+
+        content = await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    assert content == data
+    assert "Range" in server.requests[0]
+    assert "Range" not in server.requests[1]
+
+
+@pytest.mark.asyncio
+async def test_corrupted_download_is_rejected(server, cache_dir):
+    server.corrupt = True
+    service = make_service(server, cache_dir)
+    try:
+        with pytest.raises(ValueError):
+            await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    zip_path = cache_dir / "zips" / FILENAME
+    assert not zip_path.exists()
+    assert not zip_path.with_name(f"{FILENAME}.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_tampered_cached_zip_is_downloaded_again(server, cache_dir):
+    service = make_service(server, cache_dir)
+    try:
+        await service.download_file(FILENAME)
+        zip_path = cache_dir / "zips" / FILENAME
+        tampered = bytearray(zip_path.read_bytes())
+        tampered[100] ^= 1
+        zip_path.write_bytes(bytes(tampered))
+
+        content = await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    assert content == server.files[FILENAME]
+    # Checksum mismatch: no conditional GET (a 304 would keep the bad file)
+    assert "If-None-Match" not in server.requests[-1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_of_same_file_share_one_transfer(server, cache_dir):
+    service = make_service(server, cache_dir)
+    try:
+        first, second = await asyncio.gather(
+            service.download_file(FILENAME), service.download_file(FILENAME)
+        )
+    finally:
+        await service.close()
+
+    assert first == second == server.files[FILENAME]
+    # Second request waited for the first and revalidated the finished ZIP
+    assert len(server.requests) == 2
+    assert "If-None-Match" not in server.requests[0]
+    assert "If-None-Match" in server.requests[1]
+
+
+@pytest.mark.asyncio
+async def test_resume_offsets_use_file_bytes_not_decoded_bytes(server, cache_dir):
+    data = server.files[FILENAME]
+    server.gzip = True
+    drop_at = len(data) // 2
+    server.drop_at = drop_at
+    service = make_service(server, cache_dir)
+    try:
+        content = await service.download_file(FILENAME)
+    finally:
+        await service.close()
+
+    assert content == data
+    assert all(request["Accept-Encoding"] == "identity" for request in server.requests)
+    assert server.requests[-1]["Range"] == f"bytes={drop_at}-"
+
+
+@pytest.mark.asyncio
+async def test_parallel_years_respect_window_and_skip_failures(server, cache_dir):
+    years = list(range(2010, 2018))
+    for year in years:
+        if year != 2013:  # Not on the server: 404 on every attempt
+            server.files[f"COTAHIST_A{year}.ZIP"] = make_zip(lines=50 + year % 10)
+    server.delay = 0.1
+    service = make_service(server, cache_dir)
+    try:
+        results = await service.download_years_parallel(years, max_concurrent=3)
+    finally:
+        await service.close()
+
+    assert sorted(results) == [year for year in years if year != 2013]
+    for year, content in results.items():
+        assert content == server.files[f"COTAHIST_A{year}.ZIP"]
+    # Window full, never exceeded (2013 retries hold a slot too)
+    assert server.max_active == 3
+
+
+@pytest.mark.asyncio
+async def test_year_slot_reports_failure_and_frees_slot(server, cache_dir):
+    server.files["COTAHIST_A2015.ZIP"] = make_zip(lines=10)
+    service = make_service(server, cache_dir)
+    semaphore = asyncio.Semaphore(1)
+    try:
+        missing = await service._download_year_slot(2014, semaphore)
+        found = await service._download_year_slot(2015, semaphore)
+    finally:
+        await service.close()
+
+    assert missing[:2] == (2014, None)
+    assert found[:2] == (2015, server.files["COTAHIST_A2015.ZIP"])
+    assert missing[2] >= 0 and found[2] >= 0
+    assert not semaphore.locked()
+
+
+def test_verify_zip_detects_size_and_crc_errors():
+    data = make_zip(lines=10)
+    CotahistService._verify_zip(data, len(data))
+
+    with pytest.raises(ValueError, match="size mismatch"):
+        CotahistService._verify_zip(data, len(data) + 1)
+    with pytest.raises(ValueError):
+        CotahistService._verify_zip(b"not a zip", None)
@@ -0,0 +1,111 @@
+"""
+Vectorized vs streaming COTAHIST parser parity
+"""
+import io
+import zipfile
+
+import pytest
+
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+from tests.cotahist_fixtures import make_cotahist_zip, record_line
+
+
+def odd_lines():
+    """Records the parsers must keep, skip or zero-fill the same way"""
+    return [
+        record_line("PETR4", "20200102", close=30.12, open_=29.5, high=30.5, low=29.1),
+        record_line("VALE3", "20200102", close=55.0, volume=123_456_789_012, trades=99_999),
+        # Nullable fields in blank (PREMED, PREOFC, PREOFV, QUATOT)
+        record_line("ITUB4", "20200103", close=37.8, blank_optional=True),
+        # Zero prices and volume
+        record_line("OIBR3", "20200103", close=0.0, volume=0, trades=0),
+        # FII and fractional lots are kept
+        record_line("HGLG11", "20200103", close=170.0, bdi="12", stock_type="CI"),
+        record_line("PETR4F", "20200103", close=30.0, bdi="96", market_type="020"),
+        # Other BDI codes and record types are skipped
+        record_line("PETRA30", "20200103", close=1.2, bdi="78", market_type="070"),
+        record_line("PETR4", "20200103", close=30.0, tipreg="02"),
+        # Invalid trading date is skipped
+        record_line("BBAS3", "20200230", close=40.0),
+        # Latin-1 company name
+        record_line("ABEV3", "20200106", close=18.0, company="AMBEV S/AÇÃ"),
+    ]
+
+
+def parse_both(zip_content, tickers=None):
+    return (
+        CotahistService(parser_mode="vectorized", parse_workers=0).parse_file(zip_content, tickers),
+        CotahistService(parser_mode="streaming", parse_workers=0).parse_file(zip_content, tickers),
+    )
+
+
+def txt_bytes(zip_content):
+    with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
+        return zf.read(zf.namelist()[0])
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"], ids=["lf", "crlf"])
+@pytest.mark.parametrize("final_newline", [True, False], ids=["terminated", "unterminated"])
+@pytest.mark.parametrize("tickers", [None, ["petr4", "ITUB4", "ABEV3"]], ids=["all", "filtered"])
+def test_vectorized_matches_streaming(newline, final_newline, tickers):
+    zip_content = make_cotahist_zip(odd_lines(), newline=newline, final_newline=final_newline)
+
+    vectorized, streaming = parse_both(zip_content, tickers)
+
+    # Fixed-width layout: no fallback to the streaming parser
+    service = CotahistService(parser_mode="vectorized", parse_workers=0)
+    assert service._parse_buffer_vectorized(txt_bytes(zip_content), None) is not None
+
+    assert vectorized == streaming
+    expected = {"PETR4", "ITUB4", "ABEV3"} if tickers else {
+        "PETR4", "VALE3", "ITUB4", "OIBR3", "HGLG11", "PETR4F", "ABEV3"
+    }
+    assert {record["ticker"] for record in vectorized} == expected
+
+
+def test_blank_and_latin1_fields():
+    records, _ = parse_both(make_cotahist_zip(odd_lines(), newline="\r\n"))
+
+    blank = next(record for record in records if record["ticker"] == "ITUB4")
+    assert blank["average_price"] == blank["best_bid"] == blank["best_ask"] == 0
+    assert blank["trades_count"] == 0
+    assert next(r for r in records if r["ticker"] == "ABEV3")["company_name"] == "AMBEV S/AÇÃ"
+
+
+def test_variable_width_file_falls_back_to_identical_output():
+    lines = odd_lines()
+    lines[3] = lines[3].rstrip()  # Trailing spaces trimmed: not fixed-width anymore
+    zip_content = make_cotahist_zip(lines)
+
+    service = CotahistService(parser_mode="vectorized", parse_workers=0)
+    assert service._parse_buffer_vectorized(txt_bytes(zip_content), None) is None
+
+    vectorized, streaming = parse_both(zip_content)
+    assert vectorized == streaming
+    # Short OIBR3 line is dropped by both parsers
+    assert "OIBR3" not in {record["ticker"] for record in vectorized}
+    assert len(vectorized) == 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tickers", [None, ["PETR4", "ABEV3"]], ids=["all", "filtered"])
+async def test_process_pool_parse_matches_in_process(tmp_path, tickers):
+    zip_content = make_cotahist_zip(odd_lines())
+    in_process = CotahistService(cache=CotahistCache(str(tmp_path / "inline")), parse_workers=0)
+    pooled = CotahistService(cache=CotahistCache(str(tmp_path / "pool")), parse_workers=2)
+    if not pooled.parse_workers:
+        pytest.skip("single CPU: parse_workers is capped to 0")
+
+    try:
+        expected = await in_process._parse_year_async(2020, zip_content, tickers)
+        actual = await pooled._parse_year_async(2020, zip_content, tickers)
+        assert pooled._process_pool is not None  # Parsed in a spawned worker
+
+        assert in_process.columns_to_records(actual) == in_process.columns_to_records(expected)
+        # The worker's cache write is visible to the parent (same cache dir)
+        if pooled.cache.enabled:
+            assert pooled.cache.find(2020, pooled.cache.zip_hash(zip_content)) is not None
+    finally:
+        await pooled.close()
+        await in_process.close()
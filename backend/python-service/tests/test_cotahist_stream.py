@@ -0,0 +1,67 @@
+"""
+POST /cotahist/fetch/stream: NDJSON framing and parity with POST /cotahist/fetch
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+from tests.cotahist_fixtures import make_cotahist_zip, record_line, year_lines
+
+YEARS = (2019, 2020)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    service = CotahistService(cache=CotahistCache(str(tmp_path / "cotahist")), parse_workers=0)
+
+    async def download_year(year):
+        lines = year_lines(year, tickers=("PETR4", "VALE3", "ABEV3"), days=4)
+        # Latin-1 name: must reach the NDJSON output unescaped
+        lines.append(record_line("ITUB4", f"{year}0110", close=30.0, company="ITAÚ"))
+        return make_cotahist_zip(lines, year=year)
+
+    service.download_year = download_year
+    monkeypatch.setattr(main, "cotahist_service", service)
+    # Several chunks per year
+    monkeypatch.setattr(main, "NDJSON_CHUNK_SIZE", 4)
+    return TestClient(main.app)
+
+
+def stream_records(response):
+    body = response.text
+    assert body.endswith("\n")
+    lines = body.split("\n")[:-1]
+    assert all(line for line in lines)  # One object per line, no blank lines
+    return [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize("tickers", [None, ["vale3", "ITUB4"]], ids=["all", "filtered"])
+def test_stream_matches_fetch(client, tickers):
+    payload = {"start_year": YEARS[0], "end_year": YEARS[1], "tickers": tickers}
+
+    streamed = client.post("/cotahist/fetch/stream", json=payload)
+    fetched = client.post("/cotahist/fetch", json=payload)
+
+    assert streamed.status_code == fetched.status_code == 200
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert "ITAÚ" in streamed.text
+
+    records = stream_records(streamed)
+    assert records == fetched.json()["data"]
+    assert [record["date"][:4] for record in records] == sorted(record["date"][:4] for record in records)
+    expected_tickers = {"VALE3", "ITUB4"} if tickers else {"PETR4", "VALE3", "ABEV3", "ITUB4"}
+    assert {record["ticker"] for record in records} == expected_tickers
+
+
+def test_stream_rejects_adjusted(client):
+    response = client.post(
+        "/cotahist/fetch/stream",
+        json={"start_year": YEARS[0], "end_year": YEARS[1], "adjusted": True},
+    )
+
+    assert response.status_code == 400
+    assert "/cotahist/fetch" in response.json()["detail"]
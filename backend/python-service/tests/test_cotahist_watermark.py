@@ -0,0 +1,78 @@
+"""
+Tests for the COTAHIST delta-sync watermark (only unfiltered syncs move it)
+"""
+from datetime import date
+
+import httpx
+import pytest
+
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+from tests.cotahist_fixtures import make_cotahist_zip, year_lines
+
+pytest.importorskip("pyarrow")
+
+LAST_YEAR = date.today().year - 1
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = CotahistService(cache=CotahistCache(str(tmp_path / "cotahist")), parse_workers=0)
+
+    async def download_year(year):
+        return make_cotahist_zip(year_lines(year), year=year)
+
+    async def download_file(filename):
+        # Daily files: no trading session published yet
+        request = httpx.Request("GET", f"https://example.com/{filename}")
+        raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+    service.download_year = download_year
+    service.download_file = download_file
+    return service
+
+
+@pytest.mark.asyncio
+async def test_ticker_filtered_fetch_does_not_move_watermark(service):
+    await service.fetch_historical_data(LAST_YEAR, LAST_YEAR, tickers=["PETR4"], update_watermark=True)
+    await service.fetch_historical_data(LAST_YEAR, LAST_YEAR)  # internal load, no sync
+    assert service.cache.read_watermark() is None
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_sync_seeds_watermark(service):
+    await service.fetch_historical_data(LAST_YEAR, LAST_YEAR, update_watermark=True)
+    assert service.cache.read_watermark() == f"{LAST_YEAR}-12-31"
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_cache_never_seeds_year_end(service):
+    # Cached while it was the current year (partial), then the download fails
+    service.cache.write(LAST_YEAR, "partial", service.parse_file_columns(
+        make_cotahist_zip(year_lines(LAST_YEAR, days=2), year=LAST_YEAR)
+    ), closed=False)
+
+    async def failing_download(year):
+        raise OSError("B3 unavailable")
+
+    service.download_year = failing_download
+    await service.fetch_historical_data(LAST_YEAR, LAST_YEAR, update_watermark=True)
+    assert service.cache.read_watermark() is None
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_filtered_delta_does_not_persist_watermark(service):
+    since = f"{LAST_YEAR - 1}-12-31"
+    until = date(LAST_YEAR + 1, 1, 1)  # Annual file of LAST_YEAR + daily files
+
+    delta = await service.fetch_delta(since=since, tickers=["PETR4"], until=until)
+    assert delta["watermark"] == f"{LAST_YEAR}-12-31"
+    assert {record["ticker"] for record in delta["data"]} == {"PETR4"}
+    assert service.cache.read_watermark() is None
+
+    await service.fetch_delta(since=since, until=until)
+    assert service.cache.read_watermark() == f"{LAST_YEAR}-12-31"
+    await service.close()
@@ -0,0 +1,147 @@
+"""
+Tests for IncrementalIndicatorService (per-ticker state files)
+"""
+import datetime
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models import IncrementalIndicatorsRequest, PriceDataPoint
+from app.services.incremental_indicators import IncrementalIndicatorService
+from app.services.indicator_cache import IndicatorCache
+from app.services.technical_analysis import TechnicalAnalysisService
+
+
+def bar(date: str, close: float = 10.0) -> dict:
+    return {"date": date, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1000}
+
+
+@pytest.mark.parametrize("ticker", ["../../X", "a/b", "..", "PETR4\\..", "PETR 4"])
+def test_request_rejects_path_like_tickers(ticker):
+    with pytest.raises(ValidationError):
+        IncrementalIndicatorsRequest(ticker=ticker, prices=[bar("2024-01-02")])
+
+
+def test_request_normalizes_ticker():
+    request = IncrementalIndicatorsRequest(ticker="brk.b", prices=[bar("2024-01-02")])
+    assert request.ticker == "BRK.B"
+
+
+def test_state_path_stays_inside_state_dir(tmp_path):
+    service = IncrementalIndicatorService(state_dir=str(tmp_path / "state"))
+    assert service._state_path("PETR4") == (tmp_path / "state" / "PETR4.json").resolve()
+
+    with pytest.raises(ValueError):
+        service.update("../../X", [PriceDataPoint(**bar("2024-01-02"))])
+    assert not list(tmp_path.rglob("*.json"))
+
+
+def history(days: int) -> list:
+    start = datetime.date(2024, 1, 1)
+    return [
+        PriceDataPoint(**bar((start + datetime.timedelta(days=i)).isoformat(), 20 + (i * 7 % 11) - i * 0.01))
+        for i in range(days)
+    ]
+
+
+def test_same_date_bar_replaces_last_bar(tmp_path):
+    prices = history(230)
+    partial = PriceDataPoint(**{**prices[-1].dict(), "close": 25.0, "high": 26.0})
+
+    service = IncrementalIndicatorService(state_dir=str(tmp_path))
+    service.update("PETR4", prices[:-1] + [partial])
+
+    # Restarted service: the revision must also work from the persisted state
+    restarted = IncrementalIndicatorService(state_dir=str(tmp_path))
+    state, applied = restarted.update("PETR4", [prices[-1]])
+
+    expected, _ = IncrementalIndicatorService(state_dir=str(tmp_path / "fresh")).update("PETR4", prices)
+    assert applied == 1
+    assert state.bars == expected.bars == 230
+    assert state.snapshot() == expected.snapshot()
+
+
+def test_same_date_bar_without_kept_state_is_rejected(tmp_path):
+    prices = history(210)
+    service = IncrementalIndicatorService(state_dir=str(tmp_path))
+    state, _ = service.update("PETR4", prices)
+    state.previous = None
+
+    with pytest.raises(ValueError, match="reset=true"):
+        service.update("PETR4", [prices[-1]])
+
+
+def random_walk(days: int, seed: int = 3) -> list:
+    rng = np.random.default_rng(seed)
+    close = 30 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    open_ = close * (1 + rng.normal(0, 0.01, days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, days)))
+    volume = rng.integers(1_000, 50_000, days)
+    start = datetime.date(2023, 1, 1)
+    return [
+        PriceDataPoint(
+            date=(start + datetime.timedelta(days=i)).isoformat(),
+            open=open_[i], high=high[i], low=low[i], close=close[i], volume=int(volume[i]),
+        )
+        for i in range(days)
+    ]
+
+
+def full_recompute_latest(prices: list) -> dict:
+    """Last value of every field from TechnicalAnalysisService (pandas_ta engine)"""
+    full = TechnicalAnalysisService(cache=IndicatorCache(max_bytes=0)).calculate_indicators(
+        "PETR4", prices, engine="pandas_ta"
+    )
+    return {
+        "sma_20": full.sma_20[-1],
+        "sma_50": full.sma_50[-1],
+        "sma_200": full.sma_200[-1],
+        "ema_9": full.ema_9[-1],
+        "ema_21": full.ema_21[-1],
+        "rsi": full.rsi[-1],
+        "macd": full.macd.macd[-1],
+        "macd_signal": full.macd.signal[-1],
+        "macd_histogram": full.macd.histogram[-1],
+        "stochastic_k": full.stochastic.k[-1],
+        "stochastic_d": full.stochastic.d[-1],
+        "bb_upper": full.bollinger_bands.upper[-1],
+        "bb_middle": full.bollinger_bands.middle[-1],
+        "bb_lower": full.bollinger_bands.lower[-1],
+        "bb_bandwidth": full.bollinger_bands.bandwidth,
+        "atr": full.atr[-1],
+        "obv": full.obv[-1],
+        "volume_sma": full.volume_sma[-1],
+        "pivot": full.pivot.dict(),
+        "trend": full.trend,
+        "trend_strength": full.trend_strength,
+    }
+
+
+def test_seed_then_bar_by_bar_matches_full_recompute(tmp_path):
+    prices = random_walk(400)
+    seed_bars = 250
+
+    service = IncrementalIndicatorService(state_dir=str(tmp_path))
+    state, applied = service.update("PETR4", prices[:seed_bars])
+    assert applied == seed_bars
+
+    for end in range(seed_bars, len(prices) + 1):
+        if end > seed_bars:
+            if end == 325:
+                # Restart halfway: the rest is applied on top of the persisted JSON
+                service = IncrementalIndicatorService(state_dir=str(tmp_path))
+            state, applied = service.update("PETR4", [prices[end - 1]])
+            assert applied == 1
+
+        snapshot = state.snapshot().dict()
+        expected = full_recompute_latest(prices[:end])
+        assert snapshot.keys() == expected.keys()
+        for field, value in expected.items():
+            if field == "pivot":
+                assert snapshot[field] == pytest.approx(value, rel=1e-9), f"bar {end}: {field}"
+            elif isinstance(value, float):
+                assert snapshot[field] == pytest.approx(value, rel=1e-8, abs=1e-8), f"bar {end}: {field}"
+            else:
+                assert snapshot[field] == value, f"bar {end}: {field}"
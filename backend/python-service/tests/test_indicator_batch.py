@@ -0,0 +1,54 @@
+"""
+calculate_indicator_arrays_batch vs calculate_indicator_arrays per ticker
+"""
+import numpy as np
+import pytest
+
+from app.services.indicator_cache import IndicatorCache
+from app.services.technical_analysis import TechnicalAnalysisService
+from tests.test_indicator_kernels import TOLERANCE, as_prices, random_walk
+
+
+@pytest.fixture
+def service():
+    return TechnicalAnalysisService(cache=IndicatorCache(max_bytes=0))
+
+
+def test_batch_matches_per_ticker(service):
+    # Different lengths: shorter series are NaN-padded at the start of the frames
+    series = {
+        "LONG3": as_prices(random_walk(n=420, seed=1)),
+        "MID4": as_prices(random_walk(n=260, seed=2)),
+        "MIN11": as_prices(random_walk(n=service.min_data_points, seed=3)),
+        "SHORT3": as_prices(random_walk(n=service.min_data_points - 1, seed=4)),
+    }
+
+    results, errors = service.calculate_indicator_arrays_batch(series)
+
+    assert set(results) == {"LONG3", "MID4", "MIN11"}
+    assert list(errors) == ["SHORT3"]
+    with pytest.raises(ValueError) as excinfo:
+        service.calculate_indicator_arrays("SHORT3", series["SHORT3"], engine="pandas_ta")
+    assert errors["SHORT3"] == str(excinfo.value)
+
+    for ticker, (actual, actual_latest) in results.items():
+        expected, expected_latest = service.calculate_indicator_arrays(ticker, series[ticker], engine="pandas_ta")
+
+        assert actual.keys() == expected.keys(), ticker
+        for name in expected:
+            assert len(actual[name]) == len(expected[name]), f"{ticker} {name}"
+            np.testing.assert_allclose(actual[name], expected[name], err_msg=f"{ticker} {name}", **TOLERANCE)
+
+        assert actual_latest.keys() == expected_latest.keys(), ticker
+        for name, value in expected_latest.items():
+            if isinstance(value, float):
+                np.testing.assert_allclose(actual_latest[name], value, err_msg=f"{ticker} {name}", **TOLERANCE)
+            else:
+                assert actual_latest[name] == value, f"{ticker} {name}"
+
+
+def test_batch_with_only_short_series(service):
+    results, errors = service.calculate_indicator_arrays_batch({"SHORT3": as_prices(random_walk(n=50))})
+
+    assert results == {}
+    assert "got 50" in errors["SHORT3"]
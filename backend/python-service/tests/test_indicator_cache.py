@@ -0,0 +1,129 @@
+"""
+IndicatorCache: LRU byte bound, eviction order and cache keys
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import IndicatorSpec
+from app.services.indicator_cache import IndicatorCache, fingerprint_prices
+from app.services.technical_analysis import TechnicalAnalysisService
+from tests.test_indicator_kernels import as_prices, random_walk
+
+OVERHEAD = IndicatorCache.ENTRY_OVERHEAD_BYTES
+
+
+def result(n):
+    """(series, latest) whose arrays take n * 8 bytes"""
+    return {"sma_20": np.zeros(n)}, {"trend": "sideways"}
+
+
+def entry_size(n):
+    return n * 8 + OVERHEAD
+
+
+def test_lru_stays_within_byte_budget():
+    cache = IndicatorCache(max_bytes=3 * entry_size(100))
+
+    for key in "abc":
+        cache.put(key, result(100))
+    assert len(cache) == 3
+    assert cache.current_bytes == 3 * entry_size(100)
+
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("d", result(100))
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    assert cache.evictions == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_large_entry_evicts_several_in_lru_order():
+    cache = IndicatorCache(max_bytes=4 * entry_size(100))
+    for key in "abcd":
+        cache.put(key, result(100))
+    cache.get("a")
+    cache.get("c")  # Order, oldest first: b, d, a, c
+
+    cache.put("big", result(250))
+
+    assert [key for key in "abcd" if cache.get(key) is not None] == ["a", "c"]
+    assert cache.evictions == 2
+    assert cache.current_bytes == 2 * entry_size(100) + entry_size(250)
+
+
+def test_replacing_a_key_does_not_double_count():
+    cache = IndicatorCache(max_bytes=10 * entry_size(100))
+    cache.put("a", result(100))
+    cache.put("a", result(200))
+
+    assert len(cache) == 1
+    assert cache.current_bytes == entry_size(200)
+
+
+def test_oversized_and_disabled_are_not_stored():
+    cache = IndicatorCache(max_bytes=entry_size(100))
+    stored = cache.put("big", result(101))
+    assert len(cache) == 0 and cache.current_bytes == 0
+    # Still read-only: callers may keep the result around
+    assert not stored[0]["sma_20"].flags.writeable
+
+    disabled = IndicatorCache(max_bytes=0)
+    disabled.put("a", result(1))
+    assert not disabled.enabled
+    assert len(disabled) == 0
+
+
+def test_stats():
+    cache = IndicatorCache(max_bytes=entry_size(100))
+    cache.put("a", result(10))
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    cache.clear()
+    assert cache.stats()["entries"] == cache.stats()["bytes"] == 0
+
+
+def test_fingerprint_ignores_index_unit_but_not_values():
+    index = pd.date_range("2024-01-01", periods=5)
+    df = pd.DataFrame({"close": np.arange(5.0)}, index=index)
+
+    seconds = df.copy()
+    seconds.index = seconds.index.as_unit("s")
+    assert fingerprint_prices(seconds) == fingerprint_prices(df)
+
+    changed = df.copy()
+    changed.iloc[-1, 0] = 4.000001
+    assert fingerprint_prices(changed) != fingerprint_prices(df)
+
+
+@pytest.fixture
+def service():
+    return TechnicalAnalysisService(cache=IndicatorCache(max_bytes=64 * 1024 * 1024))
+
+
+def test_service_keys_on_prices_plan_and_engine(service):
+    prices = as_prices(random_walk(n=250))
+    sma = [IndicatorSpec(name="sma", params={"period": 10})]
+
+    first = service.calculate_indicator_arrays("PETR4", prices, sma, engine="numpy")
+    # Same prices under another ticker name: same fingerprint, same entry
+    assert service.calculate_indicator_arrays("OTHER3", prices, sma, engine="numpy") is first
+    assert (service.cache.hits, len(service.cache)) == (1, 1)
+
+    # Another plan (params), another engine or other prices: separate entries
+    service.calculate_indicator_arrays("PETR4", prices, [IndicatorSpec(name="sma", params={"period": 11})], engine="numpy")
+    by_pandas_ta = service.calculate_indicator_arrays("PETR4", prices, sma, engine="pandas_ta")
+    other_prices = as_prices(random_walk(n=250, seed=3))
+    service.calculate_indicator_arrays("PETR4", other_prices, sma, engine="numpy")
+
+    assert by_pandas_ta is not first
+    assert (service.cache.hits, len(service.cache)) == (1, 4)
+
+    series, _ = first
+    assert not series["sma_10"].flags.writeable
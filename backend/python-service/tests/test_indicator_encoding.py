@@ -0,0 +1,165 @@
+"""
+Columnar indicator responses: Accept negotiation and round-trips
+"""
+import base64
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.models import PivotPointsIndicator
+from app.services import indicator_encoding
+from app.services.indicator_encoding import (
+    ARROW_STREAM_MEDIA_TYPE,
+    COLUMNAR_JSON_MEDIA_TYPE,
+    DTYPES,
+    encode_indicator_response,
+    negotiate_indicator_format,
+)
+
+TIMESTAMP = datetime(2026, 10, 16, 18, 30)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("", None),
+        ("application/json", None),
+        ("*/*", None),
+        (COLUMNAR_JSON_MEDIA_TYPE, (COLUMNAR_JSON_MEDIA_TYPE, "float64")),
+        ("Application/Vnd.Indicators.Columnar+JSON; DTYPE=Float32", (COLUMNAR_JSON_MEDIA_TYPE, "float32")),
+        (f"{COLUMNAR_JSON_MEDIA_TYPE}; dtype=int8", (COLUMNAR_JSON_MEDIA_TYPE, "float64")),
+        (f"application/json, {COLUMNAR_JSON_MEDIA_TYPE}", (COLUMNAR_JSON_MEDIA_TYPE, "float64")),
+        (f"{COLUMNAR_JSON_MEDIA_TYPE}; q=0", None),
+        (f"{COLUMNAR_JSON_MEDIA_TYPE}; q=abc", None),
+        # Same quality: first listed wins; higher quality wins regardless of order
+        (f"{ARROW_STREAM_MEDIA_TYPE}; dtype=float32, {COLUMNAR_JSON_MEDIA_TYPE}", (ARROW_STREAM_MEDIA_TYPE, "float32")),
+        (f"{COLUMNAR_JSON_MEDIA_TYPE}; q=0.5, {ARROW_STREAM_MEDIA_TYPE}; q=0.9", (ARROW_STREAM_MEDIA_TYPE, "float64")),
+    ],
+)
+def test_negotiation(accept, expected, monkeypatch):
+    monkeypatch.setattr(indicator_encoding, "PYARROW_AVAILABLE", True)
+    assert negotiate_indicator_format(accept) == expected
+
+
+def test_arrow_is_not_offered_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(indicator_encoding, "PYARROW_AVAILABLE", False)
+
+    assert negotiate_indicator_format(ARROW_STREAM_MEDIA_TYPE) is None
+    assert negotiate_indicator_format(f"{ARROW_STREAM_MEDIA_TYPE}, {COLUMNAR_JSON_MEDIA_TYPE}; q=0.1") == (
+        COLUMNAR_JSON_MEDIA_TYPE, "float64"
+    )
+
+
+def make_item(ticker, data_points, seed):
+    """(ticker, data_points, series, latest) with NaN warm-up and a shorter stochastic series"""
+    rng = np.random.default_rng(seed)
+    sma = rng.normal(50, 5, data_points)
+    sma[:4] = np.nan
+    series = {
+        "sma_20": sma,
+        "obv": np.cumsum(rng.normal(0, 1e6, data_points)),
+        # ta.stoch output starts later: shorter than the price history
+        "stochastic_k": np.concatenate([[np.nan], rng.uniform(0, 100, data_points - 6)]),
+    }
+    latest = {
+        "trend": "uptrend",
+        "trend_strength": 12.5,
+        "bb_bandwidth": None,
+        "pivot": PivotPointsIndicator(pivot=10.0, r1=11.0, r2=12.0, r3=13.0, s1=9.0, s2=8.0, s3=7.0),
+    }
+    return ticker, data_points, series, latest
+
+
+def decode_series(encoded, dtype):
+    return {
+        name: np.frombuffer(base64.b64decode(column["data"]), dtype=DTYPES[dtype])[: column["length"]]
+        for name, column in encoded.items()
+    }
+
+
+def expected_latest(latest):
+    return {**latest, "pivot": latest["pivot"].dict()}
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_columnar_json_round_trip(dtype):
+    item = make_item("PETR4", 30, seed=1)
+    ticker, data_points, series, latest = item
+
+    payload = json.loads(encode_indicator_response(COLUMNAR_JSON_MEDIA_TYPE, dtype, [item], TIMESTAMP))
+
+    assert payload["ticker"] == ticker
+    assert payload["data_points"] == data_points
+    assert payload["timestamp"] == TIMESTAMP.isoformat()
+    assert payload["encoding"] == {"dtype": dtype, "byte_order": "little", "missing": "NaN"}
+    assert payload["latest"] == expected_latest(latest)
+
+    decoded = decode_series(payload["series"], dtype)
+    assert decoded.keys() == series.keys()
+    for name, values in series.items():
+        assert payload["series"][name]["length"] == len(values)
+        # Shorter series keep their own length (no padding in the JSON envelope)
+        np.testing.assert_array_equal(decoded[name], values.astype(DTYPES[dtype]), err_msg=name)
+
+
+def test_columnar_json_batch_envelope():
+    items = [make_item("PETR4", 30, seed=1), make_item("VALE3", 12, seed=2)]
+    errors = {"XPTO3": "Insufficient data"}
+
+    payload = json.loads(encode_indicator_response(
+        COLUMNAR_JSON_MEDIA_TYPE, "float64", items, TIMESTAMP, errors=errors, batch=True
+    ))
+
+    assert payload["total_tickers"] == 3
+    assert payload["errors"] == errors
+    assert payload["encoding"]["dtype"] == "float64"
+    assert [result["ticker"] for result in payload["results"]] == ["PETR4", "VALE3"]
+    for result, (_, _, series, _) in zip(payload["results"], items):
+        decoded = decode_series(result["series"], "float64")
+        for name, values in series.items():
+            np.testing.assert_array_equal(decoded[name], values, err_msg=name)
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_arrow_round_trip_right_pads_columns(dtype):
+    pa = pytest.importorskip("pyarrow")
+    items = [make_item("PETR4", 30, seed=1), make_item("VALE3", 12, seed=2)]
+    errors = {"XPTO3": "Insufficient data"}
+
+    body = encode_indicator_response(ARROW_STREAM_MEDIA_TYPE, dtype, items, TIMESTAMP, errors=errors, batch=True)
+    reader = pa.ipc.open_stream(body)
+    batches = list(reader)
+
+    schema = reader.schema
+    assert schema.field("sma_20").type == (pa.float32() if dtype == "float32" else pa.float64())
+    metadata = {key.decode(): value.decode() for key, value in schema.metadata.items()}
+    assert metadata["timestamp"] == TIMESTAMP.isoformat()
+    assert json.loads(metadata["errors"]) == errors
+    assert json.loads(metadata["latest"]) == {ticker: expected_latest(latest) for ticker, _, _, latest in items}
+
+    assert len(batches) == len(items)
+    for record_batch, (ticker, data_points, series, _) in zip(batches, items):
+        assert record_batch.num_rows == data_points
+        assert set(record_batch.column("ticker").to_pylist()) == {ticker}
+        for name, values in series.items():
+            column = record_batch.column(name)
+            # Right-aligned to the price history; NaN and padding are nulls
+            padded = np.full(data_points, np.nan)
+            padded[data_points - len(values):] = values.astype(DTYPES[dtype])
+            assert column.null_count == int(np.isnan(padded).sum()), name
+            np.testing.assert_array_equal(
+                column.to_numpy(zero_copy_only=False).astype(float), padded, err_msg=f"{ticker} {name}"
+            )
+
+
+def test_arrow_with_only_errors():
+    pa = pytest.importorskip("pyarrow")
+
+    body = encode_indicator_response(ARROW_STREAM_MEDIA_TYPE, "float64", [], TIMESTAMP, errors={"XPTO3": "x"})
+    reader = pa.ipc.open_stream(body)
+
+    assert reader.schema.names == ["ticker"]
+    assert list(reader) == []
@@ -0,0 +1,151 @@
+"""
+indicator_kernels parity with pandas_ta (numpy vs pandas_ta engine)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import INDICATOR_PARAMS, IndicatorSpec
+from app.services import indicator_kernels as kernels
+from app.services.indicator_cache import IndicatorCache
+from app.services.technical_analysis import TechnicalAnalysisService, _pandas_ta
+
+TOLERANCE = {"rtol": 1e-8, "atol": 1e-8, "equal_nan": True}
+
+# Recurrence used by EMA/RMA at import time (JIT-compiled when numba is installed)
+IMPORTED_FILTER = kernels._linear_filter
+
+RECURRENCES = {
+    "numpy": kernels._linear_filter_numpy,
+    "python_loop": kernels._linear_filter_loop,
+    "numba": IMPORTED_FILTER if kernels.NUMBA_AVAILABLE else None,
+}
+
+
+@pytest.fixture(params=list(RECURRENCES))
+def recurrence(request, monkeypatch):
+    """Run the test once per EMA/RMA recurrence implementation"""
+    linear_filter = RECURRENCES[request.param]
+    if linear_filter is None:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(kernels, "_linear_filter", linear_filter)
+    return request.param
+
+
+def random_walk(n=300, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    return {
+        "open": close * (1 + rng.normal(0, 0.005, n)),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(1_000, 100_000, n).astype(float),
+    }
+
+
+def zero_range(n=300, seed=7):
+    """high == low == close on every bar (non_zero_range epsilon path)"""
+    close = random_walk(n, seed)["close"]
+    return {"open": close, "high": close, "low": close, "close": close, "volume": np.full(n, 500.0)}
+
+
+def as_prices(columns):
+    dates = pd.bdate_range("2020-01-01", periods=len(columns["close"]))
+    return {"date": [day.date().isoformat() for day in dates], **{k: list(v) for k, v in columns.items()}}
+
+
+ALL_DEFAULTS = [IndicatorSpec(name=name) for name in INDICATOR_PARAMS]
+NON_DEFAULTS = [
+    IndicatorSpec(name="sma", params={"period": 7}),
+    IndicatorSpec(name="ema", params={"period": 50}),
+    IndicatorSpec(name="rsi", params={"period": 5}),
+    IndicatorSpec(name="macd", params={"fast": 5, "slow": 35, "signal": 5}),
+    IndicatorSpec(name="stochastic", params={"period": 5, "d": 2, "smooth_k": 4}),
+    IndicatorSpec(name="bollinger_bands", params={"period": 10, "std_dev": 2.5}),
+    IndicatorSpec(name="atr", params={"period": 21}),
+    IndicatorSpec(name="volume_sma", params={"period": 3}),
+    IndicatorSpec(name="trend", params={"fast": 10, "slow": 30}),
+]
+
+
+@pytest.mark.parametrize("series", [random_walk, zero_range], ids=["random_walk", "zero_range"])
+@pytest.mark.parametrize("indicators", [ALL_DEFAULTS, NON_DEFAULTS], ids=["defaults", "custom"])
+def test_numpy_engine_matches_pandas_ta(recurrence, series, indicators):
+    service = TechnicalAnalysisService(cache=IndicatorCache(max_bytes=0))
+    prices = as_prices(series())
+
+    expected, expected_latest = service.calculate_indicator_arrays("TEST3", prices, indicators, engine="pandas_ta")
+    actual, actual_latest = service.calculate_indicator_arrays("TEST3", prices, indicators, engine="numpy")
+
+    assert actual.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_allclose(actual[name], expected[name], err_msg=name, **TOLERANCE)
+
+    assert actual_latest.keys() == expected_latest.keys()
+    for name, value in expected_latest.items():
+        if isinstance(value, float):
+            np.testing.assert_allclose(actual_latest[name], value, err_msg=name, **TOLERANCE)
+        else:
+            assert actual_latest[name] == value, name
+
+
+def pandas_ta_reference(name, columns, length):
+    """pandas_ta output as a float array (None when pandas_ta has no result)"""
+    ta = _pandas_ta()
+    frame = pd.DataFrame(columns)
+    if name == "stochastic":
+        try:
+            result = ta.stoch(frame["high"], frame["low"], frame["close"], k=length, d=3, smooth_k=3)
+        except AttributeError:
+            # pandas_ta stoch fails when the smoothing window does not fit
+            return None
+        return None if result is None else result.iloc[:, 0].to_numpy(dtype=float)
+    result = {
+        "sma": lambda: ta.sma(frame["close"], length=length),
+        "ema": lambda: ta.ema(frame["close"], length=length),
+        "rsi": lambda: ta.rsi(frame["close"], length=length),
+        "stdev": lambda: ta.stdev(frame["close"], length=length, ddof=0),
+        "atr": lambda: ta.atr(frame["high"], frame["low"], frame["close"], length=length),
+        "obv": lambda: ta.obv(frame["close"], frame["volume"]),
+    }[name]()
+    return None if result is None else result.to_numpy(dtype=float)
+
+
+def kernel_output(name, columns, length):
+    high, low, close, volume = (columns[key] for key in ("high", "low", "close", "volume"))
+    return {
+        "sma": lambda: kernels.sma(close, length),
+        "ema": lambda: kernels.ema(close, length),
+        "rsi": lambda: kernels.rsi(close, length),
+        "stdev": lambda: kernels.stdev(close, length),
+        "atr": lambda: kernels.atr(high, low, close, length),
+        "obv": lambda: kernels.obv(close, volume),
+        "stochastic": lambda: kernels.stochastic(high, low, close, length)["stochastic_k"],
+    }[name]()
+
+
+@pytest.mark.parametrize("name", ["sma", "ema", "rsi", "stdev", "atr", "obv", "stochastic"])
+@pytest.mark.parametrize("n", [1, 5, 14, 15, 20], ids=lambda n: f"n{n}")
+def test_short_series_match_pandas_ta(recurrence, name, n):
+    columns = {key: values[:n] for key, values in random_walk(n=40).items()}
+    length = 14
+
+    expected = pandas_ta_reference(name, columns, length)
+    actual = kernel_output(name, columns, length)
+
+    if expected is None:
+        # Window does not fit: pandas_ta has no result, kernels only NaN
+        assert np.isnan(actual).all()
+    else:
+        np.testing.assert_allclose(actual, expected, **TOLERANCE)
+
+
+def test_recurrences_agree_on_long_series():
+    values = random_walk(n=5_000)["close"]
+    for beta in (0.0, 0.5, 0.9, 0.999):
+        reference = kernels._linear_filter_loop(values, beta, 1.0)
+        for name, linear_filter in RECURRENCES.items():
+            if linear_filter is not None:
+                np.testing.assert_allclose(linear_filter(values, beta, 1.0), reference, rtol=1e-10, err_msg=name)
@@ -0,0 +1,73 @@
+"""
+Validation of IndicatorSpec params against the INDICATOR_PARAMS catalog
+"""
+import inspect
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import INDICATOR_PARAMS, IndicatorSpec, IndicatorsRequest
+from app.services.technical_analysis import TechnicalAnalysisService
+
+
+def test_catalog_matches_spec_names_and_resolvers():
+    assert set(get_args(IndicatorSpec.model_fields["name"].annotation)) == set(INDICATOR_PARAMS)
+    for name, defaults in INDICATOR_PARAMS.items():
+        resolver = getattr(TechnicalAnalysisService, f"_resolve_{name}")
+        accepted = list(inspect.signature(resolver).parameters)[4:]  # After self, df, memo, engine
+        assert accepted == list(defaults), name
+
+
+def test_unknown_indicator():
+    with pytest.raises(ValidationError, match="name"):
+        IndicatorSpec(name="vwap")
+
+
+@pytest.mark.parametrize(
+    "name, params, message",
+    [
+        ("sma", {"length": 10}, r"unknown param 'length' for sma \(accepted: \['period'\]\)"),
+        ("obv", {"period": 10}, r"unknown param 'period' for obv \(accepted: none\)"),
+        ("sma", {"period": 0}, r"must be in \(0, 1000\]"),
+        ("rsi", {"period": -5}, r"must be in \(0, 1000\]"),
+        ("ema", {"period": 1001}, r"must be in \(0, 1000\]"),
+        ("atr", {"period": 14.5}, "must be an integer"),
+        ("macd", {"fast": 26, "slow": 12}, "fast must be < slow"),
+        ("macd", {"fast": 30}, "fast must be < slow"),  # Against the default slow (26)
+        ("trend", {"fast": 200}, "fast must be < slow"),
+        ("sma", {"period": "abc"}, "period"),
+    ],
+)
+def test_bad_params(name, params, message):
+    with pytest.raises(ValidationError, match=message):
+        IndicatorSpec(name=name, params=params)
+
+
+def test_params_are_normalized():
+    assert IndicatorSpec(name="sma", params={"period": 50.0}).params == {"period": 50}
+    assert isinstance(IndicatorSpec(name="sma", params={"period": 50.0}).params["period"], int)
+    # Float params keep their value
+    assert IndicatorSpec(name="bollinger_bands", params={"std_dev": 2.5}).params == {"std_dev": 2.5}
+    assert IndicatorSpec(name="ema", params={"period": 1000}).params == {"period": 1000}
+
+
+def test_duplicate_specs_are_planned_once():
+    plan = TechnicalAnalysisService.plan_indicators([
+        IndicatorSpec(name="sma"),
+        IndicatorSpec(name="rsi", params={"period": 7}),
+        IndicatorSpec(name="sma", params={"period": 20}),  # Same as the default
+        IndicatorSpec(name="rsi", params={"period": 7.0}),
+        IndicatorSpec(name="sma", params={"period": 50}),
+    ])
+
+    assert plan == (
+        ("sma", (("period", 20),)),
+        ("rsi", (("period", 7),)),
+        ("sma", (("period", 50),)),
+    )
+
+
+def test_request_needs_at_least_one_indicator():
+    with pytest.raises(ValidationError, match="indicators"):
+        IndicatorsRequest(ticker="PETR4", source="cotahist", indicators=[])
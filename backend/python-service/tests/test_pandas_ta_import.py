@@ -0,0 +1,42 @@
+"""
+pandas_ta_classic is imported lazily (only the pandas_ta engine loads it)
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+SETUP = """
+import datetime
+from app.models import PriceDataPoint
+from app.services.technical_analysis import TechnicalAnalysisService
+start = datetime.date(2024, 1, 1)
+prices = [
+    PriceDataPoint(date=(start + datetime.timedelta(days=i)).isoformat(),
+                   open=10 + i % 7, high=12 + i % 7, low=9 + i % 7, close=11 + i % 5, volume=1000 + i)
+    for i in range(250)
+]
+"""
+
+
+def loaded_after(code: str) -> bool:
+    script = f"import sys\n{code}\nprint('pandas_ta_classic' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=SERVICE_DIR, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1] == "True"
+
+
+def test_numpy_engine_does_not_import_pandas_ta():
+    assert not loaded_after(
+        SETUP
+        + "TechnicalAnalysisService().calculate_indicators('PETR4', prices, engine='numpy')"
+    )
+
+
+def test_pandas_ta_engine_imports_it_on_first_use():
+    assert loaded_after(
+        SETUP
+        + "TechnicalAnalysisService().calculate_indicators('PETR4', prices, engine='pandas_ta')"
+    )
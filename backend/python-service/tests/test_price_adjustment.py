@@ -0,0 +1,164 @@
+"""
+PriceAdjustmentService: cumulative factor math and event validation
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.price_adjustment import PriceAdjustmentService
+
+
+def make_records(ticker="PETR4", closes=(10.0, 10.0, 10.0, 10.0, 10.0), start=date(2024, 1, 2)):
+    """One record per consecutive day, all prices equal to close"""
+    return [
+        {
+            "ticker": ticker,
+            "date": (start + timedelta(days=offset)).isoformat(),
+            **{field: close for field in ("open", "high", "low", "close", "average_price", "best_bid", "best_ask")},
+            "volume": 1_000,
+        }
+        for offset, close in enumerate(closes)
+    ]
+
+
+@pytest.fixture
+def service(tmp_path):
+    # Empty local table: only events passed in each test apply
+    return PriceAdjustmentService(events_file=str(tmp_path / "missing.json"))
+
+
+def closes(records):
+    return [record["close"] for record in records]
+
+
+def test_cash_event_scales_days_before_ex_date(service):
+    records = make_records(closes=(10.0, 10.0, 8.0, 8.0))
+    events = {"PETR4": [{"tipo": "dividendo", "valor_bruto": 2.0, "data_ex": "2024-01-04"}]}
+
+    service.adjust_records(records, events=events)
+
+    # Factor (10 - 2) / 10 on both days before the ex-date
+    assert closes(records) == pytest.approx([8.0, 8.0, 8.0, 8.0])
+    assert records[0]["open"] == pytest.approx(8.0)
+    assert records[0]["volume"] == 1_000
+
+
+def test_share_event_uses_inverse_factor(service):
+    records = make_records(closes=(20.0, 20.0, 10.0, 10.0))
+    events = {"PETR4": [{"tipo": "desdobramento", "fator": 2.0, "data_ex": "2024-01-04"}]}
+
+    service.adjust_records(records, events=events)
+
+    assert closes(records) == pytest.approx([10.0, 10.0, 10.0, 10.0])
+
+
+def test_cash_and_share_events_accumulate(service):
+    records = make_records(closes=(10.0, 10.0, 10.0, 10.0, 10.0))
+    events = {
+        "PETR4": [
+            {"tipo": "grupamento", "fator": 0.5, "data_ex": "2024-01-05"},
+            {"tipo": "jcp", "valor_bruto": 1.0, "data_ex": "2024-01-03"},
+        ]
+    }
+
+    service.adjust_records(records, events=events)
+
+    # Day 1: jcp (0.9) * grupamento (2.0); days 2-3: grupamento only
+    assert closes(records) == pytest.approx([18.0, 20.0, 20.0, 10.0, 10.0])
+
+
+def test_same_day_events_multiply(service):
+    records = make_records(closes=(10.0, 10.0, 10.0))
+    events = {
+        "PETR4": [
+            {"tipo": "dividendo", "valor_bruto": 1.0, "data_ex": "2024-01-03"},
+            {"tipo": "bonus", "fator": 1.25, "data_ex": "2024-01-03"},
+        ]
+    }
+
+    service.adjust_records(records, events=events)
+
+    assert closes(records) == pytest.approx([10.0 * 0.9 / 1.25, 10.0, 10.0])
+
+
+def test_events_outside_range_are_ignored(service):
+    records = make_records(closes=(10.0, 10.0, 10.0))
+    events = {
+        "PETR4": [
+            # Ex-date on/before the first session: no earlier session to adjust
+            {"tipo": "dividendo", "valor_bruto": 1.0, "data_ex": "2024-01-02"},
+            {"tipo": "desdobramento", "fator": 2.0, "data_ex": "2023-06-01"},
+            # Ex-date after the last session: outside the adjustment base
+            {"tipo": "desdobramento", "fator": 2.0, "data_ex": "2024-02-01"},
+        ]
+    }
+    skipped = []
+
+    service.adjust_records(records, events=events, skipped=skipped)
+
+    assert closes(records) == pytest.approx([10.0, 10.0, 10.0])
+    assert skipped == []
+
+
+def test_events_only_touch_their_ticker(service):
+    records = make_records("PETR4") + make_records("VALE3")
+    events = {"petr4": [{"tipo": "desdobramento", "fator": 2.0, "data_ex": "2024-01-04"}]}
+
+    service.adjust_records(records, events=events)
+
+    assert closes(records[:5]) == pytest.approx([5.0, 5.0, 10.0, 10.0, 10.0])
+    assert closes(records[5:]) == pytest.approx([10.0] * 5)
+
+
+def test_scraped_bonus_without_factor_is_reported(service):
+    records = make_records(closes=(10.0, 10.0, 10.0))
+    # StatusInvestDividendsScraper output: bonus with valor_bruto but no fator
+    events = {"PETR4": [{"tipo": "bonus", "valor_bruto": 0.5, "data_ex": "2024-01-03"}]}
+    skipped = []
+
+    service.adjust_records(records, events=events, skipped=skipped)
+
+    assert closes(records) == pytest.approx([10.0, 10.0, 10.0])
+    assert len(skipped) == 1
+    assert skipped[0]["ticker"] == "PETR4"
+    assert skipped[0]["tipo"] == "bonus"
+    assert skipped[0]["data_ex"] == "2024-01-03"
+    assert "fator" in skipped[0]["reason"]
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def test_events_without_adjusted_are_rejected(client):
+    response = client.post(
+        "/cotahist/fetch",
+        json={
+            "start_year": 2024,
+            "end_year": 2024,
+            "tickers": ["PETR4"],
+            "events": {"PETR4": [{"tipo": "dividendo", "valor_bruto": 1.0, "data_ex": "2024-05-10"}]},
+        },
+    )
+
+    assert response.status_code == 400
+    assert "adjusted" in response.json()["detail"]
+
+
+def test_share_event_without_factor_is_rejected(client):
+    response = client.post(
+        "/cotahist/fetch",
+        json={
+            "start_year": 2024,
+            "end_year": 2024,
+            "adjusted": True,
+            "events": {"PETR4": [{"tipo": "bonus", "valor_bruto": 1.0, "data_ex": "2024-05-10"}]},
+        },
+    )
+
+    assert response.status_code == 422
+    assert "fator" in response.text
@@ -0,0 +1,105 @@
+"""
+Validation of columnar price input (PriceColumns, PriceBuffer)
+"""
+import base64
+import math
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models import PriceBuffer, PriceColumns
+
+DATES = ["2024-01-02", "2024-01-03", "2024-01-04"]
+
+
+def columns(**overrides):
+    values = {
+        "dates": list(DATES),
+        "open": [10.0, 10.5, 11.0],
+        "high": [10.8, 11.0, 11.5],
+        "low": [9.9, 10.2, 10.8],
+        "close": [10.5, 10.9, 11.2],
+        "volume": [1000.0, 0.0, 1500.0],
+    }
+    values.update(overrides)
+    return values
+
+
+def buffer(values=None, dtype="float64", date_unit="D"):
+    """PriceBuffer payload for a columns() dict"""
+    values = values or columns()
+    days = np.array(values["dates"], dtype="datetime64[D]").astype(np.int64)
+    dates = days * 86_400 if date_unit == "s" else days
+    matrix = np.vstack([dates, *(values[field] for field in ("open", "high", "low", "close", "volume"))])
+    data = base64.b64encode(matrix.astype("<f4" if dtype == "float32" else "<f8").tobytes()).decode()
+    return {"dtype": dtype, "date_unit": date_unit, "data": data}
+
+
+def test_valid_columns_and_buffer_decode_the_same():
+    expected = PriceColumns(**columns()).to_arrays()
+
+    for payload in (buffer(), buffer(date_unit="s"), buffer(dtype="float32")):
+        decoded = PriceBuffer(**payload)
+        assert len(decoded) == 3
+        arrays = decoded.to_arrays()
+        np.testing.assert_array_equal(arrays["date"], expected["date"])
+        for field in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_allclose(arrays[field], expected[field], rtol=1e-6, err_msg=field)
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"close": [10.5, 10.9]}, "close has 2 values, expected 3"),
+        ({"dates": DATES[:2]}, "open has 3 values, expected 2"),
+        ({"volume": [1000.0, 0.0, 1500.0, 1.0]}, "volume has 4 values"),
+        ({"open": [10.0, math.nan, 11.0]}, "open must contain only finite numbers"),
+        ({"high": [10.8, math.inf, 11.5]}, "high must contain only finite numbers"),
+        ({"volume": [1000.0, -math.inf, 1500.0]}, "volume must contain only finite numbers"),
+        ({"close": [10.5, 0.0, 11.2]}, r"close must be > 0 \(index 1\)"),
+        ({"volume": [1000.0, -1.0, 1500.0]}, r"volume must be >= 0 \(index 1\)"),
+        ({"low": [9.9, 10.2, 11.6]}, r"high must be >= low \(index 2\)"),
+        ({"dates": ["2024-01-02", "2024-01-04", "2024-01-03"]}, "dates must be sorted"),
+        ({"dates": ["2024-01-02", "2024-13-01", "2024-01-04"]}, "ISO date strings"),
+    ],
+)
+def test_invalid_columns(overrides, message):
+    with pytest.raises(ValidationError, match=message):
+        PriceColumns(**columns(**overrides))
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"open": [10.0, math.nan, 11.0]}, "open must contain only finite numbers"),
+        ({"volume": [1000.0, math.inf, 1500.0]}, "volume must contain only finite numbers"),
+        ({"dates": ["2024-01-04", "2024-01-03", "2024-01-05"]}, "dates must be sorted"),
+        ({"low": [11.0, 10.2, 10.8]}, r"high must be >= low \(index 0\)"),
+    ],
+)
+def test_invalid_buffer_values(overrides, message):
+    with pytest.raises(ValidationError, match=message):
+        PriceBuffer(**buffer(columns(**overrides)))
+
+
+def test_invalid_buffer_layout():
+    valid = buffer()
+
+    # One float short: rows cannot have equal lengths
+    raw = base64.b64decode(valid["data"])[:-8]
+    with pytest.raises(ValidationError, match="6 rows of float64 values of equal length"):
+        PriceBuffer(data=base64.b64encode(raw).decode())
+
+    with pytest.raises(ValidationError, match="valid base64"):
+        PriceBuffer(data="not base64!")
+
+    # Dates row must be whole days / seconds
+    matrix = np.frombuffer(base64.b64decode(valid["data"]), dtype="<f8").reshape(6, -1).copy()
+    for bad_date in (0.5, math.nan):
+        matrix[0, 1] = bad_date
+        with pytest.raises(ValidationError, match="whole D units"):
+            PriceBuffer(data=base64.b64encode(matrix.tobytes()).decode())
+
+    with pytest.raises(ValidationError):
+        PriceBuffer(**{**valid, "dtype": "int32"})
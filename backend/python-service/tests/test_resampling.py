@@ -0,0 +1,132 @@
+"""
+Tests for resample_ohlcv and ResamplingService (COTAHIST bars from the cache only)
+"""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.services.cotahist_cache import CotahistCache
+from app.services.cotahist_service import CotahistService
+from app.services.resampling import DataNotReadyError, ResamplingService, resample_ohlcv
+from tests.cotahist_fixtures import make_cotahist_zip, year_lines
+
+
+def daily(days):
+    """Bars for ISO days; close = 1, 2, 3... and high/low around it"""
+    close = np.arange(1, len(days) + 1, dtype=float)
+    return {
+        "date": np.array(days, dtype="datetime64[s]"),
+        "open": close - 0.5,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.full(len(days), 100.0),
+    }
+
+
+def as_lists(bars):
+    return {
+        "date": [str(day)[:10] for day in bars["date"].astype("datetime64[D]")],
+        **{name: bars[name].tolist() for name in ("open", "high", "low", "close", "volume")},
+    }
+
+
+def test_weekly_bars_start_on_first_trading_day_and_cross_years():
+    bars = daily([
+        "2024-12-24", "2024-12-26", "2024-12-27",  # Mon 23 and Wed 25 closed
+        "2024-12-30", "2024-12-31", "2025-01-02", "2025-01-03",  # ISO week across the year
+        "2025-01-06",  # Partial last week
+    ])
+
+    weekly = as_lists(resample_ohlcv(bars, "1wk"))
+
+    assert weekly["date"] == ["2024-12-24", "2024-12-30", "2025-01-06"]
+    assert weekly["open"] == [0.5, 3.5, 7.5]
+    assert weekly["high"] == [4.0, 8.0, 9.0]
+    assert weekly["low"] == [0.0, 3.0, 7.0]
+    assert weekly["close"] == [3.0, 7.0, 8.0]
+    assert weekly["volume"] == [300.0, 400.0, 100.0]
+
+
+def test_monthly_bars_split_on_calendar_month():
+    bars = daily(["2024-01-30", "2024-01-31", "2024-02-01", "2024-02-29", "2024-03-01"])
+
+    monthly = as_lists(resample_ohlcv(bars, "1mo"))
+
+    assert monthly["date"] == ["2024-01-30", "2024-02-01", "2024-03-01"]
+    assert monthly["close"] == [2.0, 4.0, 5.0]
+    assert monthly["high"] == [3.0, 5.0, 6.0]
+    assert monthly["low"] == [0.0, 2.0, 4.0]
+    assert monthly["volume"] == [200.0, 200.0, 100.0]
+
+
+def test_intraday_bars_and_daily_input_checks():
+    hourly = daily(["2024-01-02T10:00", "2024-01-02T11:30", "2024-01-02T14:00", "2024-01-03T10:00"])
+
+    four_hours = as_lists(resample_ohlcv(hourly, "4h"))
+    assert four_hours["close"] == [2.0, 3.0, 4.0]  # 08-12, 12-16, next day
+
+    with pytest.raises(ValueError, match="daily bars"):
+        resample_ohlcv(daily(["2024-01-02", "2024-01-03"]), "1h")
+    with pytest.raises(ValueError, match="Unsupported timeframe"):
+        resample_ohlcv(hourly, "2wk")
+
+
+def test_empty_bars():
+    assert len(resample_ohlcv(daily([]), "1wk")["date"]) == 0
+
+
+@pytest.fixture
+def cotahist(tmp_path):
+    pytest.importorskip("pyarrow")
+    service = CotahistService(cache=CotahistCache(str(tmp_path / "cotahist")), parse_workers=0)
+    downloads = []
+
+    async def download_year(year):
+        downloads.append(year)
+        return make_cotahist_zip(year_lines(year, tickers=("PETR4", "VALE3"), days=5), year=year)
+
+    service.download_year = download_year
+    service.downloads = downloads
+    return service
+
+
+@pytest.mark.asyncio
+async def test_cotahist_bars_come_from_cache_only(cotahist, monkeypatch):
+    monkeypatch.setattr(ResamplingService, "COTAHIST_YEARS", 2)
+    resampling = ResamplingService(cotahist, yfinance_service=None)
+    current_year = date.today().year
+
+    # Cache miss: no download inside the request, background fill instead
+    with pytest.raises(DataNotReadyError):
+        await resampling.load_bars("cotahist", "PETR4")
+    warmup = resampling._cotahist_warmups[(current_year - 1, current_year)]
+
+    # A second request while filling does not start another download
+    with pytest.raises(DataNotReadyError):
+        await resampling.load_bars("cotahist", "VALE3")
+    await warmup
+    assert sorted(cotahist.downloads) == [current_year - 1, current_year]
+
+    bars = await resampling.load_bars("cotahist", "VALE3", "1mo")
+    assert len(bars["date"]) == 2  # January of each year
+    assert sorted(cotahist.downloads) == [current_year - 1, current_year]
+    assert cotahist.cache.read_watermark() is None
+    await cotahist.close()
+
+
+def test_indicators_endpoint_returns_202_while_loading(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+
+    async def load_bars(source, ticker, timeframe):
+        raise DataNotReadyError("COTAHIST 2017-2026 is not cached yet")
+
+    monkeypatch.setattr(main.resampling_service, "load_bars", load_bars)
+    response = TestClient(main.app).post("/indicators", json={"ticker": "PETR4", "source": "cotahist"})
+
+    assert response.status_code == 202
+    assert response.headers["Retry-After"] == "30"
+    assert "not cached" in response.json()["detail"]
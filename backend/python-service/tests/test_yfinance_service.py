@@ -0,0 +1,202 @@
+"""
+YFinanceService async downloads with a stubbed yf.Ticker (no network)
+"""
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import yfinance_service
+from app.services.yfinance_service import YFinanceService, columns_to_records, history_to_columns
+
+DOWNLOAD_TIME = 0.1
+BACKOFF = 0.3
+
+
+class FakeYahoo:
+    """yf.Ticker stand-in: scripted failures per ticker, records concurrent downloads"""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})  # yahoo ticker -> failed attempts before success
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = []  # (yahoo ticker, start, active at start)
+
+    def Ticker(self, symbol, session=None):
+        fake = self
+
+        class Ticker:
+            def history(self, period, interval):
+                with fake.lock:
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                    fake.calls.append((symbol, time.perf_counter(), fake.active))
+                    fail = fake.failures.get(symbol, 0)
+                    if fail:
+                        fake.failures[symbol] = fail - 1
+                try:
+                    time.sleep(DOWNLOAD_TIME)
+                    if fail:
+                        raise ConnectionError(f"429 Too Many Requests for {symbol}")
+                    if symbol == "EMPTY3.SA":
+                        return pd.DataFrame()
+                    index = pd.date_range("2024-01-02", periods=3, tz="America/Sao_Paulo")
+                    return pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 100.0}, index=index)
+                finally:
+                    with fake.lock:
+                        fake.active -= 1
+
+        return Ticker()
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    fake = FakeYahoo()
+    monkeypatch.setattr(yfinance_service, "yf", fake)
+    return fake
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = YFinanceService(max_concurrency=4)
+    delays = []
+
+    def retry_delay(ticker, attempt):
+        delays.append((ticker, attempt))
+        return BACKOFF
+
+    monkeypatch.setattr(service, "_retry_delay", retry_delay)
+    service.delays = delays
+    yield service
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_with_backoff_then_succeeds(service, yahoo):
+    yahoo.failures = {"PETR4.SA": 2}
+
+    prices = await service.fetch_historical_data_async("PETR4")
+
+    assert [record["date"] for record in prices] == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert service.delays == [("PETR4", 1), ("PETR4", 2)]
+    starts = [start for symbol, start, _ in yahoo.calls]
+    assert len(starts) == 3
+    assert all(later - earlier >= DOWNLOAD_TIME + BACKOFF * 0.9 for earlier, later in zip(starts, starts[1:]))
+
+
+@pytest.mark.asyncio
+async def test_last_error_after_max_retries(service, yahoo):
+    yahoo.failures = {"VALE3.SA": service.MAX_RETRIES}
+
+    with pytest.raises(Exception, match="Failed to fetch historical data: 429"):
+        await service.fetch_historical_data_async("VALE3")
+    assert len(yahoo.calls) == service.MAX_RETRIES
+
+    # No data is a ValueError, kept as-is
+    with pytest.raises(ValueError, match="No historical data found for EMPTY3"):
+        await service.fetch_historical_data_async("EMPTY3")
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_bounds_downloads_and_frees_slot_while_backing_off(service, yahoo):
+    tickers = ["SLOW3", "A3", "B3", "C3", "D3", "E3", "EMPTY3"]
+    yahoo.failures = {"SLOW3.SA": 1}
+
+    results, errors = await service.fetch_many(tickers, max_concurrent=2)
+
+    assert list(results) == ["SLOW3", "A3", "B3", "C3", "D3", "E3"]
+    assert list(errors) == ["EMPTY3"]
+    assert yahoo.max_active == 2
+
+    # While SLOW3 waits to retry, the other tickers use both slots
+    failed_at = next(start for symbol, start, _ in yahoo.calls if symbol == "SLOW3.SA") + DOWNLOAD_TIME
+    during_backoff = [
+        active for symbol, start, active in yahoo.calls
+        if symbol != "SLOW3.SA" and failed_at < start < failed_at + BACKOFF
+    ]
+    assert max(during_backoff) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_many_window_is_capped_by_pool(service, yahoo):
+    tickers = [f"T{i}3" for i in range(10)]
+
+    results, errors = await service.fetch_many(tickers, max_concurrent=50)
+
+    assert len(results) == 10 and errors == {}
+    assert yahoo.max_active == service.max_concurrency
+
+
+def row_loop_records(hist):
+    """Conversion used before history_to_columns (iterrows + float() per cell)"""
+    return [
+        {
+            "date": date.strftime("%Y-%m-%d"),
+            "open": float(row["Open"]),
+            "high": float(row["High"]),
+            "low": float(row["Low"]),
+            "close": float(row["Close"]),
+            "volume": float(row["Volume"]),
+            "adjustedClose": float(row.get("Adj Close", row["Close"])),
+        }
+        for date, row in hist.iterrows()
+    ]
+
+
+def make_history(index, adj_close=True, nan_rows=()):
+    n = len(index)
+    rng = np.random.default_rng(5)
+    close = 20 + rng.normal(0, 1, n).cumsum()
+    hist = pd.DataFrame(
+        {"Open": close - 0.1, "High": close + 0.5, "Low": close - 0.5, "Close": close, "Volume": rng.integers(1, 10**9, n)},
+        index=index,
+    )
+    if adj_close:
+        hist["Adj Close"] = close * 0.9
+    for row in nan_rows:
+        hist.iloc[row, [0, 1, 2, 3]] = np.nan
+    return hist
+
+
+def assert_same_records(actual, expected):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got.keys() == want.keys()
+        for field, value in want.items():
+            if isinstance(value, float) and math.isnan(value):
+                assert math.isnan(got[field]), field
+            else:
+                assert got[field] == value, field
+
+
+INDEXES = {
+    # Yahoo stamps B3 bars at local midnight (03:00 UTC)
+    "tz_aware": pd.date_range("2024-01-02", periods=6, freq="B", tz="America/Sao_Paulo"),
+    # 01:00 UTC is still the previous day in Sao Paulo: the local date must win
+    "tz_utc_next_day": pd.date_range("2024-03-02 01:00", periods=6, freq="D", tz="UTC").tz_convert("America/Sao_Paulo"),
+    "naive": pd.date_range("2024-01-02", periods=6, freq="B"),
+}
+
+
+@pytest.mark.parametrize("index", list(INDEXES))
+@pytest.mark.parametrize("adj_close", [True, False], ids=["adj_close", "no_adj_close"])
+@pytest.mark.parametrize("nan_rows", [(), (0, 3)], ids=["complete", "nan_rows"])
+def test_history_to_columns_matches_row_loop(index, adj_close, nan_rows):
+    hist = make_history(INDEXES[index], adj_close, nan_rows)
+
+    columns = history_to_columns(hist)
+
+    assert columns["date"].dtype == np.dtype("datetime64[s]")
+    assert_same_records(columns_to_records(columns), row_loop_records(hist))
+    if not adj_close:
+        np.testing.assert_array_equal(columns["adjustedClose"], columns["close"])
+
+
+def test_history_to_columns_empty():
+    hist = make_history(pd.DatetimeIndex([], tz="America/Sao_Paulo"))
+
+    assert columns_to_records(history_to_columns(hist)) == row_loop_records(hist) == []